@@ -1,4 +1,10 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+
+# Modo de empacotamento: "onefile" extrai o runtime para uma pasta temporária a
+# cada execução; "onedir" deixa o runtime já extraído ao lado do executável
+# (inicialização mais rápida). Selecione com ENTALHE_BUILD_MODE=onedir.
+BUILD_MODE = os.environ.get('ENTALHE_BUILD_MODE', 'onefile').strip().lower()
 
 
 a = Analysis(
@@ -6,7 +12,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('valid_keys.json', '.')],
-    hiddenimports=['tkinter'],
+    hiddenimports=['tkinter', 'entalhe.optimizer', 'generation_cache'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -16,24 +22,53 @@ a = Analysis(
 )
 pyz = PYZ(a.pure)
 
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.datas,
-    [],
-    name='EntalheCNC_CAM',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
-    console=False,
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-    icon=['entalhe_icon.ico'],
-)
+if BUILD_MODE == 'onedir':
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name='EntalheCNC_CAM',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=True,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+        icon=['entalhe_icon.ico'],
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=True,
+        upx_exclude=[],
+        name='EntalheCNC_CAM',
+    )
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.datas,
+        [],
+        name='EntalheCNC_CAM',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=True,
+        upx_exclude=[],
+        runtime_tmpdir=None,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+        icon=['entalhe_icon.ico'],
+    )
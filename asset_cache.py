@@ -0,0 +1,191 @@
+"""
+Cache em memória dos arquivos estáticos exportados pelo Next.js (pasta out)
+
+Todos os arquivos são lidos uma única vez na inicialização e indexados pelo
+caminho da URL. Para os tipos textuais são pré-calculadas variantes gzip e
+(se o módulo brotli estiver instalado) brotli, escolhidas pelo cabeçalho
+Accept-Encoding de cada requisição.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Arquivos com hash no nome gerados pelo Next.js nunca mudam de conteúdo
+IMMUTABLE_PREFIX = "/_next/static/"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Demais arquivos (HTML, imagens públicas) são revalidados pelo ETag
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Tipos que compensam ser comprimidos
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "image/svg+xml",
+)
+# Arquivos muito pequenos não ganham nada com compressão
+MIN_COMPRESS_SIZE = 512
+
+# Extensões de variantes pré-comprimidas geradas pelo build (ex.: main.js.br)
+PRECOMPRESSED_EXTENSIONS = {".br": "br", ".gz": "gzip"}
+
+# Ordem de preferência das codificações quando o cliente aceita várias
+ENCODING_PREFERENCE = ("br", "gzip")
+
+mimetypes.add_type("application/javascript", ".js")
+mimetypes.add_type("text/css", ".css")
+mimetypes.add_type("image/svg+xml", ".svg")
+mimetypes.add_type("application/json", ".json")
+mimetypes.add_type("text/plain", ".txt")
+
+
+def parse_accept_encoding(header):
+    """Retorna o conjunto de codificações aceitas (q > 0) pelo cliente"""
+    accepted = set()
+    if not header:
+        return accepted
+    for item in header.split(","):
+        parts = item.strip().split(";")
+        coding = parts[0].strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in parts[1:]:
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding)
+    return accepted
+
+
+class Asset:
+    """Um arquivo estático carregado em memória e suas variantes comprimidas"""
+
+    __slots__ = ("url_path", "content_type", "data", "etag", "cache_control", "variants")
+
+    def __init__(self, url_path, data):
+        self.url_path = url_path
+        content_type = mimetypes.guess_type(url_path)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in ("application/javascript", "application/json"):
+            content_type += "; charset=utf-8"
+        self.content_type = content_type
+        self.data = data
+        self.etag = '"%s"' % hashlib.blake2b(data, digest_size=12).hexdigest()
+        if url_path.startswith(IMMUTABLE_PREFIX):
+            self.cache_control = IMMUTABLE_CACHE_CONTROL
+        else:
+            self.cache_control = REVALIDATE_CACHE_CONTROL
+        # codificação -> (bytes, etag). Substituído por inteiro ao ser atualizado,
+        # para que as threads do servidor nunca vejam um dicionário pela metade.
+        self.variants = {}
+
+    @property
+    def compressible(self):
+        """Indica se o tipo de conteúdo se beneficia de compressão"""
+        return len(self.data) >= MIN_COMPRESS_SIZE and self.content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def add_variant(self, encoding, data):
+        """Registra uma variante comprimida, se ela for menor que o original"""
+        if len(data) >= len(self.data):
+            return
+        variants = dict(self.variants)
+        variants[encoding] = (data, self.etag[:-1] + "-" + encoding + '"')
+        self.variants = variants
+
+    def select(self, accept_encoding):
+        """Escolhe a melhor representação para o Accept-Encoding informado
+
+        Retorna uma tupla (codificação ou None, bytes, etag).
+        """
+        variants = self.variants
+        if variants:
+            accepted = parse_accept_encoding(accept_encoding)
+            for encoding in ENCODING_PREFERENCE:
+                if encoding in variants and encoding in accepted:
+                    data, etag = variants[encoding]
+                    return encoding, data, etag
+        return None, self.data, self.etag
+
+
+class AssetTable:
+    """Tabela de arquivos estáticos indexada pelo caminho da URL"""
+
+    def __init__(self, root):
+        self.root = root
+        self.assets = {}
+        self.total_bytes = 0
+
+    def load(self):
+        """Lê toda a árvore de arquivos estáticos para a memória"""
+        assets = {}
+        precompressed = []
+        total = 0
+
+        for dir_path, _, file_names in os.walk(self.root):
+            for file_name in file_names:
+                full_path = os.path.join(dir_path, file_name)
+                rel_path = os.path.relpath(full_path, self.root).replace(os.sep, "/")
+                url_path = "/" + rel_path
+
+                with open(full_path, "rb") as f:
+                    data = f.read()
+                total += len(data)
+
+                base, ext = os.path.splitext(url_path)
+                if ext in PRECOMPRESSED_EXTENSIONS:
+                    precompressed.append((url_path, base, PRECOMPRESSED_EXTENSIONS[ext], data))
+                    continue
+
+                assets[url_path] = Asset(url_path, data)
+
+        # Variantes já comprimidas pelo build são associadas ao arquivo original
+        for url_path, base, encoding, data in precompressed:
+            if base in assets:
+                assets[base].add_variant(encoding, data)
+            else:
+                assets[url_path] = Asset(url_path, data)
+
+        # Rotas de diretório (trailingSlash do Next.js) apontam para o index.html
+        for url_path, asset in list(assets.items()):
+            if url_path.endswith("/index.html"):
+                dir_path = url_path[: -len("index.html")]
+                assets.setdefault(dir_path, asset)
+                if dir_path != "/":
+                    assets.setdefault(dir_path.rstrip("/"), asset)
+            elif url_path.endswith(".html"):
+                assets.setdefault(url_path[: -len(".html")], asset)
+
+        self.assets = assets
+        self.total_bytes = total
+        return self
+
+    def precompress(self, gzip_level=9, brotli_quality=11):
+        """Calcula as variantes gzip/brotli que ainda não vieram do build"""
+        seen = set()
+        for asset in list(self.assets.values()):
+            if id(asset) in seen or not asset.compressible:
+                continue
+            seen.add(id(asset))
+            if "gzip" not in asset.variants:
+                asset.add_variant("gzip", gzip.compress(asset.data, compresslevel=gzip_level, mtime=0))
+            if brotli is not None and "br" not in asset.variants:
+                asset.add_variant("br", brotli.compress(asset.data, quality=brotli_quality))
+
+    def lookup(self, url_path):
+        """Retorna o Asset correspondente ao caminho da URL, ou None"""
+        return self.assets.get(url_path)
+
+    def __len__(self):
+        return len({id(asset) for asset in self.assets.values()})
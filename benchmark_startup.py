@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark de inicialização do ENTALHE CNC CAM para cada modo de empacotamento
+
+Para cada executável gerado (one-file e one-dir), copia a distribuição e a
+pasta out para um diretório temporário novo e executa o launcher várias
+vezes com --exit-after-load. A primeira execução de cada cópia é a "fria"
+(nenhuma extração anterior do bundle); as seguintes são as "quentes".
+
+O tempo medido é o do relógio externo (do início do processo até o
+launcher gravar o relatório quando a interface termina de carregar),
+acompanhado das fases medidas pelo próprio launcher (--startup-report).
+
+Observação: o cache de disco do sistema operacional não é limpo entre as
+execuções; para um cenário realmente frio, reinicie a máquina antes.
+
+Uso:
+    python benchmark_startup.py [--runs=5] [--timeout=120]
+"""
+
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from build_final import BUILD_OUTPUTS
+
+EXE_NAME = "EntalheCNC_CAM.exe" if os.name == "nt" else "EntalheCNC_CAM"
+
+
+def parse_args():
+    """Lê --runs e --timeout da linha de comando"""
+    runs, timeout = 5, 120.0
+    for arg in sys.argv[1:]:
+        if arg.startswith("--runs="):
+            runs = max(2, int(arg.split("=", 1)[1]))
+        elif arg.startswith("--timeout="):
+            timeout = float(arg.split("=", 1)[1])
+    return runs, timeout
+
+
+def prepare_copy(mode, work_dir):
+    """Copia a distribuição do modo informado e a pasta out; retorna o executável"""
+    src = Path(BUILD_OUTPUTS[mode])
+    if not src.exists():
+        if mode == "onefile" and Path("dist", EXE_NAME).exists():
+            src = Path("dist", EXE_NAME)
+        else:
+            return None
+
+    target = Path(work_dir, mode)
+    if src.is_dir():
+        shutil.copytree(src, target)
+        exe_path = target / EXE_NAME
+    else:
+        target.mkdir(parents=True)
+        exe_path = target / EXE_NAME
+        shutil.copy2(src, exe_path)
+
+    if Path("out").exists():
+        shutil.copytree("out", target / "out")
+    else:
+        print("AVISO: Pasta 'out' não encontrada; execute 'pnpm run build' antes do benchmark.")
+    return exe_path
+
+
+def launch_once(exe_path, report_path, timeout):
+    """Executa o launcher uma vez e retorna (tempo externo em ms, relatório do launcher)"""
+    if os.path.exists(report_path):
+        os.remove(report_path)
+
+    t0 = time.perf_counter()
+    process = subprocess.Popen(
+        [str(exe_path), "--exit-after-load", f"--startup-report={report_path}"],
+        cwd=str(exe_path.parent),
+    )
+    # O relatório é gravado assim que a interface termina de carregar
+    deadline = t0 + timeout
+    while not os.path.exists(report_path):
+        if process.poll() is not None or time.perf_counter() > deadline:
+            break
+        time.sleep(0.005)
+    wall_ms = (time.perf_counter() - t0) * 1000
+
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+    if not os.path.exists(report_path):
+        return None, None
+    with open(report_path, encoding="utf-8") as f:
+        return wall_ms, json.load(f)
+
+
+def summarize(label, values):
+    """Formata mediana, mínimo e máximo de uma lista de tempos"""
+    if not values:
+        return f"{label:<8} sem medições"
+    return (f"{label:<8} mediana {statistics.median(values):8.0f} ms   "
+            f"mín {min(values):8.0f} ms   máx {max(values):8.0f} ms   (n={len(values)})")
+
+
+def main():
+    runs, timeout = parse_args()
+    print("=== BENCHMARK DE INICIALIZAÇÃO ENTALHE CNC CAM ===")
+    print(f"Execuções por modo: {runs} (1 fria + {runs - 1} quentes)")
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="entalhe_bench_") as work_dir:
+        for mode in BUILD_OUTPUTS:
+            exe_path = prepare_copy(mode, work_dir)
+            if exe_path is None:
+                print(f"\n[{mode}] distribuição não encontrada em {BUILD_OUTPUTS[mode]}, ignorando.")
+                print(f"        Gere com: python build_final.py --mode={mode}")
+                continue
+
+            print(f"\n[{mode}] {exe_path}")
+            report_path = os.path.join(work_dir, f"{mode}_report.json")
+            cold, warm, phases = [], [], {}
+            for i in range(runs):
+                wall_ms, report = launch_once(exe_path, report_path, timeout)
+                if report is None:
+                    print(f"  execução {i + 1}: falhou (verifique a licença e a pasta out)")
+                    continue
+                (cold if i == 0 else warm).append(wall_ms)
+                for item in report.get("phases", []):
+                    phases.setdefault(item["phase"], []).append(item["ms"])
+                print(f"  execução {i + 1} ({'fria' if i == 0 else 'quente'}): {wall_ms:.0f} ms")
+
+            results[mode] = (cold, warm, phases)
+
+    print("\n=== RESUMO ===")
+    for mode, (cold, warm, phases) in results.items():
+        print(f"\n[{mode}]")
+        print("  " + summarize("fria", cold))
+        print("  " + summarize("quente", warm))
+        for phase, values in phases.items():
+            print(f"    {phase:<24} mediana {statistics.median(values):8.1f} ms")
+
+    if not results:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
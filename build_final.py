@@ -1,17 +1,46 @@
 import os
 import shutil
 import subprocess
+import sys
 from pathlib import Path
 
+# Modos de empacotamento do executável principal:
+#  - onefile: um único .exe que extrai o runtime para uma pasta temporária a cada execução
+#  - onedir: executável + pasta _internal já extraídos (inicialização mais rápida)
+BUILD_MODES = ("onefile", "onedir")
+
+# Local onde o PyInstaller deixa o resultado de cada modo
+# (o one-dir usa um distpath próprio para não colidir com o .exe do one-file)
+ONEDIR_DISTPATH = os.path.join("dist", "onedir")
+BUILD_OUTPUTS = {
+    "onefile": os.path.join("dist", "EntalheCNC_CAM.exe"),
+    "onedir": os.path.join(ONEDIR_DISTPATH, "EntalheCNC_CAM"),
+}
+
+def get_build_mode():
+    """Determina o modo de empacotamento (--mode=<modo> ou ENTALHE_BUILD_MODE)"""
+    mode = os.environ.get("ENTALHE_BUILD_MODE", "onefile")
+    for arg in sys.argv[1:]:
+        if arg.startswith("--mode="):
+            mode = arg.split("=", 1)[1]
+        elif arg in ("--onedir", "--onefile"):
+            mode = arg[2:]
+    mode = mode.strip().lower()
+    if mode not in BUILD_MODES:
+        print(f"Modo de empacotamento desconhecido '{mode}'. Use: {', '.join(BUILD_MODES)}")
+        sys.exit(1)
+    return mode
+
 def run_command(cmd):
     """Executa um comando e retorna se foi bem-sucedido"""
     print(f"Executando: {cmd}")
     result = subprocess.run(cmd, shell=True)
     return result.returncode == 0
 
-def build_project():
+def build_project(mode="onefile"):
     """Compila o projeto Next.js e cria o executável"""
     print("=== BUILD DO INSTALADOR ENTALHE CNC CAM ===")
+    print(f"Modo de empacotamento: {mode}")
     
     # 1. Verifica se o ícone existe, caso contrário, cria
     if not os.path.exists("entalhe_icon.ico"):
@@ -41,7 +70,9 @@ def build_project():
     print("\n3. Gerando executável com PyInstaller...")
     pyinstaller_cmd = [
         "pyinstaller",
-        "--onefile",
+        f"--{mode}",
+        f"--distpath={ONEDIR_DISTPATH}" if mode == "onedir" else "",
+        "--noconfirm",
         "--windowed",
         "--name=EntalheCNC_CAM",
         "--add-data=valid_keys.json;.",
@@ -81,7 +112,7 @@ def build_project():
     
     return True
 
-def create_installer_package():
+def create_installer_package(mode="onefile"):
     """Cria o pacote do instalador"""
     print("=== CRIANDO PACOTE DO INSTALADOR ===")
     
@@ -91,14 +122,24 @@ def create_installer_package():
         shutil.rmtree(dist_dir)
     dist_dir.mkdir()
     
+    if mode == "onedir":
+        # Executável + pasta _internal com o runtime já extraído
+        onedir_src = Path(BUILD_OUTPUTS["onedir"])
+        if onedir_src.exists():
+            shutil.copytree(onedir_src, dist_dir, dirs_exist_ok=True)
+            print(f"Copiado: {onedir_src} -> {dist_dir}")
+        else:
+            print(f"Aviso: {onedir_src} não encontrado")
+    
     # Lista de arquivos para copiar
     files_to_copy = [
-        ("dist/EntalheCNC_CAM.exe", "EntalheCNC_CAM.exe"),
         ("README.md", "README.md"),
         ("LICENSE", "LICENSE.txt"),
         ("entalhe_icon.ico", "entalhe_icon.ico"),
         ("valid_keys.json", "valid_keys.json")
     ]
+    if mode == "onefile":
+        files_to_copy.insert(0, (BUILD_OUTPUTS["onefile"], "EntalheCNC_CAM.exe"))
     
     # Adiciona o gerador de licenças apenas se não estiver em modo de distribuição
     if not os.environ.get("SKIP_LICENSE_GENERATOR"):
@@ -227,6 +268,17 @@ if !errorlevel! neq 0 (
 )
 echo EntalheCNC_CAM.exe - Copiado
 
+REM Copia o runtime do modo one-dir, se presente
+if exist "_internal\\" (
+    xcopy "_internal\\*" "%INSTALL_DIR%\\_internal\\" /E /I /Q /Y >nul 2>&1
+    if !errorlevel! neq 0 (
+        echo ERRO: Falha ao copiar a pasta _internal
+        pause
+        exit /b 1
+    )
+    echo Runtime _internal - Copiado
+)
+
 REM Copia arquivo de chaves
 copy "valid_keys.json" "%INSTALL_DIR%\\" >nul
 if !errorlevel! neq 0 (
@@ -430,8 +482,9 @@ Em caso de dúvidas ou problemas, entre em contato pelo e-mail suporte@entalhec.
 
 def main():
     """Função principal"""
-    if build_project():
-        create_installer_package()
+    mode = get_build_mode()
+    if build_project(mode):
+        create_installer_package(mode)
         print("\n=== PROCESSO CONCLUÍDO COM SUCESSO ===")
     else:
         print("\n=== FALHA NO PROCESSO DE BUILD ===")
@@ -0,0 +1,51 @@
+"use client"
+
+import { useEffect, useState } from "react"
+import { getGenerationCache, type GenerationCacheStats } from "@/lib/generation-cache"
+import { showMessage } from "@/lib/utils"
+
+const EMPTY_STATS: GenerationCacheStats = { hits: 0, persistentHits: 0, misses: 0, entries: 0, store: "-" }
+
+/**
+ * Debug panel of the generation cache
+ * Shows hit/miss counters and lets the user empty the cache
+ */
+export function CacheDebugPanel() {
+  const [stats, setStats] = useState<GenerationCacheStats>(EMPTY_STATS)
+
+  // O armazenamento só é conhecido no navegador: lido após a montagem
+  useEffect(() => {
+    const cache = getGenerationCache()
+    setStats(cache.stats)
+    return cache.subscribe(() => setStats(cache.stats))
+  }, [])
+
+  const consultas = stats.hits + stats.persistentHits + stats.misses
+  const acertos = consultas > 0 ? (100 * (stats.hits + stats.persistentHits)) / consultas : 0
+
+  const handleClear = () => {
+    getGenerationCache()
+      .clear()
+      .then(() => showMessage("Cache de geração limpo.", "info"))
+      .catch((error) => showMessage(`Erro ao limpar o cache: ${error}`, "error"))
+  }
+
+  return (
+    <div className="text-sm">
+      <div className="grid grid-cols-2 gap-2 mb-3">
+        <p>Acertos (memória): {stats.hits}</p>
+        <p>Acertos (persistente): {stats.persistentHits}</p>
+        <p>Falhas (gerados): {stats.misses}</p>
+        <p>Taxa de acerto: {acertos.toFixed(0)}%</p>
+        <p>Em memória: {stats.entries}</p>
+        <p>Armazenamento: {stats.store}</p>
+      </div>
+      <button
+        onClick={handleClear}
+        className="w-full py-1 px-3 rounded bg-secondary text-secondary-foreground hover:bg-secondary/80 transition-colors"
+      >
+        Limpar cache
+      </button>
+    </div>
+  )
+}
@@ -0,0 +1,167 @@
+"use client"
+
+import { useState } from "react"
+import { useSimulation } from "@/context/SimulationContext"
+import { ROTARY_ORDERS, type GCodeDialect, type MachiningParams, type RotaryOrder } from "@/lib/gcode-generator"
+import type { FeatureJobComparison, JobFeature } from "@/lib/feature-job"
+import { GCodeJobCancelledError, getGCodeWorker } from "@/lib/gcode-worker-client"
+import { formatDuration } from "@/lib/pass-planner"
+import { showMessage } from "@/lib/utils"
+
+interface FeatureJobPanelProps {
+  buildParams: () => MachiningParams | null // parâmetros atuais, validados
+  dialect: GCodeDialect
+  optimize: boolean
+  rotaryRate: number
+}
+
+const inputClass = "w-full p-1 border border-gray-300 rounded dark:bg-gray-700 dark:border-gray-600 dark:text-white"
+
+/**
+ * Multi-feature job editor
+ * Collects the current parameters as features and generates them as one
+ * program with a single sweep of the A axis
+ */
+export function FeatureJobPanel({ buildParams, dialect, optimize, rotaryRate }: FeatureJobPanelProps) {
+  const { setJobResult } = useSimulation()
+  const [features, setFeatures] = useState<JobFeature[]>([])
+  const [name, setName] = useState("")
+  const [clearance, setClearance] = useState("")
+  const [rotaryOrder, setRotaryOrder] = useState<RotaryOrder>("sequential")
+  const [comparison, setComparison] = useState<FeatureJobComparison | null>(null)
+
+  const handleAdd = () => {
+    const params = buildParams()
+    if (!params) return
+    setFeatures([...features, { name: name.trim() || `Feature ${features.length + 1}`, params }])
+    setName("")
+    setComparison(null)
+  }
+
+  const handleGenerate = () => {
+    // Plano de troca vazio: o maior ponto de início Z das features
+    const clearanceZ = clearance.trim() === "" ? undefined : Number(clearance.replace(",", "."))
+    if (clearanceZ !== undefined && !Number.isFinite(clearanceZ)) {
+      showMessage("Plano de troca Z inválido.", "error")
+      return
+    }
+    const safeZ = clearanceZ ?? Math.max(...features.map((f) => f.params.pontoInicioZ))
+
+    showMessage("Gerando trabalho...", "info")
+    getGCodeWorker()
+      .run({
+        kind: "features",
+        features,
+        options: { dialect, rotaryOrder, clearanceZ },
+        optimize: optimize ? { safeZ } : undefined,
+        rates: { rotaryRate: rotaryRate > 0 ? rotaryRate : undefined },
+      })
+      .then((result) => {
+        // Sem parâmetros únicos não há modelo do material: só cursos e áreas proibidas
+        setJobResult(result, null)
+        setComparison(result.featureComparison)
+        showMessage(`Trabalho gerado: ${features.length} features, ${result.program.source.length} linhas.`, "success")
+      })
+      .catch((error) => {
+        if (error instanceof GCodeJobCancelledError) return
+        console.error("Erro ao gerar o trabalho:", error)
+        showMessage(`Erro ao gerar o trabalho: ${error instanceof Error ? error.message : error}`, "error")
+      })
+  }
+
+  return (
+    <div className="text-sm">
+      <p className="mb-2 text-muted-foreground">
+        Adicione os parâmetros atuais como uma feature (outro eixo ou outro rasgo na mesma fixação). Todas as
+        features usam a mesma ferramenta e são cortadas em uma única volta do eixo A.
+      </p>
+
+      <div className="flex gap-2 mb-3">
+        <input
+          type="text"
+          placeholder={`Feature ${features.length + 1}`}
+          value={name}
+          onChange={(e) => setName(e.target.value)}
+          className={inputClass}
+        />
+        <button
+          onClick={handleAdd}
+          className="px-2 rounded bg-secondary text-secondary-foreground hover:bg-secondary/80 transition-colors whitespace-nowrap"
+        >
+          Adicionar atuais
+        </button>
+      </div>
+
+      {features.length > 0 && (
+        <ul className="mb-3 space-y-1">
+          {features.map((f, index) => (
+            <li key={index} className="flex items-center gap-2 p-1 rounded border border-gray-300 dark:border-gray-600">
+              <span className="flex-1">
+                <span className="font-medium">{f.name}</span>
+                <span className="ml-2 text-xs text-muted-foreground">
+                  {f.params.numEntalhes} entalhes, Ø{f.params.diametroInicial}→{f.params.diametroFinal}, Z{f.params.pontoInicioZ}/
+                  {f.params.profundidadeFinal}, ferramenta Ø{f.params.diametroFerramenta}
+                </span>
+              </span>
+              <button
+                onClick={() => {
+                  setFeatures(features.filter((_, i) => i !== index))
+                  setComparison(null)
+                }}
+                className="px-2 rounded bg-secondary text-secondary-foreground hover:bg-secondary/80 transition-colors"
+                title="Remover feature"
+              >
+                ✕
+              </button>
+            </li>
+          ))}
+        </ul>
+      )}
+
+      <div className="grid grid-cols-2 gap-2 mb-3">
+        <label className="font-medium">
+          Plano de troca Z
+          <input
+            type="text"
+            inputMode="decimal"
+            placeholder="maior início Z"
+            value={clearance}
+            onChange={(e) => setClearance(e.target.value)}
+            className={`${inputClass} mt-1 font-normal`}
+          />
+        </label>
+        <label className="font-medium">
+          Sequência do eixo A
+          <select
+            value={rotaryOrder}
+            onChange={(e) => setRotaryOrder(e.target.value as RotaryOrder)}
+            className={`${inputClass} mt-1 font-normal`}
+          >
+            {ROTARY_ORDERS.map((o) => (
+              <option key={o.value} value={o.value}>{o.label}</option>
+            ))}
+          </select>
+        </label>
+      </div>
+
+      <button
+        onClick={handleGenerate}
+        disabled={features.length === 0}
+        className="w-full py-1 px-2 rounded bg-primary text-primary-foreground hover:bg-primary/90 transition-colors disabled:bg-muted disabled:text-muted-foreground disabled:cursor-not-allowed"
+      >
+        Gerar trabalho
+      </button>
+
+      {comparison && (
+        <p className="mt-2">
+          Tempo estimado: {formatDuration(comparison.combined)} (um programa por feature:{" "}
+          {formatDuration(comparison.separate)};{" "}
+          {comparison.saved >= 0
+            ? `economia de ${formatDuration(comparison.saved)}`
+            : `${formatDuration(-comparison.saved)} a mais, verifique o plano de troca`}
+          )
+        </p>
+      )}
+    </div>
+  )
+}
@@ -1,11 +1,30 @@
 "use client"
 
 import type React from "react"
-import { useState, useEffect } from "react"
+import { useState, useEffect, useMemo } from "react"
 import { useSimulation } from "@/context/SimulationContext"
 import { Tooltip, TooltipProvider } from "@/components/ui/tooltip"
 import { CollapsibleSection } from "@/components/CollapsibleSection"
-import { generateGCode } from "@/lib/gcode-generator"
+import { CacheDebugPanel } from "@/components/CacheDebugPanel"
+import { MachineProfilePanel } from "@/components/MachineProfilePanel"
+import { FeatureJobPanel } from "@/components/FeatureJobPanel"
+import {
+  computePassesX,
+  GCODE_DIALECTS,
+  PASS_ORDERS,
+  ROTARY_ORDERS,
+  type GCodeDialect,
+  type MachiningParams,
+  type PassOrder,
+  type RotaryOrder,
+} from "@/lib/gcode-generator"
+import { comparePassOrders, formatDuration, DEFAULT_ROTARY_RATE } from "@/lib/pass-planner"
+import { saveGCodeFile } from "@/lib/gcode-export"
+import { POST_PROFILE_OPTIONS, postProcessed } from "@/lib/post-processor"
+import { openGCodeFile } from "@/lib/gcode-import"
+import { GCodeJobCancelledError, getGCodeWorker } from "@/lib/gcode-worker-client"
+import { getGenerationCache } from "@/lib/generation-cache"
+import { summarizeViolations } from "@/lib/toolpath-check"
 import { showMessage } from "@/lib/utils"
 import { Slider } from "@/components/ui/slider"
 
@@ -46,6 +65,26 @@ export default function InputPanel() {
   // Estado para a porcentagem de uso da ferramenta no passo lateral (0-100%)
   const [porcentagemPassoLateral, setPorcentagemPassoLateral] = useState(100)
 
+  // Formato do programa: expandido ou com o corte de um entalhe em subprograma
+  const [dialeto, setDialeto] = useState<GCodeDialect>("standard")
+  const [otimizar, setOtimizar] = useState(false)
+
+  // Ordem dos passes laterais e retração curta entre passes
+  const [ordemPasses, setOrdemPasses] = useState<PassOrder>("center-out")
+  const [retracaoCurta, setRetracaoCurta] = useState(false)
+  const [planoSeguroZ, setPlanoSeguroZ] = useState('1')
+  const planoSeguro = retracaoCurta ? (planoSeguroZ.trim() === "" ? NaN : Number(planoSeguroZ.replace(",", "."))) : undefined
+
+  // Avanço adaptativo: passes com pouco engajamento avançam mais rápido, até o avanço máximo
+  const [avancoAdaptativo, setAvancoAdaptativo] = useState(false)
+  const [avancoMaximoTexto, setAvancoMaximoTexto] = useState('200')
+  const avancoMaximo = avancoAdaptativo ? (avancoMaximoTexto.trim() === "" ? NaN : Number(avancoMaximoTexto.replace(",", "."))) : undefined
+
+  // Sequência do eixo A e velocidade de rotação usada na estimativa
+  const [ordemRotacao, setOrdemRotacao] = useState<RotaryOrder>("sequential")
+  const [velocidadeA, setVelocidadeA] = useState(String(DEFAULT_ROTARY_RATE))
+  const rotaryRate = Number(velocidadeA.replace(",", "."))
+
   // Calculated values
   const [calculatedValues, setCalculatedValues] = useState({
     raioInicial: 15,
@@ -55,7 +94,46 @@ export default function InputPanel() {
     numPasses: 2,
   })
 
-  const { gCode, setGCode } = useSimulation()
+  const { gCode, setJobResult, toolpathCheck, postProfile, postProfileName, setPostProfileName } = useSimulation()
+
+  // Estimativa do programa (linhas, mergulhos e tempo) para cada ordem dos passes,
+  // recalculada a cada tecla sem gerar o código G
+  const comparacao = useMemo(() => {
+    const valores: Record<string, any> = {}
+    for (const [key, value] of Object.entries(rawParams)) {
+      if (typeof value !== "string" || key === "ladoCorte") {
+        valores[key] = value
+      } else {
+        // Campo vazio não é zero: sem estimativa até ser preenchido
+        valores[key] = value.trim() === "" ? NaN : Number(value.replace(",", "."))
+      }
+    }
+    const { numEntalhes, avanco, apY, diametroInicial, diametroFinal, diametroFerramenta, aberturaChaveta } = valores
+    const numericos = Object.entries(valores).filter(([key]) => key !== "ladoCorte" && key !== "chavetaConica")
+    if (numericos.some(([, value]) => !Number.isFinite(value))) return null
+    if (numEntalhes <= 0 || avanco <= 0 || apY <= 0 || diametroFerramenta <= 0 || diametroInicial === diametroFinal) return null
+    if (planoSeguro !== undefined && !(Number.isFinite(planoSeguro) && planoSeguro >= 0)) return null
+    if (avancoMaximo !== undefined && !(avancoMaximo >= avanco)) return null
+    if (!(rotaryRate > 0)) return null
+
+    try {
+      return comparePassOrders({
+        ...(valores as any),
+        ladoCorte: diametroInicial < diametroFinal ? "positivo" : "negativo",
+        passoLateral: aberturaChaveta > diametroFerramenta * 1.5
+          ? (porcentagemPassoLateral / 100) * diametroFerramenta
+          : undefined,
+        planoSeguroZ: planoSeguro,
+        ordemRotacao,
+        avancoMaximo,
+      }, { dialect: dialeto, rotaryRate })
+    } catch {
+      return null
+    }
+  }, [rawParams, porcentagemPassoLateral, dialeto, planoSeguro, ordemRotacao, avancoMaximo, rotaryRate])
+
+  const estimativa = comparacao?.find((c) => c.ordem === ordemPasses)?.plan ?? null
+  const menorRapido = comparacao ? Math.min(...comparacao.map((c) => c.plan.rapidDistance)) : 0
 
   // Update calculated values when relevant parameters change
   useEffect(() => {
@@ -144,27 +222,11 @@ export default function InputPanel() {
       if (aberturaChaveta > diametroFerramenta) {
         const deslocamento = (aberturaChaveta - diametroFerramenta) / 2
         
-        // Calcular o passo lateral com base na porcentagem selecionada
-        const passoLateral = (porcentagemPassoLateral / 100) * diametroFerramenta
-        
-        // Calcular número de passes necessários com base no passo lateral
-        const larguraTotal = aberturaChaveta - diametroFerramenta
-        
-        // Declarar a variável numPasses no escopo correto
-        let numPasses;
-        
-        // Para casos onde a abertura da chaveta é até 1.625 vezes o diâmetro da ferramenta,
-        // sempre usar 2 passes (um em +X e outro em -X)
-        // 1.625 = 13/8 (caso específico mencionado pelo usuário)
-        if (aberturaChaveta <= diametroFerramenta * 1.625) {
-          numPasses = 2;
-        } else {
-          // Para aberturas maiores, calcular com base no passo lateral
-          numPasses = Math.ceil(larguraTotal / passoLateral);
-          
-          // Se for número par de passes, adicionar mais um para centralizar
-          if (numPasses % 2 === 0) numPasses++;
-        }
+        // Mesmos passes laterais usados pelo gerador de código G
+        const passoLateral = aberturaChaveta > diametroFerramenta * 1.5
+          ? (porcentagemPassoLateral / 100) * diametroFerramenta
+          : undefined
+        const numPasses = computePassesX({ ...params, passoLateral }).passosX.length
         
         setCalculatedValues((prev) => ({ ...prev, deslocamento, numPasses }))
       } else {
@@ -174,107 +236,141 @@ export default function InputPanel() {
     }
   }
 
-  const handleGenerateGCode = () => {
-    try {
-      // Validate inputs
-      if (params.numEntalhes <= 0) {
-        showMessage("O número de entalhes deve ser maior que zero.", "error")
-        return
-      }
+  // Parâmetros de usinagem dos campos, já validados (null com a mensagem de erro)
+  const buildMachiningParams = (): MachiningParams | null => {
+    if (params.numEntalhes <= 0) {
+      showMessage("O número de entalhes deve ser maior que zero.", "error")
+      return null
+    }
 
-      if (params.avanco <= 0) {
-        showMessage("O avanço deve ser maior que zero.", "error")
-        return
-      }
+    if (params.avanco <= 0) {
+      showMessage("O avanço deve ser maior que zero.", "error")
+      return null
+    }
 
-      if (params.apY <= 0) {
-        showMessage("O material por passe deve ser maior que zero.", "error")
-        return
-      }
+    if (params.apY <= 0) {
+      showMessage("O material por passe deve ser maior que zero.", "error")
+      return null
+    }
 
-      if (params.diametroFinal === params.diametroInicial) {
-        showMessage("O diâmetro final não pode ser igual ao diâmetro inicial.", "error")
-        return
-      }
+    if (params.apY < 0.001) {
+      // O nível seguinte é arredondado a 0,001 mm: um passe menor nunca sai do lugar
+      showMessage("Material por passe muito pequeno para a resolução de 0,001 mm.", "error")
+      return null
+    }
 
-      if (params.diametroFerramenta <= 0) {
-        showMessage("O diâmetro da ferramenta deve ser maior que zero.", "error")
-        return
-      }
+    if (params.diametroFinal === params.diametroInicial) {
+      showMessage("O diâmetro final não pode ser igual ao diâmetro inicial.", "error")
+      return null
+    }
 
-      // Calcular o passo lateral com base na porcentagem selecionada (se aplicável)
-      let passoLateral = undefined
-      if (params.aberturaChaveta > params.diametroFerramenta * 1.5) {
-        passoLateral = (porcentagemPassoLateral / 100) * params.diametroFerramenta
-      }
+    if (params.diametroFerramenta <= 0) {
+      showMessage("O diâmetro da ferramenta deve ser maior que zero.", "error")
+      return null
+    }
+
+    // Abaixo de Z0 os rápidos entre passes (G0 X/Y) atravessariam material
+    if (planoSeguro !== undefined && !(planoSeguro > params.profundidadeFinal && planoSeguro <= params.pontoInicioZ && planoSeguro >= 0)) {
+      showMessage("O plano seguro Z deve ficar acima da peça, entre Z0 e o ponto de início Z.", "error")
+      return null
+    }
+
+    if (avancoMaximo !== undefined && !(avancoMaximo >= params.avanco)) {
+      showMessage("O avanço máximo deve ser maior ou igual ao avanço.", "error")
+      return null
+    }
+
+    // Calcular o passo lateral com base na porcentagem selecionada (se aplicável)
+    let passoLateral = undefined
+    if (params.aberturaChaveta > params.diametroFerramenta * 1.5) {
+      passoLateral = (porcentagemPassoLateral / 100) * params.diametroFerramenta
+    }
 
+    return {
+      ...params,
+      passoLateral,
+      ordemPasses,
+      planoSeguroZ: planoSeguro,
+      ordemRotacao,
+      avancoMaximo,
+    }
+  }
+
+  const handleGenerateGCode = () => {
+    try {
       // Generate G-code com o passo lateral calculado
-      const gCode = generateGCode({
-        ...params,
-        passoLateral
-      })
-      setGCode(gCode)
-      showMessage("Código G gerado com sucesso!", "success")
+      const machiningParams = buildMachiningParams()
+      if (!machiningParams) return
+
+      // Parâmetros já gerados vêm do cache; os demais são gerados, analisados e
+      // simulados no worker. Um novo clique cancela a geração que ainda não terminou
+      showMessage("Gerando código G...", "info")
+      getGenerationCache()
+        .generate({
+          kind: "generate",
+          params: machiningParams,
+          options: { dialect: dialeto },
+          optimize: otimizar ? { safeZ: params.pontoInicioZ } : undefined,
+        })
+        .then((result) => {
+          setJobResult(result, machiningParams)
+          const report = result.optimizeReport
+          if (report) {
+            const percentual = report.linesIn > 0 ? (100 * report.linesSaved) / report.linesIn : 0
+            showMessage(
+              `Código G gerado com sucesso! Otimização: ${report.linesSaved} linhas a menos (${percentual.toFixed(1)}%), ` +
+                `${formatDuration(report.airTimeSaved)} a menos em movimentos rápidos.`,
+              "success",
+            )
+          } else {
+            showMessage("Código G gerado com sucesso!", "success")
+          }
+        })
+        .catch((error) => {
+          if (error instanceof GCodeJobCancelledError) return
+          console.error("Erro ao gerar código G:", error)
+          showMessage(`Erro ao gerar código G: ${error}`, "error")
+        })
     } catch (error) {
       console.error("Erro ao gerar código G:", error)
       showMessage(`Erro ao gerar código G: ${error}`, "error")
     }
   }
 
+  // Programas externos ou editados à mão são analisados no worker e exibidos
+  // na mesma simulação (sem o modelo de material, que depende dos parâmetros)
+  const handleOpenGCode = async () => {
+    try {
+      const file = await openGCodeFile()
+      if (!file) return
+      showMessage(`Analisando ${file.name}...`, "info")
+      const result = await getGCodeWorker().run({ kind: "import", text: file.text })
+      setJobResult(result, null)
+      showMessage(
+        `${file.name}: ${result.program.source.length} linhas, ${result.program.length} movimentos carregados.`,
+        "success",
+      )
+    } catch (error) {
+      if (error instanceof GCodeJobCancelledError) return
+      console.error("Erro ao abrir código G:", error)
+      showMessage(`Erro ao abrir código G: ${error}`, "error")
+    }
+  }
+
   const handleSaveGCode = () => {
     if (gCode && gCode.length > 0) {
-      const codigoTexto = gCode.join("\n")
-      
-      // Detecta se estamos em ambiente WebView/pywebview (verifica se a API do python está disponível)
-      const isWebViewEnv = !!(window as any).pywebview;
-      
-      if (isWebViewEnv) {
-        // Usa a API Python para salvar o arquivo
-        try {
-          const api = (window as any).pywebview.api;
-          api.save_file(codigoTexto, "codigo_entalhy_cnc.nc")
-            .then((result: any) => {
-              if (result.success) {
-                showMessage(result.message, "success");
-              } else {
-                showMessage(result.message, "warning");
-              }
-            })
-            .catch((error: any) => {
-              console.error("Erro ao salvar arquivo via API:", error);
-              showMessage(`Erro ao salvar arquivo: ${error}`, "error");
-              
-              // Fallback para método tradicional se a API falhar
-              useFallbackSave(codigoTexto);
-            });
-        } catch (e) {
-          console.error("Erro ao acessar API Python:", e);
-          showMessage(`Não foi possível acessar a API de salvamento: ${e}`, "error");
-          // Fallback para método tradicional
-          useFallbackSave(codigoTexto);
-        }
-      } else {
-        // Método tradicional de download via browser
-        useFallbackSave(codigoTexto);
+      // Programa com violações só é gravado com a confirmação do usuário
+      if (toolpathCheck && toolpathCheck.total > 0 && !window.confirm(`Verificação do percurso: ${summarizeViolations(toolpathCheck)}.\n\nSalvar mesmo assim?`)) {
+        return
       }
+      // Gravação em blocos via API Python, ou download pelo navegador, já no formato da máquina
+      saveGCodeFile(postProcessed(gCode, postProfile)).catch((error) =>
+        showMessage(`Erro ao salvar código G: ${error instanceof Error ? error.message : error}`, "error"),
+      )
     } else {
       showMessage("Nenhum código G para salvar.", "error");
     }
   }
-  
-  // Função auxiliar para método de salvamento via browser
-  const useFallbackSave = (content: string) => {
-    const blob = new Blob([content], { type: "text/plain" })
-    const url = URL.createObjectURL(blob)
-    const a = document.createElement("a")
-    a.href = url
-    a.download = "codigo_entalhy_cnc.nc"
-    document.body.appendChild(a)
-    a.click()
-    document.body.removeChild(a)
-    URL.revokeObjectURL(url)
-    showMessage(`Arquivo salvo com sucesso: codigo_entalhy_cnc.nc`, "success")
-  }
 
   // Função para formatar valores numéricos com vírgula para exibição
   const formatDisplayValue = (value: any): string => {
@@ -392,6 +488,35 @@ export default function InputPanel() {
         {renderInputField("profundidadeFinal", "Profundidade Final Z (mm)", "Profundidade final do corte no eixo Z. Valores negativos indicam movimento para baixo.", { step: "0.1" })}
         {renderInputField("numEntalhes", "Número de Entalhes", "Quantidade de entalhes a serem usinados.", { min: "1" })}
         {renderInputField("avanco", "Avanço (mm/min)", "Velocidade de avanço da ferramenta.", { min: "1" })}
+        <div className="form-group mb-4">
+          <label htmlFor="avancoAdaptativo" className="flex items-center mb-1 font-medium">
+            <input
+              type="checkbox"
+              id="avancoAdaptativo"
+              checked={avancoAdaptativo}
+              onChange={(e) => setAvancoAdaptativo(e.target.checked)}
+              className="mr-2 h-4 w-4"
+            />
+            Avanço adaptativo
+            <Tooltip text="O avanço acima vale para o rasgo cheio. Os passes laterais que cortam só uma faixa estreita avançam mais rápido, mantendo a mesma carga por dente, até o avanço máximo." />
+          </label>
+        </div>
+        {avancoAdaptativo && (
+          <div className="form-group mb-4">
+            <label htmlFor="avancoMaximo" className="block mb-1 font-medium">
+              Avanço Máximo (mm/min)
+              <Tooltip text="Limite do avanço dos passes com pouco engajamento (máquina, ferramenta ou acabamento). Deve ser maior ou igual ao avanço." />
+            </label>
+            <input
+              type="text"
+              id="avancoMaximo"
+              value={avancoMaximoTexto}
+              onChange={(e) => setAvancoMaximoTexto(e.target.value)}
+              inputMode="decimal"
+              className="w-full p-2 border border-gray-300 rounded dark:bg-gray-700 dark:border-gray-600 dark:text-white"
+            />
+          </div>
+        )}
         {renderInputField("apY", "Material por Passe AP Y (mm)", "Quantidade de material removido por passe.", { step: "0.1", min: "0.1" })}
       </CollapsibleSection>
 
@@ -444,6 +569,162 @@ export default function InputPanel() {
         }
       </CollapsibleSection>
 
+      <CollapsibleSection title="Ordem dos Passes" defaultOpen={false}>
+        <div className="form-group mb-4">
+          <label htmlFor="ordemPasses" className="block mb-1 font-medium">
+            Ordem dos passes laterais
+            <Tooltip text="Do centro para fora volta a X0 a cada nível. Serpentina e vizinho mais próximo começam o nível seguinte onde o anterior terminou, reduzindo os movimentos rápidos." />
+          </label>
+          <select
+            id="ordemPasses"
+            value={ordemPasses}
+            onChange={(e) => setOrdemPasses(e.target.value as PassOrder)}
+            className="w-full p-2 border border-gray-300 rounded dark:bg-gray-700 dark:border-gray-600 dark:text-white"
+          >
+            {PASS_ORDERS.map((o) => (
+              <option key={o.value} value={o.value}>{o.label}</option>
+            ))}
+          </select>
+        </div>
+        <div className="form-group mb-4">
+          <label htmlFor="retracaoCurta" className="flex items-center mb-1 font-medium">
+            <input
+              type="checkbox"
+              id="retracaoCurta"
+              checked={retracaoCurta}
+              onChange={(e) => setRetracaoCurta(e.target.checked)}
+              className="mr-2 h-4 w-4"
+            />
+            Retração curta
+            <Tooltip text="Entre os passes de um mesmo entalhe, recua só até o plano seguro em vez do Ponto Início Z. Cada entalhe ainda começa e termina no Ponto Início Z." />
+          </label>
+        </div>
+        {retracaoCurta && (
+          <div className="form-group mb-4">
+            <label htmlFor="planoSeguroZ" className="block mb-1 font-medium">
+              Plano Seguro Z (mm)
+              <Tooltip text="Altura de retração entre passes. Deve ficar acima da peça, entre Z0 (face da peça) e o Ponto Início Z." />
+            </label>
+            <input
+              type="text"
+              id="planoSeguroZ"
+              value={planoSeguroZ}
+              onChange={(e) => setPlanoSeguroZ(e.target.value)}
+              inputMode="decimal"
+              className="w-full p-2 border border-gray-300 rounded dark:bg-gray-700 dark:border-gray-600 dark:text-white"
+            />
+          </div>
+        )}
+        {comparacao && (
+          <div className="text-sm">
+            <p className="font-medium mb-1">Movimento rápido por ordem</p>
+            {comparacao.map(({ ordem, plan }) => (
+              <p key={ordem} className={plan.rapidDistance === menorRapido ? "font-medium text-card-foreground" : ""}>
+                {PASS_ORDERS.find((o) => o.value === ordem)?.label}: {(plan.rapidDistance / 1000).toFixed(2)} m ({formatDuration(plan.cycleTime)})
+              </p>
+            ))}
+          </div>
+        )}
+      </CollapsibleSection>
+
+      <CollapsibleSection title="Eixo A" defaultOpen={false}>
+        <div className="form-group mb-4">
+          <label htmlFor="ordemRotacao" className="block mb-1 font-medium">
+            Sequência dos entalhes
+            <Tooltip text="Caminho mais curto exige rollover no eixo A (no Siemens é escrito com DC). A invertida deve ser alternada com a sequencial a cada peça, evitando o retorno da mesa a 0°." />
+          </label>
+          <select
+            id="ordemRotacao"
+            value={ordemRotacao}
+            onChange={(e) => setOrdemRotacao(e.target.value as RotaryOrder)}
+            className="w-full p-2 border border-gray-300 rounded dark:bg-gray-700 dark:border-gray-600 dark:text-white"
+          >
+            {ROTARY_ORDERS.map((o) => (
+              <option key={o.value} value={o.value}>{o.label}</option>
+            ))}
+          </select>
+        </div>
+        <div className="form-group mb-4">
+          <label htmlFor="velocidadeA" className="block mb-1 font-medium">
+            Rotação rápida A (graus/min)
+            <Tooltip text="Velocidade de indexação do eixo A, usada apenas na estimativa do tempo de ciclo." />
+          </label>
+          <input
+            type="text"
+            id="velocidadeA"
+            value={velocidadeA}
+            onChange={(e) => setVelocidadeA(e.target.value)}
+            inputMode="decimal"
+            className="w-full p-2 border border-gray-300 rounded dark:bg-gray-700 dark:border-gray-600 dark:text-white"
+          />
+        </div>
+      </CollapsibleSection>
+
+      <CollapsibleSection title="Formato do Programa" defaultOpen={false}>
+        <div className="form-group mb-4">
+          <label htmlFor="dialeto" className="block mb-1 font-medium">
+            Formato
+            <Tooltip text="Expandido repete o corte completo para cada entalhe. Os demais formatos escrevem o corte uma única vez e o chamam após cada rotação A, reduzindo muito o tamanho do programa." />
+          </label>
+          <select
+            id="dialeto"
+            value={dialeto}
+            onChange={(e) => setDialeto(e.target.value as GCodeDialect)}
+            className="w-full p-2 border border-gray-300 rounded dark:bg-gray-700 dark:border-gray-600 dark:text-white"
+          >
+            {GCODE_DIALECTS.map((d) => (
+              <option key={d.value} value={d.value}>{d.label}</option>
+            ))}
+          </select>
+        </div>
+        <div className="form-group mb-4">
+          <label htmlFor="otimizar" className="flex items-center mb-1 font-medium">
+            <input
+              type="checkbox"
+              id="otimizar"
+              checked={otimizar}
+              onChange={(e) => setOtimizar(e.target.checked)}
+              className="mr-2 h-4 w-4"
+            />
+            Otimizar movimentos
+            <Tooltip text="Remove movimentos para a posição atual, combina os rápidos em X/Y feitos acima do Ponto Início Z e omite avanços F repetidos. O corte não muda." />
+          </label>
+        </div>
+        <div className="form-group mb-4">
+          <label htmlFor="posProcessador" className="block mb-1 font-medium">
+            Pós-processador
+            <Tooltip text="Adapta o programa gravado ao comando da máquina: cabeçalho e fim, casas decimais, códigos modais repetidos, estilo dos comentários e numeração N. A simulação e a verificação usam o programa neutro." />
+          </label>
+          <select
+            id="posProcessador"
+            value={postProfileName}
+            onChange={(e) => setPostProfileName(e.target.value)}
+            className="w-full p-2 border border-gray-300 rounded dark:bg-gray-700 dark:border-gray-600 dark:text-white"
+          >
+            {POST_PROFILE_OPTIONS.map((p) => (
+              <option key={p.value} value={p.value}>{p.label}</option>
+            ))}
+          </select>
+        </div>
+      </CollapsibleSection>
+
+      <CollapsibleSection title="Trabalho com Várias Features" defaultOpen={false}>
+        <FeatureJobPanel
+          buildParams={buildMachiningParams}
+          dialect={dialeto}
+          optimize={otimizar}
+          rotaryRate={rotaryRate}
+        />
+      </CollapsibleSection>
+
+      <CollapsibleSection title="Limites da Máquina" defaultOpen={false}>
+        <MachineProfilePanel />
+      </CollapsibleSection>
+
+      <CollapsibleSection title="Depuração: Cache de Geração" defaultOpen={false}>
+        <CacheDebugPanel />
+      </CollapsibleSection>
+
       <div className="bg-muted text-muted-foreground p-4 rounded-lg mt-4">
         <h3 className="font-semibold text-lg mb-2 text-card-foreground">Informações Calculadas</h3>
         <div className="grid grid-cols-2 gap-2 text-sm">
@@ -454,6 +735,27 @@ export default function InputPanel() {
           <p>Passes em X: {calculatedValues.numPasses}</p>
         </div>
       </div>
+
+      <div className="bg-muted text-muted-foreground p-4 rounded-lg mt-4">
+        <h3 className="font-semibold text-lg mb-2 text-card-foreground">Estimativa do Programa</h3>
+        {estimativa ? (
+          <div className="grid grid-cols-2 gap-2 text-sm">
+            <p>Linhas: {estimativa.totalLines}</p>
+            <p>Passes em Y: {estimativa.yLevels.length}</p>
+            <p>Mergulhos (G1): {estimativa.totalPlunges}</p>
+            <p>Por entalhe: {estimativa.plungesPerNotch}</p>
+            <p>Avanço: {(estimativa.feedDistance / 1000).toFixed(2)} m</p>
+            <p>Rápido: {(estimativa.rapidDistance / 1000).toFixed(2)} m</p>
+            <p>Rotação A: {estimativa.rotaryDistance.toFixed(0)}°</p>
+            <p>Tempo em A: {formatDuration(estimativa.rotaryTime)}</p>
+            <p className="col-span-2 font-medium text-card-foreground">
+              Tempo estimado: {formatDuration(estimativa.cycleTime)}
+            </p>
+          </div>
+        ) : (
+          <p className="text-sm">Preencha parâmetros válidos para ver a estimativa.</p>
+        )}
+      </div>
       
       <div className="flex flex-col space-y-3 mt-6">
         <button onClick={handleGenerateGCode} className="w-full font-bold py-2 px-4 rounded bg-primary text-primary-foreground hover:bg-primary/90 transition-colors">
@@ -462,6 +764,9 @@ export default function InputPanel() {
         <button onClick={handleSaveGCode} disabled={!gCode || gCode.length === 0} className="w-full font-bold py-2 px-4 rounded bg-secondary text-secondary-foreground hover:bg-secondary/80 transition-colors disabled:bg-muted disabled:text-muted-foreground disabled:cursor-not-allowed">
           Salvar Código G
         </button>
+        <button onClick={handleOpenGCode} className="w-full font-bold py-2 px-4 rounded bg-secondary text-secondary-foreground hover:bg-secondary/80 transition-colors">
+          Abrir Código G (.nc)
+        </button>
       </div>
 
       <div id="message-container" className="mt-4"></div>
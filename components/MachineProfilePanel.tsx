@@ -0,0 +1,176 @@
+"use client"
+
+import { useEffect, useState } from "react"
+import { useSimulation } from "@/context/SimulationContext"
+import { DEFAULT_MACHINE_PROFILE, parseMachineProfile, type MachineProfile } from "@/lib/toolpath-check"
+import { showMessage } from "@/lib/utils"
+
+const AXES = ["x", "y", "z", "a"] as const
+
+interface BoxDraft {
+  name: string
+  min: string[]
+  max: string[]
+}
+
+interface ProfileDraft {
+  name: string
+  travel: Record<(typeof AXES)[number], { min: string; max: string }>
+  keepOut: BoxDraft[]
+}
+
+// Campos de texto do perfil (curso vazio: eixo sem limite)
+function toDraft(profile: MachineProfile): ProfileDraft {
+  const travel = {} as ProfileDraft["travel"]
+  for (const axis of AXES) {
+    const range = profile.travel[axis]
+    travel[axis] = { min: range ? String(range.min) : "", max: range ? String(range.max) : "" }
+  }
+  return {
+    name: profile.name,
+    travel,
+    keepOut: profile.keepOut.map((box) => ({ name: box.name, min: box.min.map(String), max: box.max.map(String) })),
+  }
+}
+
+const num = (value: string) => Number(value.replace(",", "."))
+
+function fromDraft(draft: ProfileDraft): MachineProfile {
+  const travel: Record<string, { min: number; max: number } | null> = {}
+  for (const axis of AXES) {
+    const { min, max } = draft.travel[axis]
+    travel[axis] = min.trim() === "" && max.trim() === "" ? null : { min: num(min), max: num(max) }
+  }
+  return parseMachineProfile({
+    name: draft.name,
+    travel,
+    keepOut: draft.keepOut.map((box) => ({ name: box.name, min: box.min.map(num), max: box.max.map(num) })),
+  })
+}
+
+const inputClass = "w-full p-1 border border-gray-300 rounded dark:bg-gray-700 dark:border-gray-600 dark:text-white"
+
+/**
+ * Machine profile editor
+ * Travel limits per axis and fixture keep-out boxes used to check the toolpath
+ */
+export function MachineProfilePanel() {
+  const { machineProfile, setMachineProfile } = useSimulation()
+  const [draft, setDraft] = useState<ProfileDraft>(() => toDraft(machineProfile))
+
+  // Perfil carregado do armazenamento depois da montagem
+  useEffect(() => setDraft(toDraft(machineProfile)), [machineProfile])
+
+  const setTravel = (axis: (typeof AXES)[number], end: "min" | "max", value: string) =>
+    setDraft({ ...draft, travel: { ...draft.travel, [axis]: { ...draft.travel[axis], [end]: value } } })
+
+  const setBox = (index: number, box: BoxDraft) =>
+    setDraft({ ...draft, keepOut: draft.keepOut.map((b, i) => (i === index ? box : b)) })
+
+  const handleApply = () => {
+    try {
+      setMachineProfile(fromDraft(draft))
+      showMessage("Perfil da máquina aplicado.", "success")
+    } catch (error) {
+      showMessage(`${error instanceof Error ? error.message : error}`, "error")
+    }
+  }
+
+  return (
+    <div className="text-sm">
+      <div className="form-group mb-3">
+        <label htmlFor="perfilNome" className="block mb-1 font-medium">Máquina</label>
+        <input
+          id="perfilNome"
+          type="text"
+          value={draft.name}
+          onChange={(e) => setDraft({ ...draft, name: e.target.value })}
+          className={inputClass}
+        />
+      </div>
+
+      <p className="font-medium mb-1">Curso dos eixos (vazio: sem limite)</p>
+      <div className="grid grid-cols-[auto_1fr_1fr] gap-2 items-center mb-3">
+        {AXES.map((axis) => (
+          <div key={axis} className="contents">
+            <span className="font-medium">{axis.toUpperCase()}</span>
+            <input
+              type="text"
+              inputMode="decimal"
+              placeholder="mín."
+              value={draft.travel[axis].min}
+              onChange={(e) => setTravel(axis, "min", e.target.value)}
+              className={inputClass}
+            />
+            <input
+              type="text"
+              inputMode="decimal"
+              placeholder="máx."
+              value={draft.travel[axis].max}
+              onChange={(e) => setTravel(axis, "max", e.target.value)}
+              className={inputClass}
+            />
+          </div>
+        ))}
+      </div>
+
+      <p className="font-medium mb-1">Áreas proibidas (fixação, X/Y/Z da máquina)</p>
+      {draft.keepOut.map((box, index) => (
+        <div key={index} className="mb-2 p-2 rounded border border-gray-300 dark:border-gray-600">
+          <div className="flex gap-2 mb-1">
+            <input
+              type="text"
+              value={box.name}
+              onChange={(e) => setBox(index, { ...box, name: e.target.value })}
+              className={inputClass}
+            />
+            <button
+              onClick={() => setDraft({ ...draft, keepOut: draft.keepOut.filter((_, i) => i !== index) })}
+              className="px-2 rounded bg-secondary text-secondary-foreground hover:bg-secondary/80 transition-colors"
+              title="Remover área"
+            >
+              ✕
+            </button>
+          </div>
+          {(["min", "max"] as const).map((end) => (
+            <div key={end} className="grid grid-cols-[3rem_1fr_1fr_1fr] gap-1 items-center mb-1">
+              <span>{end === "min" ? "Mín." : "Máx."}</span>
+              {[0, 1, 2].map((k) => (
+                <input
+                  key={k}
+                  type="text"
+                  inputMode="decimal"
+                  placeholder={"XYZ"[k]}
+                  value={box[end][k]}
+                  onChange={(e) => setBox(index, { ...box, [end]: box[end].map((v, j) => (j === k ? e.target.value : v)) })}
+                  className={inputClass}
+                />
+              ))}
+            </div>
+          ))}
+        </div>
+      ))}
+
+      <div className="grid grid-cols-3 gap-2 mt-2">
+        <button
+          onClick={() => setDraft({ ...draft, keepOut: [...draft.keepOut, { name: `Área ${draft.keepOut.length + 1}`, min: ["0", "0", "0"], max: ["0", "0", "0"] }] })}
+          className="py-1 px-2 rounded bg-secondary text-secondary-foreground hover:bg-secondary/80 transition-colors"
+        >
+          Nova área
+        </button>
+        <button
+          onClick={() => setDraft(toDraft(DEFAULT_MACHINE_PROFILE))}
+          className="py-1 px-2 rounded bg-secondary text-secondary-foreground hover:bg-secondary/80 transition-colors"
+        >
+          Padrão
+        </button>
+        <button
+          onClick={handleApply}
+          className="py-1 px-2 rounded bg-primary text-primary-foreground hover:bg-primary/90 transition-colors"
+        >
+          Aplicar
+        </button>
+      </div>
+    </div>
+  )
+}
@@ -1,28 +1,20 @@
 "use client"
 
-import { useState, useEffect, useRef } from "react"
+import { useState, useEffect, useRef, useMemo } from "react"
 import { useSimulation } from "@/context/SimulationContext"
 import { Canvas2D } from "@/components/visualization/Canvas2D"
 import { Canvas3D } from "@/components/visualization/Canvas3D"
 import { SimulationControls } from "@/components/visualization/SimulationControls"
-import { processGCodeForSimulation } from "@/lib/simulation-processor"
+import { StockReport } from "@/components/visualization/StockReport"
+import { ToolpathCheck } from "@/components/visualization/ToolpathCheck"
 import { showMessage } from "@/lib/utils"
-
-// Definir tipos para a API do PyWebView
-interface PyWebViewResponse {
-  success: boolean;
-  message: string;
-}
-
-declare global {
-  interface Window {
-    pywebview?: {
-      api: {
-        save_file: (content: string, filename: string) => Promise<PyWebViewResponse>;
-      };
-    };
-  }
-}
+import { saveGCodeFile } from "@/lib/gcode-export"
+import { buildTimeline, interpolateMove, locateTime, playbackTimeScale } from "@/lib/playback"
+import { postProcessed } from "@/lib/post-processor"
+import { stockFromParams } from "@/lib/stock-model"
+import { summarizeViolations } from "@/lib/toolpath-check"
+import { DEFAULT_RAPID_RATE, formatDuration } from "@/lib/pass-planner"
+import type { SimulationFrame } from "@/types/simulation"
 
 /**
  * Output panel component that displays the generated G-code and visualization
@@ -36,20 +28,79 @@ export default function OutputPanel() {
   const [zoomLevel, setZoomLevel] = useState(1)
   const [simulationSpeed, setSimulationSpeed] = useState(1)
   const [blockByBlockMode, setBlockByBlockMode] = useState(false)
+  const [rapidRate, setRapidRate] = useState(DEFAULT_RAPID_RATE)
+  // Posição da ferramenta no meio do movimento seguinte a currentFrame (null: parada no frame)
+  const [toolPosition, setToolPosition] = useState<SimulationFrame | null>(null)
+  const [showStock, setShowStock] = useState(true)
+  const [stockVersion, setStockVersion] = useState(0)
 
-  const { gCode, simulationFrames, setSimulationFrames } = useSimulation()
+  const {
+    gCode,
+    program,
+    machiningParams,
+    stockReport,
+    simulationFrames,
+    setSimulationFrames,
+    machineProfile,
+    toolpathCheck,
+    postProfile,
+  } = useSimulation()
   const animationRef = useRef<number | null>(null)
+  const clockRef = useRef(0) // tempo simulado da máquina, em s
+
+  // Relógio simulado: quando termina cada movimento e onde começa cada entalhe
+  const timeline = useMemo(() => (program ? buildTimeline(program, { rapidRate }) : null), [program, rapidRate])
+
+  // Material acompanhado pela simulação (a sobra por entalhe já vem calculada do worker)
+  const stock = useMemo(
+    () => (program && machiningParams ? stockFromParams(machiningParams) : null),
+    [program, machiningParams],
+  )
+
+  // Corta o material até o frame atual (incremental; voltar reconstrói do início)
+  useEffect(() => {
+    if (!stock || !program || !showStock) return
+    stock.applyProgram(program, currentFrame)
+    setStockVersion(stock.version)
+  }, [stock, program, currentFrame, showStock])
+
+  // Nova velocidade de rápido: o relógio continua no movimento atual
+  useEffect(() => {
+    if (!timeline || timeline.endTime.length === 0) return
+    clockRef.current = currentFrame > 0 ? timeline.endTime[Math.min(currentFrame, timeline.endTime.length - 1)] : 0
+    setToolPosition(null)
+  }, [timeline])
 
-  // Process G-code for simulation when it changes
+  // Frames da simulação a partir do programa já analisado (sem reprocessar o texto)
   useEffect(() => {
-    if (gCode && gCode.length > 0) {
-      const frames = processGCodeForSimulation(gCode);
-      console.log('Processed Simulation Frames:', frames);
-      setSimulationFrames(frames)
+    if (program && program.source.length > 0) {
+      setSimulationFrames(program.toFrames())
       setCurrentFrame(0)
+      setToolPosition(null)
+      clockRef.current = 0
       showMessage("Simulação pronta! Clique em Iniciar Simulação para visualizar.", "success")
     }
-  }, [gCode, setSimulationFrames])
+  }, [program, setSimulationFrames])
+
+  // Moves the tool to a simulated time, interpolating inside the current move
+  const showTime = (time: number) => {
+    if (!timeline || !program) return
+    const { frame, fraction } = locateTime(timeline, time)
+    if (fraction >= 1) {
+      setCurrentFrame(frame)
+      setToolPosition(null)
+    } else {
+      setCurrentFrame(Math.max(0, frame - 1))
+      setToolPosition(interpolateMove(program, frame, fraction))
+    }
+  }
+
+  // Stops the tool exactly at the end of a frame
+  const seekFrame = (frame: number) => {
+    clockRef.current = timeline && frame > 0 ? timeline.endTime[frame] : 0
+    setCurrentFrame(frame)
+    setToolPosition(null)
+  }
 
   // Handle animation frame updates
   useEffect(() => {
@@ -60,37 +111,27 @@ export default function OutputPanel() {
     }
 
     // Only start animation if active, not paused, and not in block-by-block mode
-    if (simulationActive && !simulationPaused && !blockByBlockMode) {
-      let timeoutId: NodeJS.Timeout | null = null
-
-      const animate = () => {
-        setCurrentFrame((prev) => {
-          // If we've reached the end, stop the simulation
-          if (prev >= (simulationFrames?.length || 0) - 1) {
-            // Use setTimeout to avoid state update during render
-            setTimeout(() => {
-              setSimulationActive(false)
-            }, 0)
-            return 0
-          }
-
-          // Otherwise, advance based on speed
-          const increment = simulationSpeed <= 1 ? 1 : Math.ceil(simulationSpeed)
-          return prev + increment
-        })
-
-        // Clear previous timeout
-        if (timeoutId) clearTimeout(timeoutId)
-
-        // Schedule next frame with delay based on speed
-        const frameDelay = simulationSpeed <= 1 ? 100 / simulationSpeed : 100 / Math.sqrt(simulationSpeed)
-        
-        timeoutId = setTimeout(() => {
-          // Double-check state hasn't changed before requesting next frame
-          if (simulationActive && !simulationPaused && !blockByBlockMode) {
-            animationRef.current = requestAnimationFrame(animate)
-          }
-        }, frameDelay)
+    if (simulationActive && !simulationPaused && !blockByBlockMode && timeline) {
+      // Programas longos são comprimidos; os movimentos dentro de um quadro são pulados
+      const timeScale = playbackTimeScale(timeline) * simulationSpeed
+      let lastTimestamp: number | null = null
+
+      const animate = (timestamp: number) => {
+        if (lastTimestamp !== null) {
+          clockRef.current += ((timestamp - lastTimestamp) / 1000) * timeScale
+        }
+        lastTimestamp = timestamp
+
+        // If we've reached the end, stop the simulation
+        if (clockRef.current >= timeline.duration) {
+          seekFrame(0)
+          setSimulationActive(false)
+          animationRef.current = null
+          return
+        }
+
+        showTime(clockRef.current)
+        animationRef.current = requestAnimationFrame(animate)
       }
 
       // Start the animation loop
@@ -98,14 +139,13 @@ export default function OutputPanel() {
 
       // Clean up function
       return () => {
-        if (timeoutId) clearTimeout(timeoutId)
         if (animationRef.current) {
           cancelAnimationFrame(animationRef.current)
           animationRef.current = null
         }
       }
     }
-  }, [simulationActive, simulationPaused, simulationSpeed, simulationFrames, blockByBlockMode])
+  }, [simulationActive, simulationPaused, simulationSpeed, timeline, blockByBlockMode])
 
   // Toggle simulation state
   const toggleSimulation = () => {
@@ -155,9 +195,15 @@ export default function OutputPanel() {
 
   // Reset simulation to beginning
   const restartSimulation = () => {
-    setCurrentFrame(0)
+    seekFrame(0)
     // Keep simulation paused and in block by block mode if they were active
   }
+
+  // Jump to the rotation that starts a notch
+  const seekToNotch = (notch: number) => {
+    if (!timeline || notch < 0 || notch >= timeline.notchStarts.length) return
+    seekFrame(timeline.notchStarts[notch])
+  }
   
   // Step one block at a time
   const stepBlock = () => {
@@ -180,18 +226,15 @@ export default function OutputPanel() {
     }
     
     // Move to next block/frame
-    setCurrentFrame(prev => {
-      const nextFrame = prev + 1;
-      if (nextFrame >= (simulationFrames?.length || 0)) {
-        // End reached, reset
-        setTimeout(() => {
-          setSimulationActive(false);
-          setBlockByBlockMode(false);
-        }, 0);
-        return 0;
-      }
-      return nextFrame;
-    });
+    const nextFrame = currentFrame + 1;
+    if (nextFrame >= simulationFrames.length) {
+      // End reached, reset
+      seekFrame(0);
+      setSimulationActive(false);
+      setBlockByBlockMode(false);
+      return;
+    }
+    seekFrame(nextFrame);
   }
 
   // Save G-code to file
@@ -200,48 +243,14 @@ export default function OutputPanel() {
       showMessage("Nenhum código G para salvar!", "error")
       return
     }
-
-    const codigoTexto = gCode.join("\n")
-    
-    // Verifica se estamos no ambiente WebView
-    if (window.pywebview) {
-      try {
-        // Usa a API do PyWebView para salvar o arquivo
-        window.pywebview.api.save_file(codigoTexto, "codigo_entalhy_cnc.nc")
-          .then(res => {
-            if (res.success) {
-              showMessage(res.message, "success")
-            } else {
-              showMessage(res.message, "error")
-            }
-          })
-          .catch(err => {
-            showMessage("Erro ao salvar arquivo: " + err, "error")
-            saveFileFallback(codigoTexto)
-          })
-      } catch (e) {
-        showMessage("Não foi possível acessar a API de salvamento: " + e, "error")
-        saveFileFallback(codigoTexto)
-      }
-    } else {
-      saveFileFallback(codigoTexto)
+    if (toolpathCheck && toolpathCheck.total > 0 && !window.confirm(`Verificação do percurso: ${summarizeViolations(toolpathCheck)}.\n\nSalvar mesmo assim?`)) {
+      return
     }
-  }
-
-  // Fallback para salvar arquivo no navegador convencional
-  const saveFileFallback = (content: string) => {
-    const blob = new Blob([content], { type: "text/plain" })
-    const url = URL.createObjectURL(blob)
-
-    const a = document.createElement("a")
-    a.href = url
-    a.download = "codigo_entalhy_cnc.nc"
-    document.body.appendChild(a)
-    a.click()
-    document.body.removeChild(a)
-    URL.revokeObjectURL(url)
 
-    showMessage("Código G salvo com sucesso!", "success")
+    // Gravação em blocos (sem juntar o programa inteiro em uma única string), no formato da máquina
+    saveGCodeFile(postProcessed(gCode, postProfile)).catch((error) =>
+      showMessage(`Erro ao salvar código G: ${error instanceof Error ? error.message : error}`, "error"),
+    )
   }
 
   return (
@@ -291,11 +300,20 @@ export default function OutputPanel() {
 
         <div className="canvas-container relative w-full h-[250px] sm:h-[350px] border border-border rounded-lg overflow-hidden bg-muted/30 shadow-inner">
           {is3DMode ? (
-            <Canvas3D simulationFrames={simulationFrames || []} currentFrame={currentFrame} />
+            <Canvas3D
+              simulationFrames={simulationFrames || []}
+              currentFrame={currentFrame}
+              toolPosition={toolPosition}
+              stock={showStock ? stock : null}
+              stockVersion={stockVersion}
+            />
           ) : (
             <Canvas2D
               simulationFrames={simulationFrames || []}
               currentFrame={currentFrame}
+              toolPosition={toolPosition}
+              stock={showStock ? stock : null}
+              stockVersion={stockVersion}
               zoomLevel={zoomLevel}
               setZoomLevel={setZoomLevel}
             />
@@ -305,6 +323,9 @@ export default function OutputPanel() {
           {simulationFrames && simulationFrames.length > 0 && (
             <div className="absolute bottom-2 right-2 bg-black/70 dark:bg-black/80 text-white px-2 py-1 rounded-md text-xs">
               Frame: {currentFrame + 1}/{simulationFrames.length}
+              {timeline && timeline.endTime.length === simulationFrames.length && (
+                <> · {formatDuration(timeline.endTime[currentFrame])}/{formatDuration(timeline.duration)}</>
+              )}
             </div>
           )}
         </div>
@@ -323,8 +344,30 @@ export default function OutputPanel() {
           saveGCode={saveGCode}
           blockByBlockMode={blockByBlockMode}
           stepBlock={stepBlock}
+          rapidRate={rapidRate}
+          setRapidRate={setRapidRate}
+          notchCount={timeline ? timeline.notchStarts.length : 0}
+          seekToNotch={seekToNotch}
         />
 
+        {stockReport && (
+          <StockReport
+            report={stockReport}
+            showStock={showStock}
+            setShowStock={setShowStock}
+            seekToNotch={seekToNotch}
+          />
+        )}
+
+        {toolpathCheck && (
+          <ToolpathCheck
+            report={toolpathCheck}
+            profileName={machineProfile.name}
+            hasStock={machiningParams !== null}
+            seekFrame={seekFrame}
+          />
+        )}
+
         <div id="messageContainer" className="message info hidden mt-5 p-3 rounded text-center font-medium"></div>
       </div>
     </div>
@@ -3,10 +3,14 @@
 import { useRef, useEffect } from "react"
 import type { SimulationFrame } from "@/types/simulation"
 import { updateAngleIndicator, updatePositionIndicator } from "@/lib/indicators"
+import type { StockModel } from "@/lib/stock-model"
 
 interface Canvas2DProps {
   simulationFrames: SimulationFrame[]
   currentFrame: number
+  toolPosition?: SimulationFrame | null // posição interpolada no movimento seguinte
+  stock?: StockModel | null // material cortado até o frame atual
+  stockVersion?: number // muda a cada corte do material
   zoomLevel: number
   setZoomLevel: (zoom: number) => void
 }
@@ -15,7 +19,15 @@ interface Canvas2DProps {
  * 2D Canvas visualization component
  * Renders the tool path and current position in 2D
  */
-export function Canvas2D({ simulationFrames, currentFrame, zoomLevel, setZoomLevel }: Canvas2DProps) {
+export function Canvas2D({
+  simulationFrames,
+  currentFrame,
+  toolPosition,
+  stock,
+  stockVersion,
+  zoomLevel,
+  setZoomLevel,
+}: Canvas2DProps) {
   const canvasRef = useRef<HTMLCanvasElement>(null)
   const isDraggingRef = useRef(false)
   const lastMouseXRef = useRef(0)
@@ -23,52 +35,84 @@ export function Canvas2D({ simulationFrames, currentFrame, zoomLevel, setZoomLev
   const panOffsetXRef = useRef(0)
   const panOffsetYRef = useRef(0)
 
-  // Draw the current frame on the canvas
-  useEffect(() => {
+  // Camadas fora da tela: grade (muda só com a vista) e percurso (cresce a cada frame)
+  const gridLayerRef = useRef<HTMLCanvasElement | null>(null)
+  const pathLayerRef = useRef<HTMLCanvasElement | null>(null)
+  const drawnFrameRef = useRef(-1) // último frame já desenhado na camada do percurso
+  const layerKeyRef = useRef("") // vista e frames usados nas camadas
+  const layerFramesRef = useRef<SimulationFrame[] | null>(null)
+  const renderRef = useRef<() => void>(() => {})
+
+  // Composes the visible canvas from the layers; only segments reached since the
+  // last call are drawn, so the cost per frame does not grow with the program
+  renderRef.current = () => {
     const canvas = canvasRef.current
     if (!canvas) return
 
     const ctx = canvas.getContext("2d")
     if (!ctx) return
 
-    // Update position and angle indicators
-    if (simulationFrames.length > 0 && currentFrame < simulationFrames.length) {
-      const frame = simulationFrames[currentFrame]
-      updatePositionIndicator(frame.x || 0, frame.y, frame.z)
-      updateAngleIndicator(frame.a)
+    const { width, height } = canvas
+    const view = viewTransform(height, zoomLevel, panOffsetXRef.current, panOffsetYRef.current)
+    if (!gridLayerRef.current) gridLayerRef.current = document.createElement("canvas")
+    if (!pathLayerRef.current) pathLayerRef.current = document.createElement("canvas")
+    const gridLayer = gridLayerRef.current
+    const pathLayer = pathLayerRef.current
+    const pathCtx = pathLayer.getContext("2d")
+    const gridCtx = gridLayer.getContext("2d")
+    if (!pathCtx || !gridCtx) return
+
+    // Vista ou programa mudaram: redesenha a grade e recomeça o percurso
+    const key = `${width}x${height}@${zoomLevel}:${panOffsetXRef.current},${panOffsetYRef.current}`
+    if (key !== layerKeyRef.current || layerFramesRef.current !== simulationFrames) {
+      if (gridLayer.width !== width || gridLayer.height !== height) {
+        gridLayer.width = pathLayer.width = width
+        gridLayer.height = pathLayer.height = height
+      }
+      gridCtx.clearRect(0, 0, width, height)
+      drawCoordinateSystem(gridCtx, width, height, zoomLevel, panOffsetXRef.current, panOffsetYRef.current)
+      pathCtx.clearRect(0, 0, width, height)
+      drawnFrameRef.current = -1
+      layerKeyRef.current = key
+      layerFramesRef.current = simulationFrames
     }
 
-    // Clear canvas
-    ctx.clearRect(0, 0, canvas.width, canvas.height)
+    const target = Math.min(currentFrame, simulationFrames.length - 1)
+    if (target < drawnFrameRef.current) {
+      // Voltou no tempo: o percurso é redesenhado do início
+      pathCtx.clearRect(0, 0, width, height)
+      drawnFrameRef.current = -1
+    }
+    if (target > drawnFrameRef.current) {
+      drawPathSegments(pathCtx, simulationFrames, drawnFrameRef.current + 1, target, view)
+      drawnFrameRef.current = target
+    }
 
-    // Draw coordinate system with zoom
-    drawCoordinateSystem(ctx, canvas.width, canvas.height, zoomLevel, panOffsetXRef.current, panOffsetYRef.current)
+    // Clear canvas
+    ctx.clearRect(0, 0, width, height)
+    ctx.drawImage(gridLayer, 0, 0)
 
     // Draw simulation path if available
-    if (simulationFrames.length > 0) {
-      // Draw the workpiece (rotating cylinder in 2D)
+    if (target >= 0) {
+      const frame = simulationFrames[target]
+      const tool = toolPosition ?? frame
+
+      // Update position and angle indicators
       if (currentFrame < simulationFrames.length) {
-        drawWorkpiece(
-          ctx, 
-          simulationFrames[currentFrame],
-          canvas.width,
-          canvas.height,
-          zoomLevel,
-          panOffsetXRef.current,
-          panOffsetYRef.current
-        );
+        updatePositionIndicator(tool.x || 0, tool.y, tool.z)
+        updateAngleIndicator(tool.a)
+
+        // Draw the workpiece (rotating cylinder in 2D)
+        drawWorkpiece(ctx, tool, width, height, zoomLevel, panOffsetXRef.current, panOffsetYRef.current)
+        if (stock) drawStockSection(ctx, stock, tool.a, view)
+      }
+
+      ctx.drawImage(pathLayer, 0, 0)
+      if (currentFrame < simulationFrames.length) {
+        // Trecho já percorrido do movimento em andamento
+        if (toolPosition) drawPathSegments(ctx, [frame, toolPosition], 1, 1, view)
+        drawTool(ctx, tool, view)
       }
-      
-      drawSimulationPath(
-        ctx,
-        simulationFrames,
-        currentFrame,
-        canvas.width,
-        canvas.height,
-        zoomLevel,
-        panOffsetXRef.current,
-        panOffsetYRef.current,
-      )
     } else {
       // Draw message if no simulation data
       ctx.font = "14px Arial"
@@ -76,11 +120,16 @@ export function Canvas2D({ simulationFrames, currentFrame, zoomLevel, setZoomLev
       ctx.fillStyle = "#333"
       ctx.fillText(
         "Gere o Código G e clique em Iniciar Simulação para visualizar",
-        canvas.width / 2,
-        canvas.height / 2 - 50,
+        width / 2,
+        height / 2 - 50,
       )
     }
-  }, [simulationFrames, currentFrame, zoomLevel])
+  }
+
+  // Draw the current frame on the canvas
+  useEffect(() => {
+    renderRef.current()
+  }, [simulationFrames, currentFrame, toolPosition, stock, stockVersion, zoomLevel])
 
   // Set up canvas resizing
   useEffect(() => {
@@ -91,27 +140,12 @@ export function Canvas2D({ simulationFrames, currentFrame, zoomLevel, setZoomLev
       const container = canvas.parentElement
       if (!container) return
 
+      if (canvas.width === container.clientWidth && canvas.height === container.clientHeight) return
       canvas.width = container.clientWidth
       canvas.height = container.clientHeight
 
       // Redraw after resize
-      const ctx = canvas.getContext("2d")
-      if (!ctx) return
-
-      drawCoordinateSystem(ctx, canvas.width, canvas.height, zoomLevel, panOffsetXRef.current, panOffsetYRef.current)
-
-      if (simulationFrames.length > 0) {
-        drawSimulationPath(
-          ctx,
-          simulationFrames,
-          currentFrame,
-          canvas.width,
-          canvas.height,
-          zoomLevel,
-          panOffsetXRef.current,
-          panOffsetYRef.current,
-        )
-      }
+      renderRef.current()
     }
 
     // Initial resize
@@ -123,7 +157,7 @@ export function Canvas2D({ simulationFrames, currentFrame, zoomLevel, setZoomLev
     return () => {
       window.removeEventListener("resize", resizeCanvas)
     }
-  }, [simulationFrames, currentFrame, zoomLevel])
+  }, [])
 
   // Set up canvas panning
   useEffect(() => {
@@ -150,24 +184,7 @@ export function Canvas2D({ simulationFrames, currentFrame, zoomLevel, setZoomLev
       lastMouseYRef.current = e.clientY
 
       // Redraw with new pan offset
-      const ctx = canvas.getContext("2d")
-      if (!ctx) return
-
-      ctx.clearRect(0, 0, canvas.width, canvas.height)
-      drawCoordinateSystem(ctx, canvas.width, canvas.height, zoomLevel, panOffsetXRef.current, panOffsetYRef.current)
-
-      if (simulationFrames.length > 0) {
-        drawSimulationPath(
-          ctx,
-          simulationFrames,
-          currentFrame,
-          canvas.width,
-          canvas.height,
-          zoomLevel,
-          panOffsetXRef.current,
-          panOffsetYRef.current,
-        )
-      }
+      renderRef.current()
     }
 
     const handleMouseUp = () => {
@@ -195,7 +212,7 @@ export function Canvas2D({ simulationFrames, currentFrame, zoomLevel, setZoomLev
       document.removeEventListener("mouseup", handleMouseUp)
       canvas.removeEventListener("wheel", handleWheel)
     }
-  }, [zoomLevel, setZoomLevel, simulationFrames, currentFrame])
+  }, [zoomLevel, setZoomLevel])
 
   return (
     <>
@@ -348,48 +365,105 @@ function drawWorkpiece(
   ctx.restore();
 }
 
-// Helper function to draw simulation path
-function drawSimulationPath(
+/**
+ * Draws the material section under the tool: the stock surface along Z at the
+ * angle the tool is facing (Y = radius, as the tool path)
+ *
+ * @param ctx - Context of the visible canvas
+ * @param stock - Stock cut up to the current frame
+ * @param a - Current A angle
+ * @param view - Screen transform
+ */
+function drawStockSection(ctx: CanvasRenderingContext2D, stock: StockModel, a: number, view: ViewTransform) {
+  const { originX, originY, scaleZ, scaleY } = view
+  const column = stock.columnAt(-a)
+  // Material além da superfície (interno) ou entre o eixo e a superfície (externo)
+  const limit = stock.internal ? stock.surfaceRadius * 1.5 : 0
+
+  ctx.save()
+  ctx.beginPath()
+  ctx.moveTo(originX + stock.zMin * scaleZ, originY - limit * scaleY)
+  for (let row = 0; row < stock.axialCells; row++) {
+    const radius = stock.surfaceAt(row * stock.angleCells + column)
+    const z = row === 0 ? stock.zMin : row === stock.axialCells - 1 ? stock.zMax : stock.rowZ(row)
+    ctx.lineTo(originX + z * scaleZ, originY - radius * scaleY)
+  }
+  ctx.lineTo(originX + stock.zMax * scaleZ, originY - limit * scaleY)
+  ctx.closePath()
+  ctx.fillStyle = "rgba(120, 120, 120, 0.45)"
+  ctx.fill()
+  ctx.strokeStyle = "#555"
+  ctx.lineWidth = 1
+  ctx.stroke()
+  ctx.restore()
+}
+
+// Screen transform shared by the path layer and the tool marker
+function viewTransform(height: number, zoomLevel: number, panOffsetX: number, panOffsetY: number) {
+  const padding = 40
+  return {
+    originX: (padding * 2 + panOffsetX) * zoomLevel,
+    originY: (height / 2 + panOffsetY) * zoomLevel,
+    scaleZ: 5 * zoomLevel,
+    scaleY: 5 * zoomLevel,
+  }
+}
+
+type ViewTransform = ReturnType<typeof viewTransform>
+
+/**
+ * Draws the path segments that end at frames `from`..`to` (inclusive)
+ *
+ * Consecutive segments with the same motion type are stroked as one path.
+ *
+ * @param ctx - Context of the path layer
+ * @param frames - Simulation frames
+ * @param from - First frame to draw (the segment starts at the previous frame)
+ * @param to - Last frame to draw
+ * @param view - Screen transform
+ */
+function drawPathSegments(
   ctx: CanvasRenderingContext2D,
   frames: SimulationFrame[],
-  currentFrame: number,
-  width: number,
-  height: number,
-  zoomLevel: number,
-  panOffsetX: number,
-  panOffsetY: number,
+  from: number,
+  to: number,
+  view: ViewTransform,
 ) {
-  if (currentFrame >= frames.length) return
+  const { originX, originY, scaleZ, scaleY } = view
 
-  const padding = 40
-  const originX = (padding * 2 + panOffsetX) * zoomLevel
-  const originY = (height / 2 + panOffsetY) * zoomLevel
-  const scaleZ = 5 * zoomLevel
-  const scaleY = 5 * zoomLevel
-
-  // Draw path up to current frame
-  ctx.beginPath()
-  ctx.moveTo(originX, originY)
+  // O primeiro segmento parte da origem
+  let lastX = from > 0 ? originX + frames[from - 1].z * scaleZ : originX
+  let lastY = from > 0 ? originY - frames[from - 1].y * scaleY : originY
+  let style = ""
 
-  for (let i = 0; i <= currentFrame; i++) {
+  for (let i = from; i <= to; i++) {
     const point = frames[i]
     const x = originX + point.z * scaleZ
     const y = originY - point.y * scaleY
 
-    // Use red for cutting moves (G1), blue for rapid moves (G0)
-    ctx.strokeStyle = point.cmd === "G1" ? "#cc0000" : "#0066cc"
-    ctx.lineWidth = point.cmd === "G1" ? 2 : 1
+    if (point.cmd !== style) {
+      if (style) ctx.stroke()
+      style = point.cmd
+
+      // Use red for cutting moves (G1), blue for rapid moves (G0)
+      ctx.strokeStyle = style === "G1" ? "#cc0000" : "#0066cc"
+      ctx.lineWidth = style === "G1" ? 2 : 1
+      ctx.beginPath()
+      ctx.moveTo(lastX, lastY)
+    }
 
     ctx.lineTo(x, y)
-    ctx.stroke()
-    ctx.beginPath()
-    ctx.moveTo(x, y)
+    lastX = x
+    lastY = y
   }
 
-  // Draw current tool position
-  const frame = frames[currentFrame]
-  const currentX = originX + frame.z * scaleZ
-  const currentY = originY - frame.y * scaleY
+  if (style) ctx.stroke()
+}
+
+// Helper function to draw the current tool position
+function drawTool(ctx: CanvasRenderingContext2D, frame: SimulationFrame, view: ViewTransform) {
+  const currentX = view.originX + frame.z * view.scaleZ
+  const currentY = view.originY - frame.y * view.scaleY
 
   // Draw tool
   const toolSize = 8
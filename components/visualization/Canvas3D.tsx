@@ -3,19 +3,32 @@
 import { useRef, useEffect } from "react"
 import type { SimulationFrame } from "@/types/simulation"
 import { updateAngleIndicator, updatePositionIndicator } from "@/lib/indicators"
+import type { StockModel } from "@/lib/stock-model"
 import * as THREE from "three"
 import { OrbitControls } from "three/examples/jsm/controls/OrbitControls.js"
 
 interface Canvas3DProps {
   simulationFrames: SimulationFrame[]
   currentFrame: number
+  toolPosition?: SimulationFrame | null // posição interpolada no movimento seguinte
+  stock?: StockModel | null // material cortado até o frame atual
+  stockVersion?: number // muda a cada corte do material
 }
 
+// Strong red for G0, blue for G1
+const G0_COLOR = 0xff0000
+const G1_COLOR = 0x00aaff
+// Stock surface: uncut blank and machined cells
+const STOCK_COLOR = 0x9a9a9a
+const CUT_COLOR = 0xffaa00
+// Angular columns of the stock mesh (the heightmap is reduced to this)
+const STOCK_MESH_COLUMNS = 360
+
 /**
  * 3D Canvas visualization component
  * Renders the tool path and current position in 3D using Three.js
  */
-export function Canvas3D({ simulationFrames, currentFrame }: Canvas3DProps) {
+export function Canvas3D({ simulationFrames, currentFrame, toolPosition, stock, stockVersion }: Canvas3DProps) {
   const containerRef = useRef<HTMLDivElement>(null)
   const sceneRef = useRef<THREE.Scene | null>(null)
   const cameraRef = useRef<THREE.PerspectiveCamera | null>(null)
@@ -25,43 +38,10 @@ export function Canvas3D({ simulationFrames, currentFrame }: Canvas3DProps) {
   const toolRef = useRef<THREE.Group | null>(null)
   const axesRef = useRef<THREE.AxesHelper | null>(null)
   const gridRef = useRef<THREE.GridHelper | null>(null)
+  const pathRef = useRef<THREE.LineSegments | null>(null)
+  const markerRef = useRef<THREE.Mesh<THREE.SphereGeometry, THREE.MeshBasicMaterial> | null>(null)
+  const stockMeshRef = useRef<THREE.Mesh | null>(null)
 
-  // Add legend for G0/G1
-  const addLegend = () => {
-    if (!sceneRef.current) return;
-    
-    // Remove existing legend
-    sceneRef.current.children.forEach(child => {
-      if (child.userData.isLegend) {
-        sceneRef.current!.remove(child);
-      }
-    });
-    
-    // G0 legend (red)
-    const g0Line = new THREE.Line(
-      new THREE.BufferGeometry().setFromPoints([
-        new THREE.Vector3(-90, 80, 0),
-        new THREE.Vector3(-70, 80, 0)
-      ]),
-      new THREE.LineBasicMaterial({ color: 0xff0000, linewidth: 4 })
-    );
-    g0Line.userData.isLegend = true;
-    
-    // G1 legend (blue)
-    const g1Line = new THREE.Line(
-      new THREE.BufferGeometry().setFromPoints([
-        new THREE.Vector3(-90, 70, 0),
-        new THREE.Vector3(-70, 70, 0)
-      ]),
-      new THREE.LineBasicMaterial({ color: 0x00aaff, linewidth: 3 })
-    );
-    g1Line.userData.isLegend = true;
-    
-    // Add to scene
-    sceneRef.current.add(g0Line);
-    sceneRef.current.add(g1Line);
-  };
-  
   // Initialize 3D scene with correct CNC axes
   useEffect(() => {
     if (!containerRef.current) return;
@@ -129,6 +109,18 @@ export function Canvas3D({ simulationFrames, currentFrame }: Canvas3DProps) {
     scene.add(toolGroup);
     toolRef.current = toolGroup;
 
+    // Current position marker, reused on every frame
+    const marker = new THREE.Mesh(
+      new THREE.SphereGeometry(3, 16, 16),
+      new THREE.MeshBasicMaterial({ color: G1_COLOR })
+    );
+    marker.visible = false;
+    scene.add(marker);
+    markerRef.current = marker;
+
+    // Legend for G0/G1
+    addLegend(scene);
+
     // Orbit controls
     const controls = new OrbitControls(camera, renderer.domElement);
     controls.enableDamping = true;
@@ -158,110 +150,79 @@ export function Canvas3D({ simulationFrames, currentFrame }: Canvas3DProps) {
       window.removeEventListener('resize', handleResize);
       cancelAnimationFrame(animationFrameRef.current!);
       controls.dispose();
+      disposeObject(scene);
       renderer.dispose();
+      markerRef.current = null;
     };
   }, []);
 
-  // Progressively build the tool path during simulation
+  // Upload the whole tool path once per program; the previous one is freed on regeneration
   useEffect(() => {
-    // Add legend
-    addLegend();
-    if (!sceneRef.current || !simulationFrames.length || currentFrame === undefined) return;
-
-    // Clear previous tool paths
-    sceneRef.current.children.forEach(child => {
-      if (child.userData.isToolPath) {
-        sceneRef.current!.remove(child);
-      }
-    });
+    const scene = sceneRef.current;
+    if (!scene) return;
 
-    // Define types for our segments
-    interface PathSegment {
-      points: THREE.Vector3[];
-      isG0: boolean;
-    }
+    const path = buildToolPath(simulationFrames);
+    if (!path) return;
+    scene.add(path);
+    pathRef.current = path;
 
-    // Create segmented path with G0/G1 coloring up to current frame
-    const lineSegments: PathSegment[] = [];
-    let currentSegment: THREE.Vector3[] = [];
-    let currentMode = '';
-    
-    // Only process frames up to the current frame
-    const visibleFrames = simulationFrames.slice(0, currentFrame + 1);
-    
-    visibleFrames.forEach((frame: SimulationFrame & { gCode?: string }, index) => {
-      const angle = frame.a * (Math.PI / 180);
-      const x = frame.x * Math.cos(angle) - frame.y * Math.sin(angle);
-      const y = frame.x * Math.sin(angle) + frame.y * Math.cos(angle);
-      const z = frame.z;
-      
-      // Detect G0/G1 changes (fallback to G1 if not specified, case insensitive)
-      const frameGCode = (frame.gCode || 'G1').toUpperCase();
-      if (frameGCode !== currentMode) {
-        if (currentSegment.length > 0) {
-          lineSegments.push({
-            points: currentSegment,
-            isG0: currentMode === 'G0'
-          });
-        }
-        currentSegment = [];
-        currentMode = frameGCode;
-      }
-      
-      currentSegment.push(new THREE.Vector3(x, z, y));
-      
-      // Add last segment
-      if (index === visibleFrames.length - 1) {
-        lineSegments.push({
-          points: currentSegment,
-          isG0: currentMode === 'G0'
-        });
-      }
-    });
-
-    // Create lines with appropriate colors
-    lineSegments.forEach(segment => {
-      if (segment.points.length > 1 && sceneRef.current) {
-        const geometry = new THREE.BufferGeometry().setFromPoints(segment.points);
-        const material = new THREE.LineBasicMaterial({
-          color: segment.isG0 ? 0xff0000 : 0x00aaff, // Strong red for G0, blue for G1
-          linewidth: segment.isG0 ? 4 : 3 // Thicker line for G0
-        });
-        const line = new THREE.Line(geometry, material);
-        line.userData.isToolPath = true;
-        sceneRef.current.add(line);
-      }
-    });
-
-    // Update current position
-    if (currentFrame !== undefined && currentFrame < simulationFrames.length) {
-      const frame = simulationFrames[currentFrame];
-      const angle = frame.a * (Math.PI / 180);
-      
-      // Calculate rotated position
-      const x = frame.x * Math.cos(angle) - frame.y * Math.sin(angle);
-      const y = frame.x * Math.sin(angle) + frame.y * Math.cos(angle);
-      const z = frame.z;
-      
-      // Update indicators with original values
-      updatePositionIndicator(frame.x, frame.y, frame.z);
-      updateAngleIndicator(frame.a);
-      
-      // Highlight current position (rotated)
-      // Determine if this is a G0 movement
-      const isG0Movement = ((frame as any).gCode || 'G1').toUpperCase() === 'G0';
-      
-      const sphere = new THREE.Mesh(
-        new THREE.SphereGeometry(3, 16, 16),
-        new THREE.MeshBasicMaterial({ 
-          color: isG0Movement ? 0xff0000 : 0x00aaff // Match line color
-        })
-      );
-      sphere.position.set(x, z, y); // Note: Y and Z swapped for correct display
-      sphere.userData.isToolPath = true;
-      sceneRef.current.add(sphere);
+    return () => {
+      scene.remove(path);
+      path.geometry.dispose();
+      (path.material as THREE.Material).dispose();
+      pathRef.current = null;
+    };
+  }, [simulationFrames]);
+
+  // Stock surface mesh, allocated once per stock model
+  useEffect(() => {
+    const scene = sceneRef.current;
+    if (!scene || !stock) return;
+
+    const mesh = buildStockMesh(stock);
+    scene.add(mesh);
+    stockMeshRef.current = mesh;
+
+    return () => {
+      scene.remove(mesh);
+      mesh.geometry.dispose();
+      (mesh.material as THREE.Material).dispose();
+      stockMeshRef.current = null;
+    };
+  }, [stock]);
+
+  // Cutting only rewrites the vertex radii and colors
+  useEffect(() => {
+    if (stock && stockMeshRef.current) updateStockMesh(stockMeshRef.current, stock);
+  }, [stock, stockVersion]);
+
+  // Playback only advances the draw range and moves the marker
+  useEffect(() => {
+    const marker = markerRef.current;
+    if (!marker) return;
+
+    if (!simulationFrames.length || currentFrame === undefined || currentFrame >= simulationFrames.length) {
+      marker.visible = false;
+      return;
     }
-  }, [simulationFrames, currentFrame]);
+
+    // Segmentos terminando nos frames 1..currentFrame (dois vértices cada)
+    pathRef.current?.geometry.setDrawRange(0, currentFrame * 2);
+
+    const frame = toolPosition ?? simulationFrames[currentFrame];
+
+    // Update indicators with original values
+    updatePositionIndicator(frame.x, frame.y, frame.z);
+    updateAngleIndicator(frame.a);
+
+    // Highlight current position (rotated), matching the line color
+    const angle = frame.a * (Math.PI / 180);
+    const x = frame.x * Math.cos(angle) - frame.y * Math.sin(angle);
+    const y = frame.x * Math.sin(angle) + frame.y * Math.cos(angle);
+    marker.position.set(x, frame.z, y); // Note: Y and Z swapped for correct display
+    marker.material.color.setHex(frame.cmd === "G0" ? G0_COLOR : G1_COLOR);
+    marker.visible = true;
+  }, [simulationFrames, currentFrame, toolPosition]);
 
   return (
     <>
@@ -292,3 +253,190 @@ export function Canvas3D({ simulationFrames, currentFrame }: Canvas3DProps) {
     </>
   )
 }
+
+// Adds the G0/G1 color legend to the scene
+function addLegend(scene: THREE.Scene) {
+  // G0 legend (red)
+  const g0Line = new THREE.Line(
+    new THREE.BufferGeometry().setFromPoints([
+      new THREE.Vector3(-90, 80, 0),
+      new THREE.Vector3(-70, 80, 0)
+    ]),
+    new THREE.LineBasicMaterial({ color: G0_COLOR })
+  );
+  g0Line.userData.isLegend = true;
+
+  // G1 legend (blue)
+  const g1Line = new THREE.Line(
+    new THREE.BufferGeometry().setFromPoints([
+      new THREE.Vector3(-90, 70, 0),
+      new THREE.Vector3(-70, 70, 0)
+    ]),
+    new THREE.LineBasicMaterial({ color: G1_COLOR })
+  );
+  g1Line.userData.isLegend = true;
+
+  scene.add(g0Line);
+  scene.add(g1Line);
+}
+
+/**
+ * Builds the complete tool path as one preallocated line-segment geometry
+ *
+ * Each move is a segment from the previous frame, colored by its motion type
+ * (G0 or G1) through per-vertex colors. Frames are rotated by their A angle.
+ * Playback shows a prefix of the path with `geometry.setDrawRange`.
+ *
+ * @param frames - Simulation frames
+ * @returns Line segments with the draw range empty, or null for fewer than two frames
+ */
+function buildToolPath(frames: SimulationFrame[]): THREE.LineSegments | null {
+  if (frames.length < 2) return null
+
+  const segments = frames.length - 1
+  const positions = new Float32Array(segments * 6)
+  const colors = new Float32Array(segments * 6)
+  const g0 = new THREE.Color(G0_COLOR)
+  const g1 = new THREE.Color(G1_COLOR)
+
+  let lastX = 0
+  let lastY = 0
+  let lastZ = 0
+  for (let i = 0; i < frames.length; i++) {
+    const frame = frames[i]
+    const angle = frame.a * (Math.PI / 180)
+    const cos = Math.cos(angle)
+    const sin = Math.sin(angle)
+    // Y e Z trocados para a exibição, como no marcador
+    const x = frame.x * cos - frame.y * sin
+    const y = frame.z
+    const z = frame.x * sin + frame.y * cos
+
+    if (i > 0) {
+      const o = (i - 1) * 6
+      const color = frame.cmd === "G0" ? g0 : g1
+      positions[o] = lastX
+      positions[o + 1] = lastY
+      positions[o + 2] = lastZ
+      positions[o + 3] = x
+      positions[o + 4] = y
+      positions[o + 5] = z
+      for (let v = 0; v < 6; v += 3) {
+        colors[o + v] = color.r
+        colors[o + v + 1] = color.g
+        colors[o + v + 2] = color.b
+      }
+    }
+    lastX = x
+    lastY = y
+    lastZ = z
+  }
+
+  const geometry = new THREE.BufferGeometry()
+  geometry.setAttribute("position", new THREE.BufferAttribute(positions, 3))
+  geometry.setAttribute("color", new THREE.BufferAttribute(colors, 3))
+  geometry.computeBoundingSphere()
+  geometry.setDrawRange(0, 0)
+
+  const path = new THREE.LineSegments(geometry, new THREE.LineBasicMaterial({ vertexColors: true }))
+  path.userData.isToolPath = true
+  return path
+}
+
+/**
+ * Builds the stock surface as a grid mesh over angle × axial rows
+ *
+ * The heightmap columns are grouped into STOCK_MESH_COLUMNS mesh columns; the
+ * radii are filled in by `updateStockMesh`.
+ *
+ * @param stock - Stock model
+ * @returns Surface mesh with per-vertex colors
+ */
+function buildStockMesh(stock: StockModel): THREE.Mesh {
+  const columns = Math.min(STOCK_MESH_COLUMNS, stock.angleCells)
+  const rows = stock.axialCells
+  const geometry = new THREE.BufferGeometry()
+  geometry.setAttribute("position", new THREE.BufferAttribute(new Float32Array(columns * rows * 3), 3))
+  geometry.setAttribute("color", new THREE.BufferAttribute(new Float32Array(columns * rows * 3), 3))
+
+  // Dois triângulos por célula, fechando a volta entre a última e a primeira coluna
+  const indices: number[] = []
+  for (let row = 0; row < rows - 1; row++) {
+    for (let column = 0; column < columns; column++) {
+      const next = (column + 1) % columns
+      const a = row * columns + column
+      const b = row * columns + next
+      const c = (row + 1) * columns + column
+      const d = (row + 1) * columns + next
+      indices.push(a, b, c, b, d, c)
+    }
+  }
+  geometry.setIndex(indices)
+
+  const material = new THREE.MeshLambertMaterial({
+    vertexColors: true,
+    side: THREE.DoubleSide,
+    transparent: true,
+    opacity: 0.6,
+  })
+  const mesh = new THREE.Mesh(geometry, material)
+  mesh.userData.isStock = true
+  updateStockMesh(mesh, stock)
+  return mesh
+}
+
+/**
+ * Writes the current stock surface into the mesh
+ *
+ * Each mesh column takes the deepest cut of its heightmap columns, so notches
+ * narrower than a mesh column still show. Positions use the display frame of
+ * the tool path (x = r sin θ, z = r cos θ, y = Z).
+ *
+ * @param mesh - Mesh from `buildStockMesh`
+ * @param stock - Stock model
+ */
+function updateStockMesh(mesh: THREE.Mesh, stock: StockModel) {
+  const geometry = mesh.geometry
+  const position = geometry.getAttribute("position") as THREE.BufferAttribute
+  const color = geometry.getAttribute("color") as THREE.BufferAttribute
+  const columns = position.count / stock.axialCells
+  const group = stock.angleCells / columns
+  const blank = new THREE.Color(STOCK_COLOR)
+  const cut = new THREE.Color(CUT_COLOR)
+
+  for (let column = 0; column < columns; column++) {
+    const first = Math.floor(column * group)
+    const last = Math.floor((column + 1) * group)
+    const angle = ((column + 0.5) * 2 * Math.PI) / columns
+    const sin = Math.sin(angle)
+    const cos = Math.cos(angle)
+
+    for (let row = 0; row < stock.axialCells; row++) {
+      let radius = stock.surfaceRadius
+      for (let k = first; k < last; k++) {
+        const r = stock.surfaceAt(row * stock.angleCells + k)
+        if (stock.internal ? r > radius : r < radius) radius = r
+      }
+      const v = row * columns + column
+      position.setXYZ(v, radius * sin, stock.rowZ(row), radius * cos)
+      const shade = radius !== stock.surfaceRadius ? cut : blank
+      color.setXYZ(v, shade.r, shade.g, shade.b)
+    }
+  }
+
+  position.needsUpdate = true
+  color.needsUpdate = true
+  geometry.computeVertexNormals()
+  geometry.computeBoundingSphere()
+}
+
+// Frees the geometries and materials of an object tree
+function disposeObject(root: THREE.Object3D) {
+  root.traverse((child) => {
+    const mesh = child as THREE.Mesh
+    if (mesh.geometry) mesh.geometry.dispose()
+    const material = mesh.material
+    if (Array.isArray(material)) material.forEach((m) => m.dispose())
+    else if (material) material.dispose()
+  })
+}
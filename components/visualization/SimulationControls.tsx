@@ -14,6 +14,10 @@ interface SimulationControlsProps {
   saveGCode: () => void
   blockByBlockMode: boolean
   stepBlock: () => void
+  rapidRate: number
+  setRapidRate: (rate: number) => void
+  notchCount: number
+  seekToNotch: (notch: number) => void
 }
 
 /**
@@ -34,6 +38,10 @@ export function SimulationControls({
   saveGCode,
   blockByBlockMode,
   stepBlock,
+  rapidRate,
+  setRapidRate,
+  notchCount,
+  seekToNotch,
 }: SimulationControlsProps) {
   // Define base button classes for consistency
   const baseButtonClasses = "flex items-center justify-center text-white px-3 py-2 md:px-4 md:py-2 rounded-md font-medium transition-all shadow-sm focus:outline-none focus:ring-2 focus:ring-offset-2 dark:focus:ring-offset-slate-900";
@@ -133,6 +141,48 @@ export function SimulationControls({
         </div>
       </div>
 
+      {/* Relógio da simulação: velocidade de rápido e salto para um entalhe */}
+      <div className="control-group mb-4 grid grid-cols-1 sm:grid-cols-2 gap-3">
+        <div>
+          <label htmlFor="rapidRate" className="block mb-1 text-sm font-medium text-slate-700 dark:text-slate-300">
+            Avanço Rápido G0 (mm/min):
+          </label>
+          <input
+            type="number"
+            id="rapidRate"
+            min="1"
+            step="100"
+            value={rapidRate}
+            onChange={(e) => {
+              const rate = Number.parseFloat(e.target.value)
+              if (rate > 0) setRapidRate(rate)
+            }}
+            className="w-full px-2 py-1 text-sm rounded-md border border-slate-300 dark:border-slate-600 bg-white dark:bg-slate-700 text-slate-700 dark:text-slate-200"
+          />
+        </div>
+        <div>
+          <label htmlFor="seekNotch" className="block mb-1 text-sm font-medium text-slate-700 dark:text-slate-300">
+            Ir para o Entalhe:
+          </label>
+          <select
+            id="seekNotch"
+            value=""
+            disabled={!hasSimulationData || notchCount === 0}
+            onChange={(e) => {
+              if (e.target.value !== "") seekToNotch(Number(e.target.value))
+            }}
+            className="w-full px-2 py-1 text-sm rounded-md border border-slate-300 dark:border-slate-600 bg-white dark:bg-slate-700 text-slate-700 dark:text-slate-200"
+          >
+            <option value="">Selecione...</option>
+            {Array.from({ length: notchCount }, (_, i) => (
+              <option key={i} value={i}>
+                Entalhe {i + 1}
+              </option>
+            ))}
+          </select>
+        </div>
+      </div>
+
       {/* Controle de Zoom */}
       <div className="control-group">
         <label htmlFor="zoomLevel" className="block mb-1 text-sm font-medium text-slate-700 dark:text-slate-300">
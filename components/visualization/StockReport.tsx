@@ -0,0 +1,72 @@
+"use client"
+
+import { LEFTOVER_TOLERANCE, type NotchLeftover } from "@/lib/stock-model"
+
+interface StockReportProps {
+  report: NotchLeftover[]
+  showStock: boolean
+  setShowStock: (show: boolean) => void
+  seekToNotch: (notch: number) => void
+}
+
+/**
+ * Leftover material report
+ * Lists, per notch, the material left at the bottom after the whole program
+ */
+export function StockReport({ report, showStock, setShowStock, seekToNotch }: StockReportProps) {
+  const pendentes = report.filter((r) => r.maxLeftover > LEFTOVER_TOLERANCE).length
+
+  return (
+    <div className="stock-report mt-4 p-4 bg-slate-100 dark:bg-slate-800 rounded-lg shadow-md">
+      <div className="flex flex-wrap justify-between items-center gap-2 mb-3">
+        <h3 className="text-sm font-semibold text-slate-700 dark:text-slate-300">
+          Material Restante
+          <span className={`ml-2 font-medium ${pendentes > 0 ? "text-amber-600 dark:text-amber-400" : "text-emerald-600 dark:text-emerald-400"}`}>
+            {pendentes > 0 ? `${pendentes} entalhe(s) com sobra` : "fundo limpo em todos os entalhes"}
+          </span>
+        </h3>
+        <label className="flex items-center gap-2 text-sm text-slate-700 dark:text-slate-300 cursor-pointer">
+          <input
+            type="checkbox"
+            checked={showStock}
+            onChange={(e) => setShowStock(e.target.checked)}
+            className="accent-sky-600"
+          />
+          Mostrar material
+        </label>
+      </div>
+
+      {report.length > 0 && (
+        <div className="max-h-48 overflow-auto">
+          <table className="w-full text-xs text-slate-700 dark:text-slate-300">
+            <thead>
+              <tr className="text-left border-b border-slate-300 dark:border-slate-600">
+                <th className="py-1 pr-2">Entalhe</th>
+                <th className="py-1 pr-2">A (°)</th>
+                <th className="py-1 pr-2">Sobra máx. (mm)</th>
+                <th className="py-1 pr-2">Sobra média (mm)</th>
+                <th className="py-1">Fundo não cortado</th>
+              </tr>
+            </thead>
+            <tbody>
+              {report.map((r) => (
+                <tr
+                  key={r.notch}
+                  className={`cursor-pointer hover:bg-slate-200 dark:hover:bg-slate-700 ${r.maxLeftover > LEFTOVER_TOLERANCE ? "text-amber-700 dark:text-amber-400" : ""}`}
+                  onClick={() => seekToNotch(r.notch)}
+                  title="Ir para o entalhe"
+                >
+                  <td className="py-0.5 pr-2">{r.notch + 1}</td>
+                  <td className="py-0.5 pr-2">{r.angle.toFixed(2)}</td>
+                  <td className="py-0.5 pr-2">{r.maxLeftover.toFixed(3)}</td>
+                  <td className="py-0.5 pr-2">{r.meanLeftover.toFixed(3)}</td>
+                  <td className="py-0.5">{(r.uncutFraction * 100).toFixed(1)}%</td>
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        </div>
+      )}
+    </div>
+  )
+}
@@ -0,0 +1,62 @@
+"use client"
+
+import { VIOLATION_LABELS, type CheckReport } from "@/lib/toolpath-check"
+
+interface ToolpathCheckProps {
+  report: CheckReport
+  profileName: string
+  hasStock: boolean
+  seekFrame: (frame: number) => void
+}
+
+/**
+ * Toolpath check report
+ * Lists every move that leaves the machine travel, enters a keep-out box or
+ * runs into uncut material, with its line in the program
+ */
+export function ToolpathCheck({ report, profileName, hasStock, seekFrame }: ToolpathCheckProps) {
+  const ok = report.total === 0
+
+  return (
+    <div className="toolpath-check mt-4 p-4 bg-slate-100 dark:bg-slate-800 rounded-lg shadow-md">
+      <h3 className="text-sm font-semibold text-slate-700 dark:text-slate-300 mb-3">
+        Verificação do Percurso ({profileName})
+        <span className={`ml-2 font-medium ${ok ? "text-emerald-600 dark:text-emerald-400" : "text-red-600 dark:text-red-400"}`}>
+          {ok ? `${report.moves} movimentos sem violações` : `${report.total} violação(ões)`}
+        </span>
+        {!hasStock && <span className="ml-2 font-normal text-slate-500">(sem blank: só cursos e áreas proibidas)</span>}
+      </h3>
+
+      {report.violations.length > 0 && (
+        <div className="max-h-48 overflow-auto">
+          <table className="w-full text-xs text-slate-700 dark:text-slate-300">
+            <thead>
+              <tr className="text-left border-b border-slate-300 dark:border-slate-600">
+                <th className="py-1 pr-2">Linha</th>
+                <th className="py-1 pr-2">Tipo</th>
+                <th className="py-1">Descrição</th>
+              </tr>
+            </thead>
+            <tbody>
+              {report.violations.map((v, i) => (
+                <tr
+                  key={i}
+                  className="cursor-pointer hover:bg-slate-200 dark:hover:bg-slate-700 text-red-700 dark:text-red-400"
+                  onClick={() => seekFrame(v.move)}
+                  title="Ir para o movimento"
+                >
+                  <td className="py-0.5 pr-2">{v.line}</td>
+                  <td className="py-0.5 pr-2 whitespace-nowrap">{VIOLATION_LABELS[v.kind]}</td>
+                  <td className="py-0.5">{v.message}</td>
+                </tr>
+              ))}
+            </tbody>
+          </table>
+          {report.total > report.violations.length && (
+            <p className="mt-1 text-xs text-slate-500">… mais {report.total - report.violations.length} não listadas</p>
+          )}
+        </div>
+      )}
+    </div>
+  )
+}
@@ -1,32 +1,139 @@
 "use client"
 
-import { createContext, useContext, useState, type ReactNode } from "react"
+import { createContext, useCallback, useContext, useEffect, useMemo, useState, type ReactNode } from "react"
 import type { SimulationFrame } from "@/types/simulation"
+import type { GCodeProgram } from "@/lib/gcode-program"
+import type { MachiningParams } from "@/lib/gcode-generator"
+import type { GCodeJobResult } from "@/lib/gcode-jobs"
+import type { NotchLeftover } from "@/lib/stock-model"
+import { GCodeJobCancelledError, getGCodeWorker } from "@/lib/gcode-worker-client"
+import {
+  checkToolpath,
+  DEFAULT_MACHINE_PROFILE,
+  parseMachineProfile,
+  stockCylinderFromParams,
+  type CheckReport,
+  type MachineProfile,
+} from "@/lib/toolpath-check"
+import { POST_PROFILES, type PostProfile } from "@/lib/post-processor"
+
+// Perfil da máquina e pós-processador guardados entre sessões
+const MACHINE_PROFILE_KEY = "entalhe-cnc-cam.machineProfile"
+const POST_PROFILE_KEY = "entalhe-cnc-cam.postProfile"
 
 interface SimulationContextType {
-  gCode: string[] | null
+  gCode: readonly string[] | null
   setGCode: (code: string[]) => void
+  program: GCodeProgram | null
+  machiningParams: MachiningParams | null // parâmetros que geraram o programa (modelo do material)
+  stockReport: NotchLeftover[] | null // sobra por entalhe com o programa completo
+  setJobResult: (result: GCodeJobResult, params: MachiningParams | null) => void
   simulationFrames: SimulationFrame[] | null
   setSimulationFrames: (frames: SimulationFrame[]) => void
+  machineProfile: MachineProfile
+  setMachineProfile: (profile: MachineProfile) => void
+  toolpathCheck: CheckReport | null // verificação do programa atual contra o perfil da máquina
+  postProfileName: string // "neutral" ou uma chave de POST_PROFILES
+  setPostProfileName: (name: string) => void
+  postProfile: PostProfile | null // aplicado só ao gravar; null grava o programa neutro
 }
 
 /**
  * Context for sharing simulation state across components
- * Provides access to G-code and simulation frames
+ * Provides access to G-code, its parsed program and simulation frames
+ *
+ * The G-code is parsed once, when it is set; `gCode` is the source of the
+ * current program. Generation and parsing run on the background worker
+ * (see lib/gcode-worker-client), which hands back the parsed program.
+ * Each program is checked against the machine profile (see
+ * lib/toolpath-check) as soon as it is set. The simulation and the check
+ * always use the neutral program; the post profile (see lib/post-processor)
+ * is only applied when the program is saved.
  */
 const SimulationContext = createContext<SimulationContextType | undefined>(undefined)
 
 export function SimulationProvider({ children }: { children: ReactNode }) {
-  const [gCode, setGCode] = useState<string[] | null>(null)
+  const [program, setProgram] = useState<GCodeProgram | null>(null)
   const [simulationFrames, setSimulationFrames] = useState<SimulationFrame[] | null>(null)
+  const [machiningParams, setMachiningParams] = useState<MachiningParams | null>(null)
+  const [stockReport, setStockReport] = useState<NotchLeftover[] | null>(null)
+  const [machineProfile, setProfileState] = useState<MachineProfile>(DEFAULT_MACHINE_PROFILE)
+  const [postProfileName, setPostProfileState] = useState("neutral")
+
+  // O perfil salvo só existe no navegador: lido após a montagem
+  useEffect(() => {
+    try {
+      const saved = window.localStorage.getItem(MACHINE_PROFILE_KEY)
+      if (saved) setProfileState(parseMachineProfile(JSON.parse(saved)))
+      const post = window.localStorage.getItem(POST_PROFILE_KEY)
+      if (post && post in POST_PROFILES) setPostProfileState(post)
+    } catch (error) {
+      console.error("Perfil da máquina inválido:", error)
+    }
+  }, [])
+
+  const setMachineProfile = useCallback((profile: MachineProfile) => {
+    setProfileState(profile)
+    try {
+      window.localStorage.setItem(MACHINE_PROFILE_KEY, JSON.stringify(profile))
+    } catch (error) {
+      console.error("Erro ao salvar o perfil da máquina:", error)
+    }
+  }, [])
+
+  const setPostProfileName = useCallback((name: string) => {
+    setPostProfileState(name)
+    try {
+      window.localStorage.setItem(POST_PROFILE_KEY, name)
+    } catch (error) {
+      console.error("Erro ao salvar o pós-processador:", error)
+    }
+  }, [])
+
+  const postProfile = POST_PROFILES[postProfileName] ?? null
+
+  // Sem os parâmetros (programa importado) não há blank: só cursos e áreas proibidas
+  const toolpathCheck = useMemo(
+    () => (program ? checkToolpath(program, machineProfile, machiningParams ? stockCylinderFromParams(machiningParams) : null) : null),
+    [program, machineProfile, machiningParams],
+  )
+
+  const setJobResult = useCallback((result: GCodeJobResult, params: MachiningParams | null) => {
+    setProgram(result.program)
+    setStockReport(result.stockReport)
+    setMachiningParams(params)
+  }, [])
+
+  // Código vindo de fora do gerador é analisado no worker, uma única vez
+  const setGCode = useCallback(
+    (code: string[]) => {
+      getGCodeWorker()
+        .run({ kind: "parse", lines: code })
+        .then((result) => setJobResult(result, null))
+        .catch((error) => {
+          if (!(error instanceof GCodeJobCancelledError)) console.error("Erro ao analisar código G:", error)
+        })
+    },
+    [setJobResult],
+  )
 
   return (
     <SimulationContext.Provider
       value={{
-        gCode,
+        gCode: program ? program.source : null,
         setGCode,
+        program,
+        machiningParams,
+        stockReport,
+        setJobResult,
         simulationFrames,
         setSimulationFrames,
+        machineProfile,
+        setMachineProfile,
+        toolpathCheck,
+        postProfileName,
+        setPostProfileName,
+        postProfile,
       }}
     >
       {children}
@@ -0,0 +1,11 @@
+"""
+Motor de código G do ENTALHE CNC CAM sem interface gráfica
+
+Porta em Python do gerador da interface (lib/gcode-generator.ts), para
+geração em lote a partir da linha de comando: python -m entalhe batch ...
+"""
+
+from .generator import generate_gcode, iter_gcode
+from .params import MachiningParams
+
+__all__ = ["MachiningParams", "generate_gcode", "iter_gcode"]
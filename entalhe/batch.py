@@ -0,0 +1,141 @@
+"""
+Geração em lote: lê uma lista de trabalhos (CSV ou JSON) e grava um .nc por trabalho
+"""
+
+import csv
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from .generator import iter_gcode
+from .params import MachiningParams
+from .post import post_process
+
+# Colunas que definem o nome do arquivo de saída (não são parâmetros)
+NAME_KEYS = ("nome", "arquivo", "name", "filename")
+
+
+def load_jobs(path):
+    """Lê os trabalhos de um arquivo .csv ou .json
+
+    O CSV usa a primeira linha como cabeçalho, com os nomes dos parâmetros
+    (pontoInicioZ, profundidadeFinal, ...); aceita ',' ou ';' como separador.
+    O JSON pode ser uma lista de objetos ou um objeto com a chave "jobs".
+    """
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get("jobs", [data])
+        return [dict(job) for job in data]
+
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        return [dict(row) for row in csv.DictReader(f, dialect=dialect)]
+
+
+def job_filename(job, index):
+    """Nome do arquivo .nc de um trabalho (coluna nome/arquivo ou job_0001.nc)"""
+    for key in NAME_KEYS:
+        name = job.get(key)
+        if name and str(name).strip():
+            name = re.sub(r'[<>:"/\\|?*]', "_", str(name).strip())
+            return name if name.lower().endswith(".nc") else name + ".nc"
+    return f"job_{index + 1:04d}.nc"
+
+
+def iter_chunks(lines, chunk_size=256 * 1024):
+    """Agrupa as linhas em blocos de texto de ~chunk_size caracteres
+
+    A concatenação dos blocos é exatamente "\\n".join(lines), sem montar
+    essa string inteira (equivalente a chunkGCode).
+    """
+    buffer = []
+    size = 0
+    first = True
+    for line in lines:
+        buffer.append(line)
+        size += len(line) + 1
+        if size >= chunk_size:
+            yield ("" if first else "\n") + "\n".join(buffer)
+            first = False
+            buffer = []
+            size = 0
+    if buffer:
+        yield ("" if first else "\n") + "\n".join(buffer)
+
+
+def write_gcode(path, lines):
+    """Grava as linhas em blocos, no mesmo formato do botão Salvar da interface
+
+    Retorna o número de linhas gravadas.
+    """
+    count = 0
+
+    def counted():
+        nonlocal count
+        for line in lines:
+            count += 1
+            yield line
+
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for chunk in iter_chunks(counted()):
+            f.write(chunk)
+    return count
+
+
+def run_job(job, output_path, dialect="standard", optimize=False, post=None):
+    """Gera e grava um trabalho; retorna (caminho, número de linhas)
+
+    Com um PostProfile em post, o programa passa pelo pós-processador da
+    máquina a caminho do arquivo.
+    """
+    params = MachiningParams.from_dict({k: v for k, v in job.items() if k not in NAME_KEYS})
+    params.validate()
+    return output_path, write_gcode(output_path, post_process(iter_gcode(params, dialect, optimize=optimize), post))
+
+
+def job_error(error):
+    """Mensagem de erro de um trabalho; falhas inesperadas levam o tipo da exceção"""
+    if isinstance(error, (ValueError, OSError)):
+        return str(error)
+    return f"{type(error).__name__}: {error}"
+
+
+def run_batch(jobs, output_dir, workers=None, dialect="standard", optimize=False, post=None):
+    """Gera todos os trabalhos, em paralelo quando workers != 1
+
+    Cada processo gera e grava o próprio arquivo, então só o caminho e a
+    contagem de linhas voltam ao processo principal. Retorna uma lista de
+    (caminho, número de linhas ou None, mensagem de erro ou None) na
+    ordem dos trabalhos.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    targets = [os.path.join(output_dir, job_filename(job, i)) for i, job in enumerate(jobs)]
+
+    results = []
+    if workers == 1 or len(jobs) <= 1:
+        for job, target in zip(jobs, targets):
+            try:
+                _, count = run_job(job, target, dialect, optimize, post)
+                results.append((target, count, None))
+            except Exception as e:  # uma falha não interrompe os demais trabalhos
+                results.append((target, None, job_error(e)))
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_job, job, target, dialect, optimize, post)
+                   for job, target in zip(jobs, targets)]
+        for future, target in zip(futures, targets):
+            try:
+                _, count = future.result()
+                results.append((target, count, None))
+            except Exception as e:  # uma falha não interrompe os demais trabalhos
+                results.append((target, None, job_error(e)))
+    return results
@@ -0,0 +1,457 @@
+"""
+Verificação do percurso: cursos da máquina, áreas proibidas e colisão com o material
+(porta de lib/toolpath-check.ts)
+
+Cada movimento do programa é verificado uma única vez, na ordem:
+
+- travel: ponto final de cada eixo dentro do curso da máquina;
+- keep-out: a reta do movimento (ponta aumentada de meia largura da
+  ferramenta) contra cada área proibida da fixação;
+- plunge-in-stock: G1 que começa dentro de material não cortado;
+- rapid-in-stock: G0 que atravessa material não cortado (é assim que aparece
+  um recuo pontoRecuoY que não libera o cone de uma chaveta cônica);
+- rotate-in-stock: giro de A com a ferramenta abaixo do topo do material e
+  ao alcance do blank.
+
+O perfil da máquina é o mesmo JSON da interface:
+{"name": ..., "travel": {"x": {"min": ..., "max": ...}, ..., "a": null},
+ "keepOut": [{"name": ..., "min": [x, y, z], "max": [x, y, z]}]}
+"""
+
+import json
+import math
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+from .batch import NAME_KEYS, job_error, job_filename
+from .generator import iter_gcode
+from .params import MachiningParams
+from .program import MOTION_FEED, parse_program, parse_program_text
+
+# Face da peça (Z0), topo do material: um plano de retração abaixo dela é
+# movimento dentro do material, não um topo mais baixo
+STOCK_FACE_Z = 0.0
+# Distâncias (mm) abaixo desta nunca contam como violação
+CHECK_TOLERANCE = 0.01
+# Violações guardadas no relatório (o total é sempre contado)
+MAX_REPORTED_VIOLATIONS = 500
+
+# Acima destes limites de bordas distintas o envelope usa uma grade uniforme
+MAX_X_EDGES = 256
+MAX_Z_EDGES = 64
+UNIFORM_X_BINS = 64
+UNIFORM_Z_ROWS = 16
+
+VIOLATION_KINDS = ("travel", "keep-out", "plunge-in-stock", "rapid-in-stock", "rotate-in-stock")
+
+VIOLATION_LABELS = {
+    "travel": "Curso",
+    "keep-out": "Área proibida",
+    "plunge-in-stock": "G1 no material",
+    "rapid-in-stock": "G0 no material",
+    "rotate-in-stock": "Giro no material",
+}
+
+
+@dataclass
+class KeepOutBox:
+    """Região da fixação em que a ferramenta nunca pode entrar (coordenadas da máquina)"""
+    name: str
+    min: Tuple[float, float, float]
+    max: Tuple[float, float, float]
+
+
+@dataclass
+class MachineProfile:
+    """Cursos dos eixos (None: sem limite) e áreas proibidas"""
+    name: str = "Padrão"
+    travel: dict = field(default_factory=lambda: {
+        "x": (-300.0, 300.0),
+        "y": (-50.0, 300.0),
+        "z": (-200.0, 150.0),
+        "a": None,
+    })
+    keepOut: List[KeepOutBox] = field(default_factory=list)
+
+
+@dataclass
+class StockCylinder:
+    """Blank visto pela ferramenta (mesma geometria do modelo de material)"""
+    radius: float  # raio da superfície cortada (furo ou diâmetro externo)
+    internal: bool  # True: material fora do raio
+    zTop: float  # topo do material
+    toolWidth: float  # largura da aresta da ferramenta
+
+
+@dataclass
+class Violation:
+    move: int  # índice do movimento no programa
+    line: int  # número da linha no código G (a partir de 1)
+    kind: str
+    message: str
+
+
+@dataclass
+class CheckReport:
+    violations: List[Violation]
+    total: int
+    counts: dict
+    moves: int
+
+
+def stock_cylinder_from_params(params):
+    """Blank de um trabalho (equivalente a stockCylinderFromParams)"""
+    return StockCylinder(
+        radius=params.diametroInicial / 2,
+        internal=params.diametroInicial < params.diametroFinal,
+        zTop=STOCK_FACE_Z,
+        toolWidth=params.diametroFerramenta,
+    )
+
+
+def parse_machine_profile(data):
+    """Valida um perfil lido de JSON; ValueError se um campo for inválido"""
+    data = data or {}
+    travel = data.get("travel") or {}
+
+    def axis_range(axis):
+        value = travel.get(axis)
+        if value is None:
+            return None
+        try:
+            lo, hi = float(value["min"]), float(value["max"])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Curso inválido no eixo {axis.upper()}") from None
+        if not (math.isfinite(lo) and math.isfinite(hi)) or lo > hi:
+            raise ValueError(f"Curso inválido no eixo {axis.upper()}")
+        return (lo, hi)
+
+    def point(value, what):
+        try:
+            p = [float(v) for v in value]
+        except (TypeError, ValueError):
+            p = []
+        if len(p) != 3 or not all(math.isfinite(v) for v in p):
+            raise ValueError(f"Área proibida com {what} inválido")
+        return p
+
+    boxes = []
+    for i, item in enumerate(data.get("keepOut") or []):
+        item = item or {}
+        lo = point(item.get("min"), "canto mínimo")
+        hi = point(item.get("max"), "canto máximo")
+        boxes.append(KeepOutBox(
+            name=item.get("name") or f"Área {i + 1}",
+            min=tuple(min(p, q) for p, q in zip(lo, hi)),
+            max=tuple(max(p, q) for p, q in zip(lo, hi)),
+        ))
+
+    return MachineProfile(
+        name=data.get("name") if isinstance(data.get("name"), str) else MachineProfile.name,
+        travel={axis: axis_range(axis) for axis in ("x", "y", "z", "a")},
+        keepOut=boxes,
+    )
+
+
+def load_profile(path):
+    """Lê um perfil de máquina de um arquivo JSON"""
+    with open(path, encoding="utf-8") as f:
+        return parse_machine_profile(json.load(f))
+
+
+def _exact_edges(values, limit):
+    # Bordas ordenadas e distintas (com sentinelas infinitas); None acima do limite
+    edges = sorted({round(v, 6) for v in values})
+    if len(edges) > limit:
+        return None
+    return [-math.inf] + edges + [math.inf]
+
+
+def _uniform_edges(lo, hi, cells):
+    return [-math.inf] + [lo + (hi - lo) * k / cells for k in range(cells + 1)] + [math.inf]
+
+
+def _cell_at(edges, v):
+    # Primeira célula cuja borda superior passa de v
+    return min(max(bisect_right(edges, v) - 1, 0), len(edges) - 2)
+
+
+class ClearedEnvelope:
+    """Profundidade já cortada em torno de cada entalhe
+
+    Para cada posição A uma grade de faixas X × linhas Z guarda o nível mais
+    profundo cortado d (d = Y em cortes internos, -Y em externos). A
+    ferramenta é um prisma acima da ponta, então um G1 que chega a Z corta a
+    sua faixa X em todas as linhas acima de Z. As bordas são as bordas das
+    faixas X e as pontas em Z dos G1, o que torna a grade exata para os
+    programas gerados; programas importados longos usam uma grade uniforme, em
+    que células cortadas só em parte contam como não cortadas.
+    """
+
+    def __init__(self, program, stock):
+        half = stock.toolWidth / 2
+        xs = []
+        zs = [stock.zTop]
+        px = pz = 0.0
+        for i in range(len(program)):
+            x = program.x[i]
+            z = program.z[i]
+            if program.motion[i] == MOTION_FEED and min(pz, z) < stock.zTop:
+                xs.append(min(px, x) - half)
+                xs.append(max(px, x) + half)
+                if z < stock.zTop:
+                    zs.append(z)
+                if pz < stock.zTop:
+                    zs.append(pz)
+            px = x
+            pz = z
+
+        self.x_edges = _exact_edges(xs, MAX_X_EDGES)
+        if self.x_edges is None:
+            self.x_edges = _uniform_edges(min(program.x) - half, max(program.x) + half, UNIFORM_X_BINS)
+        self.z_edges = _exact_edges(zs, MAX_Z_EDGES)
+        if self.z_edges is None:
+            self.z_edges = _uniform_edges(min(min(program.z), stock.zTop), stock.zTop, UNIFORM_Z_ROWS)
+        self.bins = len(self.x_edges) - 1
+        self.rows = len(self.z_edges) - 1
+        self._grids = {}
+        self._empty = array("d", [-math.inf]) * (self.bins * self.rows)
+
+    def grid(self, a, create):
+        """Grade de um entalhe; uma grade não cortada comum até o primeiro corte ali"""
+        key = round(a * 1000) % 360000
+        grid = self._grids.get(key)
+        if grid is None:
+            if not create:
+                return self._empty
+            grid = array("d", self._empty)
+            self._grids[key] = grid
+        return grid
+
+
+def _clip_below(z0, z1, z_limit):
+    # Trecho (parâmetros t) do movimento com a ponta abaixo de z_limit
+    if z0 <= z_limit and z1 <= z_limit:
+        return 0.0, 1.0
+    if z0 > z_limit and z1 > z_limit:
+        return None
+    t = (z_limit - z0) / (z1 - z0)
+    return (0.0, t) if z0 <= z_limit else (t, 1.0)
+
+
+def _clear(env, stock, grid, x0, y0, z0, x1, y1, z1):
+    # Marca como cortado o que um G1 varre: em cada linha do envelope, o nível
+    # mais profundo que a ponta atinge abaixo da base da linha
+    half = stock.toolWidth / 2
+    s = 1 if stock.internal else -1
+    x_edges, z_edges, bins = env.x_edges, env.z_edges, env.bins
+    eps = 1e-6
+    reta = abs(x1 - x0) < eps
+
+    for row in range(_cell_at(z_edges, min(z0, z1) - eps), env.rows):
+        clip = _clip_below(z0, z1, z_edges[row] + eps)
+        if clip is None:
+            continue
+        xa = x0 + (x1 - x0) * clip[0]
+        xb = x0 + (x1 - x0) * clip[1]
+        da = s * (y0 + (y1 - y0) * clip[0])
+        db = s * (y0 + (y1 - y0) * clip[1])
+        # Com X constante a faixa inteira chega ao nível mais profundo; andando em X
+        # só o nível menos profundo é garantido em todo o trecho
+        d = max(da, db) if reta else min(da, db)
+        lo = min(xa, xb) - half - eps
+        hi = max(xa, xb) + half + eps
+        bin_ = _cell_at(x_edges, lo)
+        while bin_ < bins and x_edges[bin_ + 1] <= hi:
+            if x_edges[bin_] >= lo:
+                k = row * bins + bin_
+                if d > grid[k]:
+                    grid[k] = d
+            bin_ += 1
+
+
+def _has_material(stock, lo, hi, y_low, y_high):
+    # A seção da ferramenta (faixa lo..hi em X, ponta entre y_low e y_high) toca o blank?
+    # Interno: a ferramenta ocupa 0 <= y' <= ponta e o material fica fora do raio;
+    # externo: ocupa y' >= ponta e o material fica dentro do raio
+    r0 = stock.radius
+    if stock.internal:
+        far = max(abs(lo), abs(hi))
+        return math.hypot(far, max(y_high, 0.0)) > r0 + CHECK_TOLERANCE
+    near = 0.0 if lo <= 0 <= hi else min(abs(lo), abs(hi))
+    return math.hypot(near, max(y_low, 0.0)) < r0 - CHECK_TOLERANCE
+
+
+def _probe(env, stock, grid, x0, y0, z0, x1, y1, z1):
+    # A ferramenta, entre dois pontos do mesmo entalhe, encontra material não cortado?
+    tol = CHECK_TOLERANCE
+    half = stock.toolWidth / 2
+    s = 1 if stock.internal else -1
+    x_edges, z_edges, bins = env.x_edges, env.z_edges, env.bins
+
+    for row in range(_cell_at(z_edges, min(z0, z1) + tol), env.rows):
+        if z_edges[row] >= stock.zTop - tol:
+            break
+        # Parte do movimento em que a ponta está abaixo do topo desta linha
+        clip = _clip_below(z0, z1, z_edges[row + 1] - tol)
+        if clip is None:
+            continue
+        xa = x0 + (x1 - x0) * clip[0]
+        xb = x0 + (x1 - x0) * clip[1]
+        ya = y0 + (y1 - y0) * clip[0]
+        yb = y0 + (y1 - y0) * clip[1]
+        d = max(s * ya, s * yb)
+        lo = min(xa, xb) - half + tol
+        hi = max(xa, xb) + half - tol
+        if lo >= hi:
+            continue
+
+        bin_ = _cell_at(x_edges, lo)
+        while bin_ < bins and x_edges[bin_] < hi:
+            # Só conta se há material entre o nível já cortado e a ponta
+            if d > grid[row * bins + bin_] + tol and _has_material(
+                    stock, max(x_edges[bin_], lo), min(x_edges[bin_ + 1], hi), min(ya, yb), max(ya, yb)):
+                return True
+            bin_ += 1
+    return False
+
+
+def _segment_hits_box(p0, p1, box, grow):
+    # Interseção da reta p0→p1 com a caixa aumentada de "grow" (teste das faixas)
+    t0, t1 = 0.0, 1.0
+    for k in range(3):
+        lo = box.min[k] - grow
+        hi = box.max[k] + grow
+        delta = p1[k] - p0[k]
+        if abs(delta) < 1e-12:
+            if p0[k] <= lo or p0[k] >= hi:
+                return False
+            continue
+        ta = (lo - p0[k]) / delta
+        tb = (hi - p0[k]) / delta
+        if ta > tb:
+            ta, tb = tb, ta
+        t0 = max(t0, ta)
+        t1 = min(t1, tb)
+        if t0 >= t1:
+            return False
+    return True
+
+
+def _num(v):
+    # Número como no JavaScript Number(v.toFixed(3)): sem zeros à direita
+    text = f"{v:.3f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def check_program(program, profile, stock=None):
+    """Verifica um programa contra o perfil da máquina e o blank
+
+    Sem blank (programas importados) só os cursos e as áreas proibidas são
+    verificados. Retorna um CheckReport com o índice do movimento e o número
+    da linha de cada violação.
+    """
+    tol = CHECK_TOLERANCE
+    counts = dict.fromkeys(VIOLATION_KINDS, 0)
+    violations = []
+    total = 0
+
+    def add(move, kind, message):
+        nonlocal total
+        total += 1
+        counts[kind] += 1
+        if len(violations) < MAX_REPORTED_VIOLATIONS:
+            violations.append(Violation(move, program.line[move] + 1, kind, message))
+
+    limits = [(axis.upper(), profile.travel.get(axis), getattr(program, axis)) for axis in ("x", "y", "z", "a")]
+    limits = [item for item in limits if item[1] is not None]
+    half = stock.toolWidth / 2 if stock else 0.0
+    env = ClearedEnvelope(program, stock) if stock else None
+
+    px = py = pz = pa = 0.0
+    for i in range(len(program)):
+        x = program.x[i]
+        y = program.y[i]
+        z = program.z[i]
+        a = program.a[i]
+
+        # Curso: basta o ponto final (o movimento é uma reta entre pontos já verificados)
+        fora = [f"{axis}{_num(column[i])} (curso {_num(lo)} a {_num(hi)})"
+                for axis, (lo, hi), column in limits
+                if column[i] < lo - tol or column[i] > hi + tol]
+        if fora:
+            add(i, "travel", "Fora do curso: " + ", ".join(fora))
+
+        for box in profile.keepOut:
+            if _segment_hits_box((px, py, pz), (x, y, z), box, half):
+                add(i, "keep-out", f'Entra na área proibida "{box.name}"')
+
+        if env is not None:
+            abaixo = min(pz, z) < stock.zTop - tol
+            if a != pa:
+                if abaixo and _has_material(stock, min(px, x) - half + tol, max(px, x) + half - tol,
+                                            min(py, y), max(py, y)):
+                    add(i, "rotate-in-stock", f"Giro de A{_num(pa)} para A{_num(a)} com a ferramenta "
+                                              f"dentro da peça (Z{_num(min(pz, z))})")
+            elif program.motion[i] == MOTION_FEED:
+                if pz < stock.zTop - tol and _probe(env, stock, env.grid(a, False), px, py, pz, px, py, pz):
+                    add(i, "plunge-in-stock", f"G1 começa dentro do material (X{_num(px)} Y{_num(py)} Z{_num(pz)})")
+            elif abaixo and _probe(env, stock, env.grid(a, False), px, py, pz, x, y, z):
+                add(i, "rapid-in-stock", f"G0 atravessa material não cortado (Y{_num(py)} → Y{_num(y)}, "
+                                         f"Z{_num(pz)} → Z{_num(z)})")
+
+            if program.motion[i] == MOTION_FEED and min(pz, z) < stock.zTop:
+                _clear(env, stock, env.grid(a, True), px, py, pz, x, y, z)
+
+        px, py, pz, pa = x, y, z, a
+
+    return CheckReport(violations, total, counts, len(program))
+
+
+def check_job(job, profile, dialect="standard", optimize=False):
+    """Gera um trabalho e verifica o programa; retorna o CheckReport"""
+    params = MachiningParams.from_dict({k: v for k, v in job.items() if k not in NAME_KEYS})
+    params.validate()
+    program = parse_program(iter_gcode(params, dialect, optimize=optimize))
+    return check_program(program, profile, stock_cylinder_from_params(params))
+
+
+def check_file(path, profile):
+    """Verifica um programa já gravado (sem blank: só cursos e áreas proibidas)
+
+    O texto é analisado como na interface (parseGCodeText), com o estado
+    modal completo: G91, G20, arcos G2/G3 e linhas G28/G53 que não movem.
+    """
+    with open(path, encoding="utf-8-sig", errors="replace", newline="") as f:
+        program = parse_program_text(f.read())
+    return check_program(program, profile)
+
+
+def check_batch(jobs, profile, workers=None, dialect="standard", optimize=False):
+    """Verifica todos os trabalhos, em paralelo quando workers != 1
+
+    Retorna uma lista de (nome, CheckReport ou None, mensagem de erro ou
+    None) na ordem dos trabalhos.
+    """
+    names = [job_filename(job, i) for i, job in enumerate(jobs)]
+
+    results = []
+    if workers == 1 or len(jobs) <= 1:
+        for job, name in zip(jobs, names):
+            try:
+                results.append((name, check_job(job, profile, dialect, optimize), None))
+            except Exception as e:  # uma falha não interrompe os demais trabalhos
+                results.append((name, None, job_error(e)))
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(check_job, job, profile, dialect, optimize) for job in jobs]
+        for future, name in zip(futures, names):
+            try:
+                results.append((name, future.result(), None))
+            except Exception as e:  # uma falha não interrompe os demais trabalhos
+                results.append((name, None, job_error(e)))
+    return results
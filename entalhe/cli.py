@@ -0,0 +1,324 @@
+"""
+Linha de comando do motor de código G
+
+Uso:
+    python -m entalhe batch trabalhos.csv -o saida/ [-j 4] [--dialect fanuc] [--optimize] [--post siemens]
+    python -m entalhe plan trabalhos.csv [--rapid-rate 5000] [--rotary-rate 3600] [--dialect fanuc]
+                                     [--compare-orders]
+    python -m entalhe sweep trabalho.json [--ap 0.2:2:0.05] [--stepover 0.2:0.9:0.05] [--feed 50:600:10]
+                                      [--rpm 3000] [--flutes 2] [--max-chip-load 0.05] [-j 4]
+    python -m entalhe check trabalhos.csv [programa.nc ...] [--profile maquina.json] [-j 4] [--dialect fanuc]
+    python -m entalhe job features.csv -o trabalho.nc [--clearance-z 100] [--rotary-order shortest] [--dialect fanuc]
+"""
+
+import argparse
+import sys
+import time
+
+from .batch import NAME_KEYS, job_filename, load_jobs, run_batch, write_gcode
+from .check import VIOLATION_KINDS, VIOLATION_LABELS, MachineProfile, check_batch, check_file, load_profile
+from .feature_job import compare_feature_job, compute_feature_stations, iter_job_gcode, load_features
+from .generator import DIALECTS
+from .params import PASS_ORDERS, ROTARY_ORDERS, MachiningParams
+from .planner import DEFAULT_RAPID_RATE, DEFAULT_ROTARY_RATE, compare_pass_orders, format_duration, plan_passes
+from .post import POST_PROFILES, load_post_profile, post_process
+from .sweep import MachineLimits, parse_range, sweep
+
+
+def cmd_batch(args):
+    """Gera um arquivo .nc para cada trabalho da lista"""
+    jobs = load_jobs(args.jobs)
+    if not jobs:
+        print(f"Nenhum trabalho encontrado em {args.jobs}")
+        return 1
+    try:
+        post = load_post_profile(args.post)
+    except OSError as e:
+        print(f"ERRO: pós-processador: {e}")
+        return 1
+    except ValueError as e:
+        print(f"ERRO: {e}")
+        return 1
+
+    t0 = time.perf_counter()
+    results = run_batch(jobs, args.output, workers=args.jobs_count, dialect=args.dialect,
+                        optimize=args.optimize, post=post)
+    elapsed = time.perf_counter() - t0
+
+    failures = 0
+    for path, count, error in results:
+        if error:
+            failures += 1
+            print(f"ERRO  {path}: {error}")
+        elif not args.quiet:
+            print(f"OK    {path} ({count} linhas)")
+
+    print(f"{len(results) - failures} de {len(results)} arquivos gerados em {elapsed:.2f} s")
+    return 1 if failures else 0
+
+
+def cmd_plan(args):
+    """Mostra a estimativa de cada trabalho sem gerar o código G"""
+    jobs = load_jobs(args.jobs)
+    if not jobs:
+        print(f"Nenhum trabalho encontrado em {args.jobs}")
+        return 1
+
+    failures = 0
+    if args.compare_orders:
+        # Movimento rápido (m) de cada ordem dos passes laterais e a mais rápida
+        print(f"{'trabalho':<24}" + "".join(f"{ordem:>14}" for ordem in PASS_ORDERS) + f"{'melhor':>14}")
+    else:
+        print(f"{'trabalho':<24}{'linhas':>10}{'G1':>8}{'passes X':>10}{'passes Y':>10}{'A graus':>10}{'tempo':>10}")
+    for i, job in enumerate(jobs):
+        name = job_filename(job, i)
+        try:
+            params = MachiningParams.from_dict({k: v for k, v in job.items() if k not in NAME_KEYS})
+            params.validate()
+            if args.compare_orders:
+                plans = compare_pass_orders(params, rapid_rate=args.rapid_rate, dialect=args.dialect,
+                                            rotary_rate=args.rotary_rate)
+            else:
+                plan = plan_passes(params, rapid_rate=args.rapid_rate, dialect=args.dialect,
+                                   rotary_rate=args.rotary_rate)
+        except ValueError as e:
+            failures += 1
+            print(f"{name:<24}ERRO: {e}")
+            continue
+        if args.compare_orders:
+            melhor = min(plans, key=lambda item: item[1].cycleTime)[0]
+            print(f"{name:<24}" + "".join(f"{p.rapidDistance / 1000:>12.2f} m" for _, p in plans) + f"{melhor:>14}")
+        else:
+            print(f"{name:<24}{plan.totalLines:>10}{plan.totalPlunges:>8}{len(plan.passosX):>10}"
+                  f"{len(plan.yLevels):>10}{plan.rotaryDistance:>10.0f}{format_duration(plan.cycleTime):>10}")
+    return 1 if failures else 0
+
+
+def cmd_sweep(args):
+    """Procura apY, passoLateral e avanço de menor tempo de ciclo para cada trabalho"""
+    jobs = load_jobs(args.jobs)
+    if not jobs:
+        print(f"Nenhum trabalho encontrado em {args.jobs}")
+        return 1
+
+    try:
+        ap_values = parse_range(args.ap)
+        stepover_values = parse_range(args.stepover)
+        feed_values = parse_range(args.feed)
+    except ValueError as e:
+        print(f"ERRO: {e}")
+        return 1
+    limits = MachineLimits(rpm=args.rpm, flutes=args.flutes, max_chip_load=args.max_chip_load,
+                           max_stepover=args.max_stepover, max_ap=args.max_ap,
+                           rapid_rate=args.rapid_rate, rotary_rate=args.rotary_rate)
+
+    failures = 0
+    for i, job in enumerate(jobs):
+        name = job_filename(job, i)
+        try:
+            params = MachiningParams.from_dict({k: v for k, v in job.items() if k not in NAME_KEYS})
+            params.validate()
+            atual = plan_passes(params, rapid_rate=args.rapid_rate, rotary_rate=args.rotary_rate)
+        except ValueError as e:
+            failures += 1
+            print(f"{name}: ERRO: {e}")
+            continue
+
+        t0 = time.perf_counter()
+        results, front = sweep(params, ap_values, stepover_values, feed_values, limits, workers=args.jobs_count)
+        elapsed = time.perf_counter() - t0
+        total = len(ap_values) * len(stepover_values) * len(feed_values)
+        print(f"{name}: {total} combinações, {len(results)} dentro dos limites, "
+              f"{len(front)} na fronteira ({elapsed:.2f} s); tempo atual {format_duration(atual.cycleTime)}")
+        if not front:
+            print("  nenhuma combinação respeita os limites da máquina")
+            continue
+        print(f"  {'apY':>8}{'passoLat':>10}{'avanco':>9}{'passes':>8}{'níveis':>8}{'passo %':>9}{'mm/dente':>10}{'tempo':>10}")
+        for r in front:
+            print(f"  {r.apY:>8.3f}{r.passoLateral:>10.3f}{r.avanco:>9.1f}{r.passes:>8}{r.levels:>8}"
+                  f"{r.stepover * 100:>8.0f}%{r.chipLoad:>10.4f}{format_duration(r.cycleTime):>10}")
+    return 1 if failures else 0
+
+
+def cmd_check(args):
+    """Verifica cursos, áreas proibidas e colisões de cada trabalho ou programa
+
+    Arquivos .csv/.json são listas de trabalhos (gerados e verificados com o
+    blank); os demais são programas já gravados (só cursos e áreas proibidas).
+    """
+    try:
+        profile = load_profile(args.profile) if args.profile else MachineProfile()
+    except (OSError, ValueError) as e:
+        print(f"ERRO: perfil da máquina: {e}")
+        return 1
+
+    t0 = time.perf_counter()
+    results = []
+    for path in args.inputs:
+        try:
+            if path.lower().endswith((".csv", ".json")):
+                jobs = load_jobs(path)
+                if not jobs:
+                    print(f"Nenhum trabalho encontrado em {path}")
+                results.extend(check_batch(jobs, profile, workers=args.jobs_count, dialect=args.dialect,
+                                           optimize=args.optimize))
+            else:
+                results.append((path, check_file(path, profile), None))
+        except (OSError, ValueError) as e:
+            results.append((path, None, str(e)))
+    elapsed = time.perf_counter() - t0
+
+    failures = 0
+    flagged = 0
+    for name, report, error in results:
+        if error:
+            failures += 1
+            print(f"ERRO  {name}: {error}")
+            continue
+        if not report.total:
+            if not args.quiet:
+                print(f"OK    {name} ({report.moves} movimentos)")
+            continue
+        flagged += 1
+        resumo = ", ".join(f"{VIOLATION_LABELS[kind]}: {report.counts[kind]}"
+                           for kind in VIOLATION_KINDS if report.counts[kind])
+        print(f"FALHA {name}: {report.total} violação(ões) ({resumo})")
+        for v in report.violations[:args.max_lines]:
+            print(f"      linha {v.line:>7}  {VIOLATION_LABELS[v.kind]:<16} {v.message}")
+        if report.total > args.max_lines:
+            print(f"      ... mais {report.total - args.max_lines}")
+
+    print(f"{len(results) - failures - flagged} de {len(results)} programas sem violações "
+          f"(perfil {profile.name}) em {elapsed:.2f} s")
+    return 1 if failures or flagged else 0
+
+
+def cmd_job(args):
+    """Grava as features de um arquivo em um único programa, com uma só varredura do eixo A"""
+    try:
+        features = load_features(load_jobs(args.features))
+        post = load_post_profile(args.post)
+        t0 = time.perf_counter()
+        count = write_gcode(args.output, post_process(
+            iter_job_gcode(features, args.dialect, rotary_order=args.rotary_order, clearance_z=args.clearance_z,
+                           optimize=args.optimize), post))
+        elapsed = time.perf_counter() - t0
+        combined, separate = compare_feature_job(features, args.rotary_order, args.clearance_z, args.optimize,
+                                                 rapid_rate=args.rapid_rate, rotary_rate=args.rotary_rate)
+    except (OSError, ValueError) as e:
+        print(f"ERRO: {e}")
+        return 1
+
+    stations = compute_feature_stations(features, args.rotary_order)
+    print(f"{args.output}: {len(features)} features, {len(stations)} posições A, {count} linhas ({elapsed:.2f} s)")
+    diferenca = (f"economia de {format_duration(separate - combined)}" if separate >= combined
+                 else f"{format_duration(combined - separate)} a mais: plano de troca alto demais?")
+    print(f"Tempo estimado: {format_duration(combined)} (um programa por feature: {format_duration(separate)}, "
+          f"{diferenca})")
+    return 0
+
+
+def add_dialect_argument(parser):
+    parser.add_argument("--dialect", choices=DIALECTS, default="standard",
+                        help="formato do programa: standard (expandido), fanuc (M98/O), "
+                             "haas (M97/N) ou siemens (REPEAT)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="entalhe",
+        description="Motor de código G do ENTALHE CNC CAM (sem interface gráfica)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    batch = subparsers.add_parser("batch", help="gera um .nc por trabalho de um arquivo CSV ou JSON")
+    batch.add_argument("jobs", help="arquivo .csv ou .json com os parâmetros de cada trabalho")
+    batch.add_argument("-o", "--output", default="saida_nc", help="pasta de saída (padrão: saida_nc)")
+    batch.add_argument("-j", "--jobs", dest="jobs_count", type=int, default=None,
+                       help="número de processos (padrão: um por núcleo; 1 = sem paralelismo)")
+    batch.add_argument("-q", "--quiet", action="store_true", help="mostra apenas erros e o resumo")
+    add_dialect_argument(batch)
+    batch.add_argument("--optimize", action="store_true",
+                       help="remove movimentos redundantes (rápidos combinados no plano seguro, F repetido)")
+    batch.add_argument("--post", default="neutral",
+                       help="pós-processador da máquina: neutral (padrão, saída do gerador), "
+                            f"{', '.join(POST_PROFILES)} ou um perfil em JSON")
+    batch.set_defaults(func=cmd_batch)
+
+    plan = subparsers.add_parser("plan", help="estima linhas, mergulhos e tempo de ciclo sem gerar o código")
+    plan.add_argument("jobs", help="arquivo .csv ou .json com os parâmetros de cada trabalho")
+    plan.add_argument("--rapid-rate", type=float, default=DEFAULT_RAPID_RATE,
+                      help=f"avanço rápido G0 em mm/min (padrão: {DEFAULT_RAPID_RATE})")
+    plan.add_argument("--rotary-rate", type=float, default=DEFAULT_ROTARY_RATE,
+                      help=f"rotação rápida do eixo A em graus/min (padrão: {DEFAULT_ROTARY_RATE})")
+    plan.add_argument("--compare-orders", action="store_true",
+                      help="mostra o movimento rápido de cada ordem dos passes laterais")
+    add_dialect_argument(plan)
+    plan.set_defaults(func=cmd_plan)
+
+    opt = subparsers.add_parser("sweep", help="procura apY, passo lateral e avanço de menor tempo de ciclo "
+                                              "(fronteira tempo x passo lateral)")
+    opt.add_argument("jobs", help="arquivo .csv ou .json com a peça de cada trabalho")
+    opt.add_argument("--ap", default="0.1:2:0.05", help="valores de apY em mm, inicio:fim:passo (padrão: 0.1:2:0.05)")
+    opt.add_argument("--stepover", default="0.2:0.9:0.05",
+                     help="passo lateral como fração do diâmetro da ferramenta (padrão: 0.2:0.9:0.05)")
+    opt.add_argument("--feed", default="50:600:10", help="avanços em mm/min (padrão: 50:600:10)")
+    opt.add_argument("--rpm", type=float, default=MachineLimits.rpm, help="rotação do fuso")
+    opt.add_argument("--flutes", type=int, default=MachineLimits.flutes, help="número de arestas da ferramenta")
+    opt.add_argument("--max-chip-load", type=float, default=MachineLimits.max_chip_load,
+                     help=f"avanço máximo por dente em mm (padrão: {MachineLimits.max_chip_load})")
+    opt.add_argument("--max-stepover", type=float, default=MachineLimits.max_stepover,
+                     help=f"passo lateral efetivo máximo, fração do diâmetro (padrão: {MachineLimits.max_stepover})")
+    opt.add_argument("--max-ap", type=float, default=None, help="material por passe máximo em mm")
+    opt.add_argument("--rapid-rate", type=float, default=DEFAULT_RAPID_RATE,
+                     help=f"avanço rápido G0 em mm/min (padrão: {DEFAULT_RAPID_RATE})")
+    opt.add_argument("--rotary-rate", type=float, default=DEFAULT_ROTARY_RATE,
+                     help=f"rotação rápida do eixo A em graus/min (padrão: {DEFAULT_ROTARY_RATE})")
+    opt.add_argument("-j", "--jobs", dest="jobs_count", type=int, default=None,
+                     help="número de processos (padrão: um por núcleo; 1 = sem paralelismo)")
+    opt.set_defaults(func=cmd_sweep)
+
+    check = subparsers.add_parser("check", help="verifica cursos da máquina, áreas proibidas e colisões "
+                                                "com o material, movimento a movimento")
+    check.add_argument("inputs", nargs="+",
+                       help="arquivos .csv/.json de trabalhos ou programas .nc já gravados")
+    check.add_argument("--profile", default=None,
+                       help="perfil da máquina em JSON (cursos e áreas proibidas; padrão: cursos amplos)")
+    check.add_argument("-j", "--jobs", dest="jobs_count", type=int, default=None,
+                       help="número de processos (padrão: um por núcleo; 1 = sem paralelismo)")
+    check.add_argument("-q", "--quiet", action="store_true", help="não lista os programas sem violações")
+    check.add_argument("--max-lines", type=int, default=20,
+                       help="violações listadas por programa (padrão: 20)")
+    add_dialect_argument(check)
+    check.add_argument("--optimize", action="store_true", help="verifica o programa otimizado")
+    check.set_defaults(func=cmd_check)
+
+    job = subparsers.add_parser("job", help="grava várias features (eixos ou rasgos) em um único programa, "
+                                            "com uma só varredura do eixo A")
+    job.add_argument("features", help="arquivo .csv ou .json com uma feature por linha (coluna nome: nome da feature)")
+    job.add_argument("-o", "--output", default="trabalho.nc", help="arquivo de saída (padrão: trabalho.nc)")
+    job.add_argument("--clearance-z", type=float, default=None,
+                     help="plano de troca entre features e de rotação do eixo A (padrão: maior pontoInicioZ; "
+                          "use um valor mais alto para peças em estações diferentes)")
+    job.add_argument("--rotary-order", choices=ROTARY_ORDERS, default="sequential",
+                     help="sequência das posições do eixo A do trabalho (padrão: sequential)")
+    job.add_argument("--rapid-rate", type=float, default=DEFAULT_RAPID_RATE,
+                     help=f"avanço rápido G0 em mm/min, para o tempo estimado (padrão: {DEFAULT_RAPID_RATE})")
+    job.add_argument("--rotary-rate", type=float, default=DEFAULT_ROTARY_RATE,
+                     help=f"rotação rápida do eixo A em graus/min, para o tempo estimado (padrão: {DEFAULT_ROTARY_RATE})")
+    add_dialect_argument(job)
+    job.add_argument("--optimize", action="store_true", help="remove movimentos redundantes (plano seguro: --clearance-z)")
+    job.add_argument("--post", default="neutral",
+                     help=f"pós-processador da máquina: neutral, {', '.join(POST_PROFILES)} ou um perfil em JSON")
+    job.set_defaults(func=cmd_job)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
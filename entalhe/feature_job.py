@@ -0,0 +1,245 @@
+"""
+Trabalho com várias features em uma única fixação do eixo A
+(porta de lib/feature-job.ts)
+
+Cada feature é um conjunto completo de parâmetros (seu próprio Z inicial e
+profundidade, diâmetros, número de entalhes e passes). O trabalho percorre
+uma única vez todas as posições A de todas as features: em cada posição corta
+as features que têm um entalhe ali, a mais próxima primeiro, passando de uma
+para outra pelo plano de troca. Em relação a um programa por feature, economiza
+os movimentos de segurança e o retorno da mesa entre os programas, e as
+posições A comuns a várias features são indexadas uma só vez. As features
+precisam usar a mesma ferramenta, então o trabalho nunca troca de ferramenta.
+
+O arquivo de features é o mesmo da geração em lote (CSV ou JSON), uma feature
+por linha; a coluna nome dá o nome de cada feature.
+"""
+
+import math
+import re
+from dataclasses import dataclass, replace
+
+from .batch import NAME_KEYS
+from .generator import (
+    DEFAULT_SUBPROGRAM_NUMBER, DIALECTS, compute_rotary_angles, iter_gcode, iter_notch_body, order_rotary_angles,
+)
+from .jsnum import js_number_str, js_to_fixed
+from .optimizer import optimize_lines
+from .params import MachiningParams
+from .planner import DEFAULT_RAPID_RATE, DEFAULT_ROTARY_RATE
+from .program import MOTION_FEED, parse_program
+
+AXIS_WORD = re.compile(r"([XYZ])([-+]?\d*\.?\d+)", re.IGNORECASE)
+COMMENT = re.compile(r"\s*(\(.*\)|;.*)$")
+
+
+@dataclass
+class JobFeature:
+    """Uma feature do trabalho (ordemRotacao é ignorada: vale a sequência do trabalho)"""
+    name: str
+    params: MachiningParams
+
+
+@dataclass
+class FeatureStation:
+    """Uma posição A do trabalho e as features cortadas nela"""
+    angle: float
+    features: list
+
+
+def siemens_labels(k):
+    """Rótulos da seção de cada feature no formato Siemens"""
+    return f"ENTALHE{k + 1}_INI", f"ENTALHE{k + 1}_FIM"
+
+
+def feature_comment(name, dialect):
+    """Nome da feature como comentário (sem parênteses nem ";")"""
+    text = re.sub(r"[();]", "", name).strip()
+    return f"; {text}" if dialect == "siemens" else f"({text})"
+
+
+def body_ends(body, params):
+    """Onde o corte de um entalhe começa (X/Y depois do Z inicial) e termina"""
+    pos = {"X": 0.0, "Y": params.diametroInicial / 2, "Z": params.pontoInicioZ}
+    for line in body:
+        for letter, value in AXIS_WORD.findall(COMMENT.sub("", line)):
+            pos[letter.upper()] = float(value)
+    return (0.0, params.diametroInicial / 2), (pos["X"], pos["Y"], pos["Z"])
+
+
+def load_features(jobs):
+    """Features a partir das linhas de um arquivo de trabalhos (load_jobs), já validadas"""
+    features = []
+    for i, job in enumerate(jobs):
+        name = next((str(job[key]).strip() for key in NAME_KEYS if job.get(key) and str(job[key]).strip()),
+                    f"Feature {i + 1}")
+        params = MachiningParams.from_dict({k: v for k, v in job.items() if k not in NAME_KEYS})
+        try:
+            params.validate()
+        except ValueError as e:
+            raise ValueError(f'Feature "{name}": {e}') from None
+        features.append(JobFeature(name, params))
+    return features
+
+
+def validate_feature_job(features, clearance_z=None):
+    """Confere que as features cabem em um programa; retorna o plano de troca Z"""
+    if not features:
+        raise ValueError("O trabalho não tem nenhuma feature")
+
+    ferramenta = features[0].params.diametroFerramenta
+    for feature in features:
+        if not feature.params.numEntalhes > 0:
+            raise ValueError(f'Feature "{feature.name}": o número de entalhes deve ser maior que zero')
+        if feature.params.diametroFerramenta != ferramenta:
+            raise ValueError(f"Todas as features devem usar a mesma ferramenta (Ø{js_number_str(ferramenta)} mm); "
+                             f'"{feature.name}" usa Ø{js_number_str(feature.params.diametroFerramenta)} mm')
+
+    maior_inicio = max(f.params.pontoInicioZ for f in features)
+    if clearance_z is None:
+        clearance_z = maior_inicio
+    if not math.isfinite(clearance_z) or clearance_z < maior_inicio:
+        raise ValueError("O plano de troca Z deve ser maior ou igual ao maior ponto de início Z "
+                         f"({js_number_str(maior_inicio)})")
+    return clearance_z
+
+
+def compute_feature_stations(features, ordem="sequential"):
+    """Entalhes de todas as features agrupados por posição A, na ordem de corte
+
+    As posições são comparadas como escritas no programa (2 casas), então o
+    entalhe de 120° de uma feature de 3 entalhes e de uma de 6 é indexado uma vez.
+    """
+    por_angulo = {}
+    for k, feature in enumerate(features):
+        for angulo in compute_rotary_angles(replace(feature.params, ordemRotacao="sequential")):
+            por_angulo.setdefault(float(js_to_fixed(angulo, 2)), []).append(k)
+
+    angulos = sorted(por_angulo)
+    return [FeatureStation(angulo, por_angulo.get(float(js_to_fixed(angulo + 360, 2)) if angulo < 0 else angulo, []))
+            for angulo in order_rotary_angles(angulos, ordem)]
+
+
+def iter_job_gcode(features, dialect="standard", subprogram=DEFAULT_SUBPROGRAM_NUMBER, rotary_order="sequential",
+                   clearance_z=None, optimize=False):
+    """Gera o programa do trabalho linha a linha (equivalente a emitFeatureJob)
+
+    Mesmo layout de iter_gcode: movimentos de segurança, depois, para cada
+    posição A, a rotação e o corte de cada feature ali (expandido, ou chamado
+    como subprograma Fanuc, sub-rotina local Haas ou seção REPEAT Siemens da
+    feature) e o movimento de segurança final. Entre features a ferramenta só
+    sobe até o plano de troca; as features de uma posição são cortadas da
+    mais próxima para a mais distante de onde a anterior terminou.
+    """
+    if dialect not in DIALECTS:
+        raise ValueError(f"Formato de programa inválido: {dialect}")
+    clearance_z = validate_feature_job(features, clearance_z)
+
+    if optimize:
+        options = {"safe_z": clearance_z, **(optimize if isinstance(optimize, dict) else {})}
+        yield from optimize_lines(iter_job_gcode(features, dialect, subprogram, rotary_order, clearance_z), **options)
+        return
+
+    com_subprograma = dialect in ("fanuc", "haas")
+    corpos = [list(iter_notch_body(f.params)) for f in features]
+    extremos = [body_ends(corpo, f.params) for corpo, f in zip(corpos, features)]
+    escritas = set()
+    caminho_curto = dialect == "siemens" and rotary_order == "shortest"
+    plano = js_number_str(clearance_z)
+
+    if com_subprograma:
+        yield "%"
+        yield "O0001 (ENTALHE CNC)" if dialect == "fanuc" else "O00001 (ENTALHE CNC)"
+
+    yield "G0 Z100"
+    yield "G0 Y0"
+    yield "G0 X0"
+
+    x, y, z = 0.0, 0.0, 100.0
+    for station in compute_feature_stations(features, rotary_order):
+        if z < clearance_z:
+            yield f"G0 Z{plano}"
+            z = clearance_z
+        angulo = js_to_fixed(station.angle, 2)
+        yield f"G0 A=DC({angulo})" if caminho_curto else f"G0 A{angulo}"
+
+        # Vizinho mais próximo em X/Y; as subidas ao plano de troca não dependem da ordem
+        restantes = list(station.features)
+        while restantes:
+            def custo(k):
+                inicio = extremos[k][0]
+                return abs(inicio[0] - x) + abs(inicio[1] - y)
+            melhor = 0
+            for i in range(1, len(restantes)):
+                if custo(restantes[i]) < custo(restantes[melhor]):
+                    melhor = i
+            k = restantes.pop(melhor)
+
+            if z < clearance_z:
+                yield f"G0 Z{plano}"
+            yield feature_comment(features[k].name, dialect)
+            if dialect == "standard":
+                yield from corpos[k]
+            elif dialect == "siemens":
+                inicio, fim = siemens_labels(k)
+                if k in escritas:
+                    yield f"REPEAT {inicio} {fim} P=1"
+                else:
+                    escritas.add(k)
+                    yield f"{inicio}:"
+                    for linha in corpos[k]:
+                        # Comentários no Sinumerik usam ";" em vez de parênteses
+                        yield re.sub(r" \((.*)\)$", r" ; \1", linha)
+                    yield f"{fim}:"
+            else:
+                yield f"M98 P{subprogram + k}" if dialect == "fanuc" else f"M97 P{subprogram + k}"
+            x, y, z = extremos[k][1]
+
+    yield "G0 Z100"
+    yield "M30"
+
+    if com_subprograma:
+        for k, corpo in enumerate(corpos):
+            if dialect == "fanuc":
+                yield f"O{subprogram + k} {feature_comment(features[k].name, dialect)}"
+            else:
+                yield f"N{subprogram + k}"
+            yield from corpo
+            yield "M99"
+        yield "%"
+
+
+def program_cycle_time(program, rapid_rate=DEFAULT_RAPID_RATE, rotary_rate=DEFAULT_ROTARY_RATE):
+    """Tempo do programa (s) pelo relógio da simulação (equivalente a buildTimeline)"""
+    time = 0.0
+    last = (0.0, 0.0, 0.0, 0.0)
+    for i in range(len(program)):
+        x, y, z, a = program.x[i], program.y[i], program.z[i], program.a[i]
+        length = math.sqrt((x - last[0]) ** 2 + (y - last[1]) ** 2 + (z - last[2]) ** 2)
+        rate = program.f[i] if program.motion[i] == MOTION_FEED and program.f[i] > 0 else rapid_rate
+        delta = a - last[3]
+        if delta and "DC(" in program.source[program.line[i]].upper():
+            # Rotação pelo caminho mais curto (Sinumerik A=DC)
+            delta = ((delta % 360) + 540) % 360 - 180
+            delta = 180 if delta == -180 else delta
+        time += max(length / rate * 60, abs(delta) / rotary_rate * 60)
+        last = (x, y, z, a)
+    return time
+
+
+def compare_feature_job(features, rotary_order="sequential", clearance_z=None, optimize=False,
+                        rapid_rate=DEFAULT_RAPID_RATE, rotary_rate=DEFAULT_ROTARY_RATE):
+    """Tempo de ciclo do trabalho e de um programa por feature, um após o outro
+
+    Retorna (trabalho, separados) em segundos (equivalente a compareFeatureJob).
+    """
+    combined = program_cycle_time(
+        parse_program(iter_job_gcode(features, rotary_order=rotary_order, clearance_z=clearance_z, optimize=optimize)),
+        rapid_rate, rotary_rate)
+
+    # Programas expandidos, concatenados: o relógio conta também o retorno de A entre eles
+    separados = []
+    for feature in features:
+        separados.extend(iter_gcode(feature.params, optimize=optimize))
+    separate = program_cycle_time(parse_program(separados), rapid_rate, rotary_rate)
+    return combined, separate
@@ -0,0 +1,388 @@
+"""
+Gerador de código G (porta de lib/gcode-generator.ts)
+
+Mantém a mesma lógica e a mesma formatação de números do gerador da
+interface, de forma que os arquivos .nc gerados em lote sejam idênticos
+aos salvos pelo aplicativo.
+"""
+
+import math
+import re
+
+from .jsnum import js_number_str, js_to_fixed
+from .optimizer import optimize_lines
+
+# Formatos de programa (equivalentes a GCodeDialect)
+DIALECTS = ("standard", "fanuc", "haas", "siemens")
+DEFAULT_SUBPROGRAM_NUMBER = 1001
+
+# Rótulos da seção repetida no formato Siemens
+SIEMENS_START_LABEL = "ENTALHE_INI"
+SIEMENS_END_LABEL = "ENTALHE_FIM"
+
+
+def compute_passes_x(params):
+    """Calcula as posições X dos passes laterais e o deslocamento máximo"""
+    if not params.aberturaChaveta > params.diametroFerramenta:
+        # Apenas um passe central
+        return [0], 0
+
+    # Determinar o passo lateral (usar diâmetro da ferramenta se não especificado)
+    if params.passoLateral and params.passoLateral > 0:
+        passo_lateral = min(params.passoLateral, params.diametroFerramenta)
+    else:
+        passo_lateral = params.diametroFerramenta
+
+    # Largura efetiva já descontando o diâmetro da ferramenta
+    largura_efetiva = params.aberturaChaveta - params.diametroFerramenta
+    x_maximo = largura_efetiva / 2
+
+    if params.aberturaChaveta <= params.diametroFerramenta * 1.625:
+        # Dois passes simétricos, sem passe central
+        passos_x = [-x_maximo, x_maximo]
+    else:
+        num_passes = math.ceil(largura_efetiva / (passo_lateral * 0.9)) + 1
+        # Número ímpar de passes para manter um passe central
+        if num_passes % 2 == 0:
+            num_passes += 1
+        metade = num_passes // 2
+        passos_x = [(i / metade) * x_maximo for i in range(-metade, metade + 1)]
+
+    # Do centro para fora
+    passos_x.sort(key=abs)
+    return passos_x, max(abs(x) for x in passos_x)
+
+
+def compute_rotary_angles(params):
+    """Posições do eixo A de cada entalhe, na ordem de corte (equivalente a computeRotaryAngles)
+
+    "sequential" e "shortest" cortam a partir de 0°; em "shortest" o comando
+    faz o caminho mais curto (rollover). "bidirectional" corta até 180° e
+    depois os ângulos negativos; "reversed" corta do último entalhe até 0°,
+    para alternar com "sequential" entre peças sem desenrolar a mesa.
+    """
+    angulo_passo = 360 / params.numEntalhes
+    angulos = []
+    ii = 0
+    while ii < params.numEntalhes:
+        angulos.append(angulo_passo * ii)
+        ii += 1
+    return order_rotary_angles(angulos, params.ordemRotacao or "sequential")
+
+
+def order_rotary_angles(angulos, ordem):
+    """Ângulos A crescentes a partir de 0° na ordem de corte de uma sequência
+
+    Equivalente a orderRotaryAngles; usado também nos trabalhos com várias features.
+    """
+    if ordem == "reversed":
+        return angulos[::-1]
+    if ordem == "bidirectional":
+        # Sentido positivo até 180° e depois o sentido negativo, a partir de 0°
+        positivos = [a for a in angulos if a <= 180]
+        negativos = [a - 360 for a in angulos if a > 180][::-1]
+        return positivos + negativos
+    return angulos
+
+
+def order_passes_x(passos_x, ordem, x_atual, nivel):
+    """Ordena os passes laterais de um nível Y (equivalente a orderPassesX)
+
+    "center-out" mantém a ordem de compute_passes_x; "serpentine" vai da
+    esquerda para a direita e inverte o sentido a cada nível; "nearest" escolhe
+    sempre o passe restante mais próximo da ferramenta.
+    """
+    if ordem == "center-out":
+        return passos_x
+
+    crescente = sorted(passos_x)
+    if ordem == "serpentine":
+        return crescente if nivel % 2 == 0 else crescente[::-1]
+
+    # Vizinho mais próximo; em caso de empate, o passe de menor X
+    ordenados = []
+    x = x_atual
+    while crescente:
+        melhor = 0
+        for i in range(1, len(crescente)):
+            if abs(crescente[i] - x) < abs(crescente[melhor] - x):
+                melhor = i
+        x = crescente.pop(melhor)
+        ordenados.append(x)
+    return ordenados
+
+
+def compute_retract_y(params):
+    """Ponto de recuo em Y comum a todos os cortes"""
+    raio_inicial = params.diametroInicial / 2
+    raio_final = params.diametroFinal / 2
+
+    if params.chavetaConica:
+        angulo_radianos = params.anguloConico * math.pi / 180
+        deslocamento_y = abs(params.profundidadeFinal) * math.tan(angulo_radianos)
+        y_final_primeiro_corte = raio_inicial + deslocamento_y
+        if params.ladoCorte == "positivo":
+            return min(raio_inicial, y_final_primeiro_corte) - 1
+        return max(raio_inicial, y_final_primeiro_corte) + 1
+
+    if params.ladoCorte == "positivo":
+        return min(raio_inicial, raio_final) - 1
+    return max(raio_inicial, raio_final) + 1
+
+
+# Trechos mais estreitos que isto não contam como material (sobreposição exata de passes)
+ENGAGEMENT_EPSILON = 1e-9
+
+
+def chip_thinning_factor(x, cortados, raio):
+    """Fator de afinamento do cavaco de um mergulho (equivalente a chipThinningFactor)
+
+    O mergulho avança em Z com a lateral da ferramenta cortando em X. Um dente
+    a uma distância u do eixo corta um cavaco de espessura fz·√(1 − (u/R)²),
+    então o cavaco mais grosso sai onde o material não cortado chega mais perto
+    do eixo. O fator é quanto o avanço pode crescer para voltar à espessura do
+    rasgo cheio: 1 quando o material alcança o eixo, infinito quando o
+    mergulho só corta ar.
+    """
+    # Trechos de [x - R, x + R] ainda não cortados neste nível
+    livres = [(x - raio, x + raio)]
+    for c in cortados:
+        trechos = []
+        for inicio, fim in livres:
+            if inicio < c - raio:
+                trechos.append((inicio, min(fim, c - raio)))
+            if fim > c + raio:
+                trechos.append((max(inicio, c + raio), fim))
+        livres = trechos
+
+    # Menor distância do eixo da ferramenta ao material
+    menor = math.inf
+    for inicio, fim in livres:
+        if fim - inicio <= ENGAGEMENT_EPSILON:
+            continue
+        distancia = 0 if inicio <= x <= fim else min(abs(inicio - x), abs(fim - x))
+        menor = min(menor, distancia)
+    if menor >= raio:
+        return math.inf
+    u = menor / raio
+    return 1 / math.sqrt(1 - u * u)
+
+
+def feed_schedule(params):
+    """Avanço de cada mergulho conforme o engajamento radial (equivalente a createFeedSchedule)
+
+    ``avanco`` é o avanço do rasgo cheio; os passes laterais que se sobrepõem
+    aos já cortados no mesmo nível Y avançam mais rápido pelo fator de
+    afinamento do cavaco, até ``avancoMaximo``, arredondados para mm/min
+    inteiros. Retorna uma função (y, x) -> avanço, chamada uma vez por
+    mergulho, na ordem de corte. Sem ``avancoMaximo``, o avanço é constante.
+    """
+    avanco_maximo = params.avancoMaximo
+    if avanco_maximo is None:
+        return lambda y, x: params.avanco
+
+    raio = params.diametroFerramenta / 2
+    estado = {"nivel": None, "cortados": []}
+
+    def avanco_do_passe(y, x):
+        # Um nível Y novo começa sem nenhum passe cortado
+        if y != estado["nivel"]:
+            estado["nivel"] = y
+            estado["cortados"] = []
+        fator = chip_thinning_factor(x, estado["cortados"], raio)
+        estado["cortados"].append(x)
+        return scheduled_feed(params.avanco, fator, avanco_maximo)
+
+    return avanco_do_passe
+
+
+def scheduled_feed(avanco, fator, avanco_maximo):
+    """Avanço de um mergulho com o fator de afinamento do cavaco dado (mm/min)"""
+    if fator == 1:
+        return avanco
+    if math.isinf(fator):
+        return avanco_maximo
+    # Math.round do JavaScript (meio arredonda para cima)
+    return min(max(math.floor(avanco * fator + 0.5), avanco), avanco_maximo)
+
+
+def iter_notch_body(params):
+    """Corte de um entalhe (tudo após a rotação A), igual para todos os entalhes"""
+    raio_inicial = params.diametroInicial / 2
+    raio_final = params.diametroFinal / 2
+    cortando_ao_contrario = params.diametroInicial > params.diametroFinal
+    angulo_radianos = params.anguloConico * math.pi / 180 if params.chavetaConica else 0
+
+    passos_x, deslocamento_x = compute_passes_x(params)
+    ordem = params.ordemPasses or "center-out"
+    ponto_recuo_y = compute_retract_y(params)
+
+    z_inicio = js_number_str(params.pontoInicioZ)
+    # Retração entre passes do mesmo entalhe; o entalhe sempre termina em pontoInicioZ
+    if params.planoSeguroZ is None:
+        z_retracao = z_inicio
+    else:
+        if params.planoSeguroZ < 0:
+            # Abaixo de Z0 os rápidos entre passes (G0 X/Y) atravessariam material
+            raise ValueError("O plano seguro Z deve ficar acima da peça, entre Z0 e o ponto de início Z.")
+        z_retracao = js_number_str(params.planoSeguroZ)
+    recuo_y = f"G0 Y{js_to_fixed(ponto_recuo_y, 2)}"
+    # Avanço de cada mergulho conforme o engajamento radial
+    avanco_do_passe = feed_schedule(params)
+
+    def corte(y, x=0):
+        # Mergulho em Z, com ajuste cônico em Y se ativado
+        avanco = js_number_str(avanco_do_passe(y, x))
+        if params.chavetaConica:
+            deslocamento_y = abs(params.profundidadeFinal) * math.tan(angulo_radianos)
+            y_final = y + deslocamento_y
+            return (f"G1 Y{js_to_fixed(y_final, 3)} Z{js_number_str(params.profundidadeFinal)} "
+                    f"F{avanco} "
+                    f"(Calculando para {js_number_str(params.anguloConico)}° graus)")
+        return f"G1 Z{js_number_str(params.profundidadeFinal)} F{avanco}"
+
+    def passes_laterais(y, passes):
+        for i, posicao_x in enumerate(passes):
+            yield f"G0 X{js_to_fixed(posicao_x, 3)}"
+            yield corte(y, posicao_x)
+            yield recuo_y
+            # Se não for o último passe, reposicionar para o próximo
+            if i < len(passes) - 1:
+                yield f"G0 Z{z_retracao}"
+                yield f"G0 Y{js_to_fixed(y, 3)}"
+
+    yield f"G0 Z{z_inicio}"
+    yield f"G0 Y{js_number_str(raio_inicial)}"
+    yield "G0 X0"
+
+    y_atual = raio_inicial
+    x_atual = 0
+    nivel = 0
+    incremento_y = -abs(params.apY) if cortando_ao_contrario else abs(params.apY)
+
+    while True:
+        if deslocamento_x > 0:
+            passes = order_passes_x(passos_x, ordem, x_atual, nivel)
+            yield from passes_laterais(y_atual, passes)
+            x_atual = passes[-1]
+            yield f"G0 Z{z_retracao}"
+            if ordem == "center-out":
+                # Retorno a X0 antes do próximo nível
+                yield "G0 X0"
+                x_atual = 0
+        else:
+            yield corte(y_atual)
+            yield recuo_y
+            yield f"G0 Z{z_retracao}"
+        nivel += 1
+
+        next_y = float(js_to_fixed(y_atual + incremento_y, 3))
+        if cortando_ao_contrario:
+            chegou_ao_destino = next_y <= raio_final
+        else:
+            chegou_ao_destino = next_y >= raio_final
+
+        if not chegou_ao_destino:
+            yield f"G0 Y{js_to_fixed(next_y, 3)}"
+            y_atual = next_y
+        elif next_y == raio_final:
+            # O próximo avanço atinge exatamente o raio final: corte só nas bordas
+            yield f"G0 Y{js_to_fixed(raio_final, 3)}"
+            if deslocamento_x > 0:
+                if ordem == "center-out":
+                    bordas = [deslocamento_x, -deslocamento_x]
+                else:
+                    bordas = order_passes_x([-deslocamento_x, deslocamento_x], ordem, x_atual, nivel)
+                yield from passes_laterais(raio_final, bordas)
+            else:
+                yield corte(raio_final)
+                yield recuo_y
+            yield f"G0 Z{z_inicio}"
+            break
+        else:
+            # O próximo passo ultrapassa o destino: último corte no raio final
+            if y_atual != raio_final:
+                yield f"G0 Y{js_to_fixed(raio_final, 3)}"
+                if deslocamento_x > 0:
+                    yield from passes_laterais(raio_final, order_passes_x(passos_x, ordem, x_atual, nivel))
+                else:
+                    yield corte(raio_final)
+                    yield recuo_y
+                yield f"G0 Z{z_inicio}"
+            elif z_retracao != z_inicio:
+                yield f"G0 Z{z_inicio}"
+            break
+
+
+def iter_gcode(params, dialect="standard", subprogram=DEFAULT_SUBPROGRAM_NUMBER, optimize=False):
+    """Gera o código G linha a linha (equivalente a emitGCode)
+
+    As linhas são produzidas sob demanda, o que permite gravar programas
+    grandes sem mantê-los inteiros em memória. Com um dialeto diferente de
+    "standard", o corte de um entalhe é escrito uma única vez e chamado após
+    cada rotação A (subprograma Fanuc M98, sub-rotina local Haas M97 ou
+    REPEAT do Siemens). Com ``optimize`` (True ou um dict de opções do
+    ToolpathOptimizer), as linhas passam pelo otimizador de movimentos, com
+    pontoInicioZ como plano seguro.
+    """
+    if dialect not in DIALECTS:
+        raise ValueError(f"Formato de programa inválido: {dialect}")
+
+    if optimize:
+        options = {"safe_z": params.pontoInicioZ, **(optimize if isinstance(optimize, dict) else {})}
+        yield from optimize_lines(iter_gcode(params, dialect, subprogram), **options)
+        return
+
+    # Rotação A de cada entalhe; no Sinumerik, DC() força o caminho mais curto
+    caminho_curto = dialect == "siemens" and params.ordemRotacao == "shortest"
+    rotacoes = [f"G0 A=DC({js_to_fixed(angulo, 2)})" if caminho_curto else f"G0 A{js_to_fixed(angulo, 2)}"
+                for angulo in compute_rotary_angles(params)]
+
+    com_subprograma = dialect in ("fanuc", "haas")
+    if com_subprograma:
+        yield "%"
+        yield "O0001 (ENTALHE CNC)" if dialect == "fanuc" else "O00001 (ENTALHE CNC)"
+
+    yield "G0 Z100"
+    yield "G0 Y0"
+    yield "G0 X0"
+
+    if dialect == "standard":
+        for rotacao in rotacoes:
+            yield rotacao
+            yield from iter_notch_body(params)
+    elif dialect == "siemens":
+        # O primeiro entalhe fica entre rótulos; os demais repetem a seção
+        for i, rotacao in enumerate(rotacoes):
+            yield rotacao
+            if i == 0:
+                yield f"{SIEMENS_START_LABEL}:"
+                for linha in iter_notch_body(params):
+                    # Comentários no Sinumerik usam ";" em vez de parênteses
+                    yield re.sub(r" \((.*)\)$", r" ; \1", linha)
+                yield f"{SIEMENS_END_LABEL}:"
+            else:
+                yield f"REPEAT {SIEMENS_START_LABEL} {SIEMENS_END_LABEL} P=1"
+    else:
+        chamada = f"M98 P{subprogram}" if dialect == "fanuc" else f"M97 P{subprogram}"
+        for rotacao in rotacoes:
+            yield rotacao
+            yield chamada
+
+    yield "G0 Z100"
+    yield "M30"
+
+    if com_subprograma:
+        if rotacoes:
+            yield f"O{subprogram} (ENTALHE)" if dialect == "fanuc" else f"N{subprogram}"
+            yield from iter_notch_body(params)
+            yield "M99"
+        yield "%"
+
+
+def generate_gcode(params, dialect="standard", subprogram=DEFAULT_SUBPROGRAM_NUMBER, optimize=False):
+    """Gera o código G de todos os entalhes
+
+    Retorna a lista de linhas, na mesma ordem da função generateGCode.
+    """
+    return list(iter_gcode(params, dialect, subprogram, optimize))
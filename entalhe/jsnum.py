@@ -0,0 +1,72 @@
+"""
+Formatação de números idêntica à do JavaScript
+
+O gerador em lib/gcode-generator.ts monta as linhas com template strings
+(`${valor}`) e Number.prototype.toFixed(). As funções abaixo reproduzem
+exatamente essas conversões para que a saída em Python seja byte a byte
+igual à da interface.
+"""
+
+import math
+from decimal import ROUND_HALF_UP, Decimal
+
+
+def js_number_str(value):
+    """Equivalente a String(valor) / `${valor}` do JavaScript"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "Infinity" if value > 0 else "-Infinity"
+    if value == 0:
+        # String(-0) === "0"
+        return "0"
+
+    sign = "-" if value < 0 else ""
+    # repr() produz a menor representação que identifica o double, a mesma
+    # sequência de dígitos usada pelo JavaScript; só o formato muda
+    _, digit_tuple, exponent = Decimal(repr(abs(value))).normalize().as_tuple()
+    digits = "".join(str(d) for d in digit_tuple)
+    k = len(digits)
+    n = exponent + k  # posição do ponto decimal em relação aos dígitos
+
+    if k <= n <= 21:
+        return sign + digits + "0" * (n - k)
+    if 0 < n <= 21:
+        return sign + digits[:n] + "." + digits[n:]
+    if -6 < n <= 0:
+        return sign + "0." + "0" * (-n) + digits
+
+    e = n - 1
+    exp_str = ("+" if e >= 0 else "-") + str(abs(e))
+    if k == 1:
+        return sign + digits + "e" + exp_str
+    return sign + digits[0] + "." + digits[1:] + "e" + exp_str
+
+
+def js_to_fixed(value, fraction_digits):
+    """Equivalente a Number.prototype.toFixed(fraction_digits)
+
+    O JavaScript arredonda o valor binário exato, escolhendo o maior inteiro
+    em caso de empate; o format() do Python usaria empate para o par.
+    """
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if abs(value) >= 1e21:
+        return js_number_str(value)
+
+    sign = ""
+    if value < 0:
+        sign = "-"
+        value = -value
+    elif value == 0:
+        # (-0).toFixed() não tem sinal
+        value = 0.0
+
+    quantum = Decimal(1).scaleb(-fraction_digits)
+    rounded = Decimal(value).quantize(quantum, rounding=ROUND_HALF_UP)
+    return sign + format(rounded, "f")
@@ -0,0 +1,248 @@
+"""
+Otimizador de movimentos (porta de lib/toolpath-optimizer.ts)
+
+Remove movimentos redundantes de um programa já gerado: movimentos para a
+posição atual, rápidos colineares consecutivos, rápidos em X/Y no plano
+seguro (combinados em um único movimento) e palavras F (e opcionalmente
+G0/G1) que repetem o valor modal. Funciona linha a linha, então pode ser
+usado tanto sobre o gerador quanto na gravação em blocos do launcher.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+
+# Velocidade de avanço rápido (G0) usada para estimar o tempo economizado, em mm/min
+DEFAULT_RAPID_RATE = 5000
+
+AXES = ("X", "Y", "Z", "A")
+
+# Linhas que não mudam o estado da máquina (em branco ou só comentário)
+PASSIVE_LINE = re.compile(r"^\s*(\(.*\)|;.*)?\s*$")
+COMMENT = re.compile(r"\s*(\(.*\)|;.*)$")
+WORD = re.compile(r"^([XYZAF])([-+]?\d*\.?\d+)$", re.IGNORECASE)
+MOTION = re.compile(r"^G0?[01]$")
+
+
+@dataclass
+class OptimizeReport:
+    """Resumo da otimização de um programa"""
+
+    linesIn: int
+    linesOut: int
+    linesSaved: int
+    rapidDistanceIn: float  # mm
+    rapidDistanceOut: float  # mm
+    airTimeSaved: float  # s
+
+
+class ToolpathOptimizer:
+    """Otimizador incremental: recebe uma linha por vez e devolve as linhas prontas
+
+    Linhas que não são movimentos G0/G1 (chamadas de subprograma, rótulos,
+    códigos M) são mantidas e zeram o estado conhecido da máquina, o que
+    mantém corretos os formatos com subprograma.
+    """
+
+    def __init__(self, safe_z=None, drop_no_ops=True, merge_rapids=True,
+                 strip_modal_f=True, strip_modal_g=False, rapid_rate=DEFAULT_RAPID_RATE):
+        self.safe_z = safe_z
+        self.drop_no_ops = drop_no_ops
+        self.merge_rapids = merge_rapids
+        self.strip_modal_f = strip_modal_f
+        self.strip_modal_g = strip_modal_g
+        self.rapid_rate = rapid_rate
+
+        self._pos = {}
+        self._pending = None  # (g, início, palavras)
+        self._modal_g = None
+        self._modal_f = None
+        self._rapid_in = 0.0
+        self._rapid_out = 0.0
+        self._lines_in = 0
+        self._lines_out = 0
+
+    def push(self, line):
+        """Recebe uma linha do programa original e retorna as linhas otimizadas prontas"""
+        self._lines_in += 1
+        out = []
+        move = self._parse_move(line)
+
+        if move is None:
+            self._flush(out)
+            self._emit(out, line)
+            if not PASSIVE_LINE.match(line):
+                self._reset_state()
+            return out
+
+        g, move_words, f, comment = move
+        start = dict(self._pos)
+        # Eixos que realmente mudam de posição
+        words = {}
+        for axis in AXES:
+            value = move_words.get(axis)
+            if value is None:
+                continue
+            if self.drop_no_ops and start.get(axis) == float(value):
+                continue
+            words[axis] = value
+        for axis, value in move_words.items():
+            self._pos[axis] = float(value)
+
+        is_rapid = g in ("G0", "G00")
+        if is_rapid:
+            self._rapid_in += _distance(start, self._pos)
+
+        if is_rapid and f is None and comment is None:
+            if not words:
+                return out  # movimento nulo
+            if self._pending and self.merge_rapids and self._can_merge(self._pending, start, words):
+                self._pending[2].update(words)
+                return out
+            self._flush(out)
+            self._pending = (g, start, words)
+            return out
+
+        self._flush(out)
+        if not words and self.drop_no_ops and comment is None:
+            # Movimento nulo; um F novo continua pendente para o próximo G1
+            return out
+
+        text = self._g_word(g)
+        for axis in AXES:
+            if axis in words:
+                text += f" {axis}{words[axis]}"
+        if f is not None:
+            if not self.strip_modal_f or f != self._modal_f:
+                text += f" F{f}"
+            self._modal_f = f
+        if comment is not None:
+            text += f" {comment}"
+        if is_rapid:
+            self._rapid_out += _distance(start, self._pos)
+        self._emit(out, text.strip())
+        return out
+
+    def finish(self):
+        """Libera o último movimento pendente no fim do programa"""
+        out = []
+        self._flush(out)
+        return out
+
+    def report(self):
+        """Linhas e tempo de movimento rápido economizados até agora"""
+        return OptimizeReport(
+            linesIn=self._lines_in,
+            linesOut=self._lines_out,
+            linesSaved=self._lines_in - self._lines_out,
+            rapidDistanceIn=self._rapid_in,
+            rapidDistanceOut=self._rapid_out,
+            airTimeSaved=(self._rapid_in - self._rapid_out) / self.rapid_rate * 60,
+        )
+
+    def _parse_move(self, line):
+        comment_match = COMMENT.search(line)
+        code = line[:comment_match.start()] if comment_match else line
+        tokens = code.split()
+        if not tokens or not MOTION.match(tokens[0].upper()):
+            return None
+
+        words = {}
+        f = None
+        for token in tokens[1:]:
+            match = WORD.match(token)
+            if not match:
+                return None
+            letter = match.group(1).upper()
+            if letter == "F":
+                f = match.group(2)
+            else:
+                words[letter] = match.group(2)
+        return tokens[0].upper(), words, f, comment_match.group(1) if comment_match else None
+
+    def _can_merge(self, pending, start, words):
+        # Dois rápidos podem virar um só se forem colineares, ou se ambos ficarem
+        # no plano seguro (sem mover Z nem A)
+        a = _displacement(pending[1], pending[2])
+        b = _displacement(start, words)
+        if a and b and _collinear(a, b):
+            return True
+
+        z = start.get("Z")
+        if self.safe_z is None or z is None or z < self.safe_z:
+            return False
+        return not any(axis in w for w in (pending[2], words) for axis in ("Z", "A"))
+
+    def _flush(self, out):
+        if not self._pending:
+            return
+        g, start, words = self._pending
+        self._pending = None
+
+        # Após uma fusão, o movimento combinado pode voltar ao ponto de partida
+        axes = [axis for axis in AXES if axis in words
+                and not (self.drop_no_ops and start.get(axis) == float(words[axis]))]
+        if not axes:
+            return
+
+        text = self._g_word(g)
+        end = dict(start)
+        for axis in axes:
+            text += f" {axis}{words[axis]}"
+            end[axis] = float(words[axis])
+        self._rapid_out += _distance(start, end)
+        self._emit(out, text.strip())
+
+    def _g_word(self, g):
+        skip = self.strip_modal_g and self._modal_g == g
+        self._modal_g = g
+        return "" if skip else g
+
+    def _emit(self, out, line):
+        out.append(line)
+        self._lines_out += 1
+
+    def _reset_state(self):
+        self._pos = {}
+        self._modal_g = None
+        self._modal_f = None
+
+
+def _displacement(start, words):
+    """Deslocamento de um movimento; None se algum eixo envolvido for desconhecido"""
+    vector = []
+    for axis in AXES:
+        if axis not in words:
+            vector.append(0.0)
+        elif axis not in start:
+            return None
+        else:
+            vector.append(float(words[axis]) - start[axis])
+    return vector
+
+
+def _collinear(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = math.hypot(*a)
+    norm_b = math.hypot(*b)
+    return norm_a > 0 and norm_b > 0 and abs(abs(dot) - norm_a * norm_b) <= 1e-9 * norm_a * norm_b
+
+
+def _distance(start, end):
+    """Distância linear (X, Y, Z) entre duas posições; eixos desconhecidos não contam"""
+    total = 0.0
+    for axis in ("X", "Y", "Z"):
+        if axis in start and axis in end:
+            total += (end[axis] - start[axis]) ** 2
+    return math.sqrt(total)
+
+
+def optimize_lines(lines, optimizer=None, **options):
+    """Otimiza uma sequência de linhas, produzindo as linhas otimizadas sob demanda
+
+    Passe um ToolpathOptimizer em ``optimizer`` para consultar o relatório ao final.
+    """
+    optimizer = optimizer or ToolpathOptimizer(**options)
+    for line in lines:
+        yield from optimizer.push(line)
+    yield from optimizer.finish()
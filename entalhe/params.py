@@ -0,0 +1,163 @@
+"""
+Parâmetros de usinagem (equivalente à interface MachiningParams do TypeScript)
+"""
+
+from dataclasses import dataclass, fields
+from typing import Optional
+
+# Ordens dos passes laterais (mesmos valores de PassOrder na interface)
+PASS_ORDERS = ("center-out", "serpentine", "nearest")
+# Sequências do eixo A (mesmos valores de RotaryOrder na interface)
+ROTARY_ORDERS = ("sequential", "shortest", "bidirectional", "reversed")
+
+
+# Valores iniciais do painel de parâmetros (components/InputPanel.tsx)
+DEFAULT_PARAMS = {
+    "pontoInicioZ": 5,
+    "profundidadeFinal": -5,
+    "numEntalhes": 4,
+    "avanco": 100,
+    "apY": 1,
+    "diametroInicial": 30,
+    "diametroFinal": 40,
+    "diametroFerramenta": 8,
+    "aberturaChaveta": 10,
+    "chavetaConica": False,
+    "anguloConico": 5,
+}
+
+# Resolução dos níveis Y no programa (3 casas decimais), menor material por passe aceito
+Y_RESOLUTION = 0.001
+
+TRUE_VALUES = ("1", "true", "sim", "s", "yes", "y", "verdadeiro")
+FALSE_VALUES = ("0", "false", "nao", "não", "n", "no", "falso", "")
+
+
+@dataclass
+class MachiningParams:
+    """Parâmetros de um entalhe, com os mesmos nomes usados na interface"""
+
+    pontoInicioZ: float
+    profundidadeFinal: float
+    numEntalhes: float
+    avanco: float
+    apY: float
+    diametroInicial: float
+    diametroFinal: float
+    diametroFerramenta: float
+    aberturaChaveta: float
+    ladoCorte: str
+    chavetaConica: bool
+    anguloConico: float
+    # Passo lateral para múltiplos passes (opcional)
+    passoLateral: Optional[float] = None
+    # Ordem dos passes laterais (padrão: do centro para fora)
+    ordemPasses: Optional[str] = None
+    # Retração curta entre passes (padrão: pontoInicioZ)
+    planoSeguroZ: Optional[float] = None
+    # Sequência das posições do eixo A (padrão: sequencial)
+    ordemRotacao: Optional[str] = None
+    # Avanço máximo dos passes com pouco engajamento (padrão: avanço constante)
+    avancoMaximo: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Cria os parâmetros a partir de um dicionário (linha de CSV ou objeto JSON)
+
+        Campos ausentes recebem os valores iniciais da interface. Aceita vírgula
+        como separador decimal, como os campos do painel. Se ``passoLateral`` não
+        for informado, ``porcentagemPassoLateral`` é convertido pela mesma regra
+        da interface (só vale para aberturas maiores que 1,5x a ferramenta).
+        """
+        values = dict(DEFAULT_PARAMS)
+        for key, value in data.items():
+            if value is None or (isinstance(value, str) and value.strip() == ""):
+                continue
+            values[key] = value
+
+        params = {}
+        for field in fields(cls):
+            name = field.name
+            if name == "ladoCorte" or name not in values:
+                continue
+            if name in ("ordemPasses", "ordemRotacao"):
+                params[name] = str(values[name]).strip().lower()
+            elif name == "chavetaConica":
+                params[name] = parse_bool(values[name])
+            else:
+                params[name] = parse_number(values[name])
+
+        # Mesmo ajuste automático do painel: lado definido pelos diâmetros
+        lado = values.get("ladoCorte")
+        if not lado:
+            lado = "positivo" if params["diametroInicial"] < params["diametroFinal"] else "negativo"
+        params["ladoCorte"] = str(lado).strip().lower()
+
+        if params.get("passoLateral") is None and "porcentagemPassoLateral" in values:
+            porcentagem = parse_number(values["porcentagemPassoLateral"])
+            if params["aberturaChaveta"] > params["diametroFerramenta"] * 1.5:
+                params["passoLateral"] = (porcentagem / 100) * params["diametroFerramenta"]
+
+        return cls(**params)
+
+    def validate(self):
+        """Aplica as mesmas validações do painel antes de gerar o código
+
+        Lança ValueError com a mensagem exibida na interface.
+        """
+        if self.numEntalhes <= 0:
+            raise ValueError("O número de entalhes deve ser maior que zero.")
+        if self.avanco <= 0:
+            raise ValueError("O avanço deve ser maior que zero.")
+        if self.apY <= 0:
+            raise ValueError("O material por passe deve ser maior que zero.")
+        if self.apY < Y_RESOLUTION:
+            # O nível seguinte é arredondado a 0,001 mm: um passe menor nunca sai do lugar
+            raise ValueError("Material por passe muito pequeno para a resolução de 0,001 mm.")
+        if self.diametroFinal == self.diametroInicial:
+            raise ValueError("O diâmetro final não pode ser igual ao diâmetro inicial.")
+        if self.diametroFerramenta <= 0:
+            raise ValueError("O diâmetro da ferramenta deve ser maior que zero.")
+        if self.ladoCorte not in ("positivo", "negativo"):
+            raise ValueError(f"Lado de corte inválido: {self.ladoCorte}")
+        if self.ordemPasses is not None and self.ordemPasses not in PASS_ORDERS:
+            raise ValueError(f"Ordem dos passes inválida: {self.ordemPasses}")
+        if self.ordemRotacao is not None and self.ordemRotacao not in ROTARY_ORDERS:
+            raise ValueError(f"Sequência do eixo A inválida: {self.ordemRotacao}")
+        # Abaixo de Z0 os rápidos entre passes (G0 X/Y) atravessariam material
+        if self.planoSeguroZ is not None and not (
+                self.profundidadeFinal < self.planoSeguroZ <= self.pontoInicioZ and self.planoSeguroZ >= 0):
+            raise ValueError("O plano seguro Z deve ficar acima da peça, entre Z0 e o ponto de início Z.")
+        if self.avancoMaximo is not None and not self.avancoMaximo >= self.avanco:
+            raise ValueError("O avanço máximo deve ser maior ou igual ao avanço.")
+
+
+def parse_number(value):
+    """Converte texto em número aceitando vírgula decimal (inteiros continuam int)"""
+    if isinstance(value, bool):
+        raise ValueError(f"Valor numérico inválido: {value}")
+    if isinstance(value, (int, float)):
+        return value
+    text = str(value).strip().replace(",", ".")
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        raise ValueError(f"Valor numérico inválido: {value}") from None
+
+
+def parse_bool(value):
+    """Converte texto em booleano (true/false, sim/não, 1/0)"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return value != 0
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError(f"Valor booleano inválido: {value}")
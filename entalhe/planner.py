@@ -0,0 +1,308 @@
+"""
+Planejamento de passes (porta de lib/pass-planner.ts)
+
+Calcula o número de linhas, de mergulhos (G1), as distâncias em avanço
+rápido e de trabalho e o tempo de ciclo sem gerar o texto do programa.
+Como todos os entalhes são iguais (muda apenas o ângulo A), basta somar o
+primeiro entalhe e um entalhe seguinte e multiplicar pelo número de entalhes.
+"""
+
+import math
+from dataclasses import dataclass, replace
+
+from .generator import compute_passes_x, compute_retract_y, compute_rotary_angles, feed_schedule, order_passes_x
+from .jsnum import js_to_fixed
+from .params import PASS_ORDERS
+
+# Velocidade de avanço rápido (G0) usada nas estimativas, em mm/min
+DEFAULT_RAPID_RATE = 5000
+# Velocidade de rotação rápida do eixo A usada nas estimativas, em graus/min
+DEFAULT_ROTARY_RATE = 3600
+
+
+@dataclass
+class PassPlan:
+    """Resultado do planejamento de um programa"""
+
+    passosX: list
+    deslocamentoX: float
+    pontoRecuoY: float
+    yLevels: list
+    numEntalhes: int
+    linesPerNotch: int
+    plungesPerNotch: int
+    totalLines: int  # linhas no formato escolhido (dialect)
+    totalPlunges: int
+    rapidDistance: float  # mm
+    feedDistance: float  # mm
+    rotaryDistance: float  # graus, incluindo o retorno para a peça seguinte
+    rapidTime: float  # s
+    feedTime: float  # s
+    rotaryTime: float  # s
+    cycleTime: float  # s
+
+
+class MoveTally:
+    """Acumula linhas e distâncias de uma sequência de movimentos, sem gerar texto"""
+
+    def __init__(self, start):
+        self.pos = dict(start)
+        self.lines = 0
+        self.plunges = 0
+        self.rapid = 0.0
+        self.feed = 0.0
+        self.feed_time = 0.0  # s
+
+    def line(self):
+        """Linha sem movimento linear (ex.: rotação A)"""
+        self.lines += 1
+
+    def rapid_to(self, **target):
+        self.rapid += self._move_to(target)
+
+    def feed_to(self, avanco, **target):
+        distancia = self._move_to(target)
+        self.feed += distancia
+        self.feed_time += distancia / avanco * 60
+        self.plunges += 1
+
+    def _move_to(self, target):
+        start = self.pos
+        self.pos = {**start, **target}
+        self.lines += 1
+        return math.hypot(self.pos["x"] - start["x"], self.pos["y"] - start["y"],
+                          self.pos["z"] - start["z"])
+
+
+def printed(value, digits):
+    """Valor efetivamente escrito no programa (o controle usa o valor arredondado)"""
+    return float(js_to_fixed(value, digits))
+
+
+def compute_y_levels(params):
+    """Níveis Y cortados em cada entalhe e como termina o último passo
+
+    Retorna (níveis, final), onde final é "exact", "extra" ou "none".
+    """
+    raio_inicial = params.diametroInicial / 2
+    raio_final = params.diametroFinal / 2
+    cortando_ao_contrario = params.diametroInicial > params.diametroFinal
+    incremento_y = -abs(params.apY) if cortando_ao_contrario else abs(params.apY)
+
+    y_levels = [raio_inicial]
+    y_atual = raio_inicial
+    while True:
+        next_y = float(js_to_fixed(y_atual + incremento_y, 3))
+        if cortando_ao_contrario:
+            chegou_ao_destino = next_y <= raio_final
+        else:
+            chegou_ao_destino = next_y >= raio_final
+
+        if not chegou_ao_destino:
+            if next_y == y_atual:
+                # Passe menor que a resolução de 0.001 mm: o programa nunca terminaria
+                raise ValueError("Material por passe muito pequeno para a resolução de 0,001 mm.")
+            y_levels.append(next_y)
+            y_atual = next_y
+        elif next_y == raio_final:
+            return y_levels, "exact"
+        else:
+            return y_levels, "extra" if y_atual != raio_final else "none"
+
+
+def compute_rotary_travel(angulos, ordem):
+    """Percurso do eixo A em uma peça, em graus
+
+    Inclui o movimento do último entalhe até o primeiro da peça seguinte
+    (o desenrolar da mesa). Em "reversed" as peças alternam com o programa
+    sequencial, então cada peça começa onde a anterior terminou.
+    """
+    escritos = [printed(a, 2) for a in angulos]
+
+    def distancia(de, para):
+        if ordem == "shortest":
+            # Com rollover o comando escolhe o sentido mais curto
+            d = abs(para - de) % 360
+            return min(d, 360 - d)
+        return abs(para - de)
+
+    total = sum(distancia(a, b) for a, b in zip(escritos, escritos[1:]))
+    if escritos and ordem != "reversed":
+        total += distancia(escritos[-1], escritos[0])
+    return total
+
+
+def dialect_line_count(dialect, expanded_lines, lines_per_notch, num_entalhes):
+    """Converte a contagem de linhas do programa expandido para o formato informado"""
+    if dialect == "standard":
+        return expanded_lines
+
+    corpo = lines_per_notch - 1  # corte de um entalhe, sem a rotação A
+    base = 5  # cabeçalho (3) e rodapé (2)
+    if dialect == "siemens":
+        # Rotação por entalhe, corpo entre dois rótulos e um REPEAT por entalhe seguinte
+        return base + num_entalhes + 2 + corpo + (num_entalhes - 1) if num_entalhes > 0 else base
+    # Fanuc/Haas: %, O, rotação + chamada por entalhe, subprograma (O/N + corpo + M99) e %
+    return 3 + base + num_entalhes * 2 + (corpo + 2 if num_entalhes > 0 else 0)
+
+
+def plan_passes(params, rapid_rate=DEFAULT_RAPID_RATE, dialect="standard", rotary_rate=DEFAULT_ROTARY_RATE):
+    """Planeja os passes do programa e estima tamanho e tempo de ciclo"""
+    raio_inicial = params.diametroInicial / 2
+    raio_final = params.diametroFinal / 2
+    passos_x, deslocamento_x = compute_passes_x(params)
+    ponto_recuo_y = printed(compute_retract_y(params), 2)
+    y_levels, final = compute_y_levels(params)
+    num_entalhes = math.ceil(params.numEntalhes) if params.numEntalhes > 0 else 0
+
+    angulo_radianos = params.anguloConico * math.pi / 180 if params.chavetaConica else 0
+    deslocamento_conico = abs(params.profundidadeFinal) * math.tan(angulo_radianos)
+    z_inicio = params.pontoInicioZ
+    z_retracao = z_inicio if params.planoSeguroZ is None else params.planoSeguroZ
+    ordem = params.ordemPasses or "center-out"
+
+    # Avanço de cada mergulho conforme o engajamento; reiniciado a cada entalhe, como no gerador
+    avanco_do_passe = feed_schedule(params)
+
+    def corte(t, y, x=0):
+        avanco = avanco_do_passe(y, x)
+        if params.chavetaConica:
+            t.feed_to(avanco, y=printed(y + deslocamento_conico, 3), z=params.profundidadeFinal)
+        else:
+            t.feed_to(avanco, z=params.profundidadeFinal)
+        t.rapid_to(y=ponto_recuo_y)
+
+    def passes_laterais(t, y, passes):
+        # Passes laterais de um nível Y, na ordem dada
+        for i, posicao_x in enumerate(passes):
+            t.rapid_to(x=printed(posicao_x, 3))
+            corte(t, y, posicao_x)
+            if i < len(passes) - 1:
+                t.rapid_to(z=z_retracao)
+                t.rapid_to(y=printed(y, 3))
+
+    def entalhe(t):
+        nonlocal avanco_do_passe
+        avanco_do_passe = feed_schedule(params)
+        t.line()  # G0 A
+        t.rapid_to(z=z_inicio)
+        t.rapid_to(y=raio_inicial)
+        t.rapid_to(x=0)
+
+        # Posição X sem arredondamento, usada para ordenar os passes do nível seguinte
+        x_atual = 0
+
+        def proximos_passes(passes, nivel):
+            nonlocal x_atual
+            ordenados = order_passes_x(passes, ordem, x_atual, nivel)
+            x_atual = ordenados[-1]
+            return ordenados
+
+        for i, y in enumerate(y_levels):
+            if deslocamento_x > 0:
+                passes_laterais(t, y, proximos_passes(passos_x, i))
+                t.rapid_to(z=z_retracao)
+                if ordem == "center-out":
+                    t.rapid_to(x=0)
+                    x_atual = 0
+            else:
+                corte(t, y)
+                t.rapid_to(z=z_retracao)
+            if i < len(y_levels) - 1:
+                t.rapid_to(y=y_levels[i + 1])
+
+        y_final = printed(raio_final, 3)
+        nivel_final = len(y_levels)
+        if final == "exact":
+            t.rapid_to(y=y_final)
+            if deslocamento_x > 0:
+                if ordem == "center-out":
+                    bordas = [deslocamento_x, -deslocamento_x]
+                else:
+                    bordas = proximos_passes([-deslocamento_x, deslocamento_x], nivel_final)
+                passes_laterais(t, raio_final, bordas)
+            else:
+                corte(t, raio_final)
+            t.rapid_to(z=z_inicio)
+        elif final == "extra":
+            t.rapid_to(y=y_final)
+            if deslocamento_x > 0:
+                passes_laterais(t, raio_final, proximos_passes(passos_x, nivel_final))
+            else:
+                corte(t, raio_final)
+            t.rapid_to(z=z_inicio)
+        elif z_retracao != z_inicio:
+            t.rapid_to(z=z_inicio)
+
+    # Cabeçalho, primeiro entalhe (parte de Z100) e um entalhe seguinte (regime)
+    total = MoveTally({"x": 0, "y": 0, "z": 100})
+    total.rapid_to(z=100)
+    total.rapid_to(y=0)
+    total.rapid_to(x=0)
+
+    lines_per_notch = plunges_per_notch = 0
+    if num_entalhes > 0:
+        first = MoveTally(total.pos)
+        entalhe(first)
+        following = MoveTally(first.pos)
+        entalhe(following)
+
+        lines_per_notch = following.lines
+        plunges_per_notch = following.plunges
+        repeticoes = num_entalhes - 1
+        total.lines += first.lines + following.lines * repeticoes
+        total.plunges += first.plunges + following.plunges * repeticoes
+        total.rapid += first.rapid + following.rapid * repeticoes
+        total.feed += first.feed + following.feed * repeticoes
+        total.feed_time += first.feed_time + following.feed_time * repeticoes
+        total.pos = following.pos
+
+    total.rapid_to(z=100)
+    total.line()  # M30
+
+    if num_entalhes > 0:
+        rotary_distance = compute_rotary_travel(compute_rotary_angles(params), params.ordemRotacao or "sequential")
+    else:
+        rotary_distance = 0
+    rapid_time = total.rapid / rapid_rate * 60
+    feed_time = total.feed_time
+    rotary_time = rotary_distance / rotary_rate * 60
+
+    return PassPlan(
+        passosX=passos_x,
+        deslocamentoX=deslocamento_x,
+        pontoRecuoY=ponto_recuo_y,
+        yLevels=y_levels,
+        numEntalhes=num_entalhes,
+        linesPerNotch=lines_per_notch,
+        plungesPerNotch=plunges_per_notch,
+        totalLines=dialect_line_count(dialect, total.lines, lines_per_notch, num_entalhes),
+        totalPlunges=total.plunges,
+        rapidDistance=total.rapid,
+        feedDistance=total.feed,
+        rotaryDistance=rotary_distance,
+        rapidTime=rapid_time,
+        feedTime=feed_time,
+        rotaryTime=rotary_time,
+        cycleTime=rapid_time + feed_time + rotary_time,
+    )
+
+
+def compare_pass_orders(params, rapid_rate=DEFAULT_RAPID_RATE, dialect="standard", rotary_rate=DEFAULT_ROTARY_RATE):
+    """Planeja o programa uma vez para cada ordem dos passes laterais
+
+    Retorna uma lista de (ordem, PassPlan) na ordem de PASS_ORDERS; o
+    parâmetro ordemPasses de ``params`` é ignorado.
+    """
+    return [(ordem, plan_passes(replace(params, ordemPasses=ordem), rapid_rate, dialect, rotary_rate))
+            for ordem in PASS_ORDERS]
+
+
+def format_duration(seconds):
+    """Formata uma duração em segundos como h:mm:ss ou m:ss"""
+    total = math.floor(seconds + 0.5)
+    h, resto = divmod(total, 3600)
+    m, s = divmod(resto, 60)
+    if h > 0:
+        return f"{h}:{m:02d}:{s:02d}"
+    return f"{m}:{s:02d}"
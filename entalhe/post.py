@@ -0,0 +1,406 @@
+"""
+Pós-processador: reescreve o programa neutro para uma máquina
+(porta de lib/post-processor.ts)
+
+O gerador escreve um programa neutro (movimentos de segurança fixos,
+`G0 A...`, `M30`, comentários entre parênteses, as casas de cada toFixed).
+Um perfil descreve o que um comando espera no lugar disso; o perfil é
+compilado uma vez em um PostProcessor que reescreve o programa linha a linha,
+entre iter_gcode e write_gcode, sem guardar uma segunda cópia do programa.
+
+O perfil é o mesmo JSON da interface:
+{"name": ..., "header": [...], "footer": [...], "tapeMarkers": true,
+ "decimals": {"linear": 3, "rotary": 3, "feed": 1}, "numberStyle": "point",
+ "suppressModal": {"motion": true, "axes": true, "feed": true},
+ "comments": "paren", "lineNumbers": {"start": 10, "step": 10, "max": 99999} ou null,
+ "rotaryAxis": "A"}
+Campos ausentes ficam com os valores do perfil Fanuc.
+"""
+
+import json
+import re
+import unicodedata
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional
+
+from .jsnum import js_to_fixed
+
+COMMENT_STYLES = ("paren", "semicolon", "none")
+# fixed: sempre com as casas decimais; trim: sem zeros à direita (10.5, 10);
+# point: sem zeros à direita mas sempre com ponto (10.5, 10.), como exige o Fanuc
+NUMBER_STYLES = ("fixed", "trim", "point")
+ROTARY_LETTERS = ("A", "B", "C")
+
+
+@dataclass
+class LineNumbers:
+    """N10, N20, ... (volta a start depois de max)"""
+    start: int = 10
+    step: int = 10
+    max: int = 99999
+
+
+@dataclass
+class PostProfile:
+    """O que um comando espera do programa"""
+    name: str = "Fanuc"
+    header: List[str] = field(default_factory=lambda: ["O0001 (ENTALHE CNC)", "G21 G90 G17"])
+    footer: List[str] = field(default_factory=lambda: ["M30"])
+    tapeMarkers: bool = True
+    decimals: Dict[str, int] = field(default_factory=lambda: {"linear": 3, "rotary": 3, "feed": 1})
+    numberStyle: str = "point"
+    suppressModal: Dict[str, bool] = field(default_factory=lambda: {"motion": True, "axes": True, "feed": True})
+    comments: str = "paren"
+    lineNumbers: Optional[LineNumbers] = None
+    rotaryAxis: str = "A"
+
+
+POST_PROFILES = {
+    "fanuc": PostProfile(),
+    "haas": PostProfile(
+        name="Haas",
+        header=["O00001 (ENTALHE CNC)", "G21 G90 G17"],
+        decimals={"linear": 4, "rotary": 3, "feed": 1},
+    ),
+    "siemens": PostProfile(
+        name="Siemens 840D",
+        header=["; ENTALHE CNC", "G71 G90 G17"],
+        tapeMarkers=False,
+        decimals={"linear": 3, "rotary": 3, "feed": 0},
+        numberStyle="trim",
+        comments="semicolon",
+        lineNumbers=LineNumbers(10, 10, 99999999),
+    ),
+    "grbl": PostProfile(
+        name="GRBL",
+        header=["G21 G90 G94"],
+        footer=["M2"],
+        tapeMarkers=False,
+        decimals={"linear": 3, "rotary": 3, "feed": 0},
+        numberStyle="trim",
+        suppressModal={"motion": False, "axes": True, "feed": True},
+    ),
+}
+
+# Posição de cada palavra de movimento (X, Y, Z, A, F)
+WORD_SLOT = {"X": 0, "Y": 1, "Z": 2, "A": 3, "F": 4, "x": 0, "y": 1, "z": 2, "a": 3, "f": 4}
+NUMBER = re.compile(r"[-+]?\d*\.?\d+")
+# Valores formatados guardados por eixo
+FORMAT_CACHE_SIZE = 4096
+TAPE_MARKER = re.compile(r"\s*%\s*\Z")
+PROGRAM_NUMBER = re.compile(r"\s*O\d+", re.I)
+PROGRAM_END = re.compile(r"\s*(M30|M0?2)\b", re.I)
+LABEL = re.compile(r"\s*([A-Z_][A-Z0-9_]*:|N\d+\s*\Z)", re.I)
+LOCAL_CALL = re.compile(r"\s*M97\s+P(\d+)", re.I)
+PASSIVE_LINE = re.compile(r"\s*(\(.*\)|;.*)?\s*\Z")
+NEGATIVE_ZERO = re.compile(r"-0?\.?0*")
+
+
+def compile_number(decimals, style):
+    """Formata um número com as casas e o estilo do perfil (compilado uma vez por eixo)"""
+    def fmt(value):
+        text = js_to_fixed(value, decimals)
+        if style != "fixed" and "." in text:
+            text = text.rstrip("0")
+        if style == "trim":
+            text = text.removesuffix(".")
+        elif style == "point" and "." not in text:
+            text += "."
+        return text[1:] if NEGATIVE_ZERO.fullmatch(text) else text
+    return fmt
+
+
+def split_comment(line):
+    """Separa o código do comentário final: "(...)" depois de um espaço (não o
+    DC( do Sinumerik) ou ";" até o fim da linha. Retorna (código, comentário ou None)
+    """
+    semicolon = line.find(";")
+    paren = line.find("(")
+    while paren > 0 and line[paren - 1] not in " \t":
+        paren = line.find("(", paren + 1)
+    text = line.rstrip()
+    if paren >= 0 and (semicolon < 0 or paren < semicolon) and text.endswith(")"):
+        return line[:paren].strip(), text[paren + 1:-1]
+    if semicolon >= 0:
+        return line[:semicolon].strip(), line[semicolon + 1:].strip()
+    return line.strip(), None
+
+
+def clean_comment(text):
+    """Comentários só com ASCII imprimível (sem acentos nem "°"), sem parênteses internos"""
+    text = unicodedata.normalize("NFD", text)
+    return "".join(c for c in text if " " <= c <= "~" and c not in "()").strip()
+
+
+class PostProcessor:
+    """Pós-processador compilado de um perfil
+
+    As linhas do programa neutro entram uma a uma e as linhas reescritas
+    voltam na hora. Movimentos (G0/G1 com palavras X/Y/Z/A/F) são refeitos com
+    as casas, a letra do eixo rotativo e a supressão modal do perfil; as demais
+    linhas (chamadas, rótulos, códigos M) são mantidas, com o comentário no
+    estilo do perfil, e zeram o estado modal conhecido, para que os layouts
+    com sub-rotinas continuem corretos. A numeração pula os rótulos chamados
+    pelo M97 do Haas.
+    """
+
+    def __init__(self, profile):
+        self.profile = profile
+        decimals = profile.decimals
+        linear = compile_number(decimals["linear"], profile.numberStyle)
+        self.formatters = [linear, linear, linear,
+                           compile_number(decimals["rotary"], profile.numberStyle),
+                           compile_number(decimals["feed"], profile.numberStyle)]
+        self.formatted = [{} for _ in range(5)]
+        self.axis_letter = ["X", "Y", "Z", profile.rotaryAxis]
+        self.last_word = [None] * 5
+        self.modal_g = None
+        self.started = False
+        self.ended = False
+        self.next_number = profile.lineNumbers.start if profile.lineNumbers else 0
+        self.reserved = set()
+
+    def push(self, line):
+        """Recebe uma linha do programa neutro; retorna as linhas para a máquina"""
+        out = []
+        if TAPE_MARKER.match(line):
+            return out
+        if not self.started:
+            # O número do programa principal vem do cabeçalho do perfil
+            if PROGRAM_NUMBER.match(line):
+                return out
+            self._start(out)
+
+        if not self.ended and PROGRAM_END.match(line):
+            self.ended = True
+            for text in self.profile.footer:
+                self._emit(out, text)
+            self._reset_state()
+            return out
+
+        motion = self._motion(line)
+        if motion is not None:
+            if motion:
+                self._emit(out, motion, bool(PASSIVE_LINE.match(motion)))
+            return out
+
+        call = LOCAL_CALL.match(line)
+        if call:
+            self._reserve(int(call.group(1)))
+        passive = bool(PASSIVE_LINE.match(line))
+        text = self._restyle(line)
+        if text:
+            self._emit(out, text, passive or bool(LABEL.match(line)) or bool(PROGRAM_NUMBER.match(line)))
+        if not passive:
+            self._reset_state()
+        return out
+
+    def finish(self):
+        """Encerra o programa (cabeçalho de um programa vazio, rodapé e marca de fita)"""
+        out = []
+        if not self.started:
+            self._start(out)
+        if not self.ended:
+            self.ended = True
+            for text in self.profile.footer:
+                self._emit(out, text)
+        if self.profile.tapeMarkers:
+            out.append("%")
+        return out
+
+    def _start(self, out):
+        self.started = True
+        if self.profile.tapeMarkers:
+            out.append("%")
+        for text in self.profile.header:
+            self._emit(out, text, bool(PROGRAM_NUMBER.match(text) or PASSIVE_LINE.match(text)))
+
+    def _motion(self, line):
+        # Reescreve uma linha G0/G1; None se não for um movimento, "" se nada mudar
+        code, comment_text = split_comment(line)
+        tokens = re.split(r"\s+", code)
+        g = tokens[0].upper()
+        if g not in ("G0", "G1", "G00", "G01"):
+            return None
+
+        # Palavras na ordem X, Y, Z, A, F, já formatadas
+        words = [None] * 5
+        for token in tokens[1:]:
+            slot = WORD_SLOT.get(token[:1])
+            if slot is None:
+                return None
+            dc = token.startswith("=DC(", 1)
+            if dc and not token.endswith(")"):
+                return None
+            text = token[5:-1] if dc else token[1:]
+            if not NUMBER.fullmatch(text):
+                return None
+            value = self._format(slot, text)
+            words[slot] = f"=DC({value})" if dc else value
+
+        suppress = self.profile.suppressModal
+        axes = ""
+        for slot in range(4):
+            word = words[slot]
+            if word is None or (suppress["axes"] and self.last_word[slot] == word):
+                continue
+            self.last_word[slot] = word
+            axes += f" {self.axis_letter[slot]}{word}"
+
+        # Sem eixo que mude, a linha não move: o F continua pendente para o próximo G1
+        comment = self._comment(comment_text)
+        if not axes:
+            return comment
+        f = words[4]
+        feed = ""
+        if f is not None:
+            if not (suppress["feed"] and self.last_word[4] == f):
+                feed = f" F{f}"
+            self.last_word[4] = f
+
+        g_word = f"G{g[2]}" if len(g) == 3 else g
+        skip_g = suppress["motion"] and self.modal_g == g_word
+        self.modal_g = g_word
+        return (axes[1:] if skip_g else g_word + axes) + feed + (f" {comment}" if comment else "")
+
+    def _format(self, slot, text):
+        # Número formatado pelo perfil; os valores se repetem muito e ficam guardados
+        cache = self.formatted[slot]
+        value = cache.get(text)
+        if value is None:
+            if len(cache) >= FORMAT_CACHE_SIZE:
+                cache.clear()
+            value = cache[text] = self.formatters[slot](float(text))
+        return value
+
+    def _comment(self, text):
+        # Comentário no estilo do perfil ("" quando removido ou vazio)
+        if text is None or self.profile.comments == "none":
+            return ""
+        clean = clean_comment(text)
+        if not clean:
+            return ""
+        return f"({clean})" if self.profile.comments == "paren" else f"; {clean}"
+
+    def _restyle(self, line):
+        # Linha que não é movimento: mantém o código e troca o estilo do comentário
+        code, comment = split_comment(line)
+        if comment is None:
+            return code
+        styled = self._comment(comment)
+        return f"{code} {styled}" if code and styled else code or styled
+
+    def _emit(self, out, text, unnumbered=False):
+        numbers = self.profile.lineNumbers
+        if not numbers or unnumbered:
+            out.append(text)
+            return
+        while self.next_number in self.reserved:
+            self.next_number += numbers.step
+        out.append(f"N{self.next_number} {text}")
+        self.next_number += numbers.step
+        if self.next_number > numbers.max:
+            self.next_number = numbers.start
+
+    def _reserve(self, label):
+        # Rótulo N chamado por M97: a numeração não pode usar o mesmo número
+        numbers = self.profile.lineNumbers
+        if (numbers and numbers.start <= label < self.next_number
+                and (label - numbers.start) % numbers.step == 0):
+            raise ValueError(f"Numeração de linhas já passou do rótulo N{label} chamado por M97; "
+                             f"use um início maior que {label}")
+        self.reserved.add(label)
+
+    def _reset_state(self):
+        self.last_word = [None] * 5
+        self.modal_g = None
+
+
+def post_process(lines, profile):
+    """Pós-processa as linhas do programa neutro (iterador); profile None as mantém"""
+    if profile is None:
+        yield from lines
+        return
+    processor = PostProcessor(profile)
+    for line in lines:
+        yield from processor.push(line)
+    yield from processor.finish()
+
+
+def parse_post_profile(data):
+    """Valida um perfil lido de JSON; campos ausentes ficam com os do Fanuc"""
+    data = data or {}
+    if not isinstance(data, dict):
+        raise ValueError("Pós-processador: o perfil deve ser um objeto JSON")
+    base = POST_PROFILES["fanuc"]
+
+    def lines(value, what):
+        if value is None:
+            return list(getattr(base, what))
+        if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+            raise ValueError(f'Pós-processador: "{what}" deve ser uma lista de linhas')
+        return value
+
+    def digits(value, what):
+        if value is None:
+            return base.decimals[what]
+        try:
+            n = float(value)
+        except (TypeError, ValueError):
+            n = -1
+        if not n.is_integer() or not 0 <= n <= 6:
+            raise ValueError(f'Pós-processador: casas decimais inválidas em "{what}"')
+        return int(n)
+
+    def choice(value, options, what):
+        if value is None:
+            return getattr(base, what)
+        if value not in options:
+            raise ValueError(f'Pós-processador: "{what}" deve ser {", ".join(options)}')
+        return value
+
+    def flag(value, fallback):
+        return fallback if value is None else bool(value)
+
+    decimals = data.get("decimals") or {}
+    suppress = data.get("suppressModal") or {}
+    line_numbers = None
+    if data.get("lineNumbers"):
+        spec = data["lineNumbers"]
+        try:
+            values = [float(spec.get(key, default)) for key, default in
+                      (("start", 10), ("step", 10), ("max", 99999))]
+        except (TypeError, ValueError, AttributeError):
+            values = [-1.0, 0.0, -1.0]
+        start, step, maximum = values
+        if not all(v.is_integer() for v in values) or start < 0 or step <= 0 or maximum < start:
+            raise ValueError("Pós-processador: numeração de linhas inválida")
+        line_numbers = LineNumbers(int(start), int(step), int(maximum))
+
+    name = data.get("name")
+    return replace(
+        base,
+        name=name if isinstance(name, str) and name else "Personalizado",
+        header=lines(data.get("header"), "header"),
+        footer=lines(data.get("footer"), "footer"),
+        tapeMarkers=flag(data.get("tapeMarkers"), base.tapeMarkers),
+        decimals={key: digits(decimals.get(key), key) for key in ("linear", "rotary", "feed")},
+        numberStyle=choice(data.get("numberStyle"), NUMBER_STYLES, "numberStyle"),
+        suppressModal={key: flag(suppress.get(key), base.suppressModal[key]) for key in ("motion", "axes", "feed")},
+        comments=choice(data.get("comments"), COMMENT_STYLES, "comments"),
+        lineNumbers=line_numbers,
+        rotaryAxis=choice(data.get("rotaryAxis"), ROTARY_LETTERS, "rotaryAxis"),
+    )
+
+
+def load_post_profile(spec):
+    """Perfil embutido pelo nome (fanuc, haas, siemens, grbl) ou lido de um arquivo JSON
+
+    "neutral" retorna None: o programa sai como o gerador o escreve.
+    """
+    if spec == "neutral":
+        return None
+    if spec in POST_PROFILES:
+        return POST_PROFILES[spec]
+    with open(spec, encoding="utf-8") as f:
+        return parse_post_profile(json.load(f))
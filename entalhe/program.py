@@ -0,0 +1,380 @@
+"""
+Programa G-code em colunas (porta de lib/gcode-program.ts)
+
+Cada movimento (linha G0/G1, depois de expandir os subprogramas; cada corda
+de um G2/G3) é uma posição nas colunas X/Y/Z/A/F, no tipo de movimento e no
+índice da linha de origem. Os comentários ficam guardados por linha. As
+colunas são array('d'), então programas grandes não criam um objeto por
+movimento.
+"""
+
+import math
+import re
+from array import array
+
+MOTION_RAPID = 0  # G0
+MOTION_FEED = 1  # G1
+
+# Limite de chamadas aninhadas (protege contra subprogramas recursivos)
+MAX_CALL_DEPTH = 16
+
+# Palavras (letra + número, inclusive a forma Sinumerik A=DC(valor)) e comentários
+TOKEN = re.compile(r";(.*)$|\(([^)]*)\)|([A-Z])(?:=(?:DC\()?)?([-+]?\d*\.?\d+)\)?", re.IGNORECASE)
+# Número de bloco no início da linha (N10 G0 X1); um "N1001" sozinho é rótulo Haas
+BLOCK_NUMBER = re.compile(r"^N\d+\s+(?=\S)", re.IGNORECASE)
+# Chamadas de subprograma, que exigem expandir o programa antes da análise
+HAS_CALLS = re.compile(r"^\s*(?:N\d+\s+)?(?:M9[78]\b|REPEAT\b)", re.IGNORECASE)
+PROGRAM = re.compile(r"^O(\d+)", re.IGNORECASE)
+N_LABEL = re.compile(r"^N(\d+)\s*$", re.IGNORECASE)
+N_BLOCK = re.compile(r"^N(\d+)\s", re.IGNORECASE)
+LABEL = re.compile(r"^([A-Z_][A-Z0-9_]*):", re.IGNORECASE)
+END = re.compile(r"^(M99|M30|M0?2)\b", re.IGNORECASE)
+M98 = re.compile(r"^M98\s+P(\d+)(?:\s+L(\d+))?", re.IGNORECASE)
+M97 = re.compile(r"^M97\s+P(\d+)(?:\s+L(\d+))?", re.IGNORECASE)
+REPEAT = re.compile(r"^REPEAT\s+([A-Z_][A-Z0-9_]*)\s+([A-Z_][A-Z0-9_]*)(?:\s+P\s*=\s*(\d+))?", re.IGNORECASE)
+
+# Códigos G não modais em que as palavras de eixo não são um movimento
+# (G4 pausa, G10 dados, G28/G30 referência, G53 coordenadas de máquina, G92 origem)
+NON_MOTION_G = (4, 10, 28, 30, 53, 92)
+
+# Maior desvio (mm) das cordas em relação a um arco G2/G3
+ARC_TOLERANCE = 0.005
+# Limite de segmentos por arco (arcos enormes ou com vários giros)
+MAX_ARC_SEGMENTS = 2048
+
+
+def expand_subprogram_indices(lines):
+    """Índices das linhas executadas, com cada chamada substituída pelo bloco chamado
+
+    Entende os formatos do gerador: Fanuc "M98 P" com programas "O" (repetições
+    em "L"), Haas "M97 P" com rótulos "N" e Siemens "REPEAT início fim P=n".
+    Retorna None quando o programa não tem chamadas.
+    """
+    if not any(HAS_CALLS.match(line) for line in lines):
+        return None
+
+    # Índices de início de cada programa O, rótulo N e rótulo Siemens
+    programs = {}
+    n_labels = {}
+    labels = {}
+    for i, line in enumerate(lines):
+        cmd = line.strip()
+        match = PROGRAM.match(cmd)
+        if match:
+            programs[int(match.group(1))] = i + 1
+            continue
+        match = N_LABEL.match(cmd)
+        if match:
+            n_labels[int(match.group(1))] = i + 1
+            continue
+        match = LABEL.match(cmd)
+        if match:
+            labels[match.group(1).upper()] = i
+            continue
+        match = N_BLOCK.match(cmd)
+        if match and int(match.group(1)) not in n_labels:
+            # Programa numerado em todas as linhas: M97 P salta para a própria linha N
+            n_labels[int(match.group(1))] = i
+
+    expanded = []
+
+    def run(start, end, depth):
+        # Executa as linhas a partir de "start" até M99/M30 (ou até "end", exclusivo)
+        if depth > MAX_CALL_DEPTH:
+            raise ValueError("Chamadas de subprograma aninhadas demais")
+
+        for i in range(start, end):
+            cmd = BLOCK_NUMBER.sub("", lines[i].strip(), count=1)
+
+            if END.match(cmd):
+                if depth == 0:
+                    expanded.append(i)
+                return
+
+            match = M98.match(cmd)
+            if match:
+                # Fanuc: P com mais de 4 dígitos carrega as repetições nos dígitos iniciais
+                program = int(match.group(1))
+                times = int(match.group(2)) if match.group(2) else 1
+                if not match.group(2) and len(match.group(1)) > 4:
+                    times = int(match.group(1)[:-4])
+                    program = int(match.group(1)[-4:])
+                if program not in programs:
+                    raise ValueError(f"Subprograma O{program} não encontrado")
+                for _ in range(times):
+                    run(programs[program], len(lines), depth + 1)
+                continue
+
+            match = M97.match(cmd)
+            if match:
+                label = int(match.group(1))
+                if label not in n_labels:
+                    raise ValueError(f"Rótulo N{match.group(1)} não encontrado")
+                times = int(match.group(2)) if match.group(2) else 1
+                for _ in range(times):
+                    run(n_labels[label], len(lines), depth + 1)
+                continue
+
+            match = REPEAT.match(cmd)
+            if match:
+                begin = labels.get(match.group(1).upper())
+                finish = labels.get(match.group(2).upper())
+                if begin is None or finish is None:
+                    raise ValueError(f"Rótulos {match.group(1)}/{match.group(2)} não encontrados")
+                times = int(match.group(3)) if match.group(3) else 1
+                for _ in range(times):
+                    run(begin + 1, finish, depth + 1)
+                continue
+
+            if cmd != "%":
+                expanded.append(i)
+
+    run(0, len(lines), 0)
+    return expanded
+
+
+class GCodeProgram:
+    """Programa analisado: colunas por movimento e as linhas de origem"""
+
+    def __init__(self, x, y, z, a, f, motion, line, source, comments=None):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.a = a
+        self.f = f
+        self.motion = motion
+        self.line = line
+        self.source = source
+        self.comments = comments or {}
+
+        # Primeiro movimento de cada linha do código (-1 se a linha não move)
+        self._first_move = array("i", [-1]) * len(source)
+        for i in range(len(line) - 1, -1, -1):
+            self._first_move[line[i]] = i
+
+    def __len__(self):
+        return len(self.motion)
+
+    def frame(self, i):
+        """Um movimento no formato dos frames da simulação"""
+        return {
+            "x": self.x[i],
+            "y": self.y[i],
+            "z": self.z[i],
+            "a": self.a[i],
+            "cmd": "G1" if self.motion[i] == MOTION_FEED else "G0",
+        }
+
+    def move_at_line(self, line_index):
+        """Primeiro movimento gerado por uma linha do código, ou -1"""
+        if 0 <= line_index < len(self._first_move):
+            return self._first_move[line_index]
+        return -1
+
+
+class ProgramBuilder:
+    """Acumula os movimentos de um programa, uma linha por vez
+
+    Acompanha o estado modal do comando: movimento (G0/G1/G2/G3), distâncias
+    absolutas ou incrementais (G90/G91), plano do arco (G17/G18/G19),
+    polegadas ou milímetros (G20/G21, guardados em mm) e o avanço. Os arcos
+    viram cordas dentro de ARC_TOLERANCE, todas apontando para a linha do arco.
+    """
+
+    def __init__(self):
+        self.x = array("d")
+        self.y = array("d")
+        self.z = array("d")
+        self.a = array("d")
+        self.f = array("d")
+        self.motion = array("B")
+        self.line = array("i")
+        self.comments = {}
+
+        # Estado modal da máquina
+        self._pos = {"X": 0.0, "Y": 0.0, "Z": 0.0, "A": 0.0, "F": 0.0}
+        self._modal_motion = None
+        self._absolute = True
+        self._plane = 17
+        self._scale = 1.0
+
+    def push(self, text, line_index):
+        """Analisa uma linha e acrescenta os movimentos dela, se houver
+
+        A linha move quando tem uma palavra de eixo e um movimento ativo, seja
+        um G0/G1/G2/G3 na própria linha ou um anterior (movimento modal).
+        Números de bloco, comentários e palavras que a simulação não usa são
+        ignorados.
+        """
+        motion = None
+        non_motion = None
+        target = {}
+        centro = {"I": 0.0, "J": 0.0, "K": 0.0}
+        raio = None
+
+        for match in TOKEN.finditer(text):
+            if match.group(3) is None:
+                comment = (match.group(1) if match.group(1) is not None else match.group(2)).strip()
+                if comment and line_index not in self.comments:
+                    self.comments[line_index] = comment
+                continue
+
+            letter = match.group(3).upper()
+            value = float(match.group(4))
+            if letter == "G":
+                if value in (0, 1, 2, 3):
+                    motion = int(value)
+                elif value == 90:
+                    self._absolute = True
+                elif value == 91:
+                    self._absolute = False
+                elif value in (17, 18, 19):
+                    self._plane = int(value)
+                elif value == 20:
+                    self._scale = 25.4
+                elif value == 21:
+                    self._scale = 1.0
+                elif value == 80:
+                    self._modal_motion = None
+                elif value in NON_MOTION_G:
+                    non_motion = int(value)
+            elif letter in ("X", "Y", "Z", "A"):
+                target[letter] = value
+            elif letter == "F":
+                self._pos["F"] = value * self._scale
+            elif letter in centro:
+                centro[letter] = value * self._scale
+            elif letter == "R":
+                raio = value * self._scale
+
+        if not target or non_motion == 4:
+            if motion is not None:
+                self._modal_motion = motion
+            return
+
+        # Destino: G90 absoluto, G91 incremental (o eixo A não muda de unidade)
+        pos = self._pos
+        absolute = self._absolute or non_motion == 92
+        destino = {}
+        for axis in ("X", "Y", "Z", "A"):
+            scale = 1.0 if axis == "A" else self._scale
+            if axis not in target:
+                destino[axis] = pos[axis]
+            elif absolute:
+                destino[axis] = target[axis] * scale
+            else:
+                destino[axis] = pos[axis] + target[axis] * scale
+
+        if non_motion is not None:
+            # G92 redefine a posição atual sem mover; os demais não entram na simulação
+            if non_motion == 92:
+                pos.update(destino)
+            return
+
+        if motion is None:
+            motion = self._modal_motion
+        if motion is None:
+            return
+        self._modal_motion = motion
+
+        if motion >= 2:
+            self._arc(motion == 2, destino, centro, raio, line_index)
+        pos.update(destino)
+        self._append(MOTION_RAPID if motion == MOTION_RAPID else MOTION_FEED, line_index)
+
+    def build(self, source):
+        return GCodeProgram(self.x, self.y, self.z, self.a, self.f, self.motion, self.line,
+                            source, self.comments)
+
+    def _arc(self, clockwise, destino, centro, raio, line_index):
+        # Pontos intermediários das cordas de um arco (o ponto final é acrescentado
+        # por push). O arco fica no plano ativo; o terceiro eixo (e A) anda em
+        # linha reta, formando uma hélice. O centro vem de I/J/K (relativos ao
+        # início) ou de R, em que R negativo escolhe o arco maior que 180°; com
+        # I/J/K e o fim igual ao início o arco é uma volta completa.
+        pos = self._pos
+        # Eixos do plano (u, v) e eixo linear, na ordem que define o sentido horário
+        u_axis, v_axis, w_axis = {18: ("Z", "X", "Y"), 19: ("Y", "Z", "X")}.get(self._plane, ("X", "Y", "Z"))
+        offsets = {"X": centro["I"], "Y": centro["J"], "Z": centro["K"]}
+        u0, v0 = pos[u_axis], pos[v_axis]
+        u1, v1 = destino[u_axis], destino[v_axis]
+        du, dv = offsets[u_axis], offsets[v_axis]
+
+        if raio is not None:
+            # Centro pelo raio: sobre a mediatriz da corda, do lado dado pelo sentido e pelo sinal de R
+            cu = u1 - u0
+            cv = v1 - v0
+            chord = math.hypot(cu, cv)
+            if chord == 0:
+                return
+            h = -math.sqrt(max(0.0, 4 * raio * raio - chord * chord)) / chord
+            if not clockwise:
+                h = -h
+            if raio < 0:
+                h = -h
+            du = 0.5 * (cu - cv * h)
+            dv = 0.5 * (cv + cu * h)
+
+        center_u = u0 + du
+        center_v = v0 + dv
+        radius = math.hypot(du, dv)
+        if radius == 0:
+            return
+
+        su = -du
+        sv = -dv
+        eu = u1 - center_u
+        ev = v1 - center_v
+        sweep = math.atan2(su * ev - sv * eu, su * eu + sv * ev)
+        if clockwise:
+            if sweep >= -1e-9:
+                sweep -= 2 * math.pi
+        elif sweep <= 1e-9:
+            sweep += 2 * math.pi
+
+        # Segmentos com a flecha dentro da tolerância
+        step = 2 * math.acos(1 - ARC_TOLERANCE / radius) if radius > ARC_TOLERANCE else math.pi / 2
+        segments = min(MAX_ARC_SEGMENTS, max(1, math.ceil(abs(sweep) / step)))
+
+        start = dict(pos)
+        start_angle = math.atan2(sv, su)
+        for s in range(1, segments):
+            t = s / segments
+            angle = start_angle + sweep * t
+            pos[u_axis] = center_u + radius * math.cos(angle)
+            pos[v_axis] = center_v + radius * math.sin(angle)
+            pos[w_axis] = start[w_axis] + (destino[w_axis] - start[w_axis]) * t
+            pos["A"] = start["A"] + (destino["A"] - start["A"]) * t
+            self._append(MOTION_FEED, line_index)
+
+    def _append(self, motion, line_index):
+        pos = self._pos
+        self.x.append(pos["X"])
+        self.y.append(pos["Y"])
+        self.z.append(pos["Z"])
+        self.a.append(pos["A"])
+        self.f.append(pos["F"])
+        self.motion.append(motion)
+        self.line.append(line_index)
+
+
+def parse_program(lines):
+    """Analisa um programa (lista ou gerador de linhas), expandindo os subprogramas"""
+    source = list(lines)
+    order = expand_subprogram_indices(source)
+    builder = ProgramBuilder()
+    for i in order if order is not None else range(len(source)):
+        builder.push(source[i], i)
+    return builder.build(source)
+
+
+def parse_program_text(text):
+    """Analisa o texto de um programa (um arquivo .nc importado, por exemplo)
+
+    As linhas são separadas como em parseGCodeText: quebras LF ou CRLF, sem
+    uma linha vazia depois da última quebra.
+    """
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return parse_program(line[:-1] if line.endswith("\r") else line for line in lines)
@@ -0,0 +1,362 @@
+"""
+Varredura de parâmetros: procura apY, passoLateral e avanco de menor tempo de ciclo
+
+Cada combinação da grade é avaliada por um modelo fechado do tempo de ciclo
+(closed_form_lengths): com os níveis Y em progressão aritmética e os passes
+laterais de compute_passes_x, as distâncias de um entalhe saem de somas
+diretas, sem percorrer os movimentos como plan_passes. A geometria depende só
+de apY e passoLateral; o avanço apenas escala o tempo de corte, então cada
+geometria é calculada uma vez para todos os avanços. Com avanço adaptativo
+(avancoMaximo), o comprimento de corte é separado pelo fator de afinamento do
+cavaco de cada mergulho, e cada avanço da grade passa pelo mesmo escalonamento
+do gerador; avanços acima de avancoMaximo são descartados.
+
+Combinações fora dos limites da máquina (carga por dente, passo lateral
+máximo, material por passe máximo) são descartadas, e o resultado é a
+fronteira de Pareto entre tempo de ciclo e passo lateral efetivo (fração do
+diâmetro da ferramenta): cada ponto da fronteira é o mais rápido possível
+sem aumentar o passo lateral.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from .generator import (
+    chip_thinning_factor, compute_passes_x, compute_retract_y, compute_rotary_angles, order_passes_x, scheduled_feed,
+)
+from .params import Y_RESOLUTION
+from .planner import DEFAULT_RAPID_RATE, DEFAULT_ROTARY_RATE, compute_rotary_travel, compute_y_levels, printed
+
+
+@dataclass
+class MachineLimits:
+    """Limites da máquina e da ferramenta usados para descartar combinações"""
+
+    rpm: float = 3000  # rotação do fuso (rpm)
+    flutes: int = 2  # número de arestas de corte
+    max_chip_load: float = 0.05  # avanço máximo por dente (mm)
+    max_stepover: float = 0.9  # passo lateral efetivo máximo (fração do diâmetro)
+    max_ap: Optional[float] = None  # material por passe máximo (mm)
+    rapid_rate: float = DEFAULT_RAPID_RATE  # mm/min
+    rotary_rate: float = DEFAULT_ROTARY_RATE  # graus/min
+
+
+@dataclass
+class SweepResult:
+    """Uma combinação avaliada"""
+
+    apY: float
+    passoLateral: float
+    avanco: float
+    passes: int  # passes laterais por nível Y
+    levels: int  # níveis Y por entalhe, incluindo o nível final
+    stepover: float  # passo lateral efetivo / diâmetro da ferramenta
+    chipLoad: float  # mm/dente
+    feedTime: float  # s
+    cycleTime: float  # s
+
+
+def parse_range(text):
+    """Converte "inicio:fim:passo" (ou um valor único) na lista de valores
+
+    Os valores são arredondados a 0,001 mm, a resolução do programa.
+    """
+    parts = [float(p.replace(",", ".")) for p in str(text).split(":")]
+    if len(parts) == 1:
+        return [parts[0]]
+    if len(parts) != 3 or parts[2] <= 0 or parts[1] < parts[0]:
+        raise ValueError(f"Faixa inválida: {text} (use inicio:fim:passo)")
+    inicio, fim, passo = parts
+    count = int(math.floor((fim - inicio) / passo + 1e-9)) + 1
+    return [round(inicio + i * passo, 3) for i in range(count)]
+
+
+def effective_stepover(passos_x, diametro):
+    """Passo lateral efetivo entre passes vizinhos, como fração do diâmetro
+
+    Com um passe só (abertura até o diâmetro da ferramenta) não há passo lateral.
+    """
+    if len(passos_x) < 2:
+        return 0.0
+    crescente = sorted(passos_x)
+    maior = max(b - a for a, b in zip(crescente, crescente[1:]))
+    return min(maior / diametro, 1.0)
+
+
+def level_travel(passos_x, ordem, x_inicial, nivel):
+    """Deslocamento em X de um nível com os passes na ordem dada
+
+    Retorna (distância, X final escrito no programa, último passe sem arredondamento).
+    """
+    ordenados = order_passes_x(passos_x, ordem, x_inicial, nivel)
+    x = x_inicial
+    distancia = 0.0
+    for p in ordenados:
+        distancia += abs(printed(p, 3) - x)
+        x = printed(p, 3)
+    if ordem == "center-out":
+        # Volta para X0 no fim de cada nível
+        distancia += abs(x)
+        x = 0
+    return distancia, x, ordenados[-1]
+
+
+def closed_form_levels(params):
+    """Níveis Y regulares por entalhe e como termina o último passo, sem percorrer os níveis
+
+    Mesmo resultado de compute_y_levels: (número de níveis, "exact", "extra"
+    ou "none"). O nível em que o passo chega ao raio final é estimado pela
+    razão profundidade/apY e confirmado com a comparação do gerador, o Y
+    seguinte arredondado a 0,001 mm contra o raio final sem arredondamento.
+    Com apY fora da resolução do programa os arredondamentos se acumulam de
+    nível em nível, e os níveis são percorridos por compute_y_levels.
+    """
+    raio_inicial = params.diametroInicial / 2
+    raio_final = params.diametroFinal / 2
+    ap = abs(params.apY)
+    if ap < Y_RESOLUTION or ap != printed(ap, 3):
+        y_levels, final = compute_y_levels(params)
+        return len(y_levels), final
+
+    ao_contrario = raio_inicial > raio_final
+    incremento = -ap if ao_contrario else ap
+    primeiro = printed(raio_inicial + incremento, 3)
+
+    def nivel(k):
+        # Y do nível k >= 1 como o programa o escreve (passos de 0,001 mm não acumulam erro)
+        return raio_inicial if k == 0 else printed(primeiro + (k - 1) * incremento, 3)
+
+    def chegou(y):
+        return y <= raio_final if ao_contrario else y >= raio_final
+
+    # Primeiro nível k >= 1 que chega ao raio final: os níveis 0..k-1 são cortados
+    k = max(1, math.ceil((raio_final - primeiro) / incremento) + 1)
+    while k > 1 and chegou(nivel(k - 1)):
+        k -= 1
+    while not chegou(nivel(k)):
+        k += 1
+
+    if nivel(k) == raio_final:
+        return k, "exact"
+    return k, "extra" if nivel(k - 1) != raio_final else "none"
+
+
+def closed_form_lengths(params):
+    """Distâncias de avanço rápido e de corte do programa, sem percorrer os movimentos
+
+    Reproduz a sequência de plan_passes com somas fechadas: os níveis Y são
+    tratados como progressão aritmética a partir do raio inicial e o recuo Y,
+    que fica fora da faixa cortada, entra pela média dos níveis. Retorna
+    (rapid_mm, feed_mm, número de níveis Y por entalhe incluindo o final,
+    engajamento), onde engajamento associa cada fator de afinamento do cavaco
+    (chip_thinning_factor) ao comprimento de corte feito com ele.
+    """
+    raio_inicial = params.diametroInicial / 2
+    raio_final = params.diametroFinal / 2
+    passos_x, deslocamento_x = compute_passes_x(params)
+    recuo = printed(compute_retract_y(params), 2)
+    num_entalhes = math.ceil(params.numEntalhes) if params.numEntalhes > 0 else 0
+    ordem = params.ordemPasses or "center-out"
+
+    # Níveis Y: L níveis regulares e o nível final (exato: só as bordas; extra: todos os passes;
+    # none: o último nível regular já está no raio final)
+    niveis, final = closed_form_levels(params)
+    incremento = abs(params.apY) if raio_final > raio_inicial else -abs(params.apY)
+    y_medio = raio_inicial + incremento * (niveis - 1) / 2
+
+    angulo = params.anguloConico * math.pi / 180 if params.chavetaConica else 0
+    conico = abs(params.profundidadeFinal) * math.tan(angulo)
+    z_inicio = params.pontoInicioZ
+    z_retracao = z_inicio if params.planoSeguroZ is None else params.planoSeguroZ
+    z_fundo = params.profundidadeFinal
+    retracao = abs(z_retracao - z_fundo)
+    mergulho = math.hypot(conico, retracao)
+    mergulho_inicial = math.hypot(conico, abs(z_inicio - z_fundo))
+
+    n = len(passos_x)
+    lateral = deslocamento_x > 0
+
+    # Comprimento de corte por fator de afinamento do cavaco (um nível começa sem passes cortados)
+    raio = params.diametroFerramenta / 2
+    engajamento = {}
+
+    def somar_engajamento(passes, vezes):
+        cortados = []
+        for x in passes:
+            fator = chip_thinning_factor(x, cortados, raio)
+            cortados.append(x)
+            engajamento[fator] = engajamento.get(fator, 0.0) + mergulho * vezes
+
+    # Níveis regulares: por passe, recuo Y após o corte; entre passes, retração Z e volta ao nível
+    feed = niveis * n * mergulho + (mergulho_inicial - mergulho)
+    rapid = niveis * (n * abs(recuo - y_medio - conico) + (n - 1) * (retracao + abs(y_medio - recuo)) + retracao)
+    # Descida de cada nível a partir do recuo (Y do nível seguinte)
+    rapid += (niveis - 1) * abs(y_medio + incremento / 2 - recuo)
+
+    # Deslocamento X: a partir do nível 1 os níveis se repetem com período 2
+    # (a serpentina e o vizinho mais próximo alternam o sentido)
+    x_fim = 0
+    ultimo_passe = 0
+    if lateral:
+        estados = []
+        for nivel in range(min(niveis, 3)):
+            inicio = 0 if nivel == 0 or ordem == "center-out" else ultimo_passe
+            d, x_fim, ultimo_passe = level_travel(passos_x, ordem, inicio, nivel)
+            estados.append((d, x_fim, ultimo_passe, order_passes_x(passos_x, ordem, inicio, nivel)))
+        rapid += estados[0][0]
+        somar_engajamento(estados[0][3], 1)
+        if niveis > 1:
+            impares = niveis // 2  # níveis 1, 3, 5...
+            pares = (niveis - 1) // 2  # níveis 2, 4, 6...
+            rapid += estados[1][0] * impares + (estados[2][0] * pares if pares else 0)
+            somar_engajamento(estados[1][3], impares)
+            if pares:
+                somar_engajamento(estados[2][3], pares)
+        _, x_fim, ultimo_passe, _ = estados[min(niveis - 1, 2 if (niveis - 1) % 2 == 0 else 1)]
+    else:
+        somar_engajamento([0], niveis)
+    # O primeiro mergulho do entalhe (rasgo cheio) parte do Z de início
+    engajamento[1.0] = engajamento.get(1.0, 0.0) + (mergulho_inicial - mergulho)
+
+    y_final = printed(raio_final, 3)
+    if final == "none":
+        passes_finais = []
+    elif final == "exact":
+        bordas = [deslocamento_x, -deslocamento_x] if lateral else [0]
+        if lateral and ordem != "center-out":
+            bordas = order_passes_x([-deslocamento_x, deslocamento_x], ordem, ultimo_passe, niveis)
+        passes_finais = bordas
+    else:
+        passes_finais = passos_x if lateral else [0]
+        if lateral:
+            passes_finais = order_passes_x(passos_x, ordem, ultimo_passe, niveis)
+    m = len(passes_finais)
+    if m:
+        rapid += abs(y_final - recuo)
+        feed += m * mergulho
+        somar_engajamento(passes_finais, 1)
+        rapid += m * abs(recuo - y_final - conico) + (m - 1) * (retracao + abs(y_final - recuo))
+        if lateral:
+            x = x_fim
+            for p in passes_finais:
+                rapid += abs(printed(p, 3) - x)
+                x = printed(p, 3)
+            x_fim = x
+        rapid += abs(z_inicio - z_fundo)
+    else:
+        # Sem nível final: só volta do plano de retração ao Z de início
+        rapid += abs(z_inicio - z_retracao)
+
+    # Início de cada entalhe: Z de início, raio inicial e X0 (o primeiro parte do cabeçalho em Z100)
+    inicio_seguinte = abs(raio_inicial - recuo) + abs(x_fim)
+    rapid_total = abs(100 - z_inicio) + raio_inicial
+    if num_entalhes > 0:
+        rapid_total += rapid * num_entalhes + inicio_seguinte * (num_entalhes - 1)
+        rapid_total += abs(100 - z_inicio)
+    engajamento = {fator: mm * num_entalhes for fator, mm in engajamento.items()}
+    return rapid_total, feed * num_entalhes, niveis + (1 if m else 0), engajamento
+
+
+def closed_form_feed_time(feed, engajamento, avanco, avanco_maximo=None):
+    """Tempo de corte (s) com o avanço dado; com avanco_maximo, pelo escalonamento do gerador"""
+    if avanco_maximo is None:
+        return feed / avanco * 60
+    return sum(mm / scheduled_feed(avanco, fator, avanco_maximo) for fator, mm in engajamento.items()) * 60
+
+
+def closed_form_cycle_time(params, rapid_rate=DEFAULT_RAPID_RATE, rotary_rate=DEFAULT_ROTARY_RATE):
+    """Tempo de ciclo estimado pelo modelo fechado, em segundos"""
+    rapid, feed, _, engajamento = closed_form_lengths(params)
+    rotary = 0
+    if params.numEntalhes > 0:
+        rotary = compute_rotary_travel(compute_rotary_angles(params), params.ordemRotacao or "sequential")
+    feed_time = closed_form_feed_time(feed, engajamento, params.avanco, params.avancoMaximo)
+    return rapid / rapid_rate * 60 + feed_time + rotary / rotary_rate * 60
+
+
+def evaluate_geometries(params, geometries, feeds, limits):
+    """Avalia um bloco de combinações (apY, passoLateral) para todos os avanços
+
+    Roda em um processo separado; retorna a lista de SweepResult viáveis.
+    """
+    rotary = 0
+    if params.numEntalhes > 0:
+        rotary = compute_rotary_travel(compute_rotary_angles(params), params.ordemRotacao or "sequential")
+    fixed_time = rotary / limits.rotary_rate * 60
+
+    results = []
+    for ap_y, passo in geometries:
+        candidate = replace(params, apY=ap_y, passoLateral=passo)
+        passos_x, _ = compute_passes_x(candidate)
+        stepover = effective_stepover(passos_x, params.diametroFerramenta)
+        if stepover > limits.max_stepover:
+            continue
+        rapid, feed, levels, engajamento = closed_form_lengths(candidate)
+        rapid_time = rapid / limits.rapid_rate * 60
+        for avanco in feeds:
+            chip_load = avanco / (limits.rpm * limits.flutes)
+            if chip_load > limits.max_chip_load:
+                continue
+            if params.avancoMaximo is not None and avanco > params.avancoMaximo:
+                # Avanço do rasgo cheio acima do avanço máximo: parâmetros inválidos
+                continue
+            feed_time = closed_form_feed_time(feed, engajamento, avanco, params.avancoMaximo)
+            results.append(SweepResult(
+                apY=ap_y,
+                passoLateral=passo,
+                avanco=avanco,
+                passes=len(passos_x),
+                levels=levels,
+                stepover=stepover,
+                chipLoad=chip_load,
+                feedTime=feed_time,
+                cycleTime=rapid_time + feed_time + fixed_time,
+            ))
+    return results
+
+
+def pareto_front(results):
+    """Fronteira de Pareto entre tempo de ciclo e passo lateral efetivo (ambos a minimizar)
+
+    Em empates fica a combinação de menor apY e menor passo lateral nominal.
+    """
+    ordenados = sorted(results, key=lambda r: (r.cycleTime, r.stepover, r.apY, r.passoLateral))
+    front = []
+    melhor_passo = math.inf
+    for r in ordenados:
+        if r.stepover < melhor_passo - 1e-12:
+            front.append(r)
+            melhor_passo = r.stepover
+    return front
+
+
+def sweep(params, ap_values, stepover_values, feed_values, limits=None, workers=None):
+    """Avalia todas as combinações da grade e retorna (viáveis, fronteira de Pareto)
+
+    ``stepover_values`` são frações do diâmetro da ferramenta (passoLateral =
+    fração x diâmetro). A grade é dividida em blocos avaliados em paralelo
+    quando workers != 1.
+    """
+    limits = limits or MachineLimits()
+    ap_values = [ap for ap in ap_values if ap > 0 and (limits.max_ap is None or ap <= limits.max_ap)]
+    geometries = [(ap, round(frac * params.diametroFerramenta, 3))
+                  for ap in ap_values for frac in stepover_values if frac > 0]
+    feeds = [f for f in feed_values if f > 0]
+
+    if workers == 1 or len(geometries) < 2:
+        results = evaluate_geometries(params, geometries, feeds, limits)
+    else:
+        count = workers or os.cpu_count() or 1
+        # Alguns blocos por processo equilibram a carga sem custo de comunicação
+        size = max(1, math.ceil(len(geometries) / (count * 4)))
+        chunks = [geometries[i:i + size] for i in range(0, len(geometries), size)]
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(evaluate_geometries, params, chunk, feeds, limits) for chunk in chunks]
+            for future in futures:
+                results.extend(future.result())
+
+    return results, pareto_front(results)
@@ -0,0 +1,115 @@
+"""
+Cache em disco dos programas gerados pela interface
+
+A interface identifica cada geração pelo hash da forma canônica dos
+parâmetros de usinagem (lib/generation-cache.ts) e guarda o resultado aqui,
+na pasta de dados do aplicativo, para reaproveitá-lo entre sessões. Cada
+entrada é um arquivo JSON; acima dos limites são removidas as entradas usadas
+há mais tempo (data de modificação, atualizada a cada leitura).
+"""
+
+import os
+import re
+import threading
+
+# Limites padrão do cache (número de entradas e tamanho total)
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Chaves são hashes hexadecimais: nunca formam caminhos fora da pasta do cache
+KEY_PATTERN = re.compile(r"^[0-9a-f]{8,64}$")
+ENTRY_SUFFIX = ".json"
+
+
+def app_data_dir():
+    """Pasta de dados do aplicativo (a mesma usada pela licença)"""
+    base = os.environ.get('APPDATA') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    return os.path.join(base, 'EntalheCNC_CAM')
+
+
+class GenerationDiskCache:
+    """Cache LRU de programas gerados, um arquivo por entrada"""
+
+    def __init__(self, folder=None, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.folder = folder or os.path.join(app_data_dir(), 'cache', 'generation')
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        if not isinstance(key, str) or not KEY_PATTERN.match(key):
+            raise ValueError(f"Chave de cache inválida: {key!r}")
+        return os.path.join(self.folder, key + ENTRY_SUFFIX)
+
+    def get(self, key):
+        """Retorna o conteúdo da entrada (ou None) e a marca como usada agora"""
+        path = self._path(key)
+        with self._lock:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    payload = f.read()
+                os.utime(path)
+                return payload
+            except OSError:
+                return None
+
+    def put(self, key, payload):
+        """Grava a entrada e remove as mais antigas acima dos limites"""
+        path = self._path(key)
+        with self._lock:
+            os.makedirs(self.folder, exist_ok=True)
+            # Grava em arquivo temporário e troca: uma leitura nunca vê entrada pela metade
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+            self._evict()
+
+    def clear(self):
+        """Remove todas as entradas; retorna quantas foram removidas"""
+        removed = 0
+        with self._lock:
+            for path, _, _ in self._entries():
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def stats(self):
+        """Número de entradas e tamanho total em bytes"""
+        with self._lock:
+            entries = self._entries()
+        return {'entries': len(entries), 'bytes': sum(size for _, _, size in entries)}
+
+    def _entries(self):
+        """Lista (caminho, data de uso, tamanho) das entradas, da mais antiga para a mais recente"""
+        entries = []
+        try:
+            names = os.listdir(self.folder)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.folder, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, st.st_mtime, st.st_size))
+        entries.sort(key=lambda entry: entry[1])
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, _, size in entries)
+        # Mantém sempre a entrada mais recente, mesmo que sozinha passe do limite
+        while len(entries) > 1 and (len(entries) > self.max_entries or total > self.max_bytes):
+            path, _, size = entries.pop(0)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
@@ -6,6 +6,8 @@ import signal
 import platform
 import sys
 import os
+import socket
+import threading
 from license_manager import LicenseManager
 
 if platform.system() == "Windows":
@@ -40,12 +42,73 @@ else:
 # --------------------
 # Inicia o servidor Next.js em segundo plano
 # --------------------
-print("Iniciando servidor Next.js (pnpm dev)...")
-dev_process = subprocess.Popen("pnpm dev", shell=True)
+DEFAULT_PORT = 3000
+# Portas alternativas, sempre as mesmas (mesma lista do launcher de produção)
+FALLBACK_PORTS = (3001, 3002, 3003, 3004, 3005)
+# Tempo máximo de espera pelo servidor de desenvolvimento (segundos)
+DEV_SERVER_TIMEOUT = 120
+# Trechos impressos pelo "next dev" quando o servidor está aceitando conexões
+READY_MARKERS = ("Ready in", "ready - started server")
 
-# Aguarda alguns segundos para o servidor levantar
-# (ajuste se necessário)
-time.sleep(5)
+def _port_available(port):
+    """Verifica se a porta pode ser usada pelo servidor de desenvolvimento"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind(("", port))
+            return True
+        except OSError:
+            return False
+
+def _choose_port():
+    """Usa a porta padrão ou a primeira alternativa fixa livre
+
+    O armazenamento do navegador pertence à origem localhost:<porta>; só em
+    último caso o sistema escolhe uma porta livre (e os dados salvos não
+    aparecem nesta sessão).
+    """
+    for candidate in (DEFAULT_PORT,) + FALLBACK_PORTS:
+        if _port_available(candidate):
+            if candidate != DEFAULT_PORT:
+                print(f"Porta {DEFAULT_PORT} ocupada, usando a porta {candidate}")
+            return candidate
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("", 0))
+        port = sock.getsockname()[1]
+    print(f"AVISO: portas {DEFAULT_PORT}-{FALLBACK_PORTS[-1]} ocupadas, usando a porta {port}; "
+          "o cache e as configurações salvas não serão carregados")
+    return port
+
+port = _choose_port()
+server_ready = threading.Event()
+
+def _watch_dev_output(process):
+    """Repassa a saída do Next.js e sinaliza quando o servidor está pronto"""
+    for line in process.stdout:
+        print(line, end="")
+        if not server_ready.is_set() and any(marker in line for marker in READY_MARKERS):
+            server_ready.set()
+    # Processo encerrou: libera quem estiver aguardando
+    process.wait()
+    server_ready.set()
+
+print(f"Iniciando servidor Next.js (pnpm dev) na porta {port}...")
+dev_process = subprocess.Popen(
+    f"pnpm dev --port {port}",
+    shell=True,
+    stdout=subprocess.PIPE,
+    stderr=subprocess.STDOUT,
+    text=True,
+    encoding="utf-8",
+    errors="replace",
+)
+threading.Thread(target=_watch_dev_output, args=(dev_process,), daemon=True).start()
+
+# Aguarda o Next.js anunciar que está pronto
+if not server_ready.wait(timeout=DEV_SERVER_TIMEOUT):
+    print("AVISO: Tempo limite excedido ao aguardar o servidor Next.js")
+elif dev_process.poll() is not None:
+    print("ERRO: O servidor Next.js encerrou inesperadamente.")
+    sys.exit(1)
 
 # Registra função para encerrar o servidor quando a aplicação fechar
 def _cleanup():
@@ -63,7 +126,7 @@ atexit.register(_cleanup)
 
 webview.create_window(
     "ENTALHE CNC CAM",
-    "http://localhost:3000",
+    f"http://localhost:{port}",
     width=width,
     height=height,
     resizable=True
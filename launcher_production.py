@@ -1,49 +1,108 @@
-import webview
-import subprocess
 import time
+
+# Marca o instante de início para medir o tempo de inicialização
+_LAUNCH_T0 = time.perf_counter()
+_LAUNCH_WALL_T0 = time.time()
+
 import atexit
-import signal
 import platform
 import sys
 import os
 import http.server
 import socketserver
 import threading
-from license_manager import LicenseManager
-
-if platform.system() == "Windows":
-    import ctypes
-    user32 = ctypes.windll.user32
-    width = user32.GetSystemMetrics(0)
-    height = user32.GetSystemMetrics(1)
-else:
+import urllib.parse
+from asset_cache import AssetTable
+from startup_profile import StartupProfiler
+
+# Módulos pesados (webview, tkinter, ctypes) são importados apenas quando
+# necessários, dentro das funções que os utilizam, para reduzir o tempo de
+# inicialização do executável.
+
+profiler = StartupProfiler(_LAUNCH_T0, _LAUNCH_WALL_T0)
+
+def _elapsed_ms():
+    """Retorna o tempo decorrido desde o início do launcher, em milissegundos"""
+    return profiler.elapsed_ms()
+
+# --profile-startup imprime o tempo de cada fase da inicialização
+PROFILE_STARTUP = "--profile-startup" in sys.argv[1:]
+# Opções usadas pelo benchmark_startup.py: grava o perfil em JSON e fecha a
+# janela assim que a interface termina de carregar
+EXIT_AFTER_LOAD = "--exit-after-load" in sys.argv[1:]
+STARTUP_REPORT = next((arg.split("=", 1)[1] for arg in sys.argv[1:]
+                       if arg.startswith("--startup-report=")), None)
+
+def get_screen_size():
+    """Retorna a resolução da tela principal"""
+    if platform.system() == "Windows":
+        import ctypes
+        user32 = ctypes.windll.user32
+        return user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)
     # Valor aproximado para telas comuns em outros sistemas
-    width, height = 1920, 1080
+    return 1920, 1080
+
+def show_error(message):
+    """Exibe uma mensagem de erro em uma caixa de diálogo"""
+    import tkinter as tk
+    from tkinter import messagebox
+    root = tk.Tk()
+    root.withdraw()  # Esconde a janela principal
+    messagebox.showerror("Erro", message)
+    root.destroy()
 
 # --------------------
 # Verificação de Licença
 # --------------------
-print("Verificando licença...")
-license_manager = LicenseManager()
-is_licensed, message = license_manager.check_license()
-
-if not is_licensed:
-    print(f"Licença inválida: {message}")
-    print("Iniciando processo de ativação...")
-    
-    # Tenta ativar via GUI
-    if not license_manager.activate_license_gui():
-        print("Ativação cancelada ou falhou. Encerrando aplicação.")
-        sys.exit(1)
-    
-    print("Licença ativada com sucesso!")
-else:
-    print("Licença válida. Iniciando aplicação...")
+def check_license():
+    """Verifica a licença e, se necessário, inicia a ativação. Retorna False se não ativada"""
+    from license_manager import LicenseManager
+
+    print("Verificando licença...")
+    license_manager = LicenseManager()
+    is_licensed, message = license_manager.check_license()
+
+    if not is_licensed:
+        print(f"Licença inválida: {message}")
+        print("Iniciando processo de ativação...")
+
+        # Tenta ativar via GUI
+        if not license_manager.activate_license_gui():
+            print("Ativação cancelada ou falhou. Encerrando aplicação.")
+            return False
+
+        print("Licença ativada com sucesso!")
+    else:
+        print("Licença válida. Iniciando aplicação...")
+    return True
 
 # --------------------
 # Servidor HTTP para arquivos estáticos
 # --------------------
 PORT = 3000
+# Portas alternativas, sempre as mesmas: o armazenamento do navegador (cache de
+# geração, perfil da máquina, preferências) pertence à origem localhost:<porta>,
+# então uma porta diferente a cada abertura perderia esses dados
+FALLBACK_PORTS = (3001, 3002, 3003, 3004, 3005)
+
+# Modo do servidor: "threaded" (padrão, HTTP/1.1 com keep-alive e uma thread
+# por conexão) ou "single" (TCPServer sequencial HTTP/1.0, modo antigo).
+# Pode ser definido por --server-mode=<modo> ou pela variável ENTALHE_SERVER_MODE.
+SERVER_MODES = ("threaded", "single")
+
+def get_server_mode():
+    """Determina o modo do servidor a partir da linha de comando ou do ambiente"""
+    mode = os.environ.get("ENTALHE_SERVER_MODE", "threaded")
+    for arg in sys.argv[1:]:
+        if arg.startswith("--server-mode="):
+            mode = arg.split("=", 1)[1]
+    mode = mode.strip().lower()
+    if mode not in SERVER_MODES:
+        print(f"AVISO: Modo de servidor desconhecido '{mode}', usando 'threaded'")
+        mode = "threaded"
+    return mode
+
+SERVER_MODE = get_server_mode()
 
 # Determina o caminho para os arquivos estáticos
 def get_static_dir():
@@ -54,188 +113,593 @@ def get_static_dir():
             base_dir = sys._MEIPASS
         else:
             base_dir = os.path.dirname(sys.executable)
-        
+
         # Tenta diferentes locais possíveis para a pasta out
         possible_dirs = [
             os.path.join(base_dir, "out"),
             os.path.join(os.path.dirname(base_dir), "out"),
             os.path.join(os.path.dirname(sys.executable), "out")
         ]
-        
+
         for dir_path in possible_dirs:
             if os.path.exists(dir_path):
                 print(f"Encontrou pasta 'out' em: {dir_path}")
                 return dir_path
-    
+
     # Modo de desenvolvimento ou pasta não encontrada nos locais específicos para PyInstaller
     return os.path.join(os.path.dirname(os.path.abspath(__file__)), "out")
 
-static_dir = get_static_dir()
-
-if not os.path.exists(static_dir):
+def report_missing_static_dir(static_dir):
+    """Informa ao usuário que a pasta out não foi encontrada"""
     print(f"ERRO: Pasta 'out' não encontrada em {static_dir}")
     print("Certifique-se de que os arquivos estáticos foram copiados corretamente.")
-    
+
     # Evita o uso de input() que causa erros quando compilado
     try:
         # Verifica se estamos em modo compiled/frozen
         if getattr(sys, 'frozen', False):
             # Se estiver em modo compilado, usa messagebox
-            import tkinter as tk
-            from tkinter import messagebox
-            root = tk.Tk()
-            root.withdraw()  # Esconde a janela principal
-            messagebox.showerror("Erro", f"Pasta 'out' não encontrada em {static_dir}\n\nCertifique-se de que os arquivos estáticos foram copiados corretamente.")
-            root.destroy()
+            show_error(f"Pasta 'out' não encontrada em {static_dir}\n\nCertifique-se de que os arquivos estáticos foram copiados corretamente.")
         else:
             # Modo normal (não compilado)
             input("Pressione Enter para sair...")
     except Exception:
         # Falha silenciosa, apenas continue com o sys.exit
         pass
-        
-    sys.exit(1)
-
-print(f"Servindo arquivos estáticos de: {static_dir}")
-
-class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, directory=static_dir, **kwargs)
-    
-    def end_headers(self):
-        self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
-        self.send_header('Pragma', 'no-cache')
-        self.send_header('Expires', '0')
-        super().end_headers()
-    
+
+def load_assets(static_dir):
+    """Carrega toda a pasta out para a memória uma única vez"""
+    t0 = time.perf_counter()
+    asset_table = AssetTable(static_dir).load()
+    print(f"[tempo] {len(asset_table)} arquivos ({asset_table.total_bytes / 1024:.0f} KB) "
+          f"carregados em memória em {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+    def precompress_assets():
+        """Calcula as variantes comprimidas sem atrasar a abertura da janela"""
+        t0 = time.perf_counter()
+        try:
+            asset_table.precompress()
+            print(f"[tempo] Variantes comprimidas prontas em {(time.perf_counter() - t0) * 1000:.0f} ms")
+        except Exception as e:
+            print(f"Erro ao comprimir arquivos estáticos: {e}")
+
+    threading.Thread(target=precompress_assets, daemon=True).start()
+    return asset_table
+
+class CustomHTTPRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Serve os arquivos da tabela em memória, sem acessar o disco"""
+    # HTTP/1.1 mantém a conexão aberta entre requisições (keep-alive), permitindo
+    # que o webview reutilize conexões ao buscar os chunks do bundle Next.js
+    protocol_version = "HTTP/1.1" if SERVER_MODE == "threaded" else "HTTP/1.0"
+    # Tabela de arquivos estáticos, definida em start_server()
+    asset_table = None
+
+    def do_GET(self):
+        self.send_asset(head_only=False)
+
+    def do_HEAD(self):
+        self.send_asset(head_only=True)
+
     def translate_path(self, path):
-        """Traduz o caminho da URL para o sistema de arquivos.
+        """Traduz o caminho da requisição para a chave da tabela de arquivos.
         Corrige o prefixo /ENTALHECNCCAM/ removendo-o do caminho"""
+        path = path.split('?', 1)[0].split('#', 1)[0]
+        path = urllib.parse.unquote(path)
         # Remover prefixo ENTALHECNCCAM se presente
         if '/ENTALHECNCCAM/' in path:
-            print(f"Corrigindo caminho: {path}")
             path = path.replace('/ENTALHECNCCAM/', '/')
-            print(f"Caminho corrigido: {path}")
-            
-        # Chama a implementação original após corrigir o caminho
-        return super().translate_path(path)
-
-def start_server():
-    """Inicia o servidor HTTP em uma thread separada"""
-    global httpd
+        return path or '/'
+
+    def send_asset(self, head_only):
+        """Envia o arquivo solicitado escolhendo a variante comprimida adequada"""
+        status = 200
+        asset = self.asset_table.lookup(self.translate_path(self.path))
+        if asset is None:
+            status = 404
+            asset = self.asset_table.lookup('/404.html')
+            if asset is None:
+                self.send_error(404, "Arquivo não encontrado")
+                return
+
+        encoding, body, etag = asset.select(self.headers.get('Accept-Encoding'))
+
+        # Revalidação: o cliente já tem exatamente esta representação
+        if status == 200 and self._etag_matches(etag):
+            self.send_response(304)
+            self._send_cache_headers(asset, etag)
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header('Content-Type', asset.content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        if status == 200:
+            self._send_cache_headers(asset, etag)
+        else:
+            self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def _etag_matches(self, etag):
+        if_none_match = self.headers.get('If-None-Match')
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in tags or etag in tags
+
+    def _send_cache_headers(self, asset, etag):
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', asset.cache_control)
+        if asset.variants:
+            self.send_header('Vary', 'Accept-Encoding')
+
+class ThreadedHTTPServer(http.server.ThreadingHTTPServer):
+    """Servidor HTTP que atende cada conexão em uma thread própria"""
+    # Threads de conexão não impedem o encerramento da aplicação
+    daemon_threads = True
+    # No Windows, SO_REUSEADDR permitiria abrir a porta mesmo já ocupada por
+    # outro processo; sem ele o bind falha e usamos uma porta alternativa
+    allow_reuse_address = platform.system() != "Windows"
+
+def create_server(port):
+    """Cria o servidor HTTP de acordo com o modo configurado"""
+    if SERVER_MODE == "threaded":
+        return ThreadedHTTPServer(("", port), CustomHTTPRequestHandler)
+    return socketserver.TCPServer(("", port), CustomHTTPRequestHandler)
+
+# Sinalizado pela thread do servidor assim que o socket está aceitando conexões
+# (ou quando a criação do servidor falhou)
+server_ready = threading.Event()
+server_port = None
+httpd = None
+
+def run_server():
+    """Cria o servidor HTTP, sinaliza que está pronto e atende requisições"""
+    global httpd, server_port
     try:
-        httpd = socketserver.TCPServer(("", PORT), CustomHTTPRequestHandler)
-        print(f"Servidor HTTP iniciado na porta {PORT}")
-        httpd.serve_forever()
+        server = None
+        for port in (PORT,) + FALLBACK_PORTS:
+            try:
+                server = create_server(port)
+                break
+            except OSError as e:
+                print(f"Porta {port} indisponível ({e})")
+        if server is None:
+            # Último recurso: o sistema escolhe uma porta livre (os dados salvos
+            # no navegador não ficam disponíveis nesta sessão)
+            print("AVISO: nenhuma porta fixa disponível, usando uma porta livre; "
+                  "o cache e as configurações salvas não serão carregados")
+            server = create_server(0)
+        httpd = server
+        server_port = server.server_address[1]
+        print(f"Servidor HTTP iniciado na porta {server_port} (modo {SERVER_MODE}, {_elapsed_ms():.0f} ms)")
     except Exception as e:
         print(f"Erro ao iniciar servidor: {e}")
+        return
+    finally:
+        server_ready.set()
+    httpd.serve_forever()
 
-# Inicia o servidor em thread separada
-print("Iniciando servidor HTTP em segundo plano...")
-server_thread = threading.Thread(target=start_server, daemon=True)
-server_thread.start()
+def start_server(asset_table):
+    """Inicia o servidor HTTP em uma thread separada e aguarda ele ficar pronto"""
+    CustomHTTPRequestHandler.asset_table = asset_table
 
-# Aguarda o servidor iniciar com verificação
-print("Aguardando servidor iniciar...")
-max_wait = 15  # segundos máximos de espera
-for i in range(max_wait):
-    try:
-        # Tenta conectar ao servidor para verificar se está rodando
-        import socket
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(1)
-        result = sock.connect_ex(('127.0.0.1', PORT))
-        sock.close()
-        if result == 0:
-            print(f"Servidor HTTP iniciado com sucesso na porta {PORT}")
-            break
-    except Exception as e:
-        print(f"Tentativa {i+1}/{max_wait} de verificar servidor: {e}")
-    time.sleep(1)
-else:
-    print("AVISO: Tempo limite excedido ao aguardar servidor HTTP iniciar")
+    print("Iniciando servidor HTTP em segundo plano...")
+    server_thread = threading.Thread(target=run_server, daemon=True)
+    server_thread.start()
+
+    # Aguarda o sinal de que o servidor está pronto
+    print("Aguardando servidor iniciar...")
+    if not server_ready.wait(timeout=15):
+        print("AVISO: Tempo limite excedido ao aguardar servidor HTTP iniciar")
+    if httpd is None:
+        return False
+    print(f"[tempo] Servidor pronto em {_elapsed_ms():.0f} ms (modo {SERVER_MODE})")
+    return True
 
 # Função de limpeza
 def _cleanup():
-    global httpd
     try:
-        if 'httpd' in globals():
+        if httpd is not None:
             httpd.shutdown()
             httpd.server_close()
         print("Servidor HTTP encerrado.")
     except Exception as e:
         print(f"Erro ao encerrar servidor: {e}")
 
-atexit.register(_cleanup)
+class _OptimizingWriter:
+    """Passa pelo otimizador de movimentos as linhas gravadas em blocos
+
+    Os blocos chegam cortados em qualquer ponto, então a última linha
+    incompleta de cada bloco fica guardada até o bloco seguinte.
+    """
+
+    def __init__(self, f, options):
+        from entalhe.optimizer import ToolpathOptimizer
+        self._f = f
+        self._optimizer = ToolpathOptimizer(safe_z=options.get('safeZ'))
+        self._partial = ''
+
+    def write(self, chunk):
+        lines = (self._partial + chunk).split('\n')
+        self._partial = lines.pop()
+        for line in lines:
+            self._write_lines(self._optimizer.push(line))
+
+    def close(self):
+        if self._partial:
+            self._write_lines(self._optimizer.push(self._partial))
+        self._write_lines(self._optimizer.finish())
+        self._f.close()
+        report = self._optimizer.report()
+        return f' ({report.linesSaved} linhas removidas pelo otimizador)'
+
+    def _write_lines(self, lines):
+        self._f.writelines(line + '\n' for line in lines)
+
+
+class _GCodeFileReader:
+    """Lê um programa de código G em blocos de texto terminados em quebra de linha
+
+    Arquivos grandes são mapeados em memória (mmap): cada bloco é fatiado do
+    mapeamento, sem carregar o arquivo inteiro no processo. Como os blocos
+    terminam logo após um '\\n', nenhum caractere multibyte é cortado ao meio.
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+    MMAP_THRESHOLD = 4 * 1024 * 1024
+
+    def __init__(self, path):
+        self._f = open(path, 'rb')
+        self.size = os.fstat(self._f.fileno()).st_size
+        if self.size >= self.MMAP_THRESHOLD:
+            import mmap
+            self._data = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._data = self._f.read()
+        # Ignora a marca de ordem de bytes (BOM) do UTF-8
+        self._offset = 3 if self._data[:3] == b'\xef\xbb\xbf' else 0
+        self._encoding = 'utf-8'
+
+    @property
+    def done(self):
+        return self._offset >= self.size
+
+    def read(self):
+        """Próximo bloco de texto ('' no fim do arquivo)"""
+        if self.done:
+            return ''
+        end = min(self._offset + self.CHUNK_SIZE, self.size)
+        if end < self.size:
+            newline = self._data.find(b'\n', end)
+            end = self.size if newline < 0 else newline + 1
+        raw = self._data[self._offset:end]
+        self._offset = end
+        try:
+            return raw.decode(self._encoding)
+        except UnicodeDecodeError:
+            # Programas de comandos antigos costumam vir em Latin-1/Windows-1252
+            self._encoding = 'cp1252'
+            return raw.decode(self._encoding, errors='replace')
+
+    def close(self):
+        if not isinstance(self._data, bytes):
+            self._data.close()
+        self._f.close()
+
 
 # Classe API para interação entre JavaScript e Python
 class Api:
-    def save_file(self, content, filename="codigo_entalhy_cnc.nc"):
-        """Salva o conteúdo em um arquivo escolhido pelo usuário"""
+    def __init__(self):
+        # Atributos com "_" não são expostos ao JavaScript pelo pywebview
+        self._window = None
+        # Arquivos abertos pela gravação em blocos: handle -> (arquivo, caminho)
+        self._open_files = {}
+        self._files_lock = threading.Lock()
+        self._next_handle = 0
+        # Arquivos abertos pela leitura em blocos: handle -> _GCodeFileReader
+        self._read_files = {}
+        # Cache em disco dos programas gerados (criado no primeiro uso)
+        self._generation_cache = None
+
+    def _ask_save_path(self, filename):
+        """Abre o seletor de arquivos nativo e retorna o caminho escolhido (ou None)"""
+        import webview
+        window = self._window
+        # Usar o seletor de arquivos nativo do sistema
+        # Formato simplificado sem filtros complexos para evitar erros
         try:
-            # Usar o seletor de arquivos nativo do sistema
-            # Formato simplificado sem filtros complexos para evitar erros
-            try:
-                file_path = window.create_file_dialog(webview.SAVE_DIALOG, 
-                                                  directory='~', 
-                                                  save_filename=filename)
-            except Exception as e:
-                print(f"Erro ao criar diálogo de arquivo: {str(e)}")
-                # Tenta novamente sem especificar tipos de arquivo
-                file_path = window.create_file_dialog(webview.SAVE_DIALOG, 
-                                                  directory='~', 
-                                                  save_filename=filename)
-            
+            file_path = window.create_file_dialog(webview.SAVE_DIALOG,
+                                              directory='~',
+                                              save_filename=filename)
+        except Exception as e:
+            print(f"Erro ao criar diálogo de arquivo: {str(e)}")
+            # Tenta novamente sem especificar tipos de arquivo
+            file_path = window.create_file_dialog(webview.SAVE_DIALOG,
+                                              directory='~',
+                                              save_filename=filename)
+
+        # Algumas versões do pywebview retornam uma tupla
+        if isinstance(file_path, (tuple, list)):
+            file_path = file_path[0] if file_path else None
+        if not file_path:
+            return None
+
+        # Verifica se o arquivo tem extensão, se não, adiciona .nc
+        if not file_path.lower().endswith(('.nc', '.gcode')):
+            file_path += '.nc'
+        return file_path
+
+    def save_file(self, content, filename="codigo_entalhy_cnc.nc", options=None):
+        """Salva o conteúdo em um arquivo escolhido pelo usuário
+
+        Com options = {'optimize': True, 'safeZ': ...} o programa passa pelo
+        otimizador de movimentos antes de ser gravado.
+        """
+        try:
+            file_path = self._ask_save_path(filename)
             if file_path:
-                # Verifica se o arquivo tem extensão, se não, adiciona .nc
-                if not file_path.lower().endswith(('.nc', '.gcode')):
-                    file_path += '.nc'
-                    
-                with open(file_path, 'w') as f:
-                    f.write(content)
-                return {'success': True, 'message': f'Arquivo salvo em: {file_path}'}
+                f = open(file_path, 'w')
+                if options and options.get('optimize'):
+                    f = _OptimizingWriter(f, options)
+                f.write(content)
+                suffix = f.close() or ''
+                return {'success': True, 'message': f'Arquivo salvo em: {file_path}{suffix}'}
             else:
                 return {'success': False, 'message': 'Operação de salvamento cancelada pelo usuário'}
         except Exception as e:
             return {'success': False, 'message': f'Erro ao salvar arquivo: {str(e)}'}
 
-# Cria e inicia a janela do webview
-print("Iniciando interface gráfica...")
-try:
-    api = Api()
-    window = webview.create_window(
-        "ENTALHE CNC CAM",
-        f"http://localhost:{PORT}",
-        width=width,
-        height=height,
-        resizable=True,
-        min_size=(800, 600),
-        js_api=api  # Expõe a API para o JavaScript
-    )
-    
-    # Adiciona handler para detectar quando a janela é fechada
-    def on_closed():
-        print("Janela fechada pelo usuário")
-        _cleanup()
-        
-    window.events.closed += on_closed
-    
-    print("Iniciando loop principal da aplicação...")
-    webview.start(debug=False)
-    print("Aplicação encerrada normalmente.")
-except Exception as e:
-    print(f"ERRO ao iniciar interface gráfica: {e}")
-    
-    # Mostra mensagem de erro ao usuário
+    def save_file_begin(self, filename="codigo_entalhy_cnc.nc", options=None):
+        """Inicia uma gravação em blocos; retorna o handle usado nas chamadas seguintes
+
+        Programas grandes são enviados pela interface em vários pedaços
+        (save_file_append), para que nenhum dos lados precise montar o
+        arquivo inteiro em memória. As opções são as mesmas de save_file.
+        """
+        try:
+            file_path = self._ask_save_path(filename)
+            if not file_path:
+                return {'success': False, 'message': 'Operação de salvamento cancelada pelo usuário'}
+
+            f = open(file_path, 'w')
+            if options and options.get('optimize'):
+                f = _OptimizingWriter(f, options)
+            with self._files_lock:
+                self._next_handle += 1
+                handle = str(self._next_handle)
+                self._open_files[handle] = (f, file_path)
+            return {'success': True, 'message': f'Salvando em: {file_path}', 'handle': handle}
+        except Exception as e:
+            return {'success': False, 'message': f'Erro ao salvar arquivo: {str(e)}'}
+
+    def save_file_append(self, handle, chunk):
+        """Acrescenta um bloco de texto ao arquivo aberto por save_file_begin"""
+        with self._files_lock:
+            entry = self._open_files.get(handle)
+        if entry is None:
+            return {'success': False, 'message': 'Gravação não encontrada ou já finalizada'}
+        try:
+            entry[0].write(chunk)
+            return {'success': True, 'message': ''}
+        except Exception as e:
+            self.save_file_abort(handle)
+            return {'success': False, 'message': f'Erro ao salvar arquivo: {str(e)}'}
+
+    def save_file_close(self, handle):
+        """Finaliza a gravação em blocos"""
+        with self._files_lock:
+            entry = self._open_files.pop(handle, None)
+        if entry is None:
+            return {'success': False, 'message': 'Gravação não encontrada ou já finalizada'}
+        f, file_path = entry
+        try:
+            suffix = f.close() or ''
+            return {'success': True, 'message': f'Arquivo salvo em: {file_path}{suffix}'}
+        except Exception as e:
+            return {'success': False, 'message': f'Erro ao salvar arquivo: {str(e)}'}
+
+    def save_file_abort(self, handle):
+        """Cancela a gravação em blocos e remove o arquivo incompleto"""
+        with self._files_lock:
+            entry = self._open_files.pop(handle, None)
+        if entry is None:
+            return {'success': False, 'message': 'Gravação não encontrada ou já finalizada'}
+        f, file_path = entry
+        try:
+            f.close()
+            os.remove(file_path)
+        except OSError:
+            pass
+        return {'success': False, 'message': 'Gravação cancelada'}
+
+    def _ask_open_path(self):
+        """Abre o seletor de arquivos nativo para escolher um programa (ou None)"""
+        import webview
+        window = self._window
+        try:
+            file_path = window.create_file_dialog(
+                webview.OPEN_DIALOG, directory='~',
+                file_types=('Programas CNC (*.nc;*.gcode;*.ngc;*.tap;*.cnc;*.txt)', 'Todos os arquivos (*.*)'))
+        except Exception as e:
+            print(f"Erro ao criar diálogo de arquivo: {str(e)}")
+            # Tenta novamente sem especificar tipos de arquivo
+            file_path = window.create_file_dialog(webview.OPEN_DIALOG, directory='~')
+
+        if isinstance(file_path, (tuple, list)):
+            file_path = file_path[0] if file_path else None
+        return file_path or None
+
+    def open_file_begin(self):
+        """Escolhe um programa no disco e prepara a leitura em blocos (open_file_read)
+
+        Retorna o handle, o nome e o tamanho do arquivo em bytes.
+        """
+        try:
+            file_path = self._ask_open_path()
+            if not file_path:
+                return {'success': False, 'message': 'Abertura cancelada pelo usuário'}
+
+            reader = _GCodeFileReader(file_path)
+            with self._files_lock:
+                self._next_handle += 1
+                handle = str(self._next_handle)
+                self._read_files[handle] = reader
+            return {'success': True, 'message': f'Abrindo: {file_path}', 'handle': handle,
+                    'name': os.path.basename(file_path), 'size': reader.size}
+        except Exception as e:
+            return {'success': False, 'message': f'Erro ao abrir arquivo: {str(e)}'}
+
+    def open_file_read(self, handle):
+        """Lê o próximo bloco do arquivo aberto por open_file_begin
+
+        ``done`` indica que o bloco retornado é o último; o arquivo é então
+        fechado automaticamente.
+        """
+        with self._files_lock:
+            reader = self._read_files.get(handle)
+        if reader is None:
+            return {'success': False, 'message': 'Leitura não encontrada ou já finalizada'}
+        try:
+            chunk = reader.read()
+            done = reader.done
+            if done:
+                self.open_file_close(handle)
+            return {'success': True, 'message': '', 'chunk': chunk, 'done': done}
+        except Exception as e:
+            self.open_file_close(handle)
+            return {'success': False, 'message': f'Erro ao ler arquivo: {str(e)}'}
+
+    def open_file_close(self, handle):
+        """Encerra a leitura em blocos"""
+        with self._files_lock:
+            reader = self._read_files.pop(handle, None)
+        if reader is None:
+            return {'success': False, 'message': 'Leitura não encontrada ou já finalizada'}
+        try:
+            reader.close()
+        except OSError:
+            pass
+        return {'success': True, 'message': ''}
+
+    def _cache(self):
+        if self._generation_cache is None:
+            from generation_cache import GenerationDiskCache
+            self._generation_cache = GenerationDiskCache()
+        return self._generation_cache
+
+    def cache_get(self, key):
+        """Lê um programa do cache de geração (payload ausente se não houver)"""
+        try:
+            payload = self._cache().get(key)
+            if payload is None:
+                return {'success': False, 'message': 'Entrada não encontrada no cache'}
+            return {'success': True, 'message': '', 'payload': payload}
+        except Exception as e:
+            return {'success': False, 'message': f'Erro ao ler o cache: {str(e)}'}
+
+    def cache_put(self, key, payload):
+        """Grava um programa gerado no cache de geração"""
+        try:
+            self._cache().put(key, payload)
+            return {'success': True, 'message': ''}
+        except Exception as e:
+            return {'success': False, 'message': f'Erro ao gravar o cache: {str(e)}'}
+
+    def cache_clear(self):
+        """Esvazia o cache de geração"""
+        try:
+            removed = self._cache().clear()
+            return {'success': True, 'message': f'{removed} entrada(s) removida(s) do cache'}
+        except Exception as e:
+            return {'success': False, 'message': f'Erro ao limpar o cache: {str(e)}'}
+
+def run_window():
+    """Cria a janela do webview e executa o loop principal da interface"""
+    print("Iniciando interface gráfica...")
     try:
-        import tkinter as tk
-        from tkinter import messagebox
-        root = tk.Tk()
-        root.withdraw()
-        messagebox.showerror("Erro", f"Falha ao iniciar a interface gráfica:\n\n{str(e)}")
-        root.destroy()
-    except:
-        pass
-    
-    _cleanup()
-    sys.exit(1)
+        import webview
+        profiler.mark("imports (webview)")
+
+        width, height = get_screen_size()
+        api = Api()
+        window = webview.create_window(
+            "ENTALHE CNC CAM",
+            f"http://localhost:{server_port}",
+            width=width,
+            height=height,
+            resizable=True,
+            min_size=(800, 600),
+            js_api=api  # Expõe a API para o JavaScript
+        )
+        api._window = window
+
+        # Adiciona handler para detectar quando a janela é fechada
+        def on_closed():
+            print("Janela fechada pelo usuário")
+            _cleanup()
+
+        window.events.closed += on_closed
+
+        # Mede o tempo até a primeira carga completa da interface
+        def on_loaded():
+            window.events.loaded -= on_loaded
+            profiler.mark("first window")
+            print(f"[tempo] Interface carregada em {_elapsed_ms():.0f} ms (modo {SERVER_MODE})")
+            if PROFILE_STARTUP:
+                profiler.report()
+            if STARTUP_REPORT:
+                profiler.save(STARTUP_REPORT, server_mode=SERVER_MODE)
+            if EXIT_AFTER_LOAD:
+                window.destroy()
+
+        window.events.loaded += on_loaded
+
+        print("Iniciando loop principal da aplicação...")
+        webview.start(debug=False)
+        print("Aplicação encerrada normalmente.")
+    except Exception as e:
+        print(f"ERRO ao iniciar interface gráfica: {e}")
+
+        # Mostra mensagem de erro ao usuário
+        try:
+            show_error(f"Falha ao iniciar a interface gráfica:\n\n{str(e)}")
+        except:
+            pass
+
+        _cleanup()
+        sys.exit(1)
+
+def main():
+    profiler.mark("imports")
+
+    if not check_license():
+        sys.exit(1)
+    profiler.mark("license check")
+
+    static_dir = get_static_dir()
+    if not os.path.exists(static_dir):
+        report_missing_static_dir(static_dir)
+        sys.exit(1)
+
+    print(f"Servindo arquivos estáticos de: {static_dir}")
+    asset_table = load_assets(static_dir)
+    profiler.mark("static assets")
+
+    if not start_server(asset_table):
+        print("ERRO: Não foi possível iniciar o servidor HTTP. Encerrando aplicação.")
+        sys.exit(1)
+    profiler.mark("server bind")
+
+    atexit.register(_cleanup)
+    run_window()
+
+    # Janela fechada antes de terminar de carregar: mostra o que foi medido
+    if PROFILE_STARTUP and not profiler.reported:
+        profiler.report()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+import {
+  computeRotaryAngles,
+  DEFAULT_SUBPROGRAM_NUMBER,
+  emitGCode,
+  emitNotchBody,
+  orderRotaryAngles,
+  type GCodeDialect,
+  type MachiningParams,
+  type RotaryOrder,
+} from "@/lib/gcode-generator"
+import { parseGCodeProgram, type GCodeProgram } from "@/lib/gcode-program"
+import { buildTimeline, type PlaybackOptions } from "@/lib/playback"
+import { optimizeToolpath, type OptimizeOptions } from "@/lib/toolpath-optimizer"
+
+/**
+ * Several keyway features cut in one program on a single rotary setup
+ *
+ * Each feature is a complete set of machining parameters (its own Z start and
+ * depth, diameters, notch count and passes). The job visits every A position
+ * of every feature in one sweep of the table: at each position it cuts all the
+ * features that have a notch there, nearest first, moving between them
+ * through a common clearance plane. Against one program per feature this
+ * saves the safety moves and the unwinding of the table between programs, and
+ * the A positions shared by several features are indexed only once. The
+ * features must share the tool, so the job never needs a tool change.
+ */
+
+/** One feature of a job */
+export interface JobFeature {
+  name: string
+  params: MachiningParams // ordemRotacao é ignorada: a sequência do eixo A é a do trabalho
+}
+
+export interface FeatureJobOptions {
+  dialect?: GCodeDialect // Formato do programa (padrão: expandido)
+  subprogramNumber?: number // Subprograma/rótulo da primeira feature; as seguintes usam os números seguintes
+  rotaryOrder?: RotaryOrder // Sequência das posições do eixo A (padrão: sequencial)
+  clearanceZ?: number // Plano de troca entre features e de rotação (padrão: maior pontoInicioZ)
+  optimize?: boolean | OptimizeOptions // Remove movimentos redundantes (plano seguro: clearanceZ)
+}
+
+/** A position of the job and the features cut there, in cutting order */
+export interface FeatureStation {
+  angle: number // graus, como escrito no programa (2 casas)
+  features: number[] // índices em `features`
+}
+
+/** Cycle time of the job against one program per feature */
+export interface FeatureJobComparison {
+  combined: number // s, programa único do trabalho
+  separate: number // s, um programa por feature, um após o outro na mesma fixação
+  saved: number // s
+}
+
+// Rótulos da seção de cada feature no formato Siemens
+const siemensLabels = (k: number) => [`ENTALHE${k + 1}_INI`, `ENTALHE${k + 1}_FIM`]
+
+const AXIS_WORD = /([XYZ])([-+]?\d*\.?\d+)/gi
+
+interface BodyEnds {
+  startX: number
+  startY: number
+  endX: number
+  endY: number
+  endZ: number
+}
+
+// Onde o corte de um entalhe começa (X/Y depois do Z inicial) e termina
+function bodyEnds(body: readonly string[], params: MachiningParams): BodyEnds {
+  const pos: Record<string, number> = { X: 0, Y: params.diametroInicial / 2, Z: params.pontoInicioZ }
+  for (const line of body) {
+    const code = line.replace(/\s*(\(.*\)|;.*)$/, "")
+    for (const match of code.matchAll(AXIS_WORD)) pos[match[1].toUpperCase()] = Number(match[2])
+  }
+  return { startX: 0, startY: params.diametroInicial / 2, endX: pos.X, endY: pos.Y, endZ: pos.Z }
+}
+
+// Nome da feature como comentário (sem parênteses nem ";", que encerrariam o comentário)
+function featureComment(name: string, dialect: GCodeDialect): string {
+  const text = name.replace(/[();]/g, "").trim()
+  return dialect === "siemens" ? `; ${text}` : `(${text})`
+}
+
+/**
+ * Checks that the features can share one program
+ *
+ * @param features - Features of the job
+ * @param options - Job options
+ * @returns Clearance plane of the job
+ * @throws Error when the job is empty, a feature has no notches, the features
+ *   need different tools or the clearance plane is below a start plane
+ */
+export function validateFeatureJob(features: readonly JobFeature[], options: FeatureJobOptions = {}): number {
+  if (features.length === 0) throw new Error("O trabalho não tem nenhuma feature")
+
+  const ferramenta = features[0].params.diametroFerramenta
+  for (const { name, params } of features) {
+    if (!(params.numEntalhes > 0)) throw new Error(`Feature "${name}": o número de entalhes deve ser maior que zero`)
+    if (params.diametroFerramenta !== ferramenta) {
+      throw new Error(
+        `Todas as features devem usar a mesma ferramenta (Ø${ferramenta} mm); "${name}" usa Ø${params.diametroFerramenta} mm`,
+      )
+    }
+  }
+
+  const maiorInicio = Math.max(...features.map((f) => f.params.pontoInicioZ))
+  const clearanceZ = options.clearanceZ ?? maiorInicio
+  if (!Number.isFinite(clearanceZ) || clearanceZ < maiorInicio) {
+    throw new Error(`O plano de troca Z deve ser maior ou igual ao maior ponto de início Z (${maiorInicio})`)
+  }
+  return clearanceZ
+}
+
+/**
+ * Groups the notches of every feature by A position, in cutting order
+ *
+ * Positions are compared as written in the program (2 decimals), so a 120°
+ * notch of a 3-notch feature and of a 6-notch feature is indexed once.
+ *
+ * @param features - Features of the job
+ * @param ordem - A-axis sequence of the job
+ * @returns Positions in cutting order, each with its features in index order
+ */
+export function computeFeatureStations(features: readonly JobFeature[], ordem: RotaryOrder = "sequential"): FeatureStation[] {
+  const porAngulo = new Map<number, number[]>()
+  features.forEach(({ params }, k) => {
+    for (const angulo of computeRotaryAngles({ ...params, ordemRotacao: "sequential" })) {
+      const chave = Number(angulo.toFixed(2))
+      const lista = porAngulo.get(chave)
+      if (lista) lista.push(k)
+      else porAngulo.set(chave, [k])
+    }
+  })
+
+  const angulos = [...porAngulo.keys()].sort((a, b) => a - b)
+  return orderRotaryAngles(angulos, ordem).map((angulo) => ({
+    angle: angulo,
+    features: porAngulo.get(angulo < 0 ? Number((angulo + 360).toFixed(2)) : angulo) ?? [],
+  }))
+}
+
+/**
+ * Emits the program of a job line by line
+ *
+ * The layout follows emitGCode: the safety moves, then for each A position
+ * the rotation and the cut of each feature there (expanded, or called as the
+ * feature's Fanuc subprogram, Haas local subroutine or Siemens REPEAT
+ * section), then the final safety move. Between features the tool goes up to
+ * the clearance plane only; inside a feature the moves are those of
+ * emitNotchBody. The features at one position are cut nearest first, starting
+ * from where the previous feature ended.
+ *
+ * @param features - Features of the job
+ * @param options - Job options
+ * @returns Iterator over G-code commands
+ * @throws Error when the features cannot share one program (validateFeatureJob)
+ */
+export function* emitFeatureJob(features: readonly JobFeature[], options: FeatureJobOptions = {}): Generator<string> {
+  const clearanceZ = validateFeatureJob(features, options)
+  if (options.optimize) {
+    const { optimize, ...rest } = options
+    const optimizeOptions = optimize === true ? {} : optimize
+    yield* optimizeToolpath(emitFeatureJob(features, rest), { safeZ: clearanceZ, ...optimizeOptions })
+    return
+  }
+
+  const dialect = options.dialect ?? "standard"
+  const ordem = options.rotaryOrder ?? "sequential"
+  const subprograma = options.subprogramNumber ?? DEFAULT_SUBPROGRAM_NUMBER
+  const comSubprograma = dialect === "fanuc" || dialect === "haas"
+
+  // Corte de um entalhe de cada feature, gerado uma única vez
+  const corpos = features.map((f) => Array.from(emitNotchBody(f.params)))
+  const extremos = corpos.map((corpo, k) => bodyEnds(corpo, features[k].params))
+  const escritas = new Set<number>() // seções Siemens já escritas
+
+  const caminhoCurto = dialect === "siemens" && ordem === "shortest"
+  const stations = computeFeatureStations(features, ordem)
+
+  if (comSubprograma) {
+    yield "%"
+    yield dialect === "fanuc" ? "O0001 (ENTALHE CNC)" : "O00001 (ENTALHE CNC)"
+  }
+
+  // Safety moves
+  yield "G0 Z100"
+  yield "G0 Y0"
+  yield "G0 X0"
+
+  let x = 0
+  let y = 0
+  let z = 100
+  for (const station of stations) {
+    if (z < clearanceZ) {
+      yield `G0 Z${clearanceZ}`
+      z = clearanceZ
+    }
+    yield caminhoCurto ? `G0 A=DC(${station.angle.toFixed(2)})` : `G0 A${station.angle.toFixed(2)}`
+
+    // Vizinho mais próximo em X/Y; as subidas ao plano de troca não dependem da ordem
+    const restantes = [...station.features]
+    while (restantes.length > 0) {
+      let melhor = 0
+      const custo = (k: number) => Math.abs(extremos[k].startX - x) + Math.abs(extremos[k].startY - y)
+      for (let i = 1; i < restantes.length; i++) {
+        if (custo(restantes[i]) < custo(restantes[melhor])) melhor = i
+      }
+      const k = restantes.splice(melhor, 1)[0]
+
+      if (z < clearanceZ) yield `G0 Z${clearanceZ}`
+      yield featureComment(features[k].name, dialect)
+      if (dialect === "standard") {
+        yield* corpos[k]
+      } else if (dialect === "siemens") {
+        const [inicio, fim] = siemensLabels(k)
+        if (escritas.has(k)) {
+          yield `REPEAT ${inicio} ${fim} P=1`
+        } else {
+          escritas.add(k)
+          yield `${inicio}:`
+          // Comentários no Sinumerik usam ";" em vez de parênteses
+          for (const linha of corpos[k]) yield linha.replace(/ \((.*)\)$/, " ; $1")
+          yield `${fim}:`
+        }
+      } else {
+        yield dialect === "fanuc" ? `M98 P${subprograma + k}` : `M97 P${subprograma + k}`
+      }
+      x = extremos[k].endX
+      y = extremos[k].endY
+      z = extremos[k].endZ
+    }
+  }
+
+  // Finalize G-code
+  yield "G0 Z100" // Safety move
+  yield "M30" // End of program
+
+  if (comSubprograma) {
+    // Corte de um entalhe de cada feature, escrito uma única vez
+    for (const [k, corpo] of corpos.entries()) {
+      yield dialect === "fanuc" ? `O${subprograma + k} ${featureComment(features[k].name, dialect)}` : `N${subprograma + k}`
+      yield* corpo
+      yield "M99"
+    }
+    yield "%"
+  }
+}
+
+/**
+ * Generates the program of a job
+ *
+ * @param features - Features of the job
+ * @param options - Job options
+ * @returns Array of G-code commands
+ */
+export function generateFeatureJob(features: readonly JobFeature[], options: FeatureJobOptions = {}): string[] {
+  return Array.from(emitFeatureJob(features, options))
+}
+
+/**
+ * Compares the cycle time of a job with one program per feature
+ *
+ * Both are timed with the playback clock (buildTimeline). The separate
+ * programs run one after the other on the same setup, each with its own A
+ * sequence, so the table unwinds back to 0° between them.
+ *
+ * @param features - Features of the job
+ * @param options - Job options (the optimization applies to both)
+ * @param rates - Rapid and rotary rates
+ * @param program - Program of the job, when already generated
+ * @returns Cycle times in seconds
+ */
+export function compareFeatureJob(
+  features: readonly JobFeature[],
+  options: FeatureJobOptions = {},
+  rates: PlaybackOptions = {},
+  program?: GCodeProgram,
+): FeatureJobComparison {
+  const combined = buildTimeline(
+    program ?? parseGCodeProgram(generateFeatureJob(features, { ...options, dialect: "standard" })),
+    rates,
+  ).duration
+
+  // Programas expandidos, concatenados: o relógio conta também o retorno de A entre eles
+  const separados: string[] = []
+  for (const { params } of features) {
+    for (const line of emitGCode(params, { optimize: options.optimize })) separados.push(line)
+  }
+  const separate = buildTimeline(parseGCodeProgram(separados), rates).duration
+
+  return { combined, separate, saved: separate - combined }
+}
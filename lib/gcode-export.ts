@@ -0,0 +1,129 @@
+import { chunkGCode } from "@/lib/gcode-generator"
+import { showMessage } from "@/lib/utils"
+
+export const DEFAULT_GCODE_FILENAME = "codigo_entalhy_cnc.nc"
+
+// Definir tipos para a API do PyWebView
+interface PyWebViewResponse {
+  success: boolean;
+  message: string;
+}
+
+interface PyWebViewBeginResponse extends PyWebViewResponse {
+  handle?: string;
+}
+
+interface PyWebViewCacheResponse extends PyWebViewResponse {
+  payload?: string;
+}
+
+interface PyWebViewOpenResponse extends PyWebViewBeginResponse {
+  name?: string;
+  size?: number;
+}
+
+interface PyWebViewReadResponse extends PyWebViewResponse {
+  chunk?: string;
+  done?: boolean;
+}
+
+declare global {
+  interface Window {
+    pywebview?: {
+      api: {
+        save_file: (content: string, filename: string) => Promise<PyWebViewResponse>;
+        save_file_begin?: (filename: string) => Promise<PyWebViewBeginResponse>;
+        save_file_append?: (handle: string, chunk: string) => Promise<PyWebViewResponse>;
+        save_file_close?: (handle: string) => Promise<PyWebViewResponse>;
+        save_file_abort?: (handle: string) => Promise<PyWebViewResponse>;
+        open_file_begin?: () => Promise<PyWebViewOpenResponse>;
+        open_file_read?: (handle: string) => Promise<PyWebViewReadResponse>;
+        open_file_close?: (handle: string) => Promise<PyWebViewResponse>;
+        cache_get?: (key: string) => Promise<PyWebViewCacheResponse>;
+        cache_put?: (key: string, payload: string) => Promise<PyWebViewResponse>;
+        cache_clear?: () => Promise<PyWebViewResponse>;
+      };
+    };
+  }
+}
+
+/**
+ * Writes G-code through the launcher's chunked save API
+ *
+ * Each chunk is awaited before the next one is built, so neither side ever holds
+ * the whole program as a single string and the UI keeps handling events.
+ *
+ * @param lines - G-code lines (array or emitGCode generator)
+ * @param filename - Suggested file name for the save dialog
+ * @returns Response of the last bridge call
+ */
+async function saveChunked(lines: Iterable<string>, filename: string): Promise<PyWebViewResponse> {
+  const api = window.pywebview!.api
+  const begin = await api.save_file_begin!(filename)
+  if (!begin.success || !begin.handle) return begin
+
+  try {
+    for (const chunk of chunkGCode(lines)) {
+      const res = await api.save_file_append!(begin.handle, chunk)
+      if (!res.success) {
+        await api.save_file_abort!(begin.handle)
+        return res
+      }
+    }
+  } catch (err) {
+    await api.save_file_abort!(begin.handle).catch(() => undefined)
+    throw err
+  }
+
+  return api.save_file_close!(begin.handle)
+}
+
+/**
+ * Saves G-code lines to a file
+ *
+ * Uses the desktop launcher's chunked save API when available, the single-call
+ * save_file API on older launchers, and a browser download otherwise.
+ * If the launcher call fails the browser download is used instead, which
+ * iterates `lines` again, so pass an array rather than a one-shot generator.
+ *
+ * @param lines - G-code lines
+ * @param filename - Suggested file name
+ */
+export async function saveGCodeFile(lines: Iterable<string>, filename = DEFAULT_GCODE_FILENAME): Promise<void> {
+  // Verifica se estamos no ambiente WebView
+  if (window.pywebview) {
+    try {
+      const api = window.pywebview.api
+      const res = api.save_file_begin
+        ? await saveChunked(lines, filename)
+        : await api.save_file(Array.from(lines).join("\n"), filename)
+      showMessage(res.message, res.success ? "success" : "error")
+      return
+    } catch (err) {
+      console.error("Erro ao salvar arquivo via API:", err)
+      showMessage("Erro ao salvar arquivo: " + err, "error")
+    }
+  }
+
+  saveFileFallback(lines, filename)
+}
+
+/**
+ * Fallback para salvar arquivo no navegador convencional
+ *
+ * O Blob é montado a partir dos blocos, sem juntar o programa em uma única string.
+ */
+function saveFileFallback(lines: Iterable<string>, filename: string): void {
+  const blob = new Blob(Array.from(chunkGCode(lines)), { type: "text/plain" })
+  const url = URL.createObjectURL(blob)
+
+  const a = document.createElement("a")
+  a.href = url
+  a.download = filename
+  document.body.appendChild(a)
+  a.click()
+  document.body.removeChild(a)
+  URL.revokeObjectURL(url)
+
+  showMessage("Código G salvo com sucesso!", "success")
+}
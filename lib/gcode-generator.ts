@@ -1,4 +1,7 @@
-interface MachiningParams {
+import { optimizeToolpath, type OptimizeOptions } from "@/lib/toolpath-optimizer"
+import { GCodeProgramBuilder, parseGCodeProgram, type GCodeProgram } from "@/lib/gcode-program"
+
+export interface MachiningParams {
   pontoInicioZ: number
   profundidadeFinal: number
   numEntalhes: number
@@ -12,29 +15,28 @@ interface MachiningParams {
   chavetaConica: boolean
   anguloConico: number
   passoLateral?: number // Passo lateral para múltiplos passes (opcional)
+  ordemPasses?: PassOrder // Ordem dos passes laterais (padrão: do centro para fora)
+  planoSeguroZ?: number // Retração curta entre passes (padrão: pontoInicioZ)
+  ordemRotacao?: RotaryOrder // Sequência das posições do eixo A (padrão: sequencial)
+  avancoMaximo?: number // Avanço máximo dos passes com pouco engajamento (padrão: avanço constante)
 }
 
+export type PassOrder = "center-out" | "serpentine" | "nearest"
+
+/** Lateral pass orderings offered in the UI */
+export const PASS_ORDERS: { value: PassOrder; label: string }[] = [
+  { value: "center-out", label: "Do centro para fora" },
+  { value: "serpentine", label: "Serpentina (alterna o sentido a cada nível)" },
+  { value: "nearest", label: "Vizinho mais próximo" },
+]
+
 /**
- * Generates G-code based on machining parameters
+ * Calculates the lateral (X) pass positions for the keyway opening
  *
  * @param params - Object containing all machining parameters
- * @returns Array of G-code commands
+ * @returns Pass positions ordered from the center outwards and the largest X displacement
  */
-export function generateGCode(params: MachiningParams): string[] {
-  // Calculate derived values
-  const raioInicial = params.diametroInicial / 2
-  const raioFinal = params.diametroFinal / 2
-  
-  // Determinar se estamos cortando de diâmetro maior para menor
-  const cortandoAoContrario = params.diametroInicial > params.diametroFinal
-  
-  // Ângulo cônico em radianos (se ativado)
-  const anguloRadianos = params.chavetaConica ? (params.anguloConico * Math.PI / 180) : 0
-
-  // Calculate angle between notches
-  const anguloPasso = 360 / params.numEntalhes
-
-  // Calculate X displacement needed and number of passes
+export function computePassesX(params: MachiningParams): { passosX: number[]; deslocamentoX: number } {
   let deslocamentoX = 0
   let numPassesLaterais = 1
   let passosX: number[] = [0] // Inicialmente apenas um passe central
@@ -83,246 +85,526 @@ export function generateGCode(params: MachiningParams): string[] {
     deslocamentoX = Math.max(...passosX.map(x => Math.abs(x)))
   }
 
-  // Calcular o ponto de recuo único para todos os cortes
-  let pontoRecuoY = raioInicial; // Valor padrão
-  
+  return { passosX, deslocamentoX }
+}
+
+export type RotaryOrder = "sequential" | "shortest" | "bidirectional" | "reversed"
+
+/** A-axis sequences offered in the UI */
+export const ROTARY_ORDERS: { value: RotaryOrder; label: string }[] = [
+  { value: "sequential", label: "Sequencial (0° a 360°)" },
+  { value: "shortest", label: "Caminho mais curto (eixo A com rollover)" },
+  { value: "bidirectional", label: "Bidirecional (entre -180° e 180°)" },
+  { value: "reversed", label: "Invertida (alternar com a sequencial a cada peça)" },
+]
+
+/**
+ * Calculates the A positions of the notches, in cutting order
+ *
+ * "sequential" and "shortest" cut from 0° upwards; with "shortest" the
+ * control is expected to take the short way around (rollover), so returning
+ * to 0° for the next part costs a single step. "bidirectional" cuts the
+ * notches up to 180° first and then the rest as negative angles, keeping the
+ * table within ±180°. "reversed" cuts from the last notch down to 0°, so
+ * alternating it with "sequential" between parts never unwinds the table.
+ *
+ * @param params - Object containing all machining parameters
+ * @returns A angles in degrees, in cutting order
+ */
+export function computeRotaryAngles(params: MachiningParams): number[] {
+  // Calculate angle between notches
+  const anguloPasso = 360 / params.numEntalhes
+  const angulos: number[] = []
+  for (let ii = 0; ii < params.numEntalhes; ii++) {
+    angulos.push(anguloPasso * ii)
+  }
+  return orderRotaryAngles(angulos, params.ordemRotacao ?? "sequential")
+}
+
+/**
+ * Puts A positions in the cutting order of an A-axis sequence
+ *
+ * @param angulos - A angles in degrees, ascending from 0° (below 360°)
+ * @param ordem - A-axis sequence
+ * @returns A angles in cutting order
+ */
+export function orderRotaryAngles(angulos: number[], ordem: RotaryOrder): number[] {
+  switch (ordem) {
+    case "reversed":
+      return [...angulos].reverse()
+    case "bidirectional": {
+      // Sentido positivo até 180° e depois o sentido negativo, a partir de 0°
+      const positivos = angulos.filter((a) => a <= 180)
+      const negativos = angulos.filter((a) => a > 180).map((a) => a - 360).reverse()
+      return [...positivos, ...negativos]
+    }
+    default:
+      return angulos
+  }
+}
+
+/**
+ * Orders the lateral passes of one Y level
+ *
+ * "center-out" keeps the order of computePassesX and returns to X0 after each
+ * level. "serpentine" sweeps from left to right and reverses on every other
+ * level; "nearest" always takes the remaining pass closest to the tool. Both
+ * start the next level where the previous one ended.
+ *
+ * @param passosX - Pass positions from computePassesX
+ * @param ordem - Ordering strategy
+ * @param xAtual - X position of the tool before the first pass
+ * @param nivel - Index of the Y level, used to alternate the serpentine direction
+ * @returns Pass positions in cutting order
+ */
+export function orderPassesX(passosX: number[], ordem: PassOrder, xAtual: number, nivel: number): number[] {
+  if (ordem === "center-out") return passosX
+
+  const crescente = [...passosX].sort((a, b) => a - b)
+  if (ordem === "serpentine") return nivel % 2 === 0 ? crescente : crescente.reverse()
+
+  // Vizinho mais próximo; em caso de empate, o passe de menor X
+  const ordenados: number[] = []
+  let x = xAtual
+  while (crescente.length > 0) {
+    let melhor = 0
+    for (let i = 1; i < crescente.length; i++) {
+      if (Math.abs(crescente[i] - x) < Math.abs(crescente[melhor] - x)) melhor = i
+    }
+    x = crescente.splice(melhor, 1)[0]
+    ordenados.push(x)
+  }
+  return ordenados
+}
+
+// Trechos mais estreitos que isto não contam como material (sobreposição exata de passes)
+const ENGAGEMENT_EPSILON = 1e-9
+
+/**
+ * Calculates the chip thinning factor of a plunge
+ *
+ * The plunge feeds along Z with the side of the tool cutting across X. A tooth
+ * at lateral offset u from the tool axis cuts a chip fz·√(1 − (u/R)²) thick,
+ * so the thickest chip is cut where the uncut material comes closest to the
+ * axis. The factor is how much the feed can grow to bring that chip back to
+ * the thickness of a full slot: 1 when the uncut material reaches the axis,
+ * growing as the engagement narrows towards the edge of the tool.
+ *
+ * @param x - Lateral position of the plunge
+ * @param cortados - Lateral positions already cut on the same Y level
+ * @param raio - Tool radius
+ * @returns Factor ≥ 1, or Infinity when the plunge only cuts air
+ */
+export function chipThinningFactor(x: number, cortados: readonly number[], raio: number): number {
+  // Trechos de [x - R, x + R] ainda não cortados neste nível
+  let livres: [number, number][] = [[x - raio, x + raio]]
+  for (const c of cortados) {
+    livres = livres.flatMap(([inicio, fim]) => {
+      const trechos: [number, number][] = []
+      if (inicio < c - raio) trechos.push([inicio, Math.min(fim, c - raio)])
+      if (fim > c + raio) trechos.push([Math.max(inicio, c + raio), fim])
+      return trechos
+    })
+  }
+
+  // Menor distância do eixo da ferramenta ao material
+  let menor = Infinity
+  for (const [inicio, fim] of livres) {
+    if (fim - inicio <= ENGAGEMENT_EPSILON) continue
+    const distancia = inicio <= x && x <= fim ? 0 : Math.min(Math.abs(inicio - x), Math.abs(fim - x))
+    menor = Math.min(menor, distancia)
+  }
+  if (menor >= raio) return Infinity
+  const u = menor / raio
+  return 1 / Math.sqrt(1 - u * u)
+}
+
+/**
+ * Creates the engagement-aware feed schedule of a notch
+ *
+ * `avanco` is the feed of a full-slot plunge. The side passes that overlap
+ * the passes already cut on the same Y level engage the tool less and run
+ * faster by the chip thinning factor, so every plunge cuts the chip of the
+ * full slot, up to `avancoMaximo`. Scheduled feeds are rounded to whole
+ * mm/min and never drop below `avanco`. Without `avancoMaximo` every plunge
+ * runs at `avanco`.
+ *
+ * @param params - Object containing all machining parameters
+ * @returns Feed (mm/min) of a plunge at level y and lateral position x; call
+ *   it once per plunge, in cutting order
+ */
+export function createFeedSchedule(params: MachiningParams): (y: number, x: number) => number {
+  const avancoMaximo = params.avancoMaximo
+  if (avancoMaximo === undefined) return () => params.avanco
+
+  const raio = params.diametroFerramenta / 2
+  let nivel = Number.NaN
+  let cortados: number[] = []
+  return (y, x) => {
+    // Um nível Y novo começa sem nenhum passe cortado
+    if (y !== nivel) {
+      nivel = y
+      cortados = []
+    }
+    const fator = chipThinningFactor(x, cortados, raio)
+    cortados.push(x)
+    if (fator === 1) return params.avanco
+    return Math.min(Math.max(Math.round(params.avanco * fator), params.avanco), avancoMaximo)
+  }
+}
+
+/**
+ * Calculates the single Y retract point shared by every cut
+ *
+ * @param params - Object containing all machining parameters
+ * @returns Retract Y coordinate
+ */
+export function computeRetractY(params: MachiningParams): number {
+  const raioInicial = params.diametroInicial / 2
+  const raioFinal = params.diametroFinal / 2
+
   if (params.chavetaConica) {
     // Calcular o deslocamento Y com base no ângulo cônico para o primeiro corte
+    const anguloRadianos = params.anguloConico * Math.PI / 180
     const profundidadeZ = Math.abs(params.profundidadeFinal);
     const deslocamentoY = profundidadeZ * Math.tan(anguloRadianos);
     const yFinalPrimeiroCorte = raioInicial + deslocamentoY;
     
     if (params.ladoCorte === "positivo") {
       // Para lado positivo, escolher o MENOR valor entre Y inicial e Y final
-      pontoRecuoY = Math.min(raioInicial, yFinalPrimeiroCorte) - 1;
-    } else {
-      // Para lado negativo, escolher o MAIOR valor entre Y inicial e Y final
-      pontoRecuoY = Math.max(raioInicial, yFinalPrimeiroCorte) + 1;
+      return Math.min(raioInicial, yFinalPrimeiroCorte) - 1;
     }
-  } else {
-    // Para cortes não cônicos, usar a lógica padrão baseada no lado de corte
-    if (params.ladoCorte === "positivo") {
-      pontoRecuoY = Math.min(raioInicial, raioFinal) - 1;
+    // Para lado negativo, escolher o MAIOR valor entre Y inicial e Y final
+    return Math.max(raioInicial, yFinalPrimeiroCorte) + 1;
+  }
+
+  // Para cortes não cônicos, usar a lógica padrão baseada no lado de corte
+  if (params.ladoCorte === "positivo") {
+    return Math.min(raioInicial, raioFinal) - 1;
+  }
+  return Math.max(raioInicial, raioFinal) + 1;
+}
+
+export type GCodeDialect = "standard" | "fanuc" | "haas" | "siemens"
+
+export interface GCodeOptions {
+  dialect?: GCodeDialect // Formato do programa (padrão: todos os entalhes expandidos)
+  subprogramNumber?: number // Número do subprograma Fanuc (O/P) ou do rótulo Haas (N/P)
+  optimize?: boolean | OptimizeOptions // Remove movimentos redundantes (plano seguro: pontoInicioZ)
+}
+
+/** Program layouts offered in the UI */
+export const GCODE_DIALECTS: { value: GCodeDialect; label: string }[] = [
+  { value: "standard", label: "Expandido (todos os entalhes)" },
+  { value: "fanuc", label: "Fanuc (subprograma M98 / O)" },
+  { value: "haas", label: "Haas (sub-rotina local M97 / N)" },
+  { value: "siemens", label: "Siemens (REPEAT entre rótulos)" },
+]
+
+export const DEFAULT_SUBPROGRAM_NUMBER = 1001
+
+// Rótulos da seção repetida no formato Siemens
+const SIEMENS_START_LABEL = "ENTALHE_INI"
+const SIEMENS_END_LABEL = "ENTALHE_FIM"
+
+/**
+ * Emits the cut sequence of a single notch (everything after its A rotation)
+ *
+ * The sequence does not depend on the notch index, which is what allows it
+ * to be written once as a subprogram.
+ *
+ * @param params - Object containing all machining parameters
+ * @returns Iterator over G-code commands
+ */
+export function* emitNotchBody(params: MachiningParams): Generator<string> {
+  // Calculate derived values
+  const raioInicial = params.diametroInicial / 2
+  const raioFinal = params.diametroFinal / 2
+  
+  // Determinar se estamos cortando de diâmetro maior para menor
+  const cortandoAoContrario = params.diametroInicial > params.diametroFinal
+  
+  // Ângulo cônico em radianos (se ativado)
+  const anguloRadianos = params.chavetaConica ? (params.anguloConico * Math.PI / 180) : 0
+
+  // Calculate X displacement needed and number of passes
+  const { passosX, deslocamentoX } = computePassesX(params)
+  const ordem = params.ordemPasses ?? "center-out"
+
+  // Calcular o ponto de recuo único para todos os cortes
+  const pontoRecuoY = computeRetractY(params)
+
+  // Retração entre passes do mesmo entalhe; o entalhe sempre termina em pontoInicioZ
+  const zRetracao = params.planoSeguroZ ?? params.pontoInicioZ
+  if (params.planoSeguroZ !== undefined && params.planoSeguroZ < 0) {
+    // Abaixo de Z0 os rápidos entre passes (G0 X/Y) atravessariam material
+    throw new Error("O plano seguro Z deve ficar acima da peça, entre Z0 e o ponto de início Z.")
+  }
+
+  // Avanço de cada mergulho conforme o engajamento radial
+  const avancoDoPasse = createFeedSchedule(params)
+
+  // Mergulho em Z (com ajuste cônico em Y, se ativado) e recuo em Y
+  function* corte(y: number, x = 0): Generator<string> {
+    const avanco = avancoDoPasse(y, x)
+    if (params.chavetaConica) {
+      // Calcular o deslocamento Y com base no ângulo cônico
+      const deslocamentoY = Math.abs(params.profundidadeFinal) * Math.tan(anguloRadianos)
+
+      // Movimento combinado Y e Z com ângulo cônico
+      yield `G1 Y${(y + deslocamentoY).toFixed(3)} Z${params.profundidadeFinal} F${avanco} (Calculando para ${params.anguloConico}° graus)`
     } else {
-      pontoRecuoY = Math.max(raioInicial, raioFinal) + 1;
+      yield `G1 Z${params.profundidadeFinal} F${avanco}`
     }
+
+    // Retract to the same Y point for all cuts
+    yield `G0 Y${pontoRecuoY.toFixed(2)}`
   }
 
-  // Initialize G-code array with safety moves
-  const codigoG = ["G0 Z100", "G0 Y0", "G0 X0"]
+  // Passes laterais de um nível Y, na ordem dada
+  let xAtual = 0
+  function* passesLaterais(y: number, passes: number[]): Generator<string> {
+    for (const [i, posicaoX] of passes.entries()) {
+      // Posicionar em X para este passe
+      yield `G0 X${posicaoX.toFixed(3)}`
+      yield* corte(y, posicaoX)
 
-  // Loop for each notch
-  for (let ii = 0; ii < params.numEntalhes; ii++) {
-    codigoG.push(`G0 A${(anguloPasso * ii).toFixed(2)}`) // Angular rotation
-    codigoG.push(`G0 Z${params.pontoInicioZ}`) // Initial Z positioning
-    
-    // Posicionamento inicial no raio de início do corte
-    codigoG.push(`G0 Y${raioInicial}`) // Initial Y positioning (initial radius)
-    codigoG.push("G0 X0") // Ensure initial X position
+      // Se não for o último passe, reposicionar para o próximo
+      if (i < passes.length - 1) {
+        yield `G0 Z${zRetracao}`
+        yield `G0 Y${y.toFixed(3)}`
+      }
+    }
+    xAtual = passes[passes.length - 1]
+  }
 
-    let yAtual = raioInicial // Start Y at initial radius
-    let yDestino = raioFinal; // Destino final do Y
-    
-    // Calcular o incremento Y com base na direção do corte
-    const incrementoY = cortandoAoContrario ? -Math.abs(params.apY) : Math.abs(params.apY);
+  yield `G0 Z${params.pontoInicioZ}` // Initial Z positioning
+  
+  // Posicionamento inicial no raio de início do corte
+  yield `G0 Y${raioInicial}` // Initial Y positioning (initial radius)
+  yield "G0 X0" // Ensure initial X position
+
+  let yAtual = raioInicial // Start Y at initial radius
+  let nivel = 0 // Níveis Y já cortados
+  
+  // Calcular o incremento Y com base na direção do corte
+  const incrementoY = cortandoAoContrario ? -Math.abs(params.apY) : Math.abs(params.apY);
+
+  // Loop for each pass
+  while (true) {
+    // If X displacement is needed, calculate passes
+    if (deslocamentoX > 0) {
+      // Executar todos os passes laterais calculados
+      yield* passesLaterais(yAtual, orderPassesX(passosX, ordem, xAtual, nivel))
+      yield `G0 Z${zRetracao}`
+
+      if (ordem === "center-out") {
+        // Retorno a X0 antes do próximo nível
+        yield "G0 X0"
+        xAtual = 0
+      }
+    } else {
+      // Normal cut without X displacement
+      yield* corte(yAtual)
+      yield `G0 Z${zRetracao}`
+    }
+    nivel++
 
-    // Loop for each pass
-    while (true) {
-      // If X displacement is needed, calculate passes
+    // Calculate next Y position based on direction
+    const nextY = Number.parseFloat((yAtual + incrementoY).toFixed(3));
+
+    // Verificar se chegamos ao destino com base na direção do corte
+    const chegouAoDestino = cortandoAoContrario 
+      ? nextY <= raioFinal  // Se cortando ao contrário, verificar se chegou ou passou do raio final (que é menor)
+      : nextY >= raioFinal; // Se cortando normal, verificar se chegou ou passou do raio final (que é maior)
+
+    if (!chegouAoDestino) {
+      // Still room for another normal advance
+      yield `G0 Y${nextY.toFixed(3)}` // Move to next Y
+      yAtual = nextY
+    } else if (nextY === raioFinal) {
+      // Next advance exactly reaches maximum value
+      yield `G0 Y${raioFinal.toFixed(3)}`
+
+      // Execute final cut (apenas nas duas bordas da abertura)
       if (deslocamentoX > 0) {
-        // Executar todos os passes laterais calculados
-        for (const posicaoX of passosX) {
-          // Posicionar em X para este passe
-          codigoG.push(`G0 X${posicaoX.toFixed(3)}`)
-          
-          // Apply Z movement with conical adjustment if enabled
-          let yFinal = yAtual;
-          if (params.chavetaConica) {
-            // Calcular o deslocamento Y com base no ângulo cônico
-            const profundidadeZ = Math.abs(params.profundidadeFinal);
-            const deslocamentoY = profundidadeZ * Math.tan(anguloRadianos);
-            yFinal = yAtual + deslocamentoY;
-            
-            // Movimento combinado Y e Z com ângulo cônico
-            codigoG.push(`G1 Y${yFinal.toFixed(3)} Z${params.profundidadeFinal} F${params.avanco} (Calculando para ${params.anguloConico}° graus)`)
-          } else {
-            codigoG.push(`G1 Z${params.profundidadeFinal} F${params.avanco}`)
-          }
-          
-          // Retract to the same Y point for all cuts
-          codigoG.push(`G0 Y${pontoRecuoY.toFixed(2)}`)
-          
-          // Se não for o último passe, reposicionar para o próximo
-          if (posicaoX !== passosX[passosX.length - 1]) {
-            codigoG.push(`G0 Z${params.pontoInicioZ}`)
-            codigoG.push(`G0 Y${yAtual.toFixed(3)}`)
-          }
-        }
-        
-        // Finalizar com recuo em Z e retorno a X0
-        codigoG.push(`G0 Z${params.pontoInicioZ}`)
-        codigoG.push("G0 X0")
+        const bordas = ordem === "center-out"
+          ? [deslocamentoX, -deslocamentoX]
+          : orderPassesX([-deslocamentoX, deslocamentoX], ordem, xAtual, nivel)
+        yield* passesLaterais(raioFinal, bordas)
       } else {
-        // Normal cut without X displacement
-        let yFinal = yAtual;
-        if (params.chavetaConica) {
-          // Calcular o deslocamento Y com base no ângulo cônico
-          const profundidadeZ = Math.abs(params.profundidadeFinal);
-          const deslocamentoY = profundidadeZ * Math.tan(anguloRadianos);
-          yFinal = yAtual + deslocamentoY;
-          
-          // Movimento combinado Y e Z com ângulo cônico
-          codigoG.push(`G1 Y${yFinal.toFixed(3)} Z${params.profundidadeFinal} F${params.avanco} (Calculando para ${params.anguloConico}° graus)`)
+        yield* corte(raioFinal)
+      }
+
+      yield `G0 Z${params.pontoInicioZ}`
+      break
+    } else {
+      // Se o próximo passo ultrapassa o destino, fazer o último corte exatamente no raio final
+      if (yAtual !== raioFinal) {
+        yield `G0 Y${raioFinal.toFixed(3)}`
+
+        if (deslocamentoX > 0) {
+          yield* passesLaterais(raioFinal, orderPassesX(passosX, ordem, xAtual, nivel))
         } else {
-          codigoG.push(`G1 Z${params.profundidadeFinal} F${params.avanco}`)
+          yield* corte(raioFinal)
         }
-        
-        // Retract to the same Y point for all cuts
-        codigoG.push(`G0 Y${pontoRecuoY.toFixed(2)}`)
-        codigoG.push(`G0 Z${params.pontoInicioZ}`)
+
+        yield `G0 Z${params.pontoInicioZ}`
+      } else if (zRetracao !== params.pontoInicioZ) {
+        yield `G0 Z${params.pontoInicioZ}`
       }
+      break
+    }
+  }
+}
 
-      // Calculate next Y position based on direction
-      const nextY = Number.parseFloat((yAtual + incrementoY).toFixed(3));
+/**
+ * Emits G-code line by line based on machining parameters
+ *
+ * Lines are produced lazily, so large programs can be written out in
+ * chunks without holding the whole program in memory. With a dialect other
+ * than "standard" the notch cut is written once and called for each A
+ * rotation (Fanuc M98 subprogram, Haas M97 local subroutine or Siemens
+ * REPEAT), instead of being unrolled for every notch. With options.optimize
+ * the lines go through the toolpath optimizer, using pontoInicioZ as the
+ * safe plane unless another safeZ is given.
+ *
+ * @param params - Object containing all machining parameters
+ * @param options - Output options (program dialect, move optimization)
+ * @returns Iterator over G-code commands
+ */
+export function* emitGCode(params: MachiningParams, options: GCodeOptions = {}): Generator<string> {
+  if (options.optimize) {
+    const { optimize, ...rest } = options
+    const optimizeOptions = optimize === true ? {} : optimize
+    yield* optimizeToolpath(emitGCode(params, rest), { safeZ: params.pontoInicioZ, ...optimizeOptions })
+    return
+  }
 
-      // Verificar se chegamos ao destino com base na direção do corte
-      const chegouAoDestino = cortandoAoContrario 
-        ? nextY <= raioFinal  // Se cortando ao contrário, verificar se chegou ou passou do raio final (que é menor)
-        : nextY >= raioFinal; // Se cortando normal, verificar se chegou ou passou do raio final (que é maior)
+  const dialect = options.dialect ?? "standard"
+  const subprograma = options.subprogramNumber ?? DEFAULT_SUBPROGRAM_NUMBER
 
-      if (!chegouAoDestino) {
-        // Still room for another normal advance
-        codigoG.push(`G0 Y${nextY.toFixed(3)}`) // Move to next Y
-        yAtual = nextY
-      } else if (nextY === raioFinal) {
-        // Next advance exactly reaches maximum value
-        codigoG.push(`G0 Y${raioFinal.toFixed(3)}`)
+  // Rotação A de cada entalhe; no Sinumerik, DC() força o caminho mais curto
+  const caminhoCurto = dialect === "siemens" && params.ordemRotacao === "shortest"
+  const rotacoes = computeRotaryAngles(params).map((angulo) =>
+    caminhoCurto ? `G0 A=DC(${angulo.toFixed(2)})` : `G0 A${angulo.toFixed(2)}`)
 
-        // Execute final cut
-        if (deslocamentoX > 0) {
-          codigoG.push(`G0 X${deslocamentoX.toFixed(3)}`)
-          
-          // Apply Z movement with conical adjustment if enabled
-          let yFinal = raioFinal;
-          if (params.chavetaConica) {
-            // Calcular o deslocamento Y com base no ângulo cônico
-            const profundidadeZ = Math.abs(params.profundidadeFinal);
-            const deslocamentoY = profundidadeZ * Math.tan(anguloRadianos);
-            yFinal = raioFinal + deslocamentoY;
-            
-            // Movimento combinado Y e Z com ângulo cônico
-            codigoG.push(`G1 Y${yFinal.toFixed(3)} Z${params.profundidadeFinal} F${params.avanco} (Calculando para ${params.anguloConico}° graus)`)
-          } else {
-            codigoG.push(`G1 Z${params.profundidadeFinal} F${params.avanco}`)
-          }
-          
-          // Retract to the same Y point for all cuts
-          codigoG.push(`G0 Y${pontoRecuoY.toFixed(2)}`)
-          codigoG.push(`G0 Z${params.pontoInicioZ}`)
-
-          codigoG.push(`G0 Y${raioFinal.toFixed(3)}`)
-
-          codigoG.push(`G0 X${(-deslocamentoX).toFixed(3)}`)
-          
-          // Apply Z movement with conical adjustment if enabled
-          if (params.chavetaConica) {
-            // Calcular o deslocamento Y com base no ângulo cônico
-            const profundidadeZ = Math.abs(params.profundidadeFinal);
-            const deslocamentoY = profundidadeZ * Math.tan(anguloRadianos);
-            yFinal = raioFinal + deslocamentoY;
-            
-            // Movimento combinado Y e Z com ângulo cônico
-            codigoG.push(`G1 Y${yFinal.toFixed(3)} Z${params.profundidadeFinal} F${params.avanco} (Calculando para ${params.anguloConico}° graus)`)
-          } else {
-            codigoG.push(`G1 Z${params.profundidadeFinal} F${params.avanco}`)
-          }
-          
-          // Retract to the same Y point for all cuts
-          codigoG.push(`G0 Y${pontoRecuoY.toFixed(2)}`)
-        } else {
-          // Apply Z movement with conical adjustment if enabled
-          let yFinal = raioFinal;
-          if (params.chavetaConica) {
-            // Calcular o deslocamento Y com base no ângulo cônico
-            const profundidadeZ = Math.abs(params.profundidadeFinal);
-            const deslocamentoY = profundidadeZ * Math.tan(anguloRadianos);
-            yFinal = raioFinal + deslocamentoY;
-            
-            // Movimento combinado Y e Z com ângulo cônico
-            codigoG.push(`G1 Y${yFinal.toFixed(3)} Z${params.profundidadeFinal} F${params.avanco} (Calculando para ${params.anguloConico}° graus)`)
-          } else {
-            codigoG.push(`G1 Z${params.profundidadeFinal} F${params.avanco}`)
-          }
-          
-          // Retract to the same Y point for all cuts
-          codigoG.push(`G0 Y${pontoRecuoY.toFixed(2)}`)
-        }
+  if (dialect === "fanuc" || dialect === "haas") {
+    yield "%"
+    yield dialect === "fanuc" ? "O0001 (ENTALHE CNC)" : "O00001 (ENTALHE CNC)"
+  }
 
-        codigoG.push(`G0 Z${params.pontoInicioZ}`)
-        break
-      } else {
-        // Se o próximo passo ultrapassa o destino, fazer o último corte exatamente no raio final
-        if (yAtual !== raioFinal) {
-          codigoG.push(`G0 Y${raioFinal.toFixed(3)}`)
-
-          if (deslocamentoX > 0) {
-            // Executar todos os passes laterais calculados
-            for (const posicaoX of passosX) {
-              // Posicionar em X para este passe
-              codigoG.push(`G0 X${posicaoX.toFixed(3)}`)
-              
-              // Apply Z movement with conical adjustment if enabled
-              let yFinal = raioFinal;
-              if (params.chavetaConica) {
-                // Calcular o deslocamento Y com base no ângulo cônico
-                const profundidadeZ = Math.abs(params.profundidadeFinal);
-                const deslocamentoY = profundidadeZ * Math.tan(anguloRadianos);
-                yFinal = raioFinal + deslocamentoY;
-                
-                // Movimento combinado Y e Z com ângulo cônico
-                codigoG.push(`G1 Y${yFinal.toFixed(3)} Z${params.profundidadeFinal} F${params.avanco} (Calculando para ${params.anguloConico}° graus)`)
-              } else {
-                codigoG.push(`G1 Z${params.profundidadeFinal} F${params.avanco}`)
-              }
-              
-              // Retract to the same Y point for all cuts
-              codigoG.push(`G0 Y${pontoRecuoY.toFixed(2)}`)
-              
-              // Se não for o último passe, reposicionar para o próximo
-              if (posicaoX !== passosX[passosX.length - 1]) {
-                codigoG.push(`G0 Z${params.pontoInicioZ}`)
-                codigoG.push(`G0 Y${raioFinal.toFixed(3)}`)
-              }
-            }
-          } else {
-            // Apply Z movement with conical adjustment if enabled
-            let yFinal = raioFinal;
-            if (params.chavetaConica) {
-              // Calcular o deslocamento Y com base no ângulo cônico
-              const profundidadeZ = Math.abs(params.profundidadeFinal);
-              const deslocamentoY = profundidadeZ * Math.tan(anguloRadianos);
-              yFinal = raioFinal + deslocamentoY;
-              
-              // Movimento combinado Y e Z com ângulo cônico
-              codigoG.push(`G1 Y${yFinal.toFixed(3)} Z${params.profundidadeFinal} F${params.avanco} (Calculando para ${params.anguloConico}° graus)`)
-            } else {
-              codigoG.push(`G1 Z${params.profundidadeFinal} F${params.avanco}`)
-            }
-            
-            // Retract to the same Y point for all cuts
-            codigoG.push(`G0 Y${pontoRecuoY.toFixed(2)}`)
-          }
-
-          codigoG.push(`G0 Z${params.pontoInicioZ}`)
+  // Safety moves
+  yield "G0 Z100"
+  yield "G0 Y0"
+  yield "G0 X0"
+
+  if (dialect === "standard") {
+    // Loop for each notch
+    for (const rotacao of rotacoes) {
+      yield rotacao
+      yield* emitNotchBody(params)
+    }
+  } else if (dialect === "siemens") {
+    // O primeiro entalhe fica entre rótulos; os demais repetem a seção
+    for (const [ii, rotacao] of rotacoes.entries()) {
+      yield rotacao
+      if (ii === 0) {
+        yield `${SIEMENS_START_LABEL}:`
+        for (const linha of emitNotchBody(params)) {
+          // Comentários no Sinumerik usam ";" em vez de parênteses
+          yield linha.replace(/ \((.*)\)$/, " ; $1")
         }
-        break
+        yield `${SIEMENS_END_LABEL}:`
+      } else {
+        yield `REPEAT ${SIEMENS_START_LABEL} ${SIEMENS_END_LABEL} P=1`
       }
     }
+  } else {
+    const chamada = dialect === "fanuc" ? `M98 P${subprograma}` : `M97 P${subprograma}`
+    for (const rotacao of rotacoes) {
+      yield rotacao
+      yield chamada
+    }
   }
 
   // Finalize G-code
-  codigoG.push("G0 Z100") // Safety move
-  codigoG.push("M30") // End of program
+  yield "G0 Z100" // Safety move
+  yield "M30" // End of program
+
+  if ((dialect === "fanuc" || dialect === "haas") && rotacoes.length > 0) {
+    // Corte de um entalhe, escrito uma única vez
+    yield dialect === "fanuc" ? `O${subprograma} (ENTALHE)` : `N${subprograma}`
+    yield* emitNotchBody(params)
+    yield "M99"
+  }
+  if (dialect === "fanuc" || dialect === "haas") {
+    yield "%"
+  }
+}
+
+/**
+ * Generates G-code based on machining parameters
+ *
+ * @param params - Object containing all machining parameters
+ * @param options - Output options (program dialect, move optimization)
+ * @returns Array of G-code commands
+ */
+export function generateGCode(params: MachiningParams, options: GCodeOptions = {}): string[] {
+  return Array.from(emitGCode(params, options))
+}
+
+/**
+ * Generates G-code together with its parsed program model
+ *
+ * The expanded layout is parsed while it is generated; subprogram layouts are
+ * parsed once after generation, expanding the calls.
+ *
+ * @param params - Object containing all machining parameters
+ * @param options - Output options (program dialect, move optimization)
+ * @returns Parsed program; the G-code lines are in `program.source`
+ */
+export function generateGCodeProgram(params: MachiningParams, options: GCodeOptions = {}): GCodeProgram {
+  if ((options.dialect ?? "standard") !== "standard") {
+    return parseGCodeProgram(generateGCode(params, options))
+  }
 
-  return codigoG
+  const lines: string[] = []
+  const builder = new GCodeProgramBuilder()
+  for (const line of emitGCode(params, options)) {
+    builder.push(line, lines.length)
+    lines.push(line)
+  }
+  return builder.build(lines)
+}
+
+/**
+ * Groups G-code lines into newline-joined text chunks of roughly `chunkSize` characters
+ *
+ * Each chunk after the first starts with the line separator, so concatenating all
+ * chunks gives exactly `lines.join("\n")` without building that string in memory.
+ *
+ * @param lines - Any iterable of G-code lines (array or emitGCode generator)
+ * @param chunkSize - Approximate maximum number of characters per chunk
+ * @returns Iterator over text chunks
+ */
+export function* chunkGCode(lines: Iterable<string>, chunkSize = 256 * 1024): Generator<string> {
+  let buffer: string[] = []
+  let size = 0
+  let first = true
+
+  for (const line of lines) {
+    buffer.push(line)
+    size += line.length + 1
+    if (size >= chunkSize) {
+      yield (first ? "" : "\n") + buffer.join("\n")
+      first = false
+      buffer = []
+      size = 0
+    }
+  }
+
+  if (buffer.length > 0) {
+    yield (first ? "" : "\n") + buffer.join("\n")
+  }
 }
@@ -0,0 +1,73 @@
+/** Extensions offered when opening a G-code file */
+export const GCODE_FILE_EXTENSIONS = [".nc", ".gcode", ".ngc", ".tap", ".cnc", ".txt"]
+
+/** G-code file read from disk */
+export interface OpenedGCodeFile {
+  name: string
+  text: string
+}
+
+/**
+ * Reads a file through the launcher's chunked open API
+ *
+ * The launcher memory-maps large files and hands them over in line-aligned
+ * chunks, so no single bridge call carries the whole program.
+ *
+ * @returns File name and text, or null when the user cancels
+ */
+async function openChunked(): Promise<OpenedGCodeFile | null> {
+  const api = window.pywebview!.api
+  const begin = await api.open_file_begin!()
+  if (!begin.success || !begin.handle) {
+    if (begin.message && !/cancelad/i.test(begin.message)) throw new Error(begin.message)
+    return null
+  }
+
+  const chunks: string[] = []
+  try {
+    for (;;) {
+      const res = await api.open_file_read!(begin.handle)
+      if (!res.success) throw new Error(res.message)
+      if (res.chunk) chunks.push(res.chunk)
+      if (res.done) break
+    }
+  } catch (err) {
+    await api.open_file_close!(begin.handle).catch(() => undefined)
+    throw err
+  }
+  return { name: begin.name ?? "", text: chunks.join("") }
+}
+
+/**
+ * Lets the user pick a file with the browser's file input
+ *
+ * @returns File name and text, or null when the user cancels
+ */
+function openWithInput(): Promise<OpenedGCodeFile | null> {
+  return new Promise((resolve, reject) => {
+    const input = document.createElement("input")
+    input.type = "file"
+    input.accept = GCODE_FILE_EXTENSIONS.join(",")
+    input.onchange = () => {
+      const file = input.files?.[0]
+      if (!file) return resolve(null)
+      file.text().then((text) => resolve({ name: file.name, text }), reject)
+    }
+    input.addEventListener("cancel", () => resolve(null))
+    input.click()
+  })
+}
+
+/**
+ * Opens a G-code program from disk
+ *
+ * Uses the desktop launcher's chunked open API when available and the
+ * browser's file input otherwise. Parse the text with an "import" job on the
+ * G-code worker (see lib/gcode-jobs).
+ *
+ * @returns File name and text, or null when the user cancels
+ */
+export async function openGCodeFile(): Promise<OpenedGCodeFile | null> {
+  if (window.pywebview?.api.open_file_begin) return openChunked()
+  return openWithInput()
+}
@@ -0,0 +1,136 @@
+import { compareFeatureJob, generateFeatureJob, type FeatureJobComparison, type FeatureJobOptions, type JobFeature } from "@/lib/feature-job"
+import { generateGCode, generateGCodeProgram, type GCodeOptions, type MachiningParams } from "@/lib/gcode-generator"
+import { packProgram, parseGCodeProgram, parseGCodeText, unpackProgram, type GCodeProgram, type GCodeProgramTransfer } from "@/lib/gcode-program"
+import { findNotchStarts, type PlaybackOptions } from "@/lib/playback"
+import { simulateStock, type NotchLeftover } from "@/lib/stock-model"
+import { optimizeGCode, type OptimizeOptions, type OptimizeReport } from "@/lib/toolpath-optimizer"
+
+/**
+ * Work that can run off the UI thread
+ *
+ * - generate: generates the program from the parameters (optionally optimized)
+ * - parse: parses G-code that came from elsewhere
+ * - import: parses the text of a G-code file (external or hand-edited programs)
+ * - features: generates one program for several features on the same setup
+ *   and compares its cycle time with one program per feature
+ *
+ * When machining parameters are given, the leftover report of the stock model
+ * is computed as well.
+ */
+export type GCodeJob =
+  | {
+      kind: "generate"
+      params: MachiningParams
+      options?: GCodeOptions
+      optimize?: OptimizeOptions // presente: passa o código pelo otimizador de percurso
+    }
+  | {
+      kind: "parse"
+      lines: string[]
+      params?: MachiningParams | null
+    }
+  | {
+      kind: "import"
+      text: string
+    }
+  | {
+      kind: "features"
+      features: JobFeature[]
+      options?: FeatureJobOptions
+      optimize?: OptimizeOptions // presente: passa o código pelo otimizador de percurso
+      rates?: PlaybackOptions // velocidades usadas na comparação dos tempos de ciclo
+    }
+
+export interface GCodeJobResult {
+  program: GCodeProgram
+  stockReport: NotchLeftover[] | null // sobra por entalhe (null sem parâmetros de usinagem)
+  optimizeReport: OptimizeReport | null
+  featureComparison: FeatureJobComparison | null // só nos trabalhos com várias features
+}
+
+/** Job result as posted by the worker */
+export interface GCodeJobMessage {
+  program: GCodeProgramTransfer
+  stockReport: NotchLeftover[] | null
+  optimizeReport: OptimizeReport | null
+  featureComparison?: FeatureJobComparison | null
+}
+
+/**
+ * Runs a job on the current thread
+ *
+ * @param job - Job description
+ * @returns Parsed program and its reports
+ */
+export function runGCodeJob(job: GCodeJob): GCodeJobResult {
+  let program: GCodeProgram
+  let optimizeReport: OptimizeReport | null = null
+  let featureComparison: FeatureJobComparison | null = null
+  let params: MachiningParams | null | undefined
+
+  if (job.kind === "generate") {
+    params = job.params
+    if (job.optimize) {
+      const { lines, report } = optimizeGCode(generateGCode(job.params, job.options), job.optimize)
+      program = parseGCodeProgram(lines)
+      optimizeReport = report
+    } else {
+      // Sem otimização o programa já sai do gerador analisado
+      program = generateGCodeProgram(job.params, job.options)
+    }
+  } else if (job.kind === "features") {
+    // Sem modelo do material: o blank de cada feature não é o mesmo
+    const lines = generateFeatureJob(job.features, job.options)
+    if (job.optimize) {
+      const optimized = optimizeGCode(lines, job.optimize)
+      program = parseGCodeProgram(optimized.lines)
+      optimizeReport = optimized.report
+    } else {
+      program = parseGCodeProgram(lines)
+    }
+    // Programas separados otimizados cada um com o próprio plano seguro
+    featureComparison = compareFeatureJob(job.features, { ...job.options, optimize: job.optimize !== undefined }, job.rates, program)
+  } else if (job.kind === "parse") {
+    params = job.params
+    program = parseGCodeProgram(job.lines)
+  } else {
+    program = parseGCodeText(job.text)
+  }
+
+  const stockReport = params ? simulateStock(program, params, findNotchStarts(program)).report : null
+  return { program, stockReport, optimizeReport, featureComparison }
+}
+
+/**
+ * Packs a job result for `postMessage`, moving the program columns
+ *
+ * @param result - Result of `runGCodeJob`
+ * @returns Message and the buffers to transfer
+ */
+export function packJobResult(result: GCodeJobResult): { message: GCodeJobMessage; transfer: ArrayBuffer[] } {
+  const { data, transfer } = packProgram(result.program)
+  return {
+    message: {
+      program: data,
+      stockReport: result.stockReport,
+      optimizeReport: result.optimizeReport,
+      featureComparison: result.featureComparison,
+    },
+    transfer,
+  }
+}
+
+/**
+ * Rebuilds a job result received from the worker
+ *
+ * @param message - Message produced by `packJobResult`
+ * @returns Job result
+ */
+export function unpackJobResult(message: GCodeJobMessage): GCodeJobResult {
+  return {
+    program: unpackProgram(message.program),
+    stockReport: message.stockReport,
+    optimizeReport: message.optimizeReport,
+    featureComparison: message.featureComparison ?? null,
+  }
+}
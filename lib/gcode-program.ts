@@ -0,0 +1,586 @@
+import type { SimulationFrame } from "@/types/simulation"
+
+/** Motion type of a move */
+export const MOTION_RAPID = 0 // G0
+export const MOTION_FEED = 1 // G1
+
+// Limite de chamadas aninhadas (protege contra subprogramas recursivos)
+const MAX_CALL_DEPTH = 16
+
+// Palavras (letra + número, inclusive a forma Sinumerik A=DC(valor)) e comentários
+const TOKEN = /;(.*)$|\(([^)]*)\)|([A-Z])(?:=(?:DC\()?)?([-+]?\d*\.?\d+)\)?/gi
+
+// Número de bloco no início da linha (N10 G0 X1); um "N1001" sozinho é rótulo Haas
+const BLOCK_NUMBER = /^N\d+\s+(?=\S)/i
+
+// Chamadas de subprograma, que exigem expandir o programa antes da análise
+const SUBPROGRAM_CALL = /^\s*(?:N\d+\s+)?(?:M9[78]\b|REPEAT\b)/i
+
+// Códigos G não modais em que as palavras de eixo não são um movimento
+// (G4 pausa, G10 dados, G28/G30 referência, G53 coordenadas de máquina, G92 origem)
+const NON_MOTION_G = [4, 10, 28, 30, 53, 92]
+
+/** Largest deviation of the chords from an arc (G2/G3), in mm */
+export const ARC_TOLERANCE = 0.005
+// Limite de segmentos por arco (arcos enormes ou com vários giros)
+const MAX_ARC_SEGMENTS = 2048
+
+/**
+ * Expands subprogram calls into the sequence of executed source lines
+ *
+ * Understands the layouts written by emitGCode: Fanuc "M98 P" with "O" programs
+ * (optional "L" repeat count), Haas "M97 P" with local "N" labels and Siemens
+ * "REPEAT start end P=n" between labels. Lines are referenced by index, so a
+ * repeated block points back to the same source lines.
+ *
+ * @param gCode - Array of G-code commands
+ * @returns Indices of the executed lines, or null when the program has no calls
+ */
+export function expandSubprogramIndices(gCode: readonly string[]): number[] | null {
+  if (!gCode.some((line) => SUBPROGRAM_CALL.test(line))) return null
+
+  // Índices de início de cada programa O, rótulo N e rótulo Siemens
+  const programs = new Map<number, number>()
+  const nLabels = new Map<number, number>()
+  const labels = new Map<string, number>()
+  gCode.forEach((line, i) => {
+    const cmd = line.trim()
+    let match
+    if ((match = /^O(\d+)/i.exec(cmd))) programs.set(Number(match[1]), i + 1)
+    else if ((match = /^N(\d+)\s*$/i.exec(cmd))) nLabels.set(Number(match[1]), i + 1)
+    else if ((match = /^([A-Z_][A-Z0-9_]*):/i.exec(cmd))) labels.set(match[1].toUpperCase(), i)
+    else if ((match = /^N(\d+)\s/i.exec(cmd)) && !nLabels.has(Number(match[1]))) {
+      // Programa numerado em todas as linhas: M97 P salta para a própria linha N
+      nLabels.set(Number(match[1]), i)
+    }
+  })
+
+  const expanded: number[] = []
+
+  // Executa as linhas a partir de "start" até M99/M30 (ou até "end", exclusivo)
+  const run = (start: number, end: number, depth: number) => {
+    if (depth > MAX_CALL_DEPTH) throw new Error("Chamadas de subprograma aninhadas demais")
+
+    for (let i = start; i < end; i++) {
+      const cmd = gCode[i].trim().replace(BLOCK_NUMBER, "")
+      let match
+
+      if (/^(M99|M30|M0?2)\b/i.test(cmd)) {
+        if (depth === 0) expanded.push(i)
+        return
+      }
+
+      if ((match = /^M98\s+P(\d+)(?:\s+L(\d+))?/i.exec(cmd))) {
+        // Fanuc: P com mais de 4 dígitos carrega as repetições nos dígitos iniciais
+        let program = Number(match[1])
+        let times = match[2] ? Number(match[2]) : 1
+        if (!match[2] && match[1].length > 4) {
+          times = Number(match[1].slice(0, -4))
+          program = Number(match[1].slice(-4))
+        }
+        const begin = programs.get(program)
+        if (begin === undefined) throw new Error(`Subprograma O${program} não encontrado`)
+        for (let t = 0; t < times; t++) run(begin, gCode.length, depth + 1)
+      } else if ((match = /^M97\s+P(\d+)(?:\s+L(\d+))?/i.exec(cmd))) {
+        const begin = nLabels.get(Number(match[1]))
+        if (begin === undefined) throw new Error(`Rótulo N${match[1]} não encontrado`)
+        const times = match[2] ? Number(match[2]) : 1
+        for (let t = 0; t < times; t++) run(begin, gCode.length, depth + 1)
+      } else if ((match = /^REPEAT\s+([A-Z_][A-Z0-9_]*)\s+([A-Z_][A-Z0-9_]*)(?:\s+P\s*=\s*(\d+))?/i.exec(cmd))) {
+        const begin = labels.get(match[1].toUpperCase())
+        const finish = labels.get(match[2].toUpperCase())
+        if (begin === undefined || finish === undefined) {
+          throw new Error(`Rótulos ${match[1]}/${match[2]} não encontrados`)
+        }
+        const times = match[3] ? Number(match[3]) : 1
+        for (let t = 0; t < times; t++) run(begin + 1, finish, depth + 1)
+      } else if (cmd !== "%") {
+        expanded.push(i)
+      }
+    }
+  }
+
+  run(0, gCode.length, 0)
+  return expanded
+}
+
+/**
+ * Parsed G-code program stored as typed-array columns
+ *
+ * Each move (G0/G1 line, after subprogram expansion) is one row: the end
+ * position in X/Y/Z/A, the modal feed rate, the motion type and the index of
+ * the source line. Comments are kept per source line. Rows are read by index
+ * without creating objects, and the source line of a move and the first move
+ * of a line are both O(1) lookups.
+ */
+export class GCodeProgram {
+  readonly length: number
+  readonly x: Float64Array
+  readonly y: Float64Array
+  readonly z: Float64Array
+  readonly a: Float64Array
+  readonly f: Float64Array
+  readonly motion: Uint8Array
+  readonly line: Int32Array
+  readonly comments: ReadonlyMap<number, string>
+  readonly source: readonly string[]
+  private readonly firstMove: Int32Array
+
+  constructor(columns: {
+    x: Float64Array
+    y: Float64Array
+    z: Float64Array
+    a: Float64Array
+    f: Float64Array
+    motion: Uint8Array
+    line: Int32Array
+  }, source: readonly string[], comments: ReadonlyMap<number, string> = new Map()) {
+    this.length = columns.motion.length
+    this.x = columns.x
+    this.y = columns.y
+    this.z = columns.z
+    this.a = columns.a
+    this.f = columns.f
+    this.motion = columns.motion
+    this.line = columns.line
+    this.source = source
+    this.comments = comments
+
+    // Primeiro movimento de cada linha do código (-1 se a linha não move)
+    this.firstMove = new Int32Array(source.length).fill(-1)
+    for (let i = this.length - 1; i >= 0; i--) this.firstMove[this.line[i]] = i
+  }
+
+  /**
+   * Returns one move as a simulation frame
+   *
+   * @param i - Move index
+   * @returns Frame with the end position and the motion command
+   */
+  frame(i: number): SimulationFrame {
+    return {
+      x: this.x[i],
+      y: this.y[i],
+      z: this.z[i],
+      a: this.a[i],
+      cmd: this.motion[i] === MOTION_FEED ? "G1" : "G0",
+    }
+  }
+
+  /**
+   * Finds the first move produced by a source line
+   *
+   * @param lineIndex - Index of the line in the source program
+   * @returns Move index, or -1 when the line has no motion
+   */
+  moveAtLine(lineIndex: number): number {
+    return lineIndex >= 0 && lineIndex < this.firstMove.length ? this.firstMove[lineIndex] : -1
+  }
+
+  /** Materializes every move as a simulation frame */
+  toFrames(): SimulationFrame[] {
+    const frames = new Array<SimulationFrame>(this.length)
+    for (let i = 0; i < this.length; i++) frames[i] = this.frame(i)
+    return frames
+  }
+}
+
+/**
+ * Accumulates moves into growable typed-array columns
+ *
+ * Tracks the modal state of the control: motion (G0/G1/G2/G3), absolute or
+ * incremental distances (G90/G91), the arc plane (G17/G18/G19), inch or
+ * metric units (G20/G21, stored in mm) and the feed rate. Arcs are stored as
+ * chords within ARC_TOLERANCE, all pointing back to the arc's source line.
+ */
+export class GCodeProgramBuilder {
+  private capacity: number
+  private count = 0
+  private x: Float64Array
+  private y: Float64Array
+  private z: Float64Array
+  private a: Float64Array
+  private f: Float64Array
+  private motion: Uint8Array
+  private line: Int32Array
+  private readonly comments = new Map<number, string>()
+
+  // Estado modal da máquina
+  private pos = { X: 0, Y: 0, Z: 0, A: 0, F: 0 }
+  private modalMotion = -1
+  private absolute = true
+  private plane = 17
+  private scale = 1
+
+  constructor(capacity = 1024) {
+    this.capacity = Math.max(16, capacity)
+    this.x = new Float64Array(this.capacity)
+    this.y = new Float64Array(this.capacity)
+    this.z = new Float64Array(this.capacity)
+    this.a = new Float64Array(this.capacity)
+    this.f = new Float64Array(this.capacity)
+    this.motion = new Uint8Array(this.capacity)
+    this.line = new Int32Array(this.capacity)
+  }
+
+  /**
+   * Parses one source line and appends its moves, if any
+   *
+   * A line moves when it has an axis word and a motion mode is active, either
+   * from a G0/G1/G2/G3 on the line or from an earlier one (modal motion).
+   * Block numbers, comments and words the simulator does not use are skipped.
+   *
+   * @param text - G-code line
+   * @param lineIndex - Index of the line in the source program
+   */
+  push(text: string, lineIndex: number): void {
+    let motion = -1
+    let nonMotion = -1
+    let hasAxis = false
+    let x = Number.NaN
+    let y = Number.NaN
+    let z = Number.NaN
+    let a = Number.NaN
+    let i = 0
+    let j = 0
+    let k = 0
+    let r = Number.NaN
+    TOKEN.lastIndex = 0
+
+    let match
+    while ((match = TOKEN.exec(text)) !== null) {
+      if (match[3] === undefined) {
+        const comment = (match[1] ?? match[2]).trim()
+        if (comment && !this.comments.has(lineIndex)) this.comments.set(lineIndex, comment)
+        continue
+      }
+
+      const value = Number.parseFloat(match[4])
+      switch (match[3].toUpperCase()) {
+        case "G":
+          if (value === 0 || value === 1 || value === 2 || value === 3) motion = value
+          else if (value === 90) this.absolute = true
+          else if (value === 91) this.absolute = false
+          else if (value === 17 || value === 18 || value === 19) this.plane = value
+          else if (value === 20) this.scale = 25.4
+          else if (value === 21) this.scale = 1
+          else if (value === 80) this.modalMotion = -1
+          else if (NON_MOTION_G.includes(value)) nonMotion = value
+          break
+        case "X": x = value; hasAxis = true; break
+        case "Y": y = value; hasAxis = true; break
+        case "Z": z = value; hasAxis = true; break
+        case "A": a = value; hasAxis = true; break
+        case "F": this.pos.F = value * this.scale; break
+        case "I": i = value * this.scale; break
+        case "J": j = value * this.scale; break
+        case "K": k = value * this.scale; break
+        case "R": r = value * this.scale; break
+      }
+    }
+
+    if (!hasAxis || nonMotion === 4) {
+      if (motion >= 0) this.modalMotion = motion
+      return
+    }
+
+    // Destino: G90 absoluto, G91 incremental (o eixo A não muda de unidade)
+    const pos = this.pos
+    const absolute = this.absolute || nonMotion === 92
+    const tx = Number.isNaN(x) ? pos.X : absolute ? x * this.scale : pos.X + x * this.scale
+    const ty = Number.isNaN(y) ? pos.Y : absolute ? y * this.scale : pos.Y + y * this.scale
+    const tz = Number.isNaN(z) ? pos.Z : absolute ? z * this.scale : pos.Z + z * this.scale
+    const ta = Number.isNaN(a) ? pos.A : absolute ? a : pos.A + a
+
+    if (nonMotion >= 0) {
+      // G92 redefine a posição atual sem mover; os demais não entram na simulação
+      if (nonMotion === 92) {
+        pos.X = tx
+        pos.Y = ty
+        pos.Z = tz
+        pos.A = ta
+      }
+      return
+    }
+
+    if (motion < 0) motion = this.modalMotion
+    if (motion < 0) return
+    this.modalMotion = motion
+
+    if (motion >= 2) this.arc(motion === 2, tx, ty, tz, ta, i, j, k, r, lineIndex)
+    pos.X = tx
+    pos.Y = ty
+    pos.Z = tz
+    pos.A = ta
+    this.append(motion === MOTION_RAPID ? MOTION_RAPID : MOTION_FEED, lineIndex)
+  }
+
+  /**
+   * Finishes the program
+   *
+   * @param source - Source lines the moves refer to
+   * @returns Program with columns trimmed to the number of moves
+   */
+  build(source: readonly string[]): GCodeProgram {
+    const n = this.count
+    return new GCodeProgram({
+      x: this.x.slice(0, n),
+      y: this.y.slice(0, n),
+      z: this.z.slice(0, n),
+      a: this.a.slice(0, n),
+      f: this.f.slice(0, n),
+      motion: this.motion.slice(0, n),
+      line: this.line.slice(0, n),
+    }, source, this.comments)
+  }
+
+  /**
+   * Appends the intermediate chord points of an arc (the end point is added by push)
+   *
+   * The arc lies in the active plane; the third axis (and A) moves linearly,
+   * giving a helix. The center comes from I/J/K (relative to the start) or
+   * from R, where a negative R selects the arc longer than 180°. With I/J/K
+   * and the end equal to the start the arc is a full circle.
+   */
+  private arc(
+    clockwise: boolean,
+    tx: number, ty: number, tz: number, ta: number,
+    i: number, j: number, k: number, r: number,
+    lineIndex: number,
+  ): void {
+    const pos = this.pos
+    // Eixos do plano (u, v) e eixo linear (w), na ordem que define o sentido horário
+    let u0: number, v0: number, u1: number, v1: number, du: number, dv: number
+    if (this.plane === 18) {
+      u0 = pos.Z; v0 = pos.X; u1 = tz; v1 = tx; du = k; dv = i
+    } else if (this.plane === 19) {
+      u0 = pos.Y; v0 = pos.Z; u1 = ty; v1 = tz; du = j; dv = k
+    } else {
+      u0 = pos.X; v0 = pos.Y; u1 = tx; v1 = ty; du = i; dv = j
+    }
+
+    if (!Number.isNaN(r)) {
+      // Centro pelo raio: sobre a mediatriz da corda, do lado dado pelo sentido e pelo sinal de R
+      const cu = u1 - u0
+      const cv = v1 - v0
+      const chord = Math.hypot(cu, cv)
+      if (chord === 0) return
+      let h = -Math.sqrt(Math.max(0, 4 * r * r - chord * chord)) / chord
+      if (!clockwise) h = -h
+      if (r < 0) h = -h
+      du = 0.5 * (cu - cv * h)
+      dv = 0.5 * (cv + cu * h)
+    }
+
+    const centerU = u0 + du
+    const centerV = v0 + dv
+    const radius = Math.hypot(du, dv)
+    if (radius === 0) return
+
+    const su = -du
+    const sv = -dv
+    const eu = u1 - centerU
+    const ev = v1 - centerV
+    let sweep = Math.atan2(su * ev - sv * eu, su * eu + sv * ev)
+    if (clockwise) {
+      if (sweep >= -1e-9) sweep -= 2 * Math.PI
+    } else if (sweep <= 1e-9) {
+      sweep += 2 * Math.PI
+    }
+
+    // Segmentos com a flecha dentro da tolerância
+    const step = radius > ARC_TOLERANCE ? 2 * Math.acos(1 - ARC_TOLERANCE / radius) : Math.PI / 2
+    const segments = Math.min(MAX_ARC_SEGMENTS, Math.max(1, Math.ceil(Math.abs(sweep) / step)))
+
+    const start = { X: pos.X, Y: pos.Y, Z: pos.Z, A: pos.A }
+    const startAngle = Math.atan2(sv, su)
+    for (let s = 1; s < segments; s++) {
+      const t = s / segments
+      const angle = startAngle + sweep * t
+      const pu = centerU + radius * Math.cos(angle)
+      const pv = centerV + radius * Math.sin(angle)
+      if (this.plane === 18) {
+        pos.Z = pu; pos.X = pv; pos.Y = start.Y + (ty - start.Y) * t
+      } else if (this.plane === 19) {
+        pos.Y = pu; pos.Z = pv; pos.X = start.X + (tx - start.X) * t
+      } else {
+        pos.X = pu; pos.Y = pv; pos.Z = start.Z + (tz - start.Z) * t
+      }
+      pos.A = start.A + (ta - start.A) * t
+      this.append(MOTION_FEED, lineIndex)
+    }
+  }
+
+  private append(motion: number, lineIndex: number): void {
+    if (this.count === this.capacity) this.grow()
+    const i = this.count++
+    this.x[i] = this.pos.X
+    this.y[i] = this.pos.Y
+    this.z[i] = this.pos.Z
+    this.a[i] = this.pos.A
+    this.f[i] = this.pos.F
+    this.motion[i] = motion
+    this.line[i] = lineIndex
+  }
+
+  private grow(): void {
+    this.capacity *= 2
+    const resize = <T extends Float64Array | Uint8Array | Int32Array>(old: T, created: T): T => {
+      created.set(old)
+      return created
+    }
+    this.x = resize(this.x, new Float64Array(this.capacity))
+    this.y = resize(this.y, new Float64Array(this.capacity))
+    this.z = resize(this.z, new Float64Array(this.capacity))
+    this.a = resize(this.a, new Float64Array(this.capacity))
+    this.f = resize(this.f, new Float64Array(this.capacity))
+    this.motion = resize(this.motion, new Uint8Array(this.capacity))
+    this.line = resize(this.line, new Int32Array(this.capacity))
+  }
+}
+
+/**
+ * Parses a G-code program into its column model, expanding subprogram calls
+ *
+ * @param gCode - Array of G-code commands
+ * @returns Parsed program
+ */
+export function parseGCodeProgram(gCode: readonly string[]): GCodeProgram {
+  const order = expandSubprogramIndices(gCode)
+  const builder = new GCodeProgramBuilder(order ? order.length : gCode.length)
+  if (order) {
+    for (const i of order) builder.push(gCode[i], i)
+  } else {
+    for (let i = 0; i < gCode.length; i++) builder.push(gCode[i], i)
+  }
+  return builder.build(gCode)
+}
+
+/**
+ * Parses G-code text as it arrives, in a single pass
+ *
+ * Chunks may end anywhere (mid-line, or between "\r" and "\n"); each complete
+ * line is split off and parsed immediately, so a multi-megabyte file is never
+ * held twice as text and lines. Subprogram calls need labels that may come
+ * later in the file: when one is seen, the rest is only collected and the
+ * program is parsed with its calls expanded at the end.
+ */
+export class GCodeTextParser {
+  private readonly source: string[] = []
+  private readonly builder: GCodeProgramBuilder
+  private partial = ""
+  private hasCalls = false
+
+  /**
+   * @param sizeHint - Expected text length, used to size the columns
+   */
+  constructor(sizeHint = 0) {
+    // ~20 caracteres por linha em programas típicos
+    this.builder = new GCodeProgramBuilder(Math.ceil(sizeHint / 20))
+  }
+
+  /**
+   * Parses the complete lines of a chunk
+   *
+   * @param chunk - Next piece of the text
+   */
+  write(chunk: string): void {
+    const text = this.partial + chunk
+    let start = 0
+    let end
+    while ((end = text.indexOf("\n", start)) >= 0) {
+      this.pushLine(text.slice(start, end > start && text.charCodeAt(end - 1) === 13 ? end - 1 : end))
+      start = end + 1
+    }
+    this.partial = text.slice(start)
+  }
+
+  /**
+   * Parses the last line and finishes the program
+   *
+   * @returns Parsed program
+   */
+  end(): GCodeProgram {
+    if (this.partial) {
+      this.pushLine(this.partial.endsWith("\r") ? this.partial.slice(0, -1) : this.partial)
+      this.partial = ""
+    }
+    return this.hasCalls ? parseGCodeProgram(this.source) : this.builder.build(this.source)
+  }
+
+  private pushLine(line: string): void {
+    const index = this.source.length
+    this.source.push(line)
+    if (!this.hasCalls && SUBPROGRAM_CALL.test(line)) this.hasCalls = true
+    if (!this.hasCalls) this.builder.push(line, index)
+  }
+}
+
+/**
+ * Parses a whole G-code text (for example an imported .nc file)
+ *
+ * @param text - Program text, with "\n" or "\r\n" line breaks
+ * @returns Parsed program
+ */
+export function parseGCodeText(text: string): GCodeProgram {
+  const parser = new GCodeTextParser(text.length)
+  parser.write(text)
+  return parser.end()
+}
+
+/**
+ * Program in a form that can be posted between threads
+ *
+ * The columns travel as transferable buffers (moved, not copied); the source
+ * goes as a single string, which is much cheaper to clone than one per line.
+ */
+export interface GCodeProgramTransfer {
+  x: Float64Array
+  y: Float64Array
+  z: Float64Array
+  a: Float64Array
+  f: Float64Array
+  motion: Uint8Array
+  line: Int32Array
+  source: string
+  comments: [number, string][]
+}
+
+/**
+ * Packs a program for `postMessage`
+ *
+ * The column buffers are listed in `transfer`; once posted, the program that
+ * was packed can no longer be read.
+ *
+ * @param program - Parsed program
+ * @returns Message payload and the buffers to transfer
+ */
+export function packProgram(program: GCodeProgram): { data: GCodeProgramTransfer; transfer: ArrayBuffer[] } {
+  const data: GCodeProgramTransfer = {
+    x: program.x,
+    y: program.y,
+    z: program.z,
+    a: program.a,
+    f: program.f,
+    motion: program.motion,
+    line: program.line,
+    source: program.source.join("\n"),
+    comments: Array.from(program.comments),
+  }
+  const columns = [data.x, data.y, data.z, data.a, data.f, data.motion, data.line]
+  return { data, transfer: columns.map((column) => column.buffer as ArrayBuffer) }
+}
+
+/**
+ * Rebuilds a program received from another thread
+ *
+ * @param data - Payload produced by `packProgram`
+ * @returns Program over the received columns
+ */
+export function unpackProgram(data: GCodeProgramTransfer): GCodeProgram {
+  return new GCodeProgram(
+    { x: data.x, y: data.y, z: data.z, a: data.a, f: data.f, motion: data.motion, line: data.line },
+    data.source.length > 0 ? data.source.split("\n") : [],
+    new Map(data.comments),
+  )
+}
@@ -0,0 +1,102 @@
+import { runGCodeJob, unpackJobResult, type GCodeJob, type GCodeJobMessage, type GCodeJobResult } from "@/lib/gcode-jobs"
+
+/** Raised for a request that was superseded by a newer one */
+export class GCodeJobCancelledError extends Error {
+  constructor() {
+    super("Pedido substituído por um mais recente")
+    this.name = "GCodeJobCancelledError"
+  }
+}
+
+interface PendingJob {
+  id: number
+  resolve: (result: GCodeJobResult) => void
+  reject: (error: Error) => void
+}
+
+/**
+ * Runs G-code jobs on a background worker, keeping only the latest request
+ *
+ * A new request cancels the one still running: its promise is rejected with
+ * GCodeJobCancelledError and the worker is terminated and replaced, so a long
+ * generation never delays the next one. Without Web Worker support (server
+ * rendering) jobs run on the calling thread.
+ */
+export class GCodeWorkerClient {
+  private worker: Worker | null = null
+  private pending: PendingJob | null = null
+  private nextId = 1
+
+  /**
+   * Runs a job, cancelling the previous one if it has not finished
+   *
+   * @param job - Job description
+   * @returns Result of the job
+   */
+  run(job: GCodeJob): Promise<GCodeJobResult> {
+    if (typeof Worker === "undefined") {
+      return new Promise((resolve) => resolve(runGCodeJob(job)))
+    }
+
+    // O pedido anterior ainda está rodando: descarta o worker junto com ele
+    if (this.pending) {
+      this.pending.reject(new GCodeJobCancelledError())
+      this.pending = null
+      this.terminate()
+    }
+
+    const worker = this.ensureWorker()
+    const id = this.nextId++
+    return new Promise<GCodeJobResult>((resolve, reject) => {
+      this.pending = { id, resolve, reject }
+      worker.postMessage({ id, job })
+    })
+  }
+
+  /** Cancels the running job, if any */
+  cancel(): void {
+    if (!this.pending) return
+    this.pending.reject(new GCodeJobCancelledError())
+    this.pending = null
+    this.terminate()
+  }
+
+  /** Stops the worker; a later `run` starts a new one */
+  dispose(): void {
+    this.cancel()
+    this.terminate()
+  }
+
+  private ensureWorker(): Worker {
+    if (this.worker) return this.worker
+    const worker = new Worker(new URL("./gcode.worker.ts", import.meta.url))
+    worker.onmessage = (event: MessageEvent<{ id: number; result?: GCodeJobMessage; error?: string }>) => {
+      const pending = this.pending
+      if (!pending || pending.id !== event.data.id) return // resposta de um pedido já cancelado
+      this.pending = null
+      if (event.data.result) pending.resolve(unpackJobResult(event.data.result))
+      else pending.reject(new Error(event.data.error ?? "Falha no processamento do código G"))
+    }
+    worker.onerror = (event) => {
+      const pending = this.pending
+      this.pending = null
+      this.terminate()
+      pending?.reject(new Error(event.message || "Falha no processamento do código G"))
+    }
+    this.worker = worker
+    return worker
+  }
+
+  private terminate(): void {
+    this.worker?.terminate()
+    this.worker = null
+  }
+}
+
+let sharedClient: GCodeWorkerClient | null = null
+
+/** Client shared by the panels (one background worker for the whole app) */
+export function getGCodeWorker(): GCodeWorkerClient {
+  if (!sharedClient) sharedClient = new GCodeWorkerClient()
+  return sharedClient
+}
@@ -0,0 +1,19 @@
+import { packJobResult, runGCodeJob, type GCodeJob } from "@/lib/gcode-jobs"
+
+/**
+ * Background worker for G-code generation, parsing and the stock report
+ *
+ * Receives `{ id, job }` and answers `{ id, result }` with the program columns
+ * transferred (not copied), or `{ id, error }`.
+ */
+const scope = self as unknown as Worker
+
+scope.onmessage = (event: MessageEvent<{ id: number; job: GCodeJob }>) => {
+  const { id, job } = event.data
+  try {
+    const { message, transfer } = packJobResult(runGCodeJob(job))
+    scope.postMessage({ id, result: message }, transfer)
+  } catch (error) {
+    scope.postMessage({ id, error: error instanceof Error ? error.message : String(error) })
+  }
+}
@@ -0,0 +1,400 @@
+import type { GCodeOptions, MachiningParams } from "@/lib/gcode-generator"
+import { GCodeProgram } from "@/lib/gcode-program"
+import { packJobResult, unpackJobResult, type GCodeJob, type GCodeJobMessage, type GCodeJobResult } from "@/lib/gcode-jobs"
+import { GCodeJobCancelledError, getGCodeWorker } from "@/lib/gcode-worker-client"
+
+/** Bump when the generator output changes, so old entries are not reused */
+export const GENERATION_CACHE_VERSION = 2
+/** Programs kept in memory */
+export const DEFAULT_MEMORY_ENTRIES = 16
+/** Programs kept in the persistent store (IndexedDB) */
+export const DEFAULT_PERSISTENT_ENTRIES = 64
+
+type GenerateJob = Extract<GCodeJob, { kind: "generate" }>
+
+/** Hit/miss counters of the generation cache */
+export interface GenerationCacheStats {
+  hits: number // resultados servidos da memória
+  persistentHits: number // resultados lidos do armazenamento persistente
+  misses: number // programas gerados
+  entries: number // programas em memória
+  store: string // armazenamento persistente em uso
+}
+
+/** Entry of a persistent store */
+export interface StoredGeneration {
+  canonical: string // chave canônica completa (confere colisões do hash)
+  message: GCodeJobMessage
+}
+
+/** Storage that survives across sessions */
+export interface GenerationStore {
+  readonly name: string
+  get(key: string): Promise<StoredGeneration | null>
+  put(key: string, entry: StoredGeneration): Promise<void>
+  clear(): Promise<void>
+}
+
+// Número normalizado: sem -0, com o valor exato (JSON.stringify não perde precisão).
+// Arredondar juntaria parâmetros que geram programas diferentes, como
+// diametroFinal 15.399999999999999 e 15.4 (o gerador compara o valor exato)
+function canonicalNumber(value: number): number | string {
+  if (!Number.isFinite(value)) return String(value)
+  return value === 0 ? 0 : value
+}
+
+// JSON com as chaves ordenadas e os campos indefinidos omitidos
+function canonicalJson(value: unknown): string {
+  if (typeof value === "number") return JSON.stringify(canonicalNumber(value))
+  if (Array.isArray(value)) return `[${value.map(canonicalJson).join(",")}]`
+  if (value && typeof value === "object") {
+    const entries = Object.keys(value)
+      .filter((key) => (value as Record<string, unknown>)[key] !== undefined)
+      .sort()
+      .map((key) => `${JSON.stringify(key)}:${canonicalJson((value as Record<string, unknown>)[key])}`)
+    return `{${entries.join(",")}}`
+  }
+  return JSON.stringify(value)
+}
+
+/**
+ * Canonical form of a generation request
+ *
+ * Keys are sorted, undefined fields dropped, -0 written as 0 and defaults
+ * filled in, so equivalent requests get the same key whatever the order or
+ * spelling of their fields. Numbers keep their exact value: params that differ
+ * only in the last bits can still generate different programs.
+ *
+ * @param params - Machining parameters
+ * @param options - Generator options
+ * @param optimize - Optimizer options, when the program is optimized
+ * @returns Canonical JSON string
+ */
+export function canonicalGenerationKey(
+  params: MachiningParams,
+  options: GCodeOptions = {},
+  optimize?: GenerateJob["optimize"],
+): string {
+  return canonicalJson({
+    v: GENERATION_CACHE_VERSION,
+    params: {
+      ...params,
+      ordemPasses: params.ordemPasses ?? "center-out",
+      ordemRotacao: params.ordemRotacao ?? "sequential",
+      planoSeguroZ: params.planoSeguroZ ?? params.pontoInicioZ,
+    },
+    dialect: options.dialect ?? "standard",
+    subprogramNumber: options.subprogramNumber,
+    optimizeOutput: options.optimize,
+    optimize: optimize ?? null,
+  })
+}
+
+/**
+ * 106-bit hash of a string as 28 hex digits (two 53-bit cyrb53 lanes)
+ *
+ * @param text - Text to hash
+ * @returns Hex digest, safe for file names
+ */
+export function hashKey(text: string): string {
+  const lane = (seed: number) => {
+    let h1 = 0xdeadbeef ^ seed
+    let h2 = 0x41c6ce57 ^ seed
+    for (let i = 0; i < text.length; i++) {
+      const ch = text.charCodeAt(i)
+      h1 = Math.imul(h1 ^ ch, 2654435761)
+      h2 = Math.imul(h2 ^ ch, 1597334677)
+    }
+    h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909)
+    h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909)
+    return (4294967296 * (2097151 & h2) + (h1 >>> 0)).toString(16).padStart(14, "0")
+  }
+  return lane(0) + lane(0x9e3779b9)
+}
+
+/**
+ * Persistent store in the browser's IndexedDB
+ *
+ * Entries are stored with their typed-array columns as they are (structured
+ * clone); the oldest used entries are removed beyond `maxEntries`.
+ */
+export class IndexedDBGenerationStore implements GenerationStore {
+  readonly name = "IndexedDB"
+  private readonly maxEntries: number
+  private db: Promise<IDBDatabase> | null = null
+
+  constructor(maxEntries = DEFAULT_PERSISTENT_ENTRIES) {
+    this.maxEntries = maxEntries
+  }
+
+  async get(key: string): Promise<StoredGeneration | null> {
+    const db = await this.open()
+    const record = await request<{ entry: StoredGeneration } | undefined>(
+      db.transaction("generations").objectStore("generations").get(key),
+    )
+    if (!record) return null
+    // Marca o uso para a remoção dos mais antigos
+    const store = db.transaction("generations", "readwrite").objectStore("generations")
+    store.put({ ...record, used: Date.now() }, key)
+    return record.entry
+  }
+
+  async put(key: string, entry: StoredGeneration): Promise<void> {
+    const db = await this.open()
+    const tx = db.transaction("generations", "readwrite")
+    const store = tx.objectStore("generations")
+    store.put({ entry, used: Date.now() }, key)
+
+    // Remove os menos usados acima do limite
+    const count = await request(store.count())
+    let excess = count - this.maxEntries
+    if (excess > 0) {
+      const cursors = store.index("used").openCursor()
+      cursors.onsuccess = () => {
+        const cursor = cursors.result
+        if (!cursor || excess <= 0) return
+        cursor.delete()
+        excess--
+        cursor.continue()
+      }
+    }
+    await done(tx)
+  }
+
+  async clear(): Promise<void> {
+    const db = await this.open()
+    const tx = db.transaction("generations", "readwrite")
+    tx.objectStore("generations").clear()
+    await done(tx)
+  }
+
+  private open(): Promise<IDBDatabase> {
+    if (!this.db) {
+      const opening = indexedDB.open("entalhe-cnc-cam", 1)
+      opening.onupgradeneeded = () => {
+        const store = opening.result.createObjectStore("generations")
+        store.createIndex("used", "used")
+      }
+      this.db = request(opening)
+    }
+    return this.db
+  }
+}
+
+function request<T>(req: IDBRequest<T>): Promise<T> {
+  return new Promise((resolve, reject) => {
+    req.onsuccess = () => resolve(req.result)
+    req.onerror = () => reject(req.error)
+  })
+}
+
+function done(tx: IDBTransaction): Promise<void> {
+  return new Promise((resolve, reject) => {
+    tx.oncomplete = () => resolve()
+    tx.onerror = () => reject(tx.error)
+    tx.onabort = () => reject(tx.error)
+  })
+}
+
+// Colunas numéricas do programa, codificadas em base64 para a ponte do pywebview (só JSON)
+const COLUMNS = ["x", "y", "z", "a", "f", "motion", "line"] as const
+
+function toBase64(array: ArrayBufferView): string {
+  const bytes = new Uint8Array(array.buffer, array.byteOffset, array.byteLength)
+  let binary = ""
+  for (let i = 0; i < bytes.length; i += 0x8000) {
+    binary += String.fromCharCode.apply(null, Array.from(bytes.subarray(i, i + 0x8000)))
+  }
+  return btoa(binary)
+}
+
+function fromBase64(text: string): ArrayBuffer {
+  const binary = atob(text)
+  const bytes = new Uint8Array(binary.length)
+  for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i)
+  return bytes.buffer
+}
+
+/**
+ * Persistent store in the desktop launcher's app-data folder
+ *
+ * The webview may not keep IndexedDB between sessions, so the launcher writes
+ * each entry as a file through its `cache_get`/`cache_put` API.
+ */
+export class LauncherGenerationStore implements GenerationStore {
+  readonly name = "Disco (app-data)"
+
+  async get(key: string): Promise<StoredGeneration | null> {
+    const api = window.pywebview?.api
+    if (!api?.cache_get) return null
+    const res = await api.cache_get(key)
+    if (!res.success || !res.payload) return null
+
+    const stored = JSON.parse(res.payload)
+    const program = stored.message.program
+    program.x = new Float64Array(fromBase64(program.x))
+    program.y = new Float64Array(fromBase64(program.y))
+    program.z = new Float64Array(fromBase64(program.z))
+    program.a = new Float64Array(fromBase64(program.a))
+    program.f = new Float64Array(fromBase64(program.f))
+    program.motion = new Uint8Array(fromBase64(program.motion))
+    program.line = new Int32Array(fromBase64(program.line))
+    return stored as StoredGeneration
+  }
+
+  async put(key: string, entry: StoredGeneration): Promise<void> {
+    const api = window.pywebview?.api
+    if (!api?.cache_put) return
+    const program: Record<string, unknown> = { ...entry.message.program }
+    for (const column of COLUMNS) program[column] = toBase64(entry.message.program[column])
+    await api.cache_put(key, JSON.stringify({ ...entry, message: { ...entry.message, program } }))
+  }
+
+  async clear(): Promise<void> {
+    await window.pywebview?.api.cache_clear?.()
+  }
+}
+
+// Resultado com um programa novo sobre as mesmas colunas: a interface trata
+// cada geração como um programa diferente (reinicia a simulação)
+function freshResult(result: GCodeJobResult): GCodeJobResult {
+  const { program } = result
+  return {
+    ...result,
+    program: new GCodeProgram(program, program.source, program.comments),
+  }
+}
+
+/**
+ * Bounded LRU cache of generated programs in front of the background worker
+ *
+ * Lookups go to memory first, then to the persistent store; a miss runs the
+ * worker and stores the result in both. Keys are the hash of the canonical
+ * request (`canonicalGenerationKey`).
+ */
+export class GenerationCache {
+  private readonly memory = new Map<string, { canonical: string; result: GCodeJobResult }>()
+  private readonly listeners = new Set<() => void>()
+  private counters = { hits: 0, persistentHits: 0, misses: 0 }
+  private latest = 0
+  private readonly store: GenerationStore | null
+  private readonly maxEntries: number
+
+  constructor(store: GenerationStore | null, maxEntries = DEFAULT_MEMORY_ENTRIES) {
+    this.store = store
+    this.maxEntries = maxEntries
+  }
+
+  /** Current counters */
+  get stats(): GenerationCacheStats {
+    return {
+      ...this.counters,
+      entries: this.memory.size,
+      store: this.store ? this.store.name : "nenhum",
+    }
+  }
+
+  /**
+   * Registers a listener called whenever the counters change
+   *
+   * @returns Function that removes the listener
+   */
+  subscribe(listener: () => void): () => void {
+    this.listeners.add(listener)
+    return () => {
+      this.listeners.delete(listener)
+    }
+  }
+
+  /**
+   * Returns the program for a generation request, generating it only on a miss
+   *
+   * Like the worker client, a newer call supersedes this one: its promise is
+   * then rejected with GCodeJobCancelledError.
+   *
+   * @param job - Generation request
+   * @returns Program and reports
+   */
+  async generate(job: GenerateJob): Promise<GCodeJobResult> {
+    const ticket = ++this.latest
+    const canonical = canonicalGenerationKey(job.params, job.options, job.optimize)
+    const key = hashKey(canonical)
+    const stale = () => ticket !== this.latest
+
+    const cached = this.memory.get(key)
+    if (cached && cached.canonical === canonical) {
+      this.remember(key, canonical, cached.result)
+      this.count("hits")
+      return freshResult(cached.result)
+    }
+
+    const stored = await this.store?.get(key).catch(() => null)
+    if (stale()) throw new GCodeJobCancelledError()
+    if (stored && stored.canonical === canonical) {
+      const result = unpackJobResult(stored.message)
+      this.remember(key, canonical, result)
+      this.count("persistentHits")
+      return freshResult(result)
+    }
+
+    const result = await getGCodeWorker().run(job)
+    this.remember(key, canonical, result)
+    this.count("misses")
+
+    // Cópia para o armazenamento persistente, sem transferir as colunas em uso
+    if (this.store) {
+      const { message } = packJobResult(freshResult(result))
+      this.store.put(key, { canonical, message }).catch((error) => {
+        console.warn("Não foi possível gravar o programa no cache:", error)
+      })
+    }
+    if (stale()) throw new GCodeJobCancelledError()
+    return freshResult(result)
+  }
+
+  /** Empties memory and the persistent store and zeroes the counters */
+  async clear(): Promise<void> {
+    this.memory.clear()
+    this.counters = { hits: 0, persistentHits: 0, misses: 0 }
+    this.notify()
+    await this.store?.clear()
+  }
+
+  private remember(key: string, canonical: string, result: GCodeJobResult): void {
+    // Map mantém a ordem de inserção: reinserir move para o fim (mais recente)
+    this.memory.delete(key)
+    this.memory.set(key, { canonical, result })
+    while (this.memory.size > this.maxEntries) {
+      this.memory.delete(this.memory.keys().next().value as string)
+    }
+  }
+
+  private count(counter: "hits" | "persistentHits" | "misses"): void {
+    this.counters = { ...this.counters, [counter]: this.counters[counter] + 1 }
+    this.notify()
+  }
+
+  private notify(): void {
+    this.listeners.forEach((listener) => listener())
+  }
+}
+
+let sharedCache: GenerationCache | null = null
+
+/**
+ * Cache shared by the app
+ *
+ * Uses the launcher's disk cache inside the desktop app and IndexedDB in the
+ * browser (no persistence where neither is available).
+ */
+export function getGenerationCache(): GenerationCache {
+  if (!sharedCache) {
+    let store: GenerationStore | null = null
+    if (typeof window !== "undefined") {
+      if (window.pywebview) store = new LauncherGenerationStore()
+      else if (typeof indexedDB !== "undefined") store = new IndexedDBGenerationStore()
+    }
+    sharedCache = new GenerationCache(store)
+  }
+  return sharedCache
+}
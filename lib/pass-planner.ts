@@ -0,0 +1,368 @@
+import {
+  computePassesX,
+  computeRetractY,
+  computeRotaryAngles,
+  createFeedSchedule,
+  orderPassesX,
+  PASS_ORDERS,
+  type GCodeDialect,
+  type MachiningParams,
+  type PassOrder,
+  type RotaryOrder,
+} from "@/lib/gcode-generator"
+
+/** Default rapid (G0) traverse rate used for time estimates, in mm/min */
+export const DEFAULT_RAPID_RATE = 5000
+
+/** Default A-axis rapid rate used for the rotary index time, in degrees/min */
+export const DEFAULT_ROTARY_RATE = 3600
+
+export interface PassPlanOptions {
+  rapidRate?: number // Velocidade de avanço rápido (G0) em mm/min
+  rotaryRate?: number // Velocidade de rotação rápida do eixo A em graus/min
+  dialect?: GCodeDialect // Formato do programa, para a contagem de linhas
+}
+
+export interface PassPlan {
+  passosX: number[] // Posições X dos passes laterais, na ordem de execução
+  deslocamentoX: number
+  pontoRecuoY: number
+  yLevels: number[] // Níveis Y cortados em cada entalhe, na ordem de execução
+  numEntalhes: number // Entalhes efetivamente gerados
+  linesPerNotch: number
+  plungesPerNotch: number // Movimentos G1 por entalhe
+  totalLines: number // Linhas no formato escolhido (options.dialect)
+  totalPlunges: number
+  rapidDistance: number // mm (X, Y e Z)
+  feedDistance: number // mm
+  rotaryDistance: number // graus, incluindo o retorno para a peça seguinte
+  rapidTime: number // s
+  feedTime: number // s
+  rotaryTime: number // s
+  cycleTime: number // s
+}
+
+interface Position {
+  x: number
+  y: number
+  z: number
+}
+
+/**
+ * Accumulates line counts and travel distances for a sequence of moves
+ * without producing any G-code text
+ */
+class MoveTally {
+  pos: Position
+  lines = 0
+  plunges = 0
+  rapid = 0
+  feed = 0
+  feedTime = 0 // s
+
+  constructor(start: Position) {
+    this.pos = { ...start }
+  }
+
+  /** Line without linear motion (e.g. the A rotation) */
+  line(): void {
+    this.lines++
+  }
+
+  rapidTo(target: Partial<Position>): void {
+    this.rapid += this.moveTo(target)
+  }
+
+  feedTo(target: Partial<Position>, avanco: number): void {
+    const distancia = this.moveTo(target)
+    this.feed += distancia
+    this.feedTime += (distancia / avanco) * 60
+    this.plunges++
+  }
+
+  private moveTo(target: Partial<Position>): number {
+    const next = { ...this.pos, ...target }
+    const dist = Math.hypot(next.x - this.pos.x, next.y - this.pos.y, next.z - this.pos.z)
+    this.pos = next
+    this.lines++
+    return dist
+  }
+}
+
+// Valor efetivamente escrito no programa (o controle usa o valor arredondado)
+const printed = (value: number, digits: number) => Number(value.toFixed(digits))
+
+/**
+ * Calculates the Y levels cut in each notch, following the generator's stepping rules
+ *
+ * @param params - Object containing all machining parameters
+ * @returns Y levels in cutting order and how the last step ends
+ */
+export function computeYLevels(params: MachiningParams): { yLevels: number[]; final: "exact" | "extra" | "none" } {
+  const raioInicial = params.diametroInicial / 2
+  const raioFinal = params.diametroFinal / 2
+  const cortandoAoContrario = params.diametroInicial > params.diametroFinal
+  const incrementoY = cortandoAoContrario ? -Math.abs(params.apY) : Math.abs(params.apY)
+
+  const yLevels = [raioInicial]
+  let yAtual = raioInicial
+  while (true) {
+    const nextY = Number.parseFloat((yAtual + incrementoY).toFixed(3))
+    const chegouAoDestino = cortandoAoContrario ? nextY <= raioFinal : nextY >= raioFinal
+
+    if (!chegouAoDestino) {
+      if (nextY === yAtual) {
+        // Passe menor que a resolução de 0.001 mm: o programa nunca terminaria
+        throw new Error("Material por passe muito pequeno para a resolução de 0,001 mm.")
+      }
+      yLevels.push(nextY)
+      yAtual = nextY
+    } else if (nextY === raioFinal) {
+      return { yLevels, final: "exact" }
+    } else {
+      return { yLevels, final: yAtual !== raioFinal ? "extra" : "none" }
+    }
+  }
+}
+
+/**
+ * Calculates the A-axis travel of one part
+ *
+ * Includes the move from the last notch to the first notch of the next part
+ * (the unwind), assuming every part runs the same program. With "reversed"
+ * the parts alternate with the sequential program, so each part starts where
+ * the previous one ended.
+ *
+ * @param angulos - A angles in cutting order (computeRotaryAngles)
+ * @param ordem - A-axis sequence
+ * @returns Rotary travel in degrees
+ */
+export function computeRotaryTravel(angulos: number[], ordem: RotaryOrder): number {
+  const escritos = angulos.map((a) => printed(a, 2))
+  const distancia = (de: number, para: number) => {
+    const d = Math.abs(para - de) % 360
+    // Com rollover o comando escolhe o sentido mais curto
+    return ordem === "shortest" ? Math.min(d, 360 - d) : Math.abs(para - de)
+  }
+
+  let total = 0
+  for (let i = 1; i < escritos.length; i++) total += distancia(escritos[i - 1], escritos[i])
+  if (escritos.length > 0 && ordem !== "reversed") {
+    total += distancia(escritos[escritos.length - 1], escritos[0])
+  }
+  return total
+}
+
+/**
+ * Converts the expanded program line count to the given dialect
+ *
+ * @param dialect - Program layout
+ * @param expandedLines - Line count with every notch unrolled
+ * @param linesPerNotch - Lines of one notch, including its A rotation
+ * @param numEntalhes - Number of notches generated
+ * @returns Line count of the program in the given dialect
+ */
+function dialectLineCount(dialect: GCodeDialect, expandedLines: number, linesPerNotch: number, numEntalhes: number): number {
+  if (dialect === "standard") return expandedLines
+
+  const corpo = linesPerNotch - 1 // Corte de um entalhe, sem a rotação A
+  const base = 5 // Cabeçalho (3) e rodapé (2)
+  if (dialect === "siemens") {
+    // Rotação por entalhe, corpo entre dois rótulos e um REPEAT por entalhe seguinte
+    return numEntalhes > 0 ? base + numEntalhes + 2 + corpo + (numEntalhes - 1) : base
+  }
+  // Fanuc/Haas: %, O, rotação + chamada por entalhe, subprograma (O/N + corpo + M99) e %
+  return 3 + base + numEntalhes * 2 + (numEntalhes > 0 ? corpo + 2 : 0)
+}
+
+/**
+ * Plans the passes of a keyway program and estimates its size and cycle time
+ *
+ * Every notch is identical apart from the A rotation, so only the first notch
+ * and one following notch are tallied; the rest is multiplied by numEntalhes.
+ *
+ * @param params - Object containing all machining parameters
+ * @param options - Estimation options (rapid traverse and A-axis rates, program dialect)
+ * @returns Pass plan with line counts, distances and times
+ */
+export function planPasses(params: MachiningParams, options: PassPlanOptions = {}): PassPlan {
+  const rapidRate = options.rapidRate ?? DEFAULT_RAPID_RATE
+  const rotaryRate = options.rotaryRate ?? DEFAULT_ROTARY_RATE
+  const raioInicial = params.diametroInicial / 2
+  const raioFinal = params.diametroFinal / 2
+  const { passosX, deslocamentoX } = computePassesX(params)
+  const pontoRecuoY = printed(computeRetractY(params), 2)
+  const { yLevels, final } = computeYLevels(params)
+  const numEntalhes = params.numEntalhes > 0 ? Math.ceil(params.numEntalhes) : 0
+
+  const anguloRadianos = params.chavetaConica ? (params.anguloConico * Math.PI / 180) : 0
+  const deslocamentoConico = Math.abs(params.profundidadeFinal) * Math.tan(anguloRadianos)
+  const zInicio = params.pontoInicioZ
+  const zRetracao = params.planoSeguroZ ?? zInicio
+  const ordem = params.ordemPasses ?? "center-out"
+
+  // Avanço de cada mergulho conforme o engajamento; reiniciado a cada entalhe, como no gerador
+  let avancoDoPasse = createFeedSchedule(params)
+
+  const corte = (t: MoveTally, y: number, x = 0) => {
+    const avanco = avancoDoPasse(y, x)
+    if (params.chavetaConica) {
+      t.feedTo({ y: printed(y + deslocamentoConico, 3), z: params.profundidadeFinal }, avanco)
+    } else {
+      t.feedTo({ z: params.profundidadeFinal }, avanco)
+    }
+    t.rapidTo({ y: pontoRecuoY })
+  }
+
+  // Passes laterais de um nível Y, na ordem dada
+  const passesLaterais = (t: MoveTally, y: number, passes: number[]) => {
+    passes.forEach((posicaoX, i) => {
+      t.rapidTo({ x: printed(posicaoX, 3) })
+      corte(t, y, posicaoX)
+      if (i < passes.length - 1) {
+        t.rapidTo({ z: zRetracao })
+        t.rapidTo({ y: printed(y, 3) })
+      }
+    })
+  }
+
+  const entalhe = (t: MoveTally) => {
+    avancoDoPasse = createFeedSchedule(params)
+    t.line() // G0 A
+    t.rapidTo({ z: zInicio })
+    t.rapidTo({ y: raioInicial })
+    t.rapidTo({ x: 0 })
+
+    // Posição X sem arredondamento, usada para ordenar os passes do nível seguinte
+    let xAtual = 0
+    const proximosPasses = (passes: number[], nivel: number) => {
+      const ordenados = orderPassesX(passes, ordem, xAtual, nivel)
+      xAtual = ordenados[ordenados.length - 1]
+      return ordenados
+    }
+
+    yLevels.forEach((y, i) => {
+      if (deslocamentoX > 0) {
+        passesLaterais(t, y, proximosPasses(passosX, i))
+        t.rapidTo({ z: zRetracao })
+        if (ordem === "center-out") {
+          t.rapidTo({ x: 0 })
+          xAtual = 0
+        }
+      } else {
+        corte(t, y)
+        t.rapidTo({ z: zRetracao })
+      }
+      if (i < yLevels.length - 1) t.rapidTo({ y: yLevels[i + 1] })
+    })
+
+    const yFinal = printed(raioFinal, 3)
+    const nivelFinal = yLevels.length
+    if (final === "exact") {
+      t.rapidTo({ y: yFinal })
+      if (deslocamentoX > 0) {
+        const bordas = ordem === "center-out"
+          ? [deslocamentoX, -deslocamentoX]
+          : proximosPasses([-deslocamentoX, deslocamentoX], nivelFinal)
+        passesLaterais(t, raioFinal, bordas)
+      } else {
+        corte(t, raioFinal)
+      }
+      t.rapidTo({ z: zInicio })
+    } else if (final === "extra") {
+      t.rapidTo({ y: yFinal })
+      if (deslocamentoX > 0) {
+        passesLaterais(t, raioFinal, proximosPasses(passosX, nivelFinal))
+      } else {
+        corte(t, raioFinal)
+      }
+      t.rapidTo({ z: zInicio })
+    } else if (zRetracao !== zInicio) {
+      t.rapidTo({ z: zInicio })
+    }
+  }
+
+  // Cabeçalho, primeiro entalhe (parte de Z100) e um entalhe seguinte (regime)
+  const total = new MoveTally({ x: 0, y: 0, z: 100 })
+  total.rapidTo({ z: 100 })
+  total.rapidTo({ y: 0 })
+  total.rapidTo({ x: 0 })
+
+  let linesPerNotch = 0
+  let plungesPerNotch = 0
+  if (numEntalhes > 0) {
+    const first = new MoveTally(total.pos)
+    entalhe(first)
+    const next = new MoveTally(first.pos)
+    entalhe(next)
+
+    linesPerNotch = next.lines
+    plungesPerNotch = next.plunges
+    const repeticoes = numEntalhes - 1
+    total.lines += first.lines + next.lines * repeticoes
+    total.plunges += first.plunges + next.plunges * repeticoes
+    total.rapid += first.rapid + next.rapid * repeticoes
+    total.feed += first.feed + next.feed * repeticoes
+    total.feedTime += first.feedTime + next.feedTime * repeticoes
+    total.pos = next.pos
+  }
+
+  total.rapidTo({ z: 100 })
+  total.line() // M30
+
+  const totalLines = dialectLineCount(options.dialect ?? "standard", total.lines, linesPerNotch, numEntalhes)
+
+  const rotaryDistance = numEntalhes > 0 ? computeRotaryTravel(computeRotaryAngles(params), params.ordemRotacao ?? "sequential") : 0
+
+  const rapidTime = (total.rapid / rapidRate) * 60
+  const feedTime = total.feedTime
+  const rotaryTime = (rotaryDistance / rotaryRate) * 60
+
+  return {
+    passosX,
+    deslocamentoX,
+    pontoRecuoY,
+    yLevels,
+    numEntalhes,
+    linesPerNotch,
+    plungesPerNotch,
+    totalLines,
+    totalPlunges: total.plunges,
+    rapidDistance: total.rapid,
+    feedDistance: total.feed,
+    rotaryDistance,
+    rapidTime,
+    feedTime,
+    rotaryTime,
+    cycleTime: rapidTime + feedTime + rotaryTime,
+  }
+}
+
+/**
+ * Plans the program once for each lateral pass ordering
+ *
+ * Only the pass order changes between the plans, so the rapid distance shows
+ * which strategy wastes the least air-cut time for the job.
+ *
+ * @param params - Object containing all machining parameters (ordemPasses is ignored)
+ * @param options - Estimation options (rapid traverse rate, program dialect)
+ * @returns One plan per ordering, in the order of PASS_ORDERS
+ */
+export function comparePassOrders(params: MachiningParams, options: PassPlanOptions = {}): { ordem: PassOrder; plan: PassPlan }[] {
+  return PASS_ORDERS.map(({ value }) => ({ ordem: value, plan: planPasses({ ...params, ordemPasses: value }, options) }))
+}
+
+/**
+ * Formats a duration in seconds as h:mm:ss or m:ss
+ *
+ * @param seconds - Duration in seconds
+ * @returns Formatted duration
+ */
+export function formatDuration(seconds: number): string {
+  const total = Math.round(seconds)
+  const h = Math.floor(total / 3600)
+  const m = Math.floor((total % 3600) / 60)
+  const s = total % 60
+  const mmss = `${String(m).padStart(h > 0 ? 2 : 1, "0")}:${String(s).padStart(2, "0")}`
+  return h > 0 ? `${h}:${mmss}` : mmss
+}
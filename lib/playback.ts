@@ -0,0 +1,161 @@
+import type { SimulationFrame } from "@/types/simulation"
+import { MOTION_FEED, type GCodeProgram } from "@/lib/gcode-program"
+import { DEFAULT_RAPID_RATE, DEFAULT_ROTARY_RATE } from "@/lib/pass-planner"
+
+/** Longest playback at 1x; longer programs are played proportionally faster */
+export const TARGET_PLAYBACK_SECONDS = 60
+
+export interface PlaybackOptions {
+  rapidRate?: number // Velocidade de avanço rápido (G0) em mm/min
+  rotaryRate?: number // Velocidade de rotação do eixo A em graus/min
+}
+
+/**
+ * Simulated clock of a program: when each move ends and where each notch starts
+ */
+export interface PlaybackTimeline {
+  endTime: Float64Array // instante (s) em que cada movimento termina
+  duration: number // s
+  notchStarts: Int32Array // movimento de rotação A que inicia cada entalhe
+}
+
+/** Position of the simulated clock inside the program */
+export interface PlaybackPosition {
+  frame: number // movimento em andamento
+  fraction: number // parte já percorrida desse movimento (0..1)
+}
+
+// Rotação pelo caminho mais curto (Sinumerik A=DC)
+function isShortestRotation(program: GCodeProgram, i: number): boolean {
+  return program.source[program.line[i]].toUpperCase().includes("DC(")
+}
+
+// Variação de A de um movimento, considerando o caminho mais curto quando for o caso
+function rotaryDelta(program: GCodeProgram, i: number, fromA: number): number {
+  const delta = program.a[i] - fromA
+  if (delta === 0 || !isShortestRotation(program, i)) return delta
+  const wrapped = ((delta % 360) + 540) % 360 - 180
+  return wrapped === -180 ? 180 : wrapped
+}
+
+/**
+ * Builds the simulated clock of a program
+ *
+ * G1 moves take their length over the modal feed rate, G0 moves their length over
+ * the rapid rate, and A rotations their angle over the rotary rate (a move that
+ * does both takes the longer of the two). The first move starts at the origin,
+ * as in the canvases. A notch starts at every move whose line programs A.
+ *
+ * @param program - Parsed program
+ * @param options - Rapid and rotary rates
+ * @returns Timeline of the program
+ */
+export function buildTimeline(program: GCodeProgram, options: PlaybackOptions = {}): PlaybackTimeline {
+  const rapidRate = options.rapidRate ?? DEFAULT_RAPID_RATE
+  const rotaryRate = options.rotaryRate ?? DEFAULT_ROTARY_RATE
+  const endTime = new Float64Array(program.length)
+
+  let time = 0
+  let lastX = 0
+  let lastY = 0
+  let lastZ = 0
+  let lastA = 0
+  for (let i = 0; i < program.length; i++) {
+    const dx = program.x[i] - lastX
+    const dy = program.y[i] - lastY
+    const dz = program.z[i] - lastZ
+    const length = Math.sqrt(dx * dx + dy * dy + dz * dz)
+    const rate = program.motion[i] === MOTION_FEED && program.f[i] > 0 ? program.f[i] : rapidRate
+    const rotation = Math.abs(rotaryDelta(program, i, lastA))
+
+    time += Math.max((length / rate) * 60, (rotation / rotaryRate) * 60)
+    endTime[i] = time
+
+    lastX = program.x[i]
+    lastY = program.y[i]
+    lastZ = program.z[i]
+    lastA = program.a[i]
+  }
+
+  return { endTime, duration: time, notchStarts: findNotchStarts(program) }
+}
+
+/**
+ * Finds where each notch starts: the first move of every line that programs A
+ *
+ * @param program - Parsed program
+ * @returns Move index of each notch start, in program order
+ */
+export function findNotchStarts(program: GCodeProgram): Int32Array {
+  const starts: number[] = []
+  let lastLine = -1
+  for (let i = 0; i < program.length; i++) {
+    const line = program.line[i]
+    if (line !== lastLine && /(^|\s)A=?(?:DC\()?[-+.\d]/i.test(program.source[line])) starts.push(i)
+    lastLine = line
+  }
+  return Int32Array.from(starts)
+}
+
+/**
+ * Simulated seconds per real second at 1x speed
+ *
+ * Programs longer than TARGET_PLAYBACK_SECONDS are compressed to that length;
+ * the moves that fall inside one animation tick are skipped over, so the frame
+ * rate does not depend on the program size.
+ *
+ * @param timeline - Timeline of the program
+ * @returns Time scale (at least 1)
+ */
+export function playbackTimeScale(timeline: PlaybackTimeline): number {
+  return Math.max(1, timeline.duration / TARGET_PLAYBACK_SECONDS)
+}
+
+/**
+ * Finds the move running at a given simulated time (binary search)
+ *
+ * @param timeline - Timeline of the program
+ * @param time - Simulated time in seconds
+ * @returns Move in progress and how much of it is done
+ */
+export function locateTime(timeline: PlaybackTimeline, time: number): PlaybackPosition {
+  const { endTime } = timeline
+  const n = endTime.length
+  if (n === 0) return { frame: 0, fraction: 1 }
+  if (time >= endTime[n - 1]) return { frame: n - 1, fraction: 1 }
+
+  // Primeiro movimento que termina depois de "time"
+  let lo = 0
+  let hi = n - 1
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1
+    if (endTime[mid] > time) hi = mid
+    else lo = mid + 1
+  }
+
+  const start = lo > 0 ? endTime[lo - 1] : 0
+  const span = endTime[lo] - start
+  return { frame: lo, fraction: span > 0 ? Math.max(0, (time - start) / span) : 1 }
+}
+
+/**
+ * Tool position partway through a move
+ *
+ * @param program - Parsed program
+ * @param frame - Move index
+ * @param fraction - Part of the move already done (0..1)
+ * @returns Interpolated frame with the motion type of the move
+ */
+export function interpolateMove(program: GCodeProgram, frame: number, fraction: number): SimulationFrame {
+  const end = program.frame(frame)
+  if (fraction >= 1) return end
+
+  const prev = frame > 0 ? program.frame(frame - 1) : { x: 0, y: 0, z: 0, a: 0 }
+  return {
+    x: prev.x + (end.x - prev.x) * fraction,
+    y: prev.y + (end.y - prev.y) * fraction,
+    z: prev.z + (end.z - prev.z) * fraction,
+    a: prev.a + rotaryDelta(program, frame, prev.a) * fraction,
+    cmd: end.cmd,
+  }
+}
@@ -0,0 +1,425 @@
+/**
+ * Post-processor: rewrites the neutral program of emitGCode for a machine
+ *
+ * The generator writes one neutral program (fixed safety moves, `G0 A...`,
+ * `M30`, comments in parentheses, the precision of each `toFixed`). A post
+ * profile describes what a given control expects instead; the profile is
+ * compiled once into a PostProcessor that rewrites the program line by line,
+ * so it can sit between emitGCode (or the lines of the current program) and a
+ * chunked save without holding a second copy of the program.
+ */
+
+export type CommentStyle = "paren" | "semicolon" | "none"
+// fixed: sempre com as casas decimais; trim: sem zeros à direita (10.5, 10);
+// point: sem zeros à direita mas sempre com ponto (10.5, 10.), como exige o Fanuc
+export type NumberStyle = "fixed" | "trim" | "point"
+export type RotaryLetter = "A" | "B" | "C"
+
+/** What a control expects from a program */
+export interface PostProfile {
+  name: string
+  header: string[] // linhas no início (substituem "%" e o número O do programa neutro)
+  footer: string[] // linhas que substituem o fim de programa (M30)
+  tapeMarkers: boolean // "%" na primeira e na última linha
+  decimals: { linear: number; rotary: number; feed: number }
+  numberStyle: NumberStyle
+  suppressModal: { motion: boolean; axes: boolean; feed: boolean } // omite G0/G1, eixos e F repetidos
+  comments: CommentStyle
+  lineNumbers: { start: number; step: number; max: number } | null // N10, N20, ... (volta a start após max)
+  rotaryAxis: RotaryLetter
+}
+
+/** Built-in profiles */
+export const POST_PROFILES: Record<string, PostProfile> = {
+  fanuc: {
+    name: "Fanuc",
+    header: ["O0001 (ENTALHE CNC)", "G21 G90 G17"],
+    footer: ["M30"],
+    tapeMarkers: true,
+    decimals: { linear: 3, rotary: 3, feed: 1 },
+    numberStyle: "point",
+    suppressModal: { motion: true, axes: true, feed: true },
+    comments: "paren",
+    lineNumbers: null,
+    rotaryAxis: "A",
+  },
+  haas: {
+    name: "Haas",
+    header: ["O00001 (ENTALHE CNC)", "G21 G90 G17"],
+    footer: ["M30"],
+    tapeMarkers: true,
+    decimals: { linear: 4, rotary: 3, feed: 1 },
+    numberStyle: "point",
+    suppressModal: { motion: true, axes: true, feed: true },
+    comments: "paren",
+    lineNumbers: null,
+    rotaryAxis: "A",
+  },
+  siemens: {
+    name: "Siemens 840D",
+    header: ["; ENTALHE CNC", "G71 G90 G17"],
+    footer: ["M30"],
+    tapeMarkers: false,
+    decimals: { linear: 3, rotary: 3, feed: 0 },
+    numberStyle: "trim",
+    suppressModal: { motion: true, axes: true, feed: true },
+    comments: "semicolon",
+    lineNumbers: { start: 10, step: 10, max: 99999999 },
+    rotaryAxis: "A",
+  },
+  grbl: {
+    name: "GRBL",
+    header: ["G21 G90 G94"],
+    footer: ["M2"],
+    tapeMarkers: false,
+    decimals: { linear: 3, rotary: 3, feed: 0 },
+    numberStyle: "trim",
+    suppressModal: { motion: false, axes: true, feed: true },
+    comments: "paren",
+    lineNumbers: null,
+    rotaryAxis: "A",
+  },
+}
+
+/** Profiles offered in the UI ("neutral" keeps the generator output as is) */
+export const POST_PROFILE_OPTIONS: { value: string; label: string }[] = [
+  { value: "neutral", label: "Neutro (sem pós-processador)" },
+  { value: "fanuc", label: "Fanuc (0i/31i)" },
+  { value: "haas", label: "Haas" },
+  { value: "siemens", label: "Siemens 840D (Sinumerik)" },
+  { value: "grbl", label: "GRBL / grblHAL" },
+]
+
+// Posição de cada palavra de movimento (X, Y, Z, A, F)
+const WORD_SLOT: Record<string, number> = { X: 0, Y: 1, Z: 2, A: 3, F: 4, x: 0, y: 1, z: 2, a: 3, f: 4 }
+const NUMBER = /^[-+]?\d*\.?\d+$/
+// Valores formatados guardados por eixo
+const FORMAT_CACHE_SIZE = 4096
+const TAPE_MARKER = /^\s*%\s*$/
+const PROGRAM_NUMBER = /^\s*O\d+/i
+const PROGRAM_END = /^\s*(M30|M0?2)\b/i
+const LABEL = /^\s*([A-Z_][A-Z0-9_]*:|N\d+\s*$)/i
+const LOCAL_CALL = /^\s*M97\s+P(\d+)/i
+const PASSIVE_LINE = /^\s*(\(.*\)|;.*)?\s*$/
+
+// Formata um número com as casas e o estilo do perfil (compilado uma vez por eixo)
+function compileNumber(decimals: number, style: NumberStyle): (value: number) => string {
+  return (value: number) => {
+    let text = value.toFixed(decimals)
+    if (style !== "fixed" && text.includes(".")) text = text.replace(/0+$/, "")
+    if (style === "trim") text = text.replace(/\.$/, "")
+    else if (style === "point" && !text.includes(".")) text += "."
+    return /^-0?\.?0*$/.test(text) ? text.slice(1) : text
+  }
+}
+
+// Separa o código do comentário final: "(...)" depois de um espaço (não o DC( do
+// Sinumerik) ou ";" até o fim da linha
+function splitComment(line: string): { code: string; comment?: string } {
+  const semicolon = line.indexOf(";")
+  let paren = line.indexOf("(")
+  while (paren > 0 && line[paren - 1] !== " " && line[paren - 1] !== "\t") paren = line.indexOf("(", paren + 1)
+  const text = line.trimEnd()
+  if (paren >= 0 && (semicolon < 0 || paren < semicolon) && text.endsWith(")")) {
+    return { code: line.slice(0, paren).trim(), comment: text.slice(paren + 1, -1) }
+  }
+  if (semicolon >= 0) return { code: line.slice(0, semicolon).trim(), comment: line.slice(semicolon + 1).trim() }
+  return { code: line.trim() }
+}
+
+// Comentários só com ASCII imprimível (sem acentos nem "°"), sem parênteses internos
+function cleanComment(text: string): string {
+  return text
+    .normalize("NFD")
+    .replace(/[^\x20-\x7e]/g, "")
+    .replace(/[()]/g, "")
+    .trim()
+}
+
+/**
+ * Streaming post-processor compiled from a profile
+ *
+ * Lines of the neutral program are pushed one at a time and the rewritten
+ * lines come back immediately. Motion lines (G0/G1 with X/Y/Z/A/F words) are
+ * rebuilt with the profile's precision, rotary letter and modal suppression;
+ * any other line (calls, labels, M codes) is kept, with its comment restyled,
+ * and resets what is known about the machine state, so subprogram layouts
+ * stay correct. Line numbers skip the labels called with Haas M97.
+ */
+export class PostProcessor {
+  private readonly profile: PostProfile
+  private readonly formatters: ((value: number) => string)[] // X, Y, Z, A, F
+  private readonly formatted: Map<string, string>[] = [new Map(), new Map(), new Map(), new Map(), new Map()]
+  private readonly axisLetter: string[]
+  private lastWord: (string | undefined)[] = []
+  private modalG: string | null = null
+  private started = false
+  private ended = false
+  private nextNumber: number
+  private readonly reserved = new Set<number>()
+
+  constructor(profile: PostProfile) {
+    this.profile = profile
+    const { decimals, numberStyle } = profile
+    const linear = compileNumber(decimals.linear, numberStyle)
+    this.formatters = [linear, linear, linear, compileNumber(decimals.rotary, numberStyle), compileNumber(decimals.feed, numberStyle)]
+    this.axisLetter = ["X", "Y", "Z", profile.rotaryAxis]
+    this.nextNumber = profile.lineNumbers?.start ?? 0
+  }
+
+  /**
+   * Feeds one line of the neutral program
+   *
+   * @param line - G-code line
+   * @returns Lines for the machine
+   */
+  push(line: string): string[] {
+    const out: string[] = []
+    if (TAPE_MARKER.test(line)) return out
+    if (!this.started) {
+      // O número do programa principal vem do cabeçalho do perfil
+      if (PROGRAM_NUMBER.test(line)) return out
+      this.start(out)
+    }
+
+    if (!this.ended && PROGRAM_END.test(line)) {
+      this.ended = true
+      for (const text of this.profile.footer) this.emit(out, text)
+      this.resetState()
+      return out
+    }
+
+    const motion = this.motion(line)
+    if (motion !== null) {
+      if (motion) this.emit(out, motion, PASSIVE_LINE.test(motion))
+      return out
+    }
+
+    const call = LOCAL_CALL.exec(line)
+    if (call) this.reserve(Number(call[1]))
+    const passive = PASSIVE_LINE.test(line)
+    const text = this.restyle(line)
+    if (text) this.emit(out, text, passive || LABEL.test(line) || PROGRAM_NUMBER.test(line))
+    if (!passive) this.resetState()
+    return out
+  }
+
+  /**
+   * Ends the program (header of an empty program, footer and tape marker)
+   *
+   * @returns Remaining lines
+   */
+  finish(): string[] {
+    const out: string[] = []
+    if (!this.started) this.start(out)
+    if (!this.ended) {
+      this.ended = true
+      for (const text of this.profile.footer) this.emit(out, text)
+    }
+    if (this.profile.tapeMarkers) out.push("%")
+    return out
+  }
+
+  private start(out: string[]): void {
+    this.started = true
+    if (this.profile.tapeMarkers) out.push("%")
+    for (const text of this.profile.header) {
+      this.emit(out, text, PROGRAM_NUMBER.test(text) || PASSIVE_LINE.test(text))
+    }
+  }
+
+  // Reescreve uma linha G0/G1; null se não for um movimento, "" se nada mudar
+  private motion(line: string): string | null {
+    const split = splitComment(line)
+    const tokens = split.code.split(/\s+/)
+    const g = tokens[0].toUpperCase()
+    if (g !== "G0" && g !== "G1" && g !== "G00" && g !== "G01") return null
+
+    // Palavras na ordem X, Y, Z, A, F, já formatadas
+    const words: (string | undefined)[] = [undefined, undefined, undefined, undefined, undefined]
+    for (let k = 1; k < tokens.length; k++) {
+      const token = tokens[k]
+      const slot = WORD_SLOT[token[0]]
+      if (slot === undefined) return null
+      const dc = token.startsWith("=DC(", 1)
+      if (dc && !token.endsWith(")")) return null
+      const text = dc ? token.slice(5, -1) : token.slice(1)
+      if (!NUMBER.test(text)) return null
+      const value = this.format(slot, text)
+      words[slot] = dc ? `=DC(${value})` : value
+    }
+
+    const { suppressModal } = this.profile
+    let axes = ""
+    for (let slot = 0; slot < 4; slot++) {
+      const word = words[slot]
+      if (word === undefined || (suppressModal.axes && this.lastWord[slot] === word)) continue
+      this.lastWord[slot] = word
+      axes += ` ${this.axisLetter[slot]}${word}`
+    }
+
+    // Sem eixo que mude, a linha não move: o F continua pendente para o próximo G1
+    const comment = this.comment(split.comment)
+    if (!axes) return comment
+    const f = words[4]
+    let feed = ""
+    if (f !== undefined) {
+      if (!(suppressModal.feed && this.lastWord[4] === f)) feed = ` F${f}`
+      this.lastWord[4] = f
+    }
+
+    const gWord = g.length === 3 ? `G${g[2]}` : g
+    const skipG = suppressModal.motion && this.modalG === gWord
+    this.modalG = gWord
+    return (skipG ? axes.slice(1) : gWord + axes) + feed + (comment ? ` ${comment}` : "")
+  }
+
+  // Número formatado pelo perfil; os valores se repetem muito e ficam guardados
+  private format(slot: number, text: string): string {
+    const cache = this.formatted[slot]
+    let value = cache.get(text)
+    if (value === undefined) {
+      if (cache.size >= FORMAT_CACHE_SIZE) cache.clear()
+      value = this.formatters[slot](Number.parseFloat(text))
+      cache.set(text, value)
+    }
+    return value
+  }
+
+  // Comentário no estilo do perfil ("" quando removido ou vazio)
+  private comment(text: string | undefined): string {
+    if (text === undefined || this.profile.comments === "none") return ""
+    const clean = cleanComment(text)
+    if (!clean) return ""
+    return this.profile.comments === "paren" ? `(${clean})` : `; ${clean}`
+  }
+
+  // Linha que não é movimento: mantém o código e troca o estilo do comentário
+  private restyle(line: string): string {
+    const { code, comment } = splitComment(line)
+    if (comment === undefined) return code
+    const styled = this.comment(comment)
+    return code && styled ? `${code} ${styled}` : code || styled
+  }
+
+  private emit(out: string[], text: string, unnumbered = false): void {
+    const numbers = this.profile.lineNumbers
+    if (!numbers || unnumbered) {
+      out.push(text)
+      return
+    }
+    while (this.reserved.has(this.nextNumber)) this.nextNumber += numbers.step
+    out.push(`N${this.nextNumber} ${text}`)
+    this.nextNumber += numbers.step
+    if (this.nextNumber > numbers.max) this.nextNumber = numbers.start
+  }
+
+  // Rótulo N chamado por M97: a numeração não pode usar o mesmo número
+  private reserve(label: number): void {
+    const numbers = this.profile.lineNumbers
+    if (numbers && label < this.nextNumber && label >= numbers.start && (label - numbers.start) % numbers.step === 0) {
+      throw new Error(`Numeração de linhas já passou do rótulo N${label} chamado por M97; use um início maior que ${label}`)
+    }
+    this.reserved.add(label)
+  }
+
+  private resetState(): void {
+    this.lastWord = []
+    this.modalG = null
+  }
+}
+
+/**
+ * Post-processes a stream of G-code lines
+ *
+ * @param lines - Neutral G-code lines (array or emitGCode generator)
+ * @param profile - Post profile
+ * @returns Iterator over the lines for the machine
+ */
+export function* postProcess(lines: Iterable<string>, profile: PostProfile): Generator<string> {
+  const processor = new PostProcessor(profile)
+  for (const line of lines) yield* processor.push(line)
+  yield* processor.finish()
+}
+
+/**
+ * Re-iterable post-processed view of a program
+ *
+ * Each iteration runs the post-processor again over `lines`, so the result can
+ * be handed to saveGCodeFile (which may iterate twice) without storing the
+ * rewritten program. A null profile returns the lines unchanged.
+ *
+ * @param lines - Neutral G-code lines (an array, not a one-shot generator)
+ * @param profile - Post profile, or null for the neutral program
+ * @returns Iterable over the lines for the machine
+ */
+export function postProcessed(lines: readonly string[], profile: PostProfile | null): Iterable<string> {
+  if (!profile) return lines
+  return { [Symbol.iterator]: () => postProcess(lines, profile) }
+}
+
+/**
+ * Validates a post profile read from JSON
+ *
+ * Missing fields take the values of the Fanuc profile.
+ *
+ * @param data - Parsed JSON
+ * @returns Profile with every field checked
+ * @throws Error when a field has an invalid value
+ */
+export function parsePostProfile(data: unknown): PostProfile {
+  const obj = (data ?? {}) as Record<string, any>
+  const base = POST_PROFILES.fanuc
+  const lines = (value: unknown, what: string): string[] => {
+    if (value === undefined) return what === "header" ? base.header : base.footer
+    if (!Array.isArray(value) || !value.every((v) => typeof v === "string")) {
+      throw new Error(`Pós-processador: "${what}" deve ser uma lista de linhas`)
+    }
+    return value
+  }
+  const digits = (value: unknown, fallback: number, what: string): number => {
+    if (value === undefined) return fallback
+    const n = Number(value)
+    if (!Number.isInteger(n) || n < 0 || n > 6) throw new Error(`Pós-processador: casas decimais inválidas em "${what}"`)
+    return n
+  }
+  const choice = <T extends string>(value: unknown, options: readonly T[], fallback: T, what: string): T => {
+    if (value === undefined) return fallback
+    if (!options.includes(value as T)) throw new Error(`Pós-processador: "${what}" deve ser ${options.join(", ")}`)
+    return value as T
+  }
+
+  const decimals = obj.decimals ?? {}
+  const suppress = obj.suppressModal ?? {}
+  let lineNumbers: PostProfile["lineNumbers"] = null
+  if (obj.lineNumbers) {
+    const start = Number(obj.lineNumbers.start ?? 10)
+    const step = Number(obj.lineNumbers.step ?? 10)
+    const max = Number(obj.lineNumbers.max ?? 99999)
+    if (![start, step, max].every(Number.isInteger) || start < 0 || step <= 0 || max < start) {
+      throw new Error("Pós-processador: numeração de linhas inválida")
+    }
+    lineNumbers = { start, step, max }
+  }
+
+  return {
+    name: typeof obj.name === "string" && obj.name ? obj.name : "Personalizado",
+    header: lines(obj.header, "header"),
+    footer: lines(obj.footer, "footer"),
+    tapeMarkers: obj.tapeMarkers === undefined ? base.tapeMarkers : Boolean(obj.tapeMarkers),
+    decimals: {
+      linear: digits(decimals.linear, base.decimals.linear, "linear"),
+      rotary: digits(decimals.rotary, base.decimals.rotary, "rotary"),
+      feed: digits(decimals.feed, base.decimals.feed, "feed"),
+    },
+    numberStyle: choice(obj.numberStyle, ["fixed", "trim", "point"] as const, base.numberStyle, "numberStyle"),
+    suppressModal: {
+      motion: suppress.motion === undefined ? base.suppressModal.motion : Boolean(suppress.motion),
+      axes: suppress.axes === undefined ? base.suppressModal.axes : Boolean(suppress.axes),
+      feed: suppress.feed === undefined ? base.suppressModal.feed : Boolean(suppress.feed),
+    },
+    comments: choice(obj.comments, ["paren", "semicolon", "none"] as const, base.comments, "comments"),
+    lineNumbers,
+    rotaryAxis: choice(obj.rotaryAxis, ["A", "B", "C"] as const, base.rotaryAxis, "rotaryAxis"),
+  }
+}
@@ -1,41 +1,30 @@
 import type { SimulationFrame } from "@/types/simulation"
+import { expandSubprogramIndices, parseGCodeProgram } from "@/lib/gcode-program"
+
+/**
+ * Expands subprogram calls so the program can be simulated line by line
+ *
+ * Understands the layouts written by emitGCode: Fanuc "M98 P" with "O" programs
+ * (optional "L" repeat count), Haas "M97 P" with local "N" labels and Siemens
+ * "REPEAT start end P=n" between labels. Programs without calls are returned as is.
+ *
+ * @param gCode - Array of G-code commands
+ * @returns Array of G-code commands with every call replaced by the called block
+ */
+export function expandSubprograms(gCode: string[]): string[] {
+  const order = expandSubprogramIndices(gCode)
+  return order ? order.map((i) => gCode[i]) : gCode
+}
 
 /**
  * Processes G-code commands to create simulation frames
  *
+ * Prefer parseGCodeProgram when the frames are read by index: it keeps the
+ * moves in typed arrays instead of one object per frame.
+ *
  * @param gCode - Array of G-code commands
  * @returns Array of simulation frames for visualization
  */
 export function processGCodeForSimulation(gCode: string[]): SimulationFrame[] {
-  const simulationFrames: SimulationFrame[] = []
-  let currentState: SimulationFrame = { x: 0, y: 0, z: 0, a: 0, cmd: "G0" }
-
-  // Function to extract values from G-code commands
-  function parseCommand(cmd: string, state: SimulationFrame): SimulationFrame {
-    const pattern = /([XYZAF])([-+]?[0-9]*\.?[0-9]+)/g
-    let match
-    const newState = { ...state }
-
-    while ((match = pattern.exec(cmd)) !== null) {
-      const [_, axis, value] = match
-      ;(newState as any)[axis.toLowerCase()] = Number.parseFloat(value)
-    }
-
-    return newState
-  }
-
-  // Process each G-code command
-  for (const cmd of gCode) {
-    const cmdTrim = cmd.trim()
-    if (!cmdTrim) continue
-
-    if (cmdTrim.startsWith("G0") || cmdTrim.startsWith("G1")) {
-      const commandType = cmdTrim.split(" ")[0]
-      const newState = parseCommand(cmdTrim, { ...currentState, cmd: commandType })
-      simulationFrames.push(newState)
-      currentState = { ...newState }
-    }
-  }
-
-  return simulationFrames
+  return parseGCodeProgram(gCode).toFrames()
 }
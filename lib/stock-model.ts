@@ -0,0 +1,444 @@
+import type { GCodeProgram } from "@/lib/gcode-program"
+import { MOTION_FEED } from "@/lib/gcode-program"
+import type { MachiningParams } from "@/lib/gcode-generator"
+
+/** Default angular resolution of the stock grid (cells per turn) */
+export const DEFAULT_ANGLE_CELLS = 1440
+/** Default axial resolution of the stock grid (cells along Z) */
+export const DEFAULT_AXIAL_CELLS = 64
+/** Leftover below this thickness (mm) counts as cut */
+export const LEFTOVER_TOLERANCE = 0.01
+
+export interface StockOptions {
+  surfaceRadius: number // raio inicial da superfície cortada (furo ou diâmetro externo)
+  internal: boolean // true: material fora do raio (corte do centro para fora)
+  zMin: number
+  zMax: number
+  toolWidth: number // largura da aresta da ferramenta (diametroFerramenta)
+  angleCells?: number
+  axialCells?: number
+}
+
+/** Leftover material at the bottom of one notch */
+export interface NotchLeftover {
+  notch: number // índice do entalhe (0 = primeiro cortado)
+  angle: number // posição A do entalhe, em graus
+  maxLeftover: number // maior espessura de material restante no fundo, mm
+  meanLeftover: number // espessura média no fundo, mm
+  uncutFraction: number // fração do fundo com sobra acima de LEFTOVER_TOLERANCE
+}
+
+/**
+ * Material-removal model of the cylindrical blank
+ *
+ * The stock is a grid of radial dexels over angle × axial position: each cell
+ * holds the interval of radius removed along its ray (`cutFrom`..`cutTo`). For
+ * an internal cut the material lies outside `surfaceRadius`, for an external
+ * cut inside it. Angles are in the display frame used by Canvas3D: a point at
+ * tool coordinates (X, Y) with the table at A lies at angle atan2(X, Y) - A.
+ *
+ * The cutting edge is the flat tool tip (width `toolWidth`, at radius Y,
+ * centered at X); each G1 move sweeps it through the rows between its start
+ * and end Z, with the tip position interpolated at every row.
+ */
+export class StockModel {
+  readonly angleCells: number
+  readonly axialCells: number
+  readonly surfaceRadius: number
+  readonly internal: boolean
+  readonly zMin: number
+  readonly zMax: number
+  readonly toolWidth: number
+  readonly cutFrom: Float32Array // início do trecho removido em cada raio, índice linha * angleCells + coluna
+  readonly cutTo: Float32Array // fim do trecho removido (cutFrom > cutTo: célula intacta)
+  private readonly cos: Float64Array // cosseno/seno do ângulo de cada coluna
+  private readonly sin: Float64Array
+  private lastX = 0
+  private lastY = 0
+  private lastZ = 0
+  private applied = 0 // movimentos já aplicados
+  private revision = 0
+  // Alcance da aresta na última posição calculada: colunas e trecho do raio em cada uma
+  private readonly reachColumn: Int32Array
+  private readonly reachFrom: Float64Array
+  private readonly reachTo: Float64Array
+  private readonly reachSecant: Float64Array // 1 / cos do ângulo da coluna no referencial da ferramenta
+  private reachCount = 0
+  private reachX = NaN
+  private reachLow = NaN
+  private reachHigh = NaN
+  private reachA = NaN
+
+  constructor(options: StockOptions) {
+    this.angleCells = options.angleCells ?? DEFAULT_ANGLE_CELLS
+    this.axialCells = options.axialCells ?? DEFAULT_AXIAL_CELLS
+    this.surfaceRadius = options.surfaceRadius
+    this.internal = options.internal
+    this.zMin = options.zMin
+    this.zMax = options.zMax
+    this.toolWidth = options.toolWidth
+    this.cutFrom = new Float32Array(this.angleCells * this.axialCells).fill(Infinity)
+    this.cutTo = new Float32Array(this.angleCells * this.axialCells).fill(-Infinity)
+    this.cos = new Float64Array(this.angleCells)
+    this.sin = new Float64Array(this.angleCells)
+    for (let column = 0; column < this.angleCells; column++) {
+      const angle = (this.columnAngle(column) * Math.PI) / 180
+      this.cos[column] = Math.cos(angle)
+      this.sin[column] = Math.sin(angle)
+    }
+    this.reachColumn = new Int32Array(this.angleCells)
+    this.reachFrom = new Float64Array(this.angleCells)
+    this.reachTo = new Float64Array(this.angleCells)
+    this.reachSecant = new Float64Array(this.angleCells)
+  }
+
+  /** Number of program moves already applied */
+  get appliedMoves(): number {
+    return this.applied
+  }
+
+  /** Changes whenever the stock is cut or reset (for redrawing) */
+  get version(): number {
+    return this.revision
+  }
+
+  /** Restores the uncut blank */
+  reset(): void {
+    this.cutFrom.fill(Infinity)
+    this.cutTo.fill(-Infinity)
+    this.lastX = this.lastY = this.lastZ = 0
+    this.applied = 0
+    this.revision++
+  }
+
+  /** Axial position of the center of a row */
+  rowZ(row: number): number {
+    return this.zMin + ((row + 0.5) * (this.zMax - this.zMin)) / this.axialCells
+  }
+
+  /** Angle (degrees) of the center of a column */
+  columnAngle(column: number): number {
+    return ((column + 0.5) * 360) / this.angleCells
+  }
+
+  /** Column that contains an angle (degrees, display frame) */
+  columnAt(angle: number): number {
+    const column = Math.floor((angle / 360) * this.angleCells) % this.angleCells
+    return column < 0 ? column + this.angleCells : column
+  }
+
+  /**
+   * Radius of the visible material surface of a cell
+   *
+   * Pockets that do not open to the surface (below the wall of a notch) are not
+   * visible and leave the surface at the blank radius.
+   */
+  surfaceAt(index: number): number {
+    const from = this.cutFrom[index]
+    const to = this.cutTo[index]
+    const r0 = this.surfaceRadius
+    if (this.internal) return from <= r0 && to > r0 ? to : r0
+    return to >= r0 && from < r0 ? from : r0
+  }
+
+  /**
+   * Thickness of material left on a ray at a target radius
+   *
+   * Measured from the target towards the open side (the bore for internal
+   * cuts, the outside for external ones); zero when the target was removed.
+   */
+  leftoverAt(index: number, radius: number): number {
+    const from = this.cutFrom[index]
+    const to = this.cutTo[index]
+    const r0 = this.surfaceRadius
+    if (from <= radius && radius <= to) return 0
+    if (this.internal) return Math.max(0, radius - Math.max(r0, to < radius ? to : -Infinity))
+    return Math.max(0, Math.min(r0, from > radius ? from : Infinity) - radius)
+  }
+
+  /**
+   * Applies the program moves up to `to` (inclusive), continuing from the last call
+   *
+   * Going backwards rebuilds the stock from the start.
+   *
+   * @param program - Parsed program
+   * @param to - Last move to apply
+   */
+  applyProgram(program: GCodeProgram, to: number = program.length - 1): void {
+    const last = Math.min(to, program.length - 1)
+    if (last + 1 < this.applied) this.reset()
+    if (last + 1 === this.applied) return
+
+    for (let i = this.applied; i <= last; i++) {
+      const x = program.x[i]
+      const y = program.y[i]
+      const z = program.z[i]
+      if (program.motion[i] === MOTION_FEED) this.sweep(this.lastX, this.lastY, this.lastZ, x, y, z, program.a[i])
+      this.lastX = x
+      this.lastY = y
+      this.lastZ = z
+    }
+    this.applied = last + 1
+    this.revision++
+  }
+
+  // Varre a aresta da ferramenta em linha reta (A constante durante o corte)
+  private sweep(x0: number, y0: number, z0: number, x1: number, y1: number, z1: number, a: number): void {
+    const dz = z1 - z0
+
+    if (x0 === x1) {
+      // X constante (mergulhos retos ou cônicos): a faixa da aresta é a mesma em todas
+      // as linhas, só o nível Y da ponta muda
+      this.computeReach(x1, Math.min(y0, y1), Math.max(y0, y1), a)
+      // Sem movimento em Z a linha recebe o nível Y que mais avança no material
+      const yFlat = this.internal ? Math.max(y0, y1) : Math.min(y0, y1)
+      const [first, last] = this.rowRange(z0, z1)
+      for (let row = first; row <= last; row++) {
+        // Nível da ponta quando ela passa pelo centro da linha (limitado ao movimento)
+        const t = dz !== 0 ? Math.min(1, Math.max(0, (this.rowZ(row) - z0) / dz)) : -1
+        this.applyReach(row, t >= 0 ? y0 + (y1 - y0) * t : yFlat)
+      }
+      return
+    }
+
+    // Movimento em X: trechos menores que uma célula angular no raio da superfície
+    const cell = (2 * Math.PI * Math.max(this.surfaceRadius, 1)) / this.angleCells
+    const pieces = Math.ceil(Math.hypot(x1 - x0, y1 - y0) / cell)
+    for (let p = 0; p < pieces; p++) {
+      const t = (p + 1) / pieces
+      const x = x0 + (x1 - x0) * t
+      const y = y0 + (y1 - y0) * t
+      this.computeReach(x, y, y, a)
+      const [first, last] = this.rowRange(z0 + (dz * p) / pieces, z0 + dz * t)
+      for (let row = first; row <= last; row++) this.applyReach(row, y)
+    }
+  }
+
+  // Primeira e última linha cuja faixa de Z é atravessada pela ponta entre za e zb
+  private rowRange(za: number, zb: number): [number, number] {
+    const rowHeight = (this.zMax - this.zMin) / this.axialCells
+    return [
+      Math.max(0, Math.floor((Math.min(za, zb) - this.zMin) / rowHeight)),
+      Math.min(this.axialCells - 1, Math.floor((Math.max(za, zb) - this.zMin) / rowHeight)),
+    ]
+  }
+
+  // Calcula, para a aresta centrada em X com a ponta entre os níveis yLow e yHigh,
+  // o trecho de cada raio dentro da faixa |x' - x| <= half (reaproveitado entre chamadas)
+  private computeReach(x: number, yLow: number, yHigh: number, a: number): void {
+    if (x === this.reachX && yLow === this.reachLow && yHigh === this.reachHigh && a === this.reachA) return
+    this.reachX = x
+    this.reachLow = yLow
+    this.reachHigh = yHigh
+    this.reachA = a
+    this.reachCount = 0
+
+    const { angleCells, internal } = this
+    const r0 = this.surfaceRadius
+    const half = this.toolWidth / 2
+
+    // Janela angular (referencial da ferramenta) da região varrida que tem material:
+    // interno: faixa 0 <= y' <= y fora do furo; externo: faixa y' >= y dentro do blank
+    if (!internal && yLow >= r0) return
+    let lo = Infinity
+    let hi = -Infinity
+    const add = (px: number, py: number) => {
+      const angle = Math.atan2(px, py)
+      if (angle < lo) lo = angle
+      if (angle > hi) hi = angle
+    }
+    for (const px of [x - half, x + half]) {
+      add(px, yLow)
+      add(px, yHigh)
+      if (Math.abs(px) < r0) {
+        const py = Math.sqrt(r0 * r0 - px * px)
+        if (internal ? py <= yHigh : py >= yLow) add(px, py)
+      } else if (internal) {
+        add(px, 0)
+      }
+    }
+
+    const step = (2 * Math.PI) / angleCells
+    const aRad = (a * Math.PI) / 180
+    const firstColumn = Math.floor((lo - aRad) / step) - 1
+    const count = Math.min(angleCells, Math.ceil((hi - aRad) / step) + 1 - firstColumn)
+    const cosA = Math.cos(aRad)
+    const sinA = Math.sin(aRad)
+    const yBest = internal ? yHigh : yLow
+    let column = ((firstColumn % angleCells) + angleCells) % angleCells
+
+    for (let k = 0; k < count; k++, column = column + 1 === angleCells ? 0 : column + 1) {
+      // Ângulo da coluna no referencial da ferramenta (coluna + A)
+      const c = this.cos[column] * cosA - this.sin[column] * sinA
+      const sn = this.sin[column] * cosA + this.cos[column] * sinA
+      if (c <= 0) continue
+
+      let rMin = 0
+      let rMax = Infinity
+      if (Math.abs(sn) < 1e-12) {
+        if (Math.abs(x) > half) continue
+      } else {
+        const r1 = (x - half) / sn
+        const r2 = (x + half) / sn
+        rMin = Math.max(0, Math.min(r1, r2))
+        rMax = Math.max(r1, r2)
+      }
+
+      // Descarta colunas que a aresta não alcança nem no nível mais avançado
+      if (internal ? Math.min(rMax, yBest / c) <= r0 : Math.max(rMin, yBest / c) >= Math.min(rMax, r0)) continue
+
+      const n = this.reachCount++
+      this.reachColumn[n] = column
+      this.reachFrom[n] = rMin
+      this.reachTo[n] = rMax
+      this.reachSecant[n] = 1 / c
+    }
+  }
+
+  // Junta o alcance da aresta no nível y ao trecho já removido de cada célula da linha;
+  // trechos separados ficam com o mais próximo da superfície
+  private applyReach(row: number, y: number): void {
+    const { cutFrom, cutTo, internal, reachColumn, reachFrom, reachTo, reachSecant } = this
+    const base = row * this.angleCells
+    for (let n = 0; n < this.reachCount; n++) {
+      // Lado da aresta: 0 <= y' <= y (interno) ou y' >= y (externo)
+      let rMin = reachFrom[n]
+      let rMax = reachTo[n]
+      const level = y * reachSecant[n]
+      if (internal) {
+        if (level < rMax) rMax = level
+      } else if (level > rMin) {
+        rMin = level
+      }
+      if (rMax < rMin) continue
+
+      const i = base + reachColumn[n]
+      const from = cutFrom[i]
+      const to = cutTo[i]
+      if (from > to || (rMin <= to && rMax >= from)) {
+        // Célula intacta (from = +∞, to = -∞) ou trechos sobrepostos
+        if (rMin < from) cutFrom[i] = rMin
+        if (rMax > to) cutTo[i] = rMax
+      } else if (internal ? rMin < from : rMax > to) {
+        cutFrom[i] = rMin
+        cutTo[i] = rMax
+      }
+    }
+  }
+}
+
+/** Z of the part face, the top of the stock */
+export const STOCK_FACE_Z = 0
+
+/**
+ * Creates the stock for a notch program from its machining parameters
+ *
+ * The axial range goes from a little below the final depth up to the part face
+ * (Z0). The face is fixed: a retract plane below it is a move inside the stock,
+ * not a lower top.
+ *
+ * @param params - Object containing all machining parameters
+ * @param options - Grid resolution
+ * @returns Uncut stock
+ */
+export function stockFromParams(
+  params: MachiningParams,
+  options: { angleCells?: number; axialCells?: number } = {},
+): StockModel {
+  const margin = Math.max(1, 0.1 * (STOCK_FACE_Z - params.profundidadeFinal))
+  return new StockModel({
+    surfaceRadius: params.diametroInicial / 2,
+    internal: params.diametroInicial < params.diametroFinal,
+    zMin: Math.min(params.profundidadeFinal, STOCK_FACE_Z) - margin,
+    zMax: STOCK_FACE_Z,
+    toolWidth: params.diametroFerramenta,
+    ...options,
+  })
+}
+
+
+/**
+ * Measures the material left at the bottom of each notch
+ *
+ * The bottom is the flat face at the final radius across the whole opening
+ * (`aberturaChaveta`), following the taper when the keyway is conical, between
+ * the final depth and the top of the stock.
+ *
+ * @param stock - Stock after applying the program
+ * @param params - Object containing all machining parameters
+ * @param notchAngles - A position of each notch, in cutting order
+ * @returns Leftover per notch
+ */
+export function leftoverReport(stock: StockModel, params: MachiningParams, notchAngles: number[]): NotchLeftover[] {
+  const raioFinal = Number((params.diametroFinal / 2).toFixed(3))
+  const half = params.aberturaChaveta / 2
+  const zRetracao = params.planoSeguroZ ?? params.pontoInicioZ
+  const conico = params.chavetaConica
+    ? Math.abs(params.profundidadeFinal) * Math.tan((params.anguloConico * Math.PI) / 180)
+    : 0
+
+  // Linhas dentro da profundidade programada
+  const rows: number[] = []
+  for (let row = 0; row < stock.axialCells; row++) {
+    const z = stock.rowZ(row)
+    if (z >= params.profundidadeFinal && z <= stock.zMax) rows.push(row)
+  }
+
+  return notchAngles.map((angle, notch) => {
+    let max = 0
+    let sum = 0
+    let uncut = 0
+    let cells = 0
+
+    for (const row of rows) {
+      const z = stock.rowZ(row)
+      // Raio do fundo nesta altura (no cone o fundo acompanha o mergulho)
+      const fundo = conico > 0 && zRetracao > params.profundidadeFinal
+        ? raioFinal + (conico * (zRetracao - Math.max(z, params.profundidadeFinal))) / (zRetracao - params.profundidadeFinal)
+        : raioFinal
+      const window = Math.atan2(half, fundo)
+      const span = Math.ceil((window * stock.angleCells) / (2 * Math.PI))
+      const offset = (-angle / 360) * stock.angleCells
+
+      for (let k = -span; k <= span; k++) {
+        const column = (((Math.floor(offset) + k) % stock.angleCells) + stock.angleCells) % stock.angleCells
+        let phi = ((column + 0.5) / stock.angleCells) * 2 * Math.PI + (angle * Math.PI) / 180
+        phi = phi - 2 * Math.PI * Math.round(phi / (2 * Math.PI))
+        if (Math.abs(fundo * Math.tan(phi)) > half || Math.cos(phi) <= 0) continue
+
+        const sobra = stock.leftoverAt(row * stock.angleCells + column, fundo / Math.cos(phi))
+        max = Math.max(max, sobra)
+        sum += sobra
+        if (sobra > LEFTOVER_TOLERANCE) uncut++
+        cells++
+      }
+    }
+
+    return {
+      notch,
+      angle,
+      maxLeftover: max,
+      meanLeftover: cells > 0 ? sum / cells : 0,
+      uncutFraction: cells > 0 ? uncut / cells : 0,
+    }
+  })
+}
+
+/**
+ * Runs the whole program on a fresh stock and reports the leftover per notch
+ *
+ * @param program - Parsed program
+ * @param params - Object containing all machining parameters
+ * @param notchStarts - Move index where each notch starts (its A rotation)
+ * @returns Final stock and the leftover report
+ */
+export function simulateStock(
+  program: GCodeProgram,
+  params: MachiningParams,
+  notchStarts: ArrayLike<number>,
+): { stock: StockModel; report: NotchLeftover[] } {
+  const stock = stockFromParams(params)
+  stock.applyProgram(program)
+  const angles = Array.from(notchStarts, (i) => program.a[i])
+  return { stock, report: leftoverReport(stock, params, angles) }
+}
@@ -0,0 +1,477 @@
+import type { GCodeProgram } from "@/lib/gcode-program"
+import { MOTION_FEED } from "@/lib/gcode-program"
+import type { MachiningParams } from "@/lib/gcode-generator"
+import { STOCK_FACE_Z } from "@/lib/stock-model"
+
+/** Distances (mm) below this never count as a violation */
+export const CHECK_TOLERANCE = 0.01
+/** Violations kept in a report (the total is always counted) */
+export const MAX_REPORTED_VIOLATIONS = 500
+
+// Acima destes limites de bordas distintas o envelope usa uma grade uniforme
+const MAX_X_EDGES = 256
+const MAX_Z_EDGES = 64
+const UNIFORM_X_BINS = 64
+const UNIFORM_Z_ROWS = 16
+
+/** Travel of one machine axis */
+export interface AxisRange {
+  min: number
+  max: number
+}
+
+/** Fixture region the tool must never enter, in machine coordinates */
+export interface KeepOutBox {
+  name: string
+  min: [number, number, number] // canto X/Y/Z mínimo
+  max: [number, number, number] // canto X/Y/Z máximo
+}
+
+/** Machine travel limits and fixture keep-out boxes */
+export interface MachineProfile {
+  name: string
+  travel: {
+    x: AxisRange | null
+    y: AxisRange | null
+    z: AxisRange | null
+    a: AxisRange | null // null: eixo rotativo contínuo
+  }
+  keepOut: KeepOutBox[]
+}
+
+/** Permissive profile used until the user enters the real machine limits */
+export const DEFAULT_MACHINE_PROFILE: MachineProfile = {
+  name: "Padrão",
+  travel: {
+    x: { min: -300, max: 300 },
+    y: { min: -50, max: 300 },
+    z: { min: -200, max: 150 },
+    a: null,
+  },
+  keepOut: [],
+}
+
+/** Blank cylinder seen by the tool (see StockModel for the geometry) */
+export interface StockCylinder {
+  radius: number // raio da superfície cortada (furo ou diâmetro externo)
+  internal: boolean // true: material fora do raio
+  zTop: number // topo do material; abaixo dele a peça ocupa todo o comprimento
+  toolWidth: number // largura da aresta da ferramenta
+}
+
+export type ViolationKind = "travel" | "keep-out" | "plunge-in-stock" | "rapid-in-stock" | "rotate-in-stock"
+
+/** Labels shown in the UI and the CLI */
+export const VIOLATION_LABELS: Record<ViolationKind, string> = {
+  travel: "Curso",
+  "keep-out": "Área proibida",
+  "plunge-in-stock": "G1 no material",
+  "rapid-in-stock": "G0 no material",
+  "rotate-in-stock": "Giro no material",
+}
+
+/** One move that breaks a limit */
+export interface Violation {
+  move: number // índice do movimento no programa
+  line: number // número da linha no código G (a partir de 1)
+  kind: ViolationKind
+  message: string
+}
+
+/** Result of checking a whole program */
+export interface CheckReport {
+  violations: Violation[] // no máximo MAX_REPORTED_VIOLATIONS, na ordem do programa
+  total: number
+  counts: Record<ViolationKind, number>
+  moves: number
+}
+
+/**
+ * One-line summary of a report, e.g. to confirm an export
+ *
+ * @param report - Result of checkToolpath
+ * @returns Count per kind and the first lines involved
+ */
+export function summarizeViolations(report: CheckReport): string {
+  const tipos = (Object.keys(report.counts) as ViolationKind[])
+    .filter((kind) => report.counts[kind] > 0)
+    .map((kind) => `${VIOLATION_LABELS[kind]}: ${report.counts[kind]}`)
+    .join(", ")
+  const linhas = Array.from(new Set(report.violations.map((v) => v.line))).slice(0, 5).join(", ")
+  return `${report.total} violação(ões) (${tipos}); linhas ${linhas}${report.total > 5 ? "..." : ""}`
+}
+
+/**
+ * Builds the blank cylinder of a job
+ *
+ * @param params - Object containing all machining parameters
+ * @returns Stock seen by the collision check
+ */
+export function stockCylinderFromParams(params: MachiningParams): StockCylinder {
+  return {
+    radius: params.diametroInicial / 2,
+    internal: params.diametroInicial < params.diametroFinal,
+    zTop: STOCK_FACE_Z,
+    toolWidth: params.diametroFerramenta,
+  }
+}
+
+// Bordas ordenadas e distintas (com sentinelas infinitas); null acima do limite
+function exactEdges(values: number[], max: number): Float64Array | null {
+  const sorted = Array.from(new Set(values.map((v) => Math.round(v * 1e6) / 1e6))).sort((p, q) => p - q)
+  if (sorted.length > max) return null
+  return Float64Array.from([-Infinity, ...sorted, Infinity])
+}
+
+function uniformEdges(from: number, to: number, cells: number): Float64Array {
+  const edges = new Float64Array(cells + 3)
+  edges[0] = -Infinity
+  for (let k = 0; k <= cells; k++) edges[k + 1] = from + ((to - from) * k) / cells
+  edges[cells + 2] = Infinity
+  return edges
+}
+
+// Primeira célula cuja borda superior passa de v (bordas crescentes)
+function cellAt(edges: Float64Array, v: number): number {
+  let lo = 0
+  let hi = edges.length - 2
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1
+    if (edges[mid + 1] <= v) lo = mid + 1
+    else hi = mid
+  }
+  return lo
+}
+
+/**
+ * Depth the tool has already cleared around each notch
+ *
+ * For every A position (notch) a grid of X bins × Z rows holds the deepest
+ * cleared level `d` (d = Y for internal cuts, -Y for external ones). The tool
+ * is a prism above its tip, so a G1 that reaches Z clears its X band at every
+ * row above Z. Bin and row edges are the distinct X band edges and Z ends of
+ * the G1 moves, which makes the grid exact for the generated programs; long
+ * imported programs fall back to a uniform grid, where partially covered
+ * cells count as uncut.
+ */
+class ClearedEnvelope {
+  readonly xEdges: Float64Array
+  readonly zEdges: Float64Array
+  private readonly grids = new Map<number, Float64Array>()
+  private readonly empty: Float64Array
+
+  constructor(program: GCodeProgram, stock: StockCylinder) {
+    const half = stock.toolWidth / 2
+    const xs: number[] = []
+    const zs: number[] = [stock.zTop]
+    let minX = Infinity
+    let maxX = -Infinity
+    let minZ = stock.zTop
+    let px = 0
+    let pz = 0
+    for (let i = 0; i < program.length; i++) {
+      const x = program.x[i]
+      const z = program.z[i]
+      if (x < minX) minX = x
+      if (x > maxX) maxX = x
+      if (z < minZ) minZ = z
+      if (program.motion[i] === MOTION_FEED && Math.min(pz, z) < stock.zTop) {
+        xs.push(Math.min(px, x) - half, Math.max(px, x) + half)
+        if (z < stock.zTop) zs.push(z)
+        if (pz < stock.zTop) zs.push(pz)
+      }
+      px = x
+      pz = z
+    }
+    this.xEdges = exactEdges(xs, MAX_X_EDGES) ?? uniformEdges(minX - half, maxX + half, UNIFORM_X_BINS)
+    this.zEdges = exactEdges(zs, MAX_Z_EDGES) ?? uniformEdges(minZ, stock.zTop, UNIFORM_Z_ROWS)
+    this.empty = new Float64Array((this.xEdges.length - 1) * (this.zEdges.length - 1)).fill(-Infinity)
+  }
+
+  get bins(): number {
+    return this.xEdges.length - 1
+  }
+
+  get rows(): number {
+    return this.zEdges.length - 1
+  }
+
+  /** Grid of a notch (A position); a shared uncut grid until the first cut there */
+  grid(a: number, create: boolean): Float64Array {
+    const key = ((Math.round(a * 1000) % 360000) + 360000) % 360000
+    let grid = this.grids.get(key)
+    if (!grid) {
+      if (!create) return this.empty
+      grid = new Float64Array(this.empty.length).fill(-Infinity)
+      this.grids.set(key, grid)
+    }
+    return grid
+  }
+}
+
+/**
+ * Checks a program against the machine profile and the stock
+ *
+ * Every move is tested once, in program order:
+ * - travel: the end point of each axis inside the machine travel;
+ * - keep-out: the straight move (tool tip grown by half the tool width)
+ *   against each fixture box;
+ * - plunge-in-stock: a G1 that starts inside uncut material;
+ * - rapid-in-stock: a G0 that crosses uncut material, which is how a retract
+ *   (pontoRecuoY) that does not clear a conical keyway shows up;
+ * - rotate-in-stock: an A rotation with the tool below the top of the stock
+ *   and within reach of the blank.
+ * Without a stock (imported programs) only travel and keep-out are checked.
+ *
+ * @param program - Parsed program
+ * @param profile - Machine travel and keep-out boxes
+ * @param stock - Blank cylinder, or null when the part is unknown
+ * @returns Violations with their move index and line number
+ */
+export function checkToolpath(program: GCodeProgram, profile: MachineProfile, stock: StockCylinder | null): CheckReport {
+  const tol = CHECK_TOLERANCE
+  const report: CheckReport = {
+    violations: [],
+    total: 0,
+    counts: { travel: 0, "keep-out": 0, "plunge-in-stock": 0, "rapid-in-stock": 0, "rotate-in-stock": 0 },
+    moves: program.length,
+  }
+  const add = (move: number, kind: ViolationKind, message: string) => {
+    report.total++
+    report.counts[kind]++
+    if (report.violations.length < MAX_REPORTED_VIOLATIONS) {
+      report.violations.push({ move, line: program.line[move] + 1, kind, message })
+    }
+  }
+
+  const { travel } = profile
+  const limits: [string, AxisRange | null, Float64Array][] = [
+    ["X", travel.x, program.x],
+    ["Y", travel.y, program.y],
+    ["Z", travel.z, program.z],
+    ["A", travel.a, program.a],
+  ]
+  const half = stock ? stock.toolWidth / 2 : 0
+  const envelope = stock ? new ClearedEnvelope(program, stock) : null
+
+  let px = 0
+  let py = 0
+  let pz = 0
+  let pa = 0
+  for (let i = 0; i < program.length; i++) {
+    const x = program.x[i]
+    const y = program.y[i]
+    const z = program.z[i]
+    const a = program.a[i]
+
+    // Curso: basta o ponto final (o movimento é uma reta entre pontos já verificados)
+    let fora = ""
+    for (const [axis, range, column] of limits) {
+      const v = column[i]
+      if (range && (v < range.min - tol || v > range.max + tol)) {
+        fora += `${fora ? ", " : ""}${axis}${Number(v.toFixed(3))} (curso ${range.min} a ${range.max})`
+      }
+    }
+    if (fora) add(i, "travel", `Fora do curso: ${fora}`)
+
+    for (const box of profile.keepOut) {
+      if (segmentHitsBox(px, py, pz, x, y, z, box, half)) add(i, "keep-out", `Entra na área proibida "${box.name}"`)
+    }
+
+    if (stock && envelope) {
+      const abaixo = Math.min(pz, z) < stock.zTop - tol
+      if (a !== pa) {
+        if (abaixo && reachesBlank(stock, Math.min(px, x) - half, Math.max(px, x) + half, py, y)) {
+          add(i, "rotate-in-stock", `Giro de A${Number(pa.toFixed(3))} para A${Number(a.toFixed(3))} com a ferramenta dentro da peça (Z${Number(Math.min(pz, z).toFixed(3))})`)
+        }
+      } else if (program.motion[i] === MOTION_FEED) {
+        if (pz < stock.zTop - tol && probe(envelope, stock, envelope.grid(a, false), px, py, pz, px, py, pz)) {
+          add(i, "plunge-in-stock", `G1 começa dentro do material (X${Number(px.toFixed(3))} Y${Number(py.toFixed(3))} Z${Number(pz.toFixed(3))})`)
+        }
+      } else if (abaixo && probe(envelope, stock, envelope.grid(a, false), px, py, pz, x, y, z)) {
+        add(i, "rapid-in-stock", `G0 atravessa material não cortado (Y${Number(py.toFixed(3))} → Y${Number(y.toFixed(3))}, Z${Number(pz.toFixed(3))} → Z${Number(z.toFixed(3))})`)
+      }
+
+      if (program.motion[i] === MOTION_FEED && Math.min(pz, z) < stock.zTop) {
+        clear(envelope, stock, envelope.grid(a, true), px, py, pz, x, y, z)
+      }
+    }
+
+    px = x
+    py = y
+    pz = z
+    pa = a
+  }
+  return report
+}
+
+// Trecho (parâmetros t) do movimento com a ponta abaixo de zLimit
+function clipBelow(z0: number, z1: number, zLimit: number): [number, number] | null {
+  if (z0 <= zLimit && z1 <= zLimit) return [0, 1]
+  if (z0 > zLimit && z1 > zLimit) return null
+  const t = (zLimit - z0) / (z1 - z0)
+  return z0 <= zLimit ? [0, t] : [t, 1]
+}
+
+// Marca como cortado o que um G1 varre: em cada linha do envelope, o nível mais
+// profundo que a ponta atinge abaixo da base da linha
+function clear(
+  envelope: ClearedEnvelope,
+  stock: StockCylinder,
+  grid: Float64Array,
+  x0: number, y0: number, z0: number,
+  x1: number, y1: number, z1: number,
+): void {
+  const half = stock.toolWidth / 2
+  const s = stock.internal ? 1 : -1
+  const { xEdges, zEdges, bins } = envelope
+  const eps = 1e-6
+  const reta = Math.abs(x1 - x0) < eps
+
+  for (let row = cellAt(zEdges, Math.min(z0, z1) - eps); row < envelope.rows; row++) {
+    const clip = clipBelow(z0, z1, zEdges[row] + eps)
+    if (!clip) continue
+    const xa = x0 + (x1 - x0) * clip[0]
+    const xb = x0 + (x1 - x0) * clip[1]
+    const da = s * (y0 + (y1 - y0) * clip[0])
+    const db = s * (y0 + (y1 - y0) * clip[1])
+    // Com X constante a faixa inteira chega ao nível mais profundo; andando em X
+    // só o nível menos profundo é garantido em todo o trecho
+    const d = reta ? Math.max(da, db) : Math.min(da, db)
+    const lo = Math.min(xa, xb) - half - eps
+    const hi = Math.max(xa, xb) + half + eps
+    for (let bin = cellAt(xEdges, lo); bin < bins && xEdges[bin + 1] <= hi; bin++) {
+      if (xEdges[bin] < lo) continue
+      const k = row * bins + bin
+      if (d > grid[k]) grid[k] = d
+    }
+  }
+}
+
+// A ferramenta, entre dois pontos do mesmo entalhe, encontra material não cortado?
+function probe(
+  envelope: ClearedEnvelope,
+  stock: StockCylinder,
+  grid: Float64Array,
+  x0: number, y0: number, z0: number,
+  x1: number, y1: number, z1: number,
+): boolean {
+  const tol = CHECK_TOLERANCE
+  const half = stock.toolWidth / 2
+  const s = stock.internal ? 1 : -1
+  const { xEdges, zEdges, bins } = envelope
+  const zMin = Math.min(z0, z1)
+
+  for (let row = cellAt(zEdges, zMin + tol); row < envelope.rows; row++) {
+    const top = zEdges[row + 1]
+    if (zEdges[row] >= stock.zTop - tol) break
+    // Parte do movimento em que a ponta está abaixo do topo desta linha
+    const clip = clipBelow(z0, z1, top - tol)
+    if (!clip) continue
+    const xa = x0 + (x1 - x0) * clip[0]
+    const xb = x0 + (x1 - x0) * clip[1]
+    const ya = y0 + (y1 - y0) * clip[0]
+    const yb = y0 + (y1 - y0) * clip[1]
+    const d = Math.max(s * ya, s * yb)
+    const lo = Math.min(xa, xb) - half + tol
+    const hi = Math.max(xa, xb) + half - tol
+    if (lo >= hi) continue
+
+    for (let bin = cellAt(xEdges, lo); bin < bins && xEdges[bin] < hi; bin++) {
+      const env = grid[row * bins + bin]
+      if (d <= env + tol) continue
+      // Só conta se há material entre o nível já cortado e a ponta
+      const from = Math.max(xEdges[bin], lo)
+      const to = Math.min(xEdges[bin + 1], hi)
+      if (hasMaterial(stock, from, to, Math.min(ya, yb), Math.max(ya, yb))) return true
+    }
+  }
+  return false
+}
+
+// A seção da ferramenta (faixa from..to em X, ponta entre yLow e yHigh) toca o blank?
+// Interno: a ferramenta ocupa 0 <= y' <= ponta e o material fica fora do raio;
+// externo: ocupa y' >= ponta e o material fica dentro do raio
+function hasMaterial(stock: StockCylinder, from: number, to: number, yLow: number, yHigh: number): boolean {
+  const tol = CHECK_TOLERANCE
+  const r0 = stock.radius
+  if (stock.internal) {
+    const far = Math.max(Math.abs(from), Math.abs(to))
+    return Math.hypot(far, Math.max(yHigh, 0)) > r0 + tol
+  }
+  const near = from <= 0 && to >= 0 ? 0 : Math.min(Math.abs(from), Math.abs(to))
+  return Math.hypot(near, Math.max(yLow, 0)) < r0 - tol
+}
+
+function reachesBlank(stock: StockCylinder, from: number, to: number, y0: number, y1: number): boolean {
+  return hasMaterial(stock, from + CHECK_TOLERANCE, to - CHECK_TOLERANCE, Math.min(y0, y1), Math.max(y0, y1))
+}
+
+// Interseção da reta p0→p1 com a caixa aumentada de "grow" (teste das faixas)
+function segmentHitsBox(
+  x0: number, y0: number, z0: number,
+  x1: number, y1: number, z1: number,
+  box: KeepOutBox, grow: number,
+): boolean {
+  let t0 = 0
+  let t1 = 1
+  const start = [x0, y0, z0]
+  const delta = [x1 - x0, y1 - y0, z1 - z0]
+  for (let k = 0; k < 3; k++) {
+    const lo = box.min[k] - grow
+    const hi = box.max[k] + grow
+    if (Math.abs(delta[k]) < 1e-12) {
+      if (start[k] <= lo || start[k] >= hi) return false
+      continue
+    }
+    let ta = (lo - start[k]) / delta[k]
+    let tb = (hi - start[k]) / delta[k]
+    if (ta > tb) [ta, tb] = [tb, ta]
+    if (ta > t0) t0 = ta
+    if (tb < t1) t1 = tb
+    if (t0 >= t1) return false
+  }
+  return true
+}
+
+/**
+ * Validates a machine profile read from JSON (file or localStorage)
+ *
+ * @param data - Parsed JSON
+ * @returns Profile with every field checked
+ * @throws Error when a field is missing or not a number
+ */
+export function parseMachineProfile(data: unknown): MachineProfile {
+  const obj = (data ?? {}) as Record<string, unknown>
+  const travel = (obj.travel ?? {}) as Record<string, unknown>
+  const range = (axis: string): AxisRange | null => {
+    const value = travel[axis] as Record<string, unknown> | null | undefined
+    if (value == null) return null
+    const min = Number(value.min)
+    const max = Number(value.max)
+    if (!Number.isFinite(min) || !Number.isFinite(max) || min > max) {
+      throw new Error(`Curso inválido no eixo ${axis.toUpperCase()}`)
+    }
+    return { min, max }
+  }
+  const point = (value: unknown, what: string): [number, number, number] => {
+    const p = Array.isArray(value) ? value.map(Number) : []
+    if (p.length !== 3 || !p.every(Number.isFinite)) throw new Error(`Área proibida com ${what} inválido`)
+    return [p[0], p[1], p[2]]
+  }
+  const keepOut = Array.isArray(obj.keepOut) ? obj.keepOut : []
+  return {
+    name: typeof obj.name === "string" ? obj.name : DEFAULT_MACHINE_PROFILE.name,
+    travel: { x: range("x"), y: range("y"), z: range("z"), a: range("a") },
+    keepOut: keepOut.map((item, i) => {
+      const box = (item ?? {}) as Record<string, unknown>
+      const min = point(box.min, "canto mínimo")
+      const max = point(box.max, "canto máximo")
+      return {
+        name: typeof box.name === "string" && box.name ? box.name : `Área ${i + 1}`,
+        min: [Math.min(min[0], max[0]), Math.min(min[1], max[1]), Math.min(min[2], max[2])],
+        max: [Math.max(min[0], max[0]), Math.max(min[1], max[1]), Math.max(min[2], max[2])],
+      }
+    }),
+  }
+}
@@ -0,0 +1,294 @@
+/** Rapid (G0) traverse rate used for the air-cut time estimate, in mm/min */
+export const DEFAULT_OPTIMIZER_RAPID_RATE = 5000
+
+type Axis = "X" | "Y" | "Z" | "A"
+type Position = Partial<Record<Axis, number>>
+type Words = Partial<Record<Axis, string>>
+
+const AXES: Axis[] = ["X", "Y", "Z", "A"]
+
+export interface OptimizeOptions {
+  safeZ?: number // Altura segura: rápidos em X/Y acima dela podem ser combinados
+  dropNoOps?: boolean // Remove movimentos para a posição atual (padrão: true)
+  mergeRapids?: boolean // Combina rápidos colineares e rápidos no plano seguro (padrão: true)
+  stripModalF?: boolean // Omite F repetido (padrão: true)
+  stripModalG?: boolean // Omite G0/G1 repetido (padrão: false)
+  rapidRate?: number // mm/min, para estimar o tempo economizado
+}
+
+export interface OptimizeReport {
+  linesIn: number
+  linesOut: number
+  linesSaved: number
+  rapidDistanceIn: number // mm
+  rapidDistanceOut: number // mm
+  airTimeSaved: number // s
+}
+
+interface PendingRapid {
+  g: string
+  start: Position
+  words: Words
+}
+
+// Linhas que não mudam o estado da máquina (em branco ou só comentário)
+const PASSIVE_LINE = /^\s*(\(.*\)|;.*)?\s*$/
+const COMMENT = /\s*(\(.*\)|;.*)$/
+const WORD = /^([XYZAF])([-+]?\d*\.?\d+)$/i
+
+/**
+ * Streaming optimizer that removes redundant moves from a G-code program
+ *
+ * Lines are pushed one at a time and the optimized lines come back as soon as
+ * they are final, so it can sit behind emitGCode or a chunked save. It drops
+ * moves to the current position, merges consecutive collinear rapids, merges
+ * X/Y rapids made at or above the safe height into one move, and strips F (and
+ * optionally G0/G1) words that repeat the modal value. Any line it does not
+ * understand (subprogram calls, labels, M codes) is kept and resets what is
+ * known about the machine state, so compact subprogram dialects stay correct.
+ */
+export class ToolpathOptimizer {
+  private readonly options: Required<Omit<OptimizeOptions, "safeZ">> & { safeZ?: number }
+  private pos: Position = {}
+  private pending: PendingRapid | null = null
+  private modalG: string | null = null
+  private modalF: string | null = null
+  private rapidIn = 0
+  private rapidOut = 0
+  private linesIn = 0
+  private linesOut = 0
+
+  constructor(options: OptimizeOptions = {}) {
+    this.options = {
+      dropNoOps: true,
+      mergeRapids: true,
+      stripModalF: true,
+      stripModalG: false,
+      rapidRate: DEFAULT_OPTIMIZER_RAPID_RATE,
+      ...options,
+    }
+  }
+
+  /**
+   * Feeds one line of the original program
+   *
+   * @param line - G-code line
+   * @returns Optimized lines that are ready to be written
+   */
+  push(line: string): string[] {
+    this.linesIn++
+    const out: string[] = []
+    const move = this.parseMove(line)
+
+    if (!move) {
+      this.flush(out)
+      this.emit(out, line)
+      if (!PASSIVE_LINE.test(line)) this.resetState()
+      return out
+    }
+
+    const start = { ...this.pos }
+    // Eixos que realmente mudam de posição
+    const words: Words = {}
+    for (const axis of AXES) {
+      const value = move.words[axis]
+      if (value === undefined) continue
+      if (this.options.dropNoOps && start[axis] === Number.parseFloat(value)) continue
+      words[axis] = value
+    }
+    for (const axis of AXES) {
+      if (move.words[axis] !== undefined) this.pos[axis] = Number.parseFloat(move.words[axis]!)
+    }
+
+    const isRapid = move.g === "G0" || move.g === "G00"
+    if (isRapid) this.rapidIn += distance(start, this.pos)
+
+    if (isRapid && !move.f && !move.comment) {
+      if (Object.keys(words).length === 0) return out // Movimento nulo
+
+      if (this.pending && this.options.mergeRapids && this.canMerge(this.pending, start, words)) {
+        this.pending.words = { ...this.pending.words, ...words }
+        return out
+      }
+      this.flush(out)
+      this.pending = { g: move.g, start, words }
+      return out
+    }
+
+    this.flush(out)
+    if (Object.keys(words).length === 0 && this.options.dropNoOps && !move.comment) {
+      // Movimento nulo; um F novo continua pendente para o próximo G1
+      return out
+    }
+
+    let text = this.gWord(move.g)
+    for (const axis of AXES) {
+      if (words[axis] !== undefined) text += ` ${axis}${words[axis]}`
+    }
+    if (move.f !== undefined) {
+      if (!this.options.stripModalF || move.f !== this.modalF) text += ` F${move.f}`
+      this.modalF = move.f
+    }
+    if (move.comment) text += ` ${move.comment}`
+    if (isRapid) this.rapidOut += distance(start, this.pos)
+    this.emit(out, text.trim())
+    return out
+  }
+
+  /**
+   * Flushes the last pending move at the end of the program
+   *
+   * @returns Remaining optimized lines
+   */
+  finish(): string[] {
+    const out: string[] = []
+    this.flush(out)
+    return out
+  }
+
+  /** Lines and estimated air-cut time saved so far */
+  report(): OptimizeReport {
+    return {
+      linesIn: this.linesIn,
+      linesOut: this.linesOut,
+      linesSaved: this.linesIn - this.linesOut,
+      rapidDistanceIn: this.rapidIn,
+      rapidDistanceOut: this.rapidOut,
+      airTimeSaved: ((this.rapidIn - this.rapidOut) / this.options.rapidRate) * 60,
+    }
+  }
+
+  private parseMove(line: string): { g: string; words: Words; f?: string; comment?: string } | null {
+    const commentMatch = COMMENT.exec(line)
+    const code = commentMatch ? line.slice(0, commentMatch.index) : line
+    const tokens = code.trim().split(/\s+/)
+    const g = tokens[0]?.toUpperCase()
+    if (!g || !/^G0?[01]$/.test(g)) return null
+
+    const words: Words = {}
+    let f: string | undefined
+    for (const token of tokens.slice(1)) {
+      const match = WORD.exec(token)
+      if (!match) return null
+      const letter = match[1].toUpperCase()
+      if (letter === "F") f = match[2]
+      else words[letter as Axis] = match[2]
+    }
+    return { g, words, f, comment: commentMatch?.[1] }
+  }
+
+  // Dois rápidos podem virar um só se forem colineares, ou se ambos ficarem
+  // no plano seguro (sem mover Z nem A)
+  private canMerge(pending: PendingRapid, start: Position, words: Words): boolean {
+    const a = displacement(pending.start, pending.words)
+    const b = displacement(start, words)
+    if (a && b && collinear(a, b)) return true
+
+    const { safeZ } = this.options
+    if (safeZ === undefined || start.Z === undefined || start.Z < safeZ) return false
+    const movesZorA = (w: Words) => w.Z !== undefined || w.A !== undefined
+    return !movesZorA(pending.words) && !movesZorA(words)
+  }
+
+  private flush(out: string[]): void {
+    if (!this.pending) return
+    const { g, start, words } = this.pending
+    this.pending = null
+
+    // Após uma fusão, o movimento combinado pode voltar ao ponto de partida
+    const axes = AXES.filter((axis) => words[axis] !== undefined &&
+      !(this.options.dropNoOps && start[axis] === Number.parseFloat(words[axis]!)))
+    if (axes.length === 0) return
+
+    let text = this.gWord(g)
+    const end: Position = { ...start }
+    for (const axis of axes) {
+      text += ` ${axis}${words[axis]}`
+      end[axis] = Number.parseFloat(words[axis]!)
+    }
+    this.rapidOut += distance(start, end)
+    this.emit(out, text.trim())
+  }
+
+  private gWord(g: string): string {
+    const skip = this.options.stripModalG && this.modalG === g
+    this.modalG = g
+    return skip ? "" : g
+  }
+
+  private emit(out: string[], line: string): void {
+    out.push(line)
+    this.linesOut++
+  }
+
+  private resetState(): void {
+    this.pos = {}
+    this.modalG = null
+    this.modalF = null
+  }
+}
+
+// Deslocamento de um movimento; null se algum eixo envolvido tiver posição desconhecida
+function displacement(start: Position, words: Words): number[] | null {
+  const vector: number[] = []
+  for (const axis of AXES) {
+    if (words[axis] === undefined) {
+      vector.push(0)
+    } else if (start[axis] === undefined) {
+      return null
+    } else {
+      vector.push(Number.parseFloat(words[axis]!) - start[axis]!)
+    }
+  }
+  return vector
+}
+
+function collinear(a: number[], b: number[]): boolean {
+  const dot = a.reduce((sum, v, i) => sum + v * b[i], 0)
+  const normA = Math.hypot(...a)
+  const normB = Math.hypot(...b)
+  return normA > 0 && normB > 0 && Math.abs(Math.abs(dot) - normA * normB) <= 1e-9 * normA * normB
+}
+
+// Distância linear (X, Y, Z) entre duas posições; eixos desconhecidos não contam
+function distance(from: Position, to: Position): number {
+  let sum = 0
+  for (const axis of ["X", "Y", "Z"] as Axis[]) {
+    if (from[axis] !== undefined && to[axis] !== undefined) sum += (to[axis]! - from[axis]!) ** 2
+  }
+  return Math.sqrt(sum)
+}
+
+/**
+ * Optimizes a stream of G-code lines
+ *
+ * @param lines - G-code lines (array or emitGCode generator)
+ * @param options - Optimization options
+ * @param onReport - Called with the report once the stream is exhausted
+ * @returns Iterator over optimized lines
+ */
+export function* optimizeToolpath(
+  lines: Iterable<string>,
+  options: OptimizeOptions = {},
+  onReport?: (report: OptimizeReport) => void,
+): Generator<string> {
+  const optimizer = new ToolpathOptimizer(options)
+  for (const line of lines) yield* optimizer.push(line)
+  yield* optimizer.finish()
+  onReport?.(optimizer.report())
+}
+
+/**
+ * Optimizes a complete G-code program
+ *
+ * @param lines - G-code lines
+ * @param options - Optimization options
+ * @returns Optimized lines and the optimization report
+ */
+export function optimizeGCode(lines: Iterable<string>, options: OptimizeOptions = {}): { lines: string[]; report: OptimizeReport } {
+  const optimizer = new ToolpathOptimizer(options)
+  const out: string[] = []
+  for (const line of lines) out.push(...optimizer.push(line))
+  out.push(...optimizer.finish())
+  return { lines: out, report: optimizer.report() }
+}
@@ -3,8 +3,6 @@ import json
 import os
 import uuid
 from datetime import datetime, timedelta
-import tkinter as tk
-from tkinter import messagebox, simpledialog
 import sys
 
 class LicenseManager:
@@ -146,6 +144,10 @@ class LicenseManager:
     
     def activate_license_gui(self):
         """Interface gráfica para ativação da licença"""
+        # Importado apenas aqui: o tkinter é pesado e só é necessário na ativação
+        import tkinter as tk
+        from tkinter import messagebox, simpledialog
+
         root = tk.Tk()
         root.withdraw()  # Esconde a janela principal
         
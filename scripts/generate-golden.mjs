@@ -0,0 +1,49 @@
+// Regenera os programas de referência de tests/golden a partir do gerador TypeScript
+//
+// Uso: node scripts/generate-golden.mjs  (Node 22.18 ou mais recente, que executa .ts diretamente)
+//
+// Cada caso de tests/golden/cases.json vira tests/golden/<nome>.nc; o teste
+// tests/test_golden.py compara a saída do pacote Python com esses arquivos.
+// Cada programa editado à mão em tests/golden/importados/<nome>.nc ganha um
+// <nome>.json com os movimentos que parseGCodeText encontra nele e o relatório
+// de checkToolpath com o perfil padrão (sem blank, como em "entalhe check").
+import { readdirSync, readFileSync, writeFileSync } from "node:fs"
+import { registerHooks } from "node:module"
+import { dirname, join } from "node:path"
+import { fileURLToPath, pathToFileURL } from "node:url"
+
+const root = join(dirname(fileURLToPath(import.meta.url)), "..")
+const goldenDir = join(root, "tests", "golden")
+
+// Resolve os aliases "@/..." do tsconfig para os arquivos .ts do projeto
+registerHooks({
+  resolve(specifier, context, nextResolve) {
+    if (specifier.startsWith("@/")) {
+      return nextResolve(pathToFileURL(join(root, `${specifier.slice(2)}.ts`)).href, context)
+    }
+    return nextResolve(specifier, context)
+  },
+})
+
+const { generateGCode } = await import(pathToFileURL(join(root, "lib", "gcode-generator.ts")).href)
+const { parseGCodeText } = await import(pathToFileURL(join(root, "lib", "gcode-program.ts")).href)
+const { checkToolpath, DEFAULT_MACHINE_PROFILE } = await import(pathToFileURL(join(root, "lib", "toolpath-check.ts")).href)
+
+const cases = JSON.parse(readFileSync(join(goldenDir, "cases.json"), "utf8"))
+for (const { name, params, dialect, optimize } of cases) {
+  const lines = generateGCode(params, { dialect: dialect ?? "standard", optimize: optimize ?? false })
+  writeFileSync(join(goldenDir, `${name}.nc`), `${lines.join("\n")}\n`)
+}
+console.log(`${cases.length} programas de referência gravados em ${goldenDir}`)
+
+const importedDir = join(goldenDir, "importados")
+const imported = readdirSync(importedDir).filter((file) => file.endsWith(".nc"))
+for (const file of imported) {
+  const program = parseGCodeText(readFileSync(join(importedDir, file), "utf8"))
+  const moves = Array.from(program.motion, (motion, i) => [
+    program.x[i], program.y[i], program.z[i], program.a[i], program.f[i], motion, program.line[i],
+  ])
+  const check = checkToolpath(program, DEFAULT_MACHINE_PROFILE, null)
+  writeFileSync(join(importedDir, file.replace(/\.nc$/, ".json")), `${JSON.stringify({ moves, check })}\n`)
+}
+console.log(`${imported.length} programas importados analisados em ${importedDir}`)
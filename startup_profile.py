@@ -0,0 +1,127 @@
+"""
+Medição das fases de inicialização do launcher (--profile-startup)
+
+Usa apenas a biblioteca padrão para não acrescentar tempo de import ao
+executável. A fase de descompactação é estimada a partir do instante de
+criação do processo: no modo --onefile do PyInstaller o bootloader é o
+processo pai, que extrai o runtime antes de iniciar o interpretador.
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+
+
+def _windows_process_start_time(pid):
+    """Instante de criação (epoch) de um processo no Windows"""
+    import ctypes
+    from ctypes import wintypes
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        return None
+    try:
+        creation = wintypes.FILETIME()
+        exit_time = wintypes.FILETIME()
+        kernel_time = wintypes.FILETIME()
+        user_time = wintypes.FILETIME()
+        if not kernel32.GetProcessTimes(handle, ctypes.byref(creation), ctypes.byref(exit_time),
+                                        ctypes.byref(kernel_time), ctypes.byref(user_time)):
+            return None
+        # FILETIME conta intervalos de 100 ns desde 01/01/1601
+        ticks = (creation.dwHighDateTime << 32) | creation.dwLowDateTime
+        return ticks / 1e7 - 11644473600
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def _proc_process_start_time(pid):
+    """Instante de criação (epoch) de um processo em sistemas com /proc"""
+    with open(f"/proc/{pid}/stat") as f:
+        # O nome do processo pode conter espaços; os campos seguem o último ")"
+        fields = f.read().rsplit(")", 1)[1].split()
+    start_ticks = int(fields[19])
+    with open("/proc/uptime") as f:
+        uptime = float(f.read().split()[0])
+    return time.time() - (uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+
+
+def process_start_time(pid):
+    """Instante de criação (epoch) do processo informado, ou None se indisponível"""
+    try:
+        if platform.system() == "Windows":
+            return _windows_process_start_time(pid)
+        return _proc_process_start_time(pid)
+    except Exception:
+        return None
+
+
+def is_onefile_bundle():
+    """Indica se estamos rodando de um executável PyInstaller --onefile"""
+    if not getattr(sys, "frozen", False) or not hasattr(sys, "_MEIPASS"):
+        return False
+    exe_dir = os.path.normcase(os.path.abspath(os.path.dirname(sys.executable)))
+    meipass = os.path.normcase(os.path.abspath(sys._MEIPASS))
+    # No modo one-dir os arquivos ficam junto do executável (ou em _internal)
+    return not meipass.startswith(exe_dir)
+
+
+class StartupProfiler:
+    """Registra a duração de cada fase da inicialização"""
+
+    def __init__(self, t0, wall_t0):
+        # t0: time.perf_counter() no início do script; wall_t0: time.time() no mesmo instante
+        self.t0 = t0
+        self.wall_t0 = wall_t0
+        self.last = t0
+        self.phases = []
+        self.reported = False
+
+        # Fase anterior ao interpretador: extração do bundle (--onefile) ou
+        # inicialização do próprio Python
+        pid = os.getppid() if is_onefile_bundle() else os.getpid()
+        started = process_start_time(pid)
+        if started is not None and started <= wall_t0:
+            label = "unpack" if is_onefile_bundle() else "interpreter"
+            self.phases.append((label, (wall_t0 - started) * 1000))
+
+    def mark(self, phase):
+        """Fecha a fase atual com o nome informado"""
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000))
+        self.last = now
+
+    def elapsed_ms(self):
+        """Tempo decorrido desde o início do script, em milissegundos"""
+        return (time.perf_counter() - self.t0) * 1000
+
+    def as_dict(self):
+        """Fases e total em um dicionário (útil para benchmarks)"""
+        return {
+            "phases": [{"phase": name, "ms": round(ms, 1)} for name, ms in self.phases],
+            "total_ms": round(sum(ms for _, ms in self.phases), 1),
+        }
+
+    def save(self, path, **extra):
+        """Grava as fases em um arquivo JSON"""
+        data = self.as_dict()
+        data.update(extra)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+    def report(self):
+        """Imprime a tabela de tempos por fase"""
+        self.reported = True
+        data = self.as_dict()
+        print("=" * 44)
+        print("PERFIL DE INICIALIZAÇÃO")
+        print("-" * 44)
+        for item in data["phases"]:
+            print(f"{item['phase']:<28}{item['ms']:>12.1f} ms")
+        print("-" * 44)
+        print(f"{'total':<28}{data['total_ms']:>12.1f} ms")
+        print("=" * 44)
@@ -0,0 +1,374 @@
+G0 Z100
+G0 Y0
+G0 X0
+G0 A0.00
+G0 Z2.5
+G0 Y12.7
+G0 X0
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y12.700
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y13.050
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y13.050
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y13.400
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y13.400
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y13.750
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y13.750
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y14.100
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y14.100
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y14.450
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y14.450
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y14.800
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y14.800
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y15.150
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y15.150
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y15.500
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y15.500
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y15.850
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y15.850
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y15.875
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y15.875
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 A120.00
+G0 Z2.5
+G0 Y12.7
+G0 X0
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y12.700
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y13.050
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y13.050
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y13.400
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y13.400
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y13.750
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y13.750
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y14.100
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y14.100
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y14.450
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y14.450
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y14.800
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y14.800
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y15.150
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y15.150
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y15.500
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y15.500
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y15.850
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y15.850
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y15.875
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y15.875
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 A240.00
+G0 Z2.5
+G0 Y12.7
+G0 X0
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y12.700
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y13.050
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y13.050
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y13.400
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y13.400
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y13.750
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y13.750
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y14.100
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y14.100
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y14.450
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y14.450
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y14.800
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y14.800
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y15.150
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y15.150
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y15.500
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y15.500
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y15.850
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y15.850
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 X0
+G0 Y15.875
+G0 X-1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Y15.875
+G0 X1.588
+G1 Z-12.75 F75.5
+G0 Y11.70
+G0 Z2.5
+G0 Z100
+M30
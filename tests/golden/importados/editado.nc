@@ -0,0 +1,26 @@
+%
+O2001 (ENTALHE EDITADO NA MAQUINA)
+N10 G21 G90 G17 G54
+N20 G0 X0 Y0 Z5 A0
+N30 G1 Z-2 F150
+N40 G2 X10 Y0 I5 J0
+(volta completa e arco por raio)
+N50 G3 X10 Y0 I-5
+N60 G2 X20 Y10 R10
+N70 G3 X30 Y0 R-10
+N80 X40
+N90 G91 G0 X250
+N100 X250
+N110 G90 X100
+N120 G28 X400
+N130 G53 Z0
+N140 G4 P500 X9
+N150 G18 G2 X110 Z-6 I5 K-2 Y4
+N160 G20 G1 X5 Y0.5 F10
+N170 G91 Z-0.1 A=DC(90)
+N180 G90 G21 G92 X0 Y0
+N190 G1 X1 Y1
+N200 G80 X7
+N210 G0 Z5 ; recuo
+N220 M30
+%
@@ -0,0 +1,15 @@
+%
+O2002 (RETORNO EM G91 EDITADO A MAO)
+G21 G90 G17
+G0 X0 Y0 Z5
+G91
+G0 X250
+G0 X250
+G90
+N20 X100
+G1 Z-1 F100
+G2 X110 Y0 I5 J0
+G28 X400
+G0 Z5
+M30
+%
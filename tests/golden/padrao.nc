@@ -0,0 +1,277 @@
+G0 Z100
+G0 Y0
+G0 X0
+G0 A0.00
+G0 Z5
+G0 Y15
+G0 X0
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y15.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y16.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y16.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y17.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y17.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y18.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y18.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y19.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y19.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y20.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y20.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 A90.00
+G0 Z5
+G0 Y15
+G0 X0
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y15.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y16.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y16.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y17.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y17.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y18.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y18.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y19.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y19.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y20.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y20.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 A180.00
+G0 Z5
+G0 Y15
+G0 X0
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y15.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y16.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y16.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y17.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y17.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y18.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y18.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y19.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y19.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y20.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y20.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 A270.00
+G0 Z5
+G0 Y15
+G0 X0
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y15.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y16.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y16.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y17.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y17.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y18.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y18.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y19.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y19.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y20.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y20.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Z100
+M30
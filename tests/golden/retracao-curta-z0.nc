@@ -0,0 +1,269 @@
+G0 Z100
+G0 Y0
+G0 X0
+G0 A0.00
+G0 Z5
+G0 Y20
+G0 X0
+G0 X0.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y20.000
+G0 X-3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y20.000
+G0 X3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y19.000
+G0 X3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y19.000
+G0 X0.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y19.000
+G0 X-3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y18.000
+G0 X-3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y18.000
+G0 X0.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y18.000
+G0 X3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y17.000
+G0 X3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y17.000
+G0 X0.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y17.000
+G0 X-3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y16.000
+G0 X-3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y16.000
+G0 X0.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y16.000
+G0 X3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y15.000
+G0 X3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y15.000
+G0 X-3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z5
+G0 A120.00
+G0 Z5
+G0 Y20
+G0 X0
+G0 X0.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y20.000
+G0 X-3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y20.000
+G0 X3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y19.000
+G0 X3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y19.000
+G0 X0.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y19.000
+G0 X-3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y18.000
+G0 X-3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y18.000
+G0 X0.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y18.000
+G0 X3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y17.000
+G0 X3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y17.000
+G0 X0.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y17.000
+G0 X-3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y16.000
+G0 X-3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y16.000
+G0 X0.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y16.000
+G0 X3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y15.000
+G0 X3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y15.000
+G0 X-3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z5
+G0 A240.00
+G0 Z5
+G0 Y20
+G0 X0
+G0 X0.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y20.000
+G0 X-3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y20.000
+G0 X3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y19.000
+G0 X3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y19.000
+G0 X0.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y19.000
+G0 X-3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y18.000
+G0 X-3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y18.000
+G0 X0.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y18.000
+G0 X3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y17.000
+G0 X3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y17.000
+G0 X0.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y17.000
+G0 X-3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y16.000
+G0 X-3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y16.000
+G0 X0.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y16.000
+G0 X3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y15.000
+G0 X3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z0
+G0 Y15.000
+G0 X-3.000
+G1 Z-5 F100
+G0 Y21.00
+G0 Z5
+G0 Z100
+M30
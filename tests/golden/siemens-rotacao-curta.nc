@@ -0,0 +1,85 @@
+G0 Z100
+G0 Y0
+G0 X0
+G0 A=DC(0.00)
+ENTALHE_INI:
+G0 Z5
+G0 Y15
+G0 X0
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y15.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y16.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y16.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y17.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y17.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y18.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y18.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y19.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y19.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y20.000
+G0 X1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+G0 Y20.000
+G0 X-1.000
+G1 Z-5 F100
+G0 Y14.00
+G0 Z5
+ENTALHE_FIM:
+G0 A=DC(60.00)
+REPEAT ENTALHE_INI ENTALHE_FIM P=1
+G0 A=DC(120.00)
+REPEAT ENTALHE_INI ENTALHE_FIM P=1
+G0 A=DC(180.00)
+REPEAT ENTALHE_INI ENTALHE_FIM P=1
+G0 A=DC(240.00)
+REPEAT ENTALHE_INI ENTALHE_FIM P=1
+G0 A=DC(300.00)
+REPEAT ENTALHE_INI ENTALHE_FIM P=1
+G0 Z100
+M30
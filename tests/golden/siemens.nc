@@ -0,0 +1,106 @@
+G0 Z100
+G0 Y0
+G0 X0
+G0 A0.00
+ENTALHE_INI:
+G0 Z5
+G0 Y15
+G0 X0
+G0 X0.000
+G1 Y15.437 Z-5 F100 ; Calculando para 5° graus
+G0 Y14.00
+G0 Z5
+G0 Y15.000
+G0 X-3.000
+G1 Y15.437 Z-5 F100 ; Calculando para 5° graus
+G0 Y14.00
+G0 Z5
+G0 Y15.000
+G0 X3.000
+G1 Y15.437 Z-5 F100 ; Calculando para 5° graus
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y16.000
+G0 X0.000
+G1 Y16.437 Z-5 F100 ; Calculando para 5° graus
+G0 Y14.00
+G0 Z5
+G0 Y16.000
+G0 X-3.000
+G1 Y16.437 Z-5 F100 ; Calculando para 5° graus
+G0 Y14.00
+G0 Z5
+G0 Y16.000
+G0 X3.000
+G1 Y16.437 Z-5 F100 ; Calculando para 5° graus
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y17.000
+G0 X0.000
+G1 Y17.437 Z-5 F100 ; Calculando para 5° graus
+G0 Y14.00
+G0 Z5
+G0 Y17.000
+G0 X-3.000
+G1 Y17.437 Z-5 F100 ; Calculando para 5° graus
+G0 Y14.00
+G0 Z5
+G0 Y17.000
+G0 X3.000
+G1 Y17.437 Z-5 F100 ; Calculando para 5° graus
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y18.000
+G0 X0.000
+G1 Y18.437 Z-5 F100 ; Calculando para 5° graus
+G0 Y14.00
+G0 Z5
+G0 Y18.000
+G0 X-3.000
+G1 Y18.437 Z-5 F100 ; Calculando para 5° graus
+G0 Y14.00
+G0 Z5
+G0 Y18.000
+G0 X3.000
+G1 Y18.437 Z-5 F100 ; Calculando para 5° graus
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y19.000
+G0 X0.000
+G1 Y19.437 Z-5 F100 ; Calculando para 5° graus
+G0 Y14.00
+G0 Z5
+G0 Y19.000
+G0 X-3.000
+G1 Y19.437 Z-5 F100 ; Calculando para 5° graus
+G0 Y14.00
+G0 Z5
+G0 Y19.000
+G0 X3.000
+G1 Y19.437 Z-5 F100 ; Calculando para 5° graus
+G0 Y14.00
+G0 Z5
+G0 X0
+G0 Y20.000
+G0 X3.000
+G1 Y20.437 Z-5 F100 ; Calculando para 5° graus
+G0 Y14.00
+G0 Z5
+G0 Y20.000
+G0 X-3.000
+G1 Y20.437 Z-5 F100 ; Calculando para 5° graus
+G0 Y14.00
+G0 Z5
+ENTALHE_FIM:
+G0 A90.00
+REPEAT ENTALHE_INI ENTALHE_FIM P=1
+G0 A180.00
+REPEAT ENTALHE_INI ENTALHE_FIM P=1
+G0 A270.00
+REPEAT ENTALHE_INI ENTALHE_FIM P=1
+G0 Z100
+M30
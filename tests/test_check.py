@@ -0,0 +1,52 @@
+"""
+Verificação do percurso contra o blank (entalhe.check)
+"""
+
+import json
+from dataclasses import asdict, replace
+from pathlib import Path
+
+import pytest
+
+from entalhe.check import MachineProfile, STOCK_FACE_Z, check_file, check_program, stock_cylinder_from_params
+from entalhe.generator import iter_gcode
+from entalhe.params import MachiningParams
+from entalhe.program import parse_program
+
+IMPORTED_DIR = Path(__file__).parent / "golden" / "importados"
+
+PARAMS = MachiningParams.from_dict({
+    "diametroInicial": 40, "diametroFinal": 30, "aberturaChaveta": 14, "numEntalhes": 3,
+    "planoSeguroZ": 0, "ordemPasses": "nearest",
+})
+
+
+def test_generated_program_is_clean():
+    report = check_program(parse_program(iter_gcode(PARAMS)), MachineProfile(), stock_cylinder_from_params(PARAMS))
+    assert report.total == 0
+
+
+def test_retract_below_stock_face_is_reported():
+    # Retração curta dentro do material (programa editado à mão): o topo do blank
+    # continua na face Z0, então os rápidos e mergulhos abaixo dela são violações
+    params = replace(PARAMS, planoSeguroZ=-2)
+    lines = ["G0 Z-2" if line == "G0 Z0" else line for line in iter_gcode(PARAMS)]
+    stock = stock_cylinder_from_params(params)
+    assert stock.zTop == STOCK_FACE_Z
+
+    report = check_program(parse_program(lines), MachineProfile(), stock)
+    assert report.counts["rapid-in-stock"] == 57
+    assert report.counts["plunge-in-stock"] == 42
+
+
+@pytest.mark.parametrize("name", sorted(path.stem for path in IMPORTED_DIR.glob("*.nc")))
+def test_imported_file_matches_typescript_checker(name):
+    # Programas editados à mão (G91, G2/G3, G28...): mesmas violações que
+    # checkToolpath encontra no resultado de parseGCodeText
+    expected = json.loads((IMPORTED_DIR / f"{name}.json").read_text(encoding="utf-8"))["check"]
+    report = check_file(IMPORTED_DIR / f"{name}.nc", MachineProfile())
+
+    assert report.moves == expected["moves"]
+    assert report.total == expected["total"]
+    assert report.counts == expected["counts"]
+    assert [asdict(v) for v in report.violations] == expected["violations"]
@@ -0,0 +1,28 @@
+"""
+Saída do pacote entalhe comparada, byte a byte, com a do gerador TypeScript
+
+Os programas de referência em tests/golden foram gerados por
+lib/gcode-generator.ts com scripts/generate-golden.mjs; ao mudar o gerador,
+rode o script de novo e confira a diferença dos arquivos .nc.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from entalhe.generator import generate_gcode
+from entalhe.params import MachiningParams
+
+GOLDEN_DIR = Path(__file__).parent / "golden"
+CASES = json.loads((GOLDEN_DIR / "cases.json").read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("case", CASES, ids=[case["name"] for case in CASES])
+def test_matches_typescript_generator(case):
+    params = MachiningParams.from_dict(case["params"])
+    params.validate()
+    lines = generate_gcode(params, case.get("dialect", "standard"), optimize=case.get("optimize", False))
+
+    expected = (GOLDEN_DIR / f"{case['name']}.nc").read_bytes()
+    assert ("\n".join(lines) + "\n").encode("utf-8") == expected
@@ -0,0 +1,22 @@
+"""
+Validação dos parâmetros (MachiningParams.validate e o gerador)
+"""
+
+import pytest
+
+from entalhe.generator import generate_gcode
+from entalhe.params import MachiningParams
+
+
+@pytest.mark.parametrize("plano", [-2, -0.001])
+def test_safe_plane_inside_stock_is_rejected(plano):
+    params = MachiningParams.from_dict({"planoSeguroZ": plano, "aberturaChaveta": 14})
+    with pytest.raises(ValueError, match="acima da peça"):
+        params.validate()
+    with pytest.raises(ValueError, match="acima da peça"):
+        generate_gcode(params)
+
+
+@pytest.mark.parametrize("plano", [0, 1, 5])
+def test_safe_plane_at_or_above_stock_face_is_accepted(plano):
+    MachiningParams.from_dict({"planoSeguroZ": plano, "aberturaChaveta": 14}).validate()
@@ -0,0 +1,31 @@
+"""
+Programas editados à mão analisados pelo pacote entalhe e por lib/gcode-program.ts
+
+Os movimentos de referência em tests/golden/importados/<nome>.json foram
+gravados por scripts/generate-golden.mjs a partir de parseGCodeText; os
+arquivos .nc usam G91, G20, G2/G3, G28/G53, G92 e eixos modais em linhas N.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from entalhe.program import parse_program_text
+
+IMPORTED_DIR = Path(__file__).parent / "golden" / "importados"
+PROGRAMS = sorted(path.stem for path in IMPORTED_DIR.glob("*.nc"))
+
+
+@pytest.mark.parametrize("name", PROGRAMS)
+def test_matches_typescript_parser(name):
+    program = parse_program_text((IMPORTED_DIR / f"{name}.nc").read_bytes().decode("utf-8"))
+    expected = json.loads((IMPORTED_DIR / f"{name}.json").read_text(encoding="utf-8"))["moves"]
+
+    moves = [[program.x[i], program.y[i], program.z[i], program.a[i], program.f[i], program.motion[i], program.line[i]]
+             for i in range(len(program))]
+    assert len(moves) == len(expected)
+    for move, reference in zip(moves, expected):
+        # Cordas dos arcos: seno e cosseno podem diferir no último bit entre as linguagens
+        assert move[:5] == pytest.approx(reference[:5], abs=1e-9)
+        assert move[5:] == reference[5:]
@@ -0,0 +1,56 @@
+"""
+Modelo fechado da varredura (entalhe.sweep) comparado com plan_passes
+"""
+
+from dataclasses import replace
+
+import pytest
+
+from entalhe.params import MachiningParams
+from entalhe.planner import compute_y_levels, plan_passes
+from entalhe.sweep import MachineLimits, closed_form_cycle_time, closed_form_levels, evaluate_geometries
+
+CASES = {
+    "rasgo-cheio": {"aberturaChaveta": 8},
+    "dois-passes": {"aberturaChaveta": 12},
+    "centro-para-fora": {"aberturaChaveta": 20, "passoLateral": 2.4},
+    "serpentina-final-extra": {"aberturaChaveta": 20, "passoLateral": 3.2, "ordemPasses": "serpentine",
+                               "apY": 1.5, "diametroFinal": 37.3},
+    "vizinho-ao-contrario": {"aberturaChaveta": 14, "ordemPasses": "nearest", "diametroInicial": 40,
+                             "diametroFinal": 30, "planoSeguroZ": 1},
+    "conica": {"aberturaChaveta": 20, "passoLateral": 4, "chavetaConica": True, "anguloConico": 3},
+    # 25.4 - 10: o raio final fica 0.5 ulp abaixo de 7.7, e o gerador corta um nível extra
+    "diametro-final-inexato": {"aberturaChaveta": 14, "diametroInicial": 25.4,
+                               "diametroFinal": 15.399999999999999, "apY": 1},
+}
+
+
+@pytest.mark.parametrize("avanco_maximo", [None, 150, 400])
+@pytest.mark.parametrize("name", list(CASES))
+def test_closed_form_matches_planner(name, avanco_maximo):
+    params = MachiningParams.from_dict({**CASES[name], "avancoMaximo": avanco_maximo})
+    params.validate()
+    esperado = plan_passes(params).cycleTime
+    assert closed_form_cycle_time(params) == pytest.approx(esperado, rel=1e-4)
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_closed_form_levels_match_generator(name):
+    params = MachiningParams.from_dict(CASES[name])
+    y_levels, final = compute_y_levels(params)
+    assert closed_form_levels(params) == (len(y_levels), final)
+
+
+def test_sweep_applies_adaptive_feed():
+    params = MachiningParams.from_dict({"aberturaChaveta": 20, "avancoMaximo": 400})
+    limits = MachineLimits(max_chip_load=1)
+    geometria = [(1, 2.4)]
+
+    adaptativo = evaluate_geometries(params, geometria, [100, 500], limits)
+    constante = evaluate_geometries(replace(params, avancoMaximo=None), geometria, [100], limits)
+
+    # Avanços acima do avanço máximo são descartados
+    assert [r.avanco for r in adaptativo] == [100]
+    candidate = replace(params, apY=1, passoLateral=2.4)
+    assert adaptativo[0].cycleTime == pytest.approx(plan_passes(candidate).cycleTime, rel=1e-4)
+    assert adaptativo[0].feedTime < constante[0].feedTime